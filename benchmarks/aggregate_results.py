@@ -100,6 +100,8 @@ def main():
             'jwt_verification': compute_stats(data.get('jwt_verification_s', [])),
             'jwks_generation': compute_stats(data.get('jwks_generation_s', []))
         }
+        if data.get('verify_many_throughput'):
+            aggregated['verify_many_throughput'] = data['verify_many_throughput']
 
     # 4. Sizes (Static values)
     raw_sizes = results_dir / 'raw_sizes.json'
@@ -22,7 +22,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from kemtls.handshake import ClientHandshake, ServerHandshake
 from kemtls.pdk import PDKTrustStore
-from kemtls.certs import validate_certificate
+from kemtls.certs import CertificateCache, validate_certificate
 from utils.encoding import base64url_decode
 from crypto.ml_kem import MLKEM768
 from crypto.ml_dsa import MLDSA65
@@ -74,7 +74,9 @@ def bench_handshake_local(mode: str, keys: dict) -> Dict[str, Any]:
         expected_identity="auth-server",
         ca_pk=keys['ca_pk'],
         pdk_store=keys['pdk_store'],
-        mode=mode
+        mode=mode,
+        # Cold cache: every run carries and verifies the full certificate.
+        cert_cache=CertificateCache(),
     )
     server = ServerHandshake(
         server_identity="auth-server",
@@ -1,16 +1,122 @@
 """
 Benchmark: Protocol Flow Sizes
-Compares KEMTLS vs KEMTLS-PDK vs PQ-TLS handshake sizes.
+Compares KEMTLS vs KEMTLS-PDK vs PQ-TLS handshake sizes, and the KEMTLS/1.0
+(JSON) vs KEMTLS/1.1 (binary TLV) handshake wire formats, with and without a
+cached server certificate.
 """
 
 import os
 import sys
 import json
+import time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from crypto.ml_dsa import MLDSA65
+from crypto.ml_kem import MLKEM768
+from kemtls._wire import VERSION_BINARY, VERSION_JSON, decode_handshake_message, encode_message
+from kemtls.certs import CertificateCache, create_certificate
+from kemtls.handshake import ClientHandshake, ServerHandshake
+from utils.encoding import base64url_decode
+from utils.serialization import serialize_message
+
+BYTES_FIELDS = ('eph_pk', 'ct_ephemeral', 'ct_longterm', 'mac')
+MESSAGE_NAMES = ['ClientHello', 'ServerHello', 'ClientKeyExchange', 'ServerFinished', 'ClientFinished']
+
+
+def _encode(version: str, message: dict) -> bytes:
+    if version == VERSION_BINARY and message.get('type') != 'ClientHello':
+        return encode_message(message)
+    return serialize_message(message)
+
+
+def _source_message(message: dict) -> dict:
+    """Turn a decoded message back into the dict the handshake encodes (raw bytes fields)."""
+    source = dict(message)
+    for field in BYTES_FIELDS:
+        if isinstance(source.get(field), str):
+            source[field] = base64url_decode(source[field])
+    return source
+
+
+def _baseline_handshake(version: str, ca_pk: bytes, lt_sk: bytes, cert: dict, cert_cache: CertificateCache) -> list:
+    client = ClientHandshake('server-1', ca_pk=ca_pk, mode='baseline', versions=[version], cert_cache=cert_cache)
+    server = ServerHandshake('server-1', lt_sk, cert=cert)
+    ch = client.client_hello()
+    sh = server.process_client_hello(ch)
+    cke, session = client.process_server_hello(sh)
+    sf = server.process_client_key_exchange(cke)
+    client.process_server_finished(sf, session)
+    cf = client.client_finished()
+    server.verify_client_finished(cf)
+    return [ch, sh, cke, sf, cf]
+
+
+def measure_wire_formats(runs: int = 200) -> dict:
+    """Handshake bytes per message and encode/decode cost for each wire format."""
+    ca_pk, ca_sk = MLDSA65.generate_keypair()
+    lt_pk, lt_sk = MLKEM768.generate_keypair()
+    cert = create_certificate(
+        subject='server-1',
+        kem_pk=lt_pk,
+        ca_sk=ca_sk,
+        issuer='Root CA',
+        valid_from=0,
+        valid_to=4_000_000_000,
+    )
+
+    results = {}
+    for version in (VERSION_JSON, VERSION_BINARY):
+        # A fresh cache per version: the first handshake carries the full certificate,
+        # the second only its digest.
+        cert_cache = CertificateCache()
+        wire = _baseline_handshake(version, ca_pk, lt_sk, cert, cert_cache)
+        cached_wire = _baseline_handshake(version, ca_pk, lt_sk, cert, cert_cache)
+
+        decoded = [_source_message(decode_handshake_message(raw)) for raw in wire]
+
+        encode_ns = 0
+        decode_ns = 0
+        for _ in range(runs):
+            start = time.perf_counter_ns()
+            for message in decoded:
+                _encode(version, message)
+            encode_ns += time.perf_counter_ns() - start
+            start = time.perf_counter_ns()
+            for raw in wire:
+                decode_handshake_message(raw)
+            decode_ns += time.perf_counter_ns() - start
+
+        results[version] = {
+            'message_bytes': {name: len(raw) for name, raw in zip(MESSAGE_NAMES, wire)},
+            'total_bytes': sum(len(raw) for raw in wire),
+            'cached_cert_message_bytes': {name: len(raw) for name, raw in zip(MESSAGE_NAMES, cached_wire)},
+            'cached_cert_total_bytes': sum(len(raw) for raw in cached_wire),
+            'encode_us_per_handshake': round(encode_ns / runs / 1000, 3),
+            'decode_us_per_handshake': round(decode_ns / runs / 1000, 3),
+        }
+
+    json_total = results[VERSION_JSON]['total_bytes']
+    binary_total = results[VERSION_BINARY]['total_bytes']
+    results['savings_binary_vs_json_percent'] = round((json_total - binary_total) / json_total * 100, 2)
+    return results
+
+
 def run_benchmark(config: dict):
     print("Computing Protocol Handshake Sizes...")
-    
+
+    wire_formats = measure_wire_formats(int(config.get('wire_format_runs', 200)))
+    os.makedirs('results', exist_ok=True)
+    with open('results/raw_wire_formats.json', 'w') as f:
+        json.dump(wire_formats, f, indent=2)
+    print(
+        f"KEMTLS/1.0 JSON: {wire_formats[VERSION_JSON]['total_bytes']} bytes, "
+        f"KEMTLS/1.1 binary: {wire_formats[VERSION_BINARY]['total_bytes']} bytes "
+        f"({wire_formats[VERSION_BINARY]['cached_cert_total_bytes']} with a cached certificate)"
+    )
+    print("Saved raw_wire_formats.json")
+
     # We load the raw_kemtls data to get the exact bytes for kemtls and kemtls-pdk
     raw_path = Path('results/raw_kemtls.json')
     if not raw_path.exists():
@@ -37,7 +143,8 @@ def run_benchmark(config: dict):
         'kemtls_bytes': kemtls_size,
         'kemtls_pdk_bytes': pdk_size,
         'savings_kemtls_vs_pqtls_percent': round(diff_kemtls, 2),
-        'savings_kemtls_pdk_vs_pqtls_percent': round(diff_pdk, 2)
+        'savings_kemtls_pdk_vs_pqtls_percent': round(diff_pdk, 2),
+        'wire_formats': wire_formats,
     }
 
     os.makedirs('results', exist_ok=True)
@@ -10,7 +10,7 @@ import time
 import uuid
 from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 ROOT_DIR = SCRIPT_DIR.parent.parent
@@ -19,13 +19,16 @@ if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
 from client.kemtls_http_client import KEMTLSHttpClient
+from client.metadata_cache import MetadataCache
 from client.oidc_client import OIDCClient
+from kemtls.resumption import TicketCache
 from telemetry.collector import KEMTLSHandshakeCollector
 
 from runtime_support import (
     BENCH_CLIENT_ID,
     BENCH_REDIRECT_URI,
     BENCH_SCOPE,
+    SERVER_IMPLS,
     BenchmarkStack,
 )
 
@@ -40,7 +43,25 @@ def _protocol_modes(protocols: Iterable[str]) -> List[str]:
     return modes or ["baseline", "pdk"]
 
 
-def _build_http_client(stack: BenchmarkStack, *, expected_identity: str, mode: str, keep_alive: bool) -> KEMTLSHttpClient:
+def _server_impls(values: Iterable[str]) -> List[str]:
+    impls: List[str] = []
+    for value in values:
+        normalized = str(value).lower()
+        if normalized not in SERVER_IMPLS:
+            raise ValueError(f"Unsupported server implementation: {value}")
+        if normalized not in impls:
+            impls.append(normalized)
+    return impls or ["threaded"]
+
+
+def _build_http_client(
+    stack: BenchmarkStack,
+    *,
+    expected_identity: str,
+    mode: str,
+    keep_alive: bool,
+    ticket_cache: Optional[TicketCache] = None,
+) -> KEMTLSHttpClient:
     client = KEMTLSHttpClient(
         ca_pk=stack.keys["ca_pk"],
         pdk_store=stack.keys["pdk_store"],
@@ -48,6 +69,7 @@ def _build_http_client(stack: BenchmarkStack, *, expected_identity: str, mode: s
         mode=mode,
         transport="tcp",
         keep_alive=keep_alive,
+        ticket_cache=ticket_cache,
     )
     client.client.collector = KEMTLSHandshakeCollector()
     return client
@@ -61,17 +83,30 @@ def _percentile(values: List[float], p: float) -> float:
     return float(ordered[idx])
 
 
-def _single_request(mode: str, stack: BenchmarkStack) -> Dict[str, Any]:
+def _single_request(
+    mode: str,
+    stack: BenchmarkStack,
+    ticket_cache: Optional[TicketCache] = None,
+    metadata_cache: Optional[MetadataCache] = None,
+) -> Dict[str, Any]:
     start_ns = time.perf_counter_ns()
     try:
-        auth_http = _build_http_client(stack, expected_identity="auth-server", mode=mode, keep_alive=True)
+        auth_http = _build_http_client(
+            stack,
+            expected_identity="auth-server",
+            mode=mode,
+            keep_alive=True,
+            ticket_cache=ticket_cache,
+        )
         oidc_client = OIDCClient(
             http_client=auth_http,
             client_id=BENCH_CLIENT_ID,
             issuer_url=stack.auth_url,
             redirect_uri=BENCH_REDIRECT_URI,
+            # Without a shared cache every simulated user fetches discovery itself.
+            metadata_cache=metadata_cache or MetadataCache(),
         )
-        auth_http.get(f"{stack.auth_url}/.well-known/openid-configuration")
+        oidc_client.discover()
         authorize_resp = auth_http.get(oidc_client.start_auth(scope=BENCH_SCOPE))
         code = authorize_resp.get("body", {}).get("code")
         if authorize_resp.get("status") != 200 or not code:
@@ -81,7 +116,13 @@ def _single_request(mode: str, stack: BenchmarkStack) -> Dict[str, Any]:
         if not token:
             raise ValueError("token_error")
 
-        resource_http = _build_http_client(stack, expected_identity="resource-server", mode=mode, keep_alive=False)
+        resource_http = _build_http_client(
+            stack,
+            expected_identity="resource-server",
+            mode=mode,
+            keep_alive=False,
+            ticket_cache=ticket_cache,
+        )
         resource_http.set_binding_keypair(*auth_http.get_binding_keypair())
         userinfo_resp = resource_http.get(
             f"{stack.resource_url}/benchmark/userinfo",
@@ -120,11 +161,18 @@ def _single_request(mode: str, stack: BenchmarkStack) -> Dict[str, Any]:
         }
 
 
-def _run_level(mode: str, stack: BenchmarkStack, total_requests: int, concurrency: int) -> Dict[str, Any]:
+def _run_level(
+    mode: str,
+    stack: BenchmarkStack,
+    total_requests: int,
+    concurrency: int,
+    ticket_cache: Optional[TicketCache] = None,
+    metadata_cache: Optional[MetadataCache] = None,
+) -> Dict[str, Any]:
     started = time.perf_counter()
     results: List[Dict[str, Any]] = []
     with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
-        futures = [executor.submit(_single_request, mode, stack) for _ in range(total_requests)]
+        futures = [executor.submit(_single_request, mode, stack, ticket_cache, metadata_cache) for _ in range(total_requests)]
         for future in concurrent.futures.as_completed(futures):
             results.append(future.result())
     duration = max(time.perf_counter() - started, 1e-9)
@@ -173,6 +221,9 @@ def run_benchmark(config: Dict[str, Any]) -> Path:
     warmup = int(config.get("warmup", 50))
     protocols = list(config.get("protocols", ["kemtls", "kemtls_pdk"]))
     concurrency_levels = [int(v) for v in config.get("load_concurrency_levels", [1, 5, 10, 25, 50, 100])]
+    server_impls = _server_impls(config.get("load_server_impls", ["threaded"]))
+    resumption = bool(config.get("load_resumption", False))
+    cache_metadata = bool(config.get("load_metadata_cache", False))
     results_dir = Path(config.get("results_dir", "benchmarks/results"))
     raw_dir = results_dir / "raw" / run_id
     raw_dir.mkdir(parents=True, exist_ok=True)
@@ -185,44 +236,56 @@ def run_benchmark(config: Dict[str, Any]) -> Path:
     print(f"[*] environment_profile={environment_profile}")
     print(f"[*] scenario={scenario}")
     print(f"[*] warmup_requests={warmup} measured_requests={repeat}")
+    print(f"[*] server_impls={','.join(server_impls)}")
+    print(f"[*] resumption={'on' if resumption else 'off'}")
+    print(f"[*] metadata_cache={'on' if cache_metadata else 'off'}")
 
     rows: List[Dict[str, Any]] = []
-    summaries: Dict[str, Dict[str, Any]] = {}
-
-    with BenchmarkStack(transport="tcp") as stack:
-        stack.start_oidc_servers()
-        for mode in _protocol_modes(protocols):
-            summaries[mode] = {}
-            for concurrency in concurrency_levels:
-                if warmup > 0:
-                    _run_level(mode, stack, warmup, concurrency)
-                result = _run_level(mode, stack, repeat, concurrency)
-                row = {
-                    "run_id": run_id,
-                    "protocol": "OIDC_LOAD",
-                    "scenario": scenario,
-                    "handshake_mode": mode,
-                    "concurrency": concurrency,
-                    "total_requests": result["total_requests"],
-                    "successes": result["successes"],
-                    "failures": result["failures"],
-                    "error_rate_pct": round(float(result["error_rate_pct"]), 3),
-                    "throughput_req_sec": round(float(result["throughput_req_sec"]), 3),
-                    "avg_latency_ms": round(float(result["avg_latency_ms"]), 3),
-                    "p50_latency_ms": round(float(result["p50_latency_ms"]), 3),
-                    "p95_latency_ms": round(float(result["p95_latency_ms"]), 3),
-                    "p99_latency_ms": round(float(result["p99_latency_ms"]), 3),
-                    "min_latency_ms": round(float(result["min_latency_ms"]), 3),
-                    "max_latency_ms": round(float(result["max_latency_ms"]), 3),
-                    "t_auth_total_ms_avg": round(float(result["t_auth_total_ms_avg"]), 3),
-                    "t_token_ms_avg": round(float(result["t_token_ms_avg"]), 3),
-                    "t_userinfo_ms_avg": round(float(result["t_userinfo_ms_avg"]), 3),
-                    "t_tls_hs_ms_avg": round(float(result["t_tls_hs_ms_avg"]), 3),
-                    "warmup_requests": warmup,
-                    "environment_profile": environment_profile,
-                }
-                rows.append(row)
-                summaries[mode][str(concurrency)] = {**row, "errors": result["errors"]}
+    summaries: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    for server_impl in server_impls:
+        summaries[server_impl] = {}
+        with BenchmarkStack(transport="tcp", server_impl=server_impl) as stack:
+            stack.start_oidc_servers()
+            for mode in _protocol_modes(protocols):
+                summaries[server_impl][mode] = {}
+                # One cache per mode, shared by every simulated user, so repeat
+                # connections to each server resume instead of re-running the KEM.
+                ticket_cache = TicketCache() if resumption else None
+                metadata_cache = MetadataCache() if cache_metadata else None
+                for concurrency in concurrency_levels:
+                    if warmup > 0:
+                        _run_level(mode, stack, warmup, concurrency, ticket_cache, metadata_cache)
+                    result = _run_level(mode, stack, repeat, concurrency, ticket_cache, metadata_cache)
+                    row = {
+                        "run_id": run_id,
+                        "protocol": "OIDC_LOAD",
+                        "scenario": scenario,
+                        "server_impl": server_impl,
+                        "handshake_mode": mode,
+                        "resumption": resumption,
+                        "metadata_cache": cache_metadata,
+                        "concurrency": concurrency,
+                        "total_requests": result["total_requests"],
+                        "successes": result["successes"],
+                        "failures": result["failures"],
+                        "error_rate_pct": round(float(result["error_rate_pct"]), 3),
+                        "throughput_req_sec": round(float(result["throughput_req_sec"]), 3),
+                        "avg_latency_ms": round(float(result["avg_latency_ms"]), 3),
+                        "p50_latency_ms": round(float(result["p50_latency_ms"]), 3),
+                        "p95_latency_ms": round(float(result["p95_latency_ms"]), 3),
+                        "p99_latency_ms": round(float(result["p99_latency_ms"]), 3),
+                        "min_latency_ms": round(float(result["min_latency_ms"]), 3),
+                        "max_latency_ms": round(float(result["max_latency_ms"]), 3),
+                        "t_auth_total_ms_avg": round(float(result["t_auth_total_ms_avg"]), 3),
+                        "t_token_ms_avg": round(float(result["t_token_ms_avg"]), 3),
+                        "t_userinfo_ms_avg": round(float(result["t_userinfo_ms_avg"]), 3),
+                        "t_tls_hs_ms_avg": round(float(result["t_tls_hs_ms_avg"]), 3),
+                        "warmup_requests": warmup,
+                        "environment_profile": environment_profile,
+                    }
+                    rows.append(row)
+                    summaries[server_impl][mode][str(concurrency)] = {**row, "errors": result["errors"]}
 
     with csv_path.open("w", newline="", encoding="utf-8") as file_handle:
         writer = csv.DictWriter(
@@ -231,7 +294,10 @@ def run_benchmark(config: Dict[str, Any]) -> Path:
                 "run_id",
                 "protocol",
                 "scenario",
+                "server_impl",
                 "handshake_mode",
+                "resumption",
+                "metadata_cache",
                 "concurrency",
                 "total_requests",
                 "successes",
@@ -269,6 +335,22 @@ def main() -> None:
     parser.add_argument("--repeat", type=int, default=None)
     parser.add_argument("--warmup", type=int, default=None)
     parser.add_argument("--environment-profile", default=None)
+    parser.add_argument(
+        "--server-impl",
+        choices=[*SERVER_IMPLS, "both"],
+        default=None,
+        help="TCP server implementation to load (threaded, async, or both for a side-by-side run)",
+    )
+    parser.add_argument(
+        "--resumption",
+        action="store_true",
+        help="Share a resumption ticket cache so repeat connections skip the KEM round trip",
+    )
+    parser.add_argument(
+        "--metadata-cache",
+        action="store_true",
+        help="Share a discovery metadata cache so only the first flow fetches the openid-configuration",
+    )
     args = parser.parse_args()
 
     config_path = (SCRIPT_DIR / args.config).resolve()
@@ -283,6 +365,12 @@ def main() -> None:
         config["warmup"] = args.warmup
     if args.environment_profile is not None:
         config["environment_profile"] = args.environment_profile
+    if args.server_impl is not None:
+        config["load_server_impls"] = list(SERVER_IMPLS) if args.server_impl == "both" else [args.server_impl]
+    if args.resumption:
+        config["load_resumption"] = True
+    if args.metadata_cache:
+        config["load_metadata_cache"] = True
 
     run_benchmark(config)
 
@@ -8,7 +8,7 @@ import sys
 import time
 import uuid
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 ROOT_DIR = SCRIPT_DIR.parent.parent
@@ -18,6 +18,7 @@ if str(SRC_DIR) not in sys.path:
 
 from client.kemtls_http_client import KEMTLSHttpClient
 from client.oidc_client import OIDCClient
+from kemtls.pool import ConnectionPool
 from runtime_support import (
     BENCH_CLIENT_ID,
     BENCH_REDIRECT_URI,
@@ -28,7 +29,7 @@ from runtime_support import (
 # Import collectors for sizing and timers
 from telemetry.collector import OIDCTokenCollector, OIDCUserinfoCollector
 
-def _run_flow(mode: str, stack: BenchmarkStack) -> Dict[str, Any]:
+def _run_flow(mode: str, stack: BenchmarkStack, pool: Optional[ConnectionPool] = None) -> Dict[str, Any]:
     # Measurements
     t_handshake_ms = 0.0
     t_authorize_ms = 0.0
@@ -44,6 +45,7 @@ def _run_flow(mode: str, stack: BenchmarkStack) -> Dict[str, Any]:
         expected_identity="auth-server",
         mode=mode,
         keep_alive=True,
+        pool=pool,
     )
     # The first request triggers handshake
     auth_http.get(f"{stack.auth_url}/.well-known/openid-configuration")
@@ -78,6 +80,7 @@ def _run_flow(mode: str, stack: BenchmarkStack) -> Dict[str, Any]:
         pdk_store=stack.keys["pdk_store"],
         expected_identity="resource-server",
         mode=mode,
+        pool=pool,
     )
     resource_http.set_binding_keypair(*auth_http.get_binding_keypair())
     
@@ -132,6 +135,7 @@ def run_benchmark(config: Dict[str, Any]):
     repeat = config.get("repeat", 10)
     warmup = config.get("warmup", 2)
     protocols = config.get("protocols", ["baseline", "pdk"])
+    pooled = bool(config.get("oidc_pool", False))
     
     results_dir = Path(config.get("results_dir", "benchmarks/results"))
     raw_dir = results_dir / "raw" / run_id
@@ -146,12 +150,14 @@ def run_benchmark(config: Dict[str, Any]):
         stack.start_oidc_servers()
         
         for mode in protocols:
-            print(f"[*] OIDC -> Mode: {mode}")
+            print(f"[*] OIDC -> Mode: {mode} (pool={'on' if pooled else 'off'})")
+            # One pool per mode, shared by the auth and resource clients of every flow.
+            pool = ConnectionPool() if pooled else None
             for _ in range(warmup):
-                _run_flow(mode, stack)
+                _run_flow(mode, stack, pool)
                 
             for i in range(repeat):
-                res = _run_flow(mode, stack)
+                res = _run_flow(mode, stack, pool)
                 rows.append({
                     "run_id": run_id,
                     "protocol": "KEMTLS",
@@ -166,14 +172,17 @@ def run_benchmark(config: Dict[str, Any]):
                     "pop_ms": round(res["t_pop_verify_ms"], 3),
                     "jwt_sign_ms": round(res["t_jwt_sign_ms"], 3),
                     "replay_blocked": res["replay_blocked"],
+                    "pooled": pooled,
                     "iteration": i
                 })
+            if pool is not None:
+                pool.close()
 
     with csv_path.open("w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=[
             "run_id", "protocol", "scenario", "auth_total_ms", "full_cycle_ms",
             "handshake_ms", "authorize_ms", "token_ms", "verify_ms", "resource_ms", "pop_ms",
-            "jwt_sign_ms", "replay_blocked", "iteration"
+            "jwt_sign_ms", "replay_blocked", "pooled", "iteration"
         ])
         writer.writeheader()
         writer.writerows(rows)
@@ -188,11 +197,17 @@ if __name__ == "__main__":
     parser.add_argument("--repeat", type=int, default=10)
     parser.add_argument("--warmup", type=int, default=2)
     parser.add_argument("--environment-profile", default=None)
+    parser.add_argument(
+        "--pool",
+        action="store_true",
+        help="Share a connection pool so each server hop reuses an established KEMTLS session",
+    )
     args = parser.parse_args()
     
     run_benchmark({
         "repeat": args.repeat,
         "warmup": args.warmup,
         "run_id": args.run_id,
-        "results_dir": args.results_dir
+        "results_dir": args.results_dir,
+        "oidc_pool": args.pool,
     })
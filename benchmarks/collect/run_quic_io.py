@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+ROOT_DIR = SCRIPT_DIR.parent.parent
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from flask import Flask, jsonify
+
+from client.kemtls_http_client import KEMTLSHttpClient
+from kemtls.quic_server import KEMTLSQUICServer
+
+from runtime_support import find_free_port, load_keys
+
+
+IO_MODES = {"unbatched": False, "batched": True}
+
+
+def _create_payload_app(payload_bytes: int) -> Flask:
+    app = Flask("quic-io-bench")
+    blob = "x" * payload_bytes
+
+    @app.route("/payload", methods=["GET"])
+    def payload():
+        return jsonify({"blob": blob})
+
+    return app
+
+
+def _serve(batch_io: bool, port: int, payload_bytes: int, control) -> None:
+    """Child process: run one QUIC server and report its CPU time and I/O counters."""
+    keys = load_keys()
+    server = KEMTLSQUICServer(
+        app=_create_payload_app(payload_bytes),
+        server_identity="auth-server",
+        server_lt_sk=keys["auth_sk"],
+        cert=keys["auth_cert"],
+        pdk_key_id=keys["auth_pdk_key_id"],
+        host="127.0.0.1",
+        port=port,
+        batch_io=batch_io,
+    )
+    thread = threading.Thread(target=server.start, daemon=True)
+    thread.start()
+    while server.sock.getsockname()[1] != port:
+        time.sleep(0.01)
+    control.send("ready")
+
+    control.recv()
+    start_cpu = sum(os.times()[:2])
+    start_io = server.get_metrics()["io"]
+    control.send("measuring")
+
+    control.recv()
+    cpu_seconds = sum(os.times()[:2]) - start_cpu
+    end_io = server.get_metrics()["io"]
+    server.stop()
+    thread.join(timeout=3.0)
+    io = {key: value - start_io[key] if isinstance(value, int) and not isinstance(value, bool) else value for key, value in end_io.items()}
+    control.send({"cpu_seconds": cpu_seconds, "io": io})
+
+
+def _client_worker(keys: Dict[str, Any], port: int, requests: int) -> int:
+    client = KEMTLSHttpClient(
+        ca_pk=keys["ca_pk"],
+        pdk_store=keys["pdk_store"],
+        expected_identity="auth-server",
+        mode="baseline",
+        transport="quic",
+        keep_alive=True,
+    )
+    ok = 0
+    try:
+        for _ in range(requests):
+            if client.get(f"kemtls://127.0.0.1:{port}/payload").get("status") == 200:
+                ok += 1
+    finally:
+        client.close()
+    return ok
+
+
+def _run_mode(io_mode: str, *, clients: int, requests: int, payload_bytes: int) -> Dict[str, Any]:
+    keys = load_keys()
+    port = find_free_port()
+    context = multiprocessing.get_context("fork")
+    control, child_control = context.Pipe()
+    process = context.Process(target=_serve, args=(IO_MODES[io_mode], port, payload_bytes, child_control), daemon=True)
+    process.start()
+    try:
+        control.recv()
+        # Warm the server (and its key pool) up before measuring.
+        _client_worker(keys, port, 1)
+
+        control.send("start")
+        control.recv()
+        started = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=clients) as executor:
+            futures = [executor.submit(_client_worker, keys, port, requests) for _ in range(clients)]
+            successes = sum(future.result() for future in futures)
+        duration = max(time.perf_counter() - started, 1e-9)
+
+        control.send("stop")
+        report = control.recv()
+    finally:
+        process.join(timeout=5.0)
+        if process.is_alive():
+            process.terminate()
+
+    io = report["io"]
+    packets = int(io["datagrams_received"]) + int(io["datagrams_sent"])
+    cpu_seconds = max(float(report["cpu_seconds"]), 1e-9)
+    return {
+        "io_mode": io_mode,
+        "clients": clients,
+        "requests_per_client": requests,
+        "payload_bytes": payload_bytes,
+        "successes": successes,
+        "duration_s": duration,
+        "server_cpu_s": cpu_seconds,
+        "packets": packets,
+        "packets_per_sec": packets / duration,
+        "packets_per_sec_per_core": packets / cpu_seconds,
+        "datagrams_received": io["datagrams_received"],
+        "receive_wakeups": io["receive_wakeups"],
+        "datagrams_sent": io["datagrams_sent"],
+        "send_calls": io["send_calls"],
+        "segment_offload": io["segment_offload"],
+    }
+
+
+def run_benchmark(config: Dict[str, Any]) -> Path:
+    run_id = str(config.get("run_id") or uuid.uuid4().hex[:8])
+    clients = int(config.get("quic_io_clients", 8))
+    requests = int(config.get("quic_io_requests", 20))
+    payload_bytes = int(config.get("quic_io_payload_bytes", 32 * 1024))
+    results_dir = Path(config.get("results_dir", "benchmarks/results"))
+    raw_dir = results_dir / "raw" / run_id
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = raw_dir / "quic_io_results.csv"
+    summary_path = raw_dir / "quic_io_summary.json"
+
+    print("Running QUIC datagram I/O benchmark...")
+    print(f"[*] run_id={run_id} clients={clients} requests_per_client={requests} payload_bytes={payload_bytes}")
+
+    rows: List[Dict[str, Any]] = []
+    for io_mode in IO_MODES:
+        row = _run_mode(io_mode, clients=clients, requests=requests, payload_bytes=payload_bytes)
+        row = {"run_id": run_id, **{key: round(value, 3) if isinstance(value, float) else value for key, value in row.items()}}
+        rows.append(row)
+        print(
+            f"[*] {io_mode}: {row['packets_per_sec_per_core']} packets/s/core, "
+            f"{row['packets']} packets in {row['send_calls']} send calls / {row['receive_wakeups']} receive wakeups"
+        )
+
+    with csv_path.open("w", newline="", encoding="utf-8") as file_handle:
+        writer = csv.DictWriter(file_handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    summary_path.write_text(json.dumps({row["io_mode"]: row for row in rows}, indent=2), encoding="utf-8")
+    print(f"[*] QUIC I/O benchmarks saved to {csv_path}")
+    return csv_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare batched and one-datagram-per-syscall QUIC server I/O")
+    parser.add_argument("--config", default="../config.json")
+    parser.add_argument("--results-dir", default=None)
+    parser.add_argument("--run-id", default=None)
+    parser.add_argument("--clients", type=int, default=None)
+    parser.add_argument("--requests", type=int, default=None)
+    parser.add_argument("--payload-bytes", type=int, default=None)
+    args = parser.parse_args()
+
+    config_path = (SCRIPT_DIR / args.config).resolve()
+    config = json.loads(config_path.read_text(encoding="utf-8")) if config_path.exists() else {}
+    if args.results_dir is not None:
+        config["results_dir"] = args.results_dir
+    if args.run_id is not None:
+        config["run_id"] = args.run_id
+    if args.clients is not None:
+        config["quic_io_clients"] = args.clients
+    if args.requests is not None:
+        config["quic_io_requests"] = args.requests
+    if args.payload_bytes is not None:
+        config["quic_io_payload_bytes"] = args.payload_bytes
+    run_benchmark(config)
+
+
+if __name__ == "__main__":
+    main()
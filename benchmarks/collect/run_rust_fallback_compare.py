@@ -22,6 +22,7 @@ from client.kemtls_http_client import KEMTLSHttpClient
 from crypto.key_schedule import compute_transcript_hash, hkdf_extract, hkdf_expand_label
 from crypto.ml_dsa import MLDSA65
 from crypto.ml_kem import MLKEM768
+from crypto.ml_kem import get_backend_name as get_ml_kem_backend
 from kemtls._http_bridge import parse_http_request
 from kemtls.certs import create_certificate
 from kemtls.handshake import ClientHandshake, ServerHandshake
@@ -469,6 +470,7 @@ def run_benchmark(config: Dict[str, Any]) -> Path:
             "design": "same-process A/B with Rust enabled vs forced Python fallback",
             "scope_note": "Partial-path benchmark. Measures helper and handshake paths, not full distributed system throughput.",
             "build_profile": get_build_profile(),
+            "ml_kem_backend": get_ml_kem_backend(),
             "synthetic_vs_meaningful_review": {
                 "synthetic": [
                     "serialization_roundtrip",
@@ -9,7 +9,7 @@ import time
 from contextlib import ExitStack
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, Optional
+from typing import Any, Callable, Dict, Iterable, Optional, Union
 
 from flask import Flask, jsonify
 
@@ -20,6 +20,7 @@ SRC_DIR = ROOT_DIR / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
+from kemtls.async_tcp_server import AsyncKEMTLSTCPServer
 from kemtls.pdk import PDKTrustStore
 from kemtls.tcp_server import KEMTLSTCPServer
 from oidc.auth_endpoints import InMemoryClientRegistry
@@ -37,6 +38,11 @@ BENCH_CLIENT_ID = "bench-client"
 BENCH_REDIRECT_URI = "kemtls://127.0.0.1:50001/callback"
 BENCH_SCOPE = "openid profile email"
 
+SERVER_IMPLS = {
+    "threaded": KEMTLSTCPServer,
+    "async": AsyncKEMTLSTCPServer,
+}
+
 
 def load_keys() -> Dict[str, Any]:
     base_dir = ROOT_DIR / "keys"
@@ -96,7 +102,7 @@ class ServerHandle:
     name: str
     host: str
     port: int
-    server: KEMTLSTCPServer
+    server: Union[KEMTLSTCPServer, AsyncKEMTLSTCPServer]
     thread: threading.Thread
     handshake_metrics: "queue.SimpleQueue[Dict[str, Any]]"
 
@@ -115,9 +121,12 @@ def _start_server(
     server_lt_sk: bytes,
     cert: Optional[Dict[str, Any]],
     pdk_key_id: Optional[str],
+    server_impl: str = "threaded",
 ) -> ServerHandle:
+    if server_impl not in SERVER_IMPLS:
+        raise ValueError(f"Unsupported server implementation: {server_impl}")
     metrics_queue: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
-    server = KEMTLSTCPServer(
+    server = SERVER_IMPLS[server_impl](
         app=app,
         server_identity=server_identity,
         server_lt_sk=server_lt_sk,
@@ -207,9 +216,18 @@ def create_resource_app(
 
 
 class BenchmarkStack:
-    def __init__(self, *, transport: str = "tcp", host: str = "127.0.0.1"):
+    def __init__(
+        self,
+        *,
+        transport: str = "tcp",
+        host: str = "127.0.0.1",
+        server_impl: str = "threaded",
+    ):
+        if server_impl not in SERVER_IMPLS:
+            raise ValueError(f"Unsupported server implementation: {server_impl}")
         self.transport = transport
         self.host = host
+        self.server_impl = server_impl
         self.keys = load_keys()
         self._exit_stack = ExitStack()
         self.auth_handle: Optional[ServerHandle] = None
@@ -239,6 +257,7 @@ class BenchmarkStack:
             server_lt_sk=self.keys["auth_sk"],
             cert=self.keys["auth_cert"],
             pdk_key_id=self.keys["auth_pdk_key_id"],
+            server_impl=self.server_impl,
         )
         self._exit_stack.callback(handle.stop)
         return handle
@@ -269,6 +288,7 @@ class BenchmarkStack:
             server_lt_sk=self.keys["auth_sk"],
             cert=self.keys["auth_cert"],
             pdk_key_id=self.keys["auth_pdk_key_id"],
+            server_impl=self.server_impl,
         )
         self._exit_stack.callback(self.auth_handle.stop)
 
@@ -281,6 +301,7 @@ class BenchmarkStack:
             server_lt_sk=self.keys["resource_sk"],
             cert=self.keys["resource_cert"],
             pdk_key_id=self.keys["resource_pdk_key_id"],
+            server_impl=self.server_impl,
         )
         self._exit_stack.callback(self.resource_handle.stop)
         return self.auth_handle, self.resource_handle
@@ -78,6 +78,7 @@ def main() -> None:
     parser.add_argument("--transport", choices=["tcp", "quic"], default="quic")
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=4433)
+    parser.add_argument("--workers", type=int, default=1, help="QUIC worker processes (SO_REUSEPORT)")
     args = parser.parse_args()
 
     base_dir = Path(__file__).parent.parent / "keys"
@@ -91,6 +92,7 @@ def main() -> None:
 
     app = create_auth_app(args.host, args.port, args.transport)
     server_class = KEMTLSTCPServer if args.transport == "tcp" else KEMTLSQUICServer
+    server_kwargs = {} if args.transport == "tcp" else {"workers": args.workers}
     server = server_class(
         app=app,
         server_identity="auth-server",
@@ -99,6 +101,7 @@ def main() -> None:
         pdk_key_id=load_pdk_key_id(base_dir, "auth-server"),
         host=args.host,
         port=args.port,
+        **server_kwargs,
     )
     print(f"Starting Auth Server on {args.host}:{args.port} using {args.transport.upper()} transport...")
     server.start()
@@ -1,9 +1,10 @@
 
 """Client package exports."""
 
-from . import kemtls_client, oidc_client
+from . import kemtls_client, metadata_cache, oidc_client
 
 __all__ = [
 	"kemtls_client",
+	"metadata_cache",
 	"oidc_client",
 ]
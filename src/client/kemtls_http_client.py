@@ -7,10 +7,12 @@ response parsing for KEMTLS-secured HTTP interaction.
 """
 
 import json
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlparse, urlencode
 from kemtls.client import KEMTLSClient
 from kemtls.pdk import PDKTrustStore
+from kemtls.pool import ConnectionPool
+from kemtls.resumption import TicketCache
 from kemtls.tcp_transport import build_http_request
 from oidc.session_binding import build_binding_proof_headers
 from rust_ext import http as rust_http
@@ -33,6 +35,10 @@ class KEMTLSHttpClient:
         keep_alive: bool = False,
         binding_public_key: Optional[bytes] = None,
         binding_secret_key: Optional[bytes] = None,
+        handshake_versions: Optional[List[str]] = None,
+        ticket_cache: Optional[TicketCache] = None,
+        early_data: bool = False,
+        pool: Optional[ConnectionPool] = None,
     ):
         """
         Initialize the HTTP client.
@@ -42,6 +48,15 @@ class KEMTLSHttpClient:
             pdk_store: PDK Trust Store for pre-distributed keys
             expected_identity: Target server's identity
             mode: Handshake mode (baseline, pdk, or auto)
+            handshake_versions: KEMTLS wire versions to offer, most preferred
+                first (e.g. ["KEMTLS/1.1", "KEMTLS/1.0"] for the binary format)
+            ticket_cache: Resumption ticket store; when set, repeat connections
+                to a server resume with a PSK instead of a full KEM handshake
+            early_data: Send credential-free GETs to the discovery and JWKS
+                routes as 0-RTT data when resuming, one round trip sooner
+            pool: Connection pool to check connections out of; share one
+                between the clients for the authorization and resource servers
+                so each server hop reuses an established session
         """
         self.ca_pk = ca_pk
         self.pdk_store = pdk_store
@@ -59,6 +74,10 @@ class KEMTLSHttpClient:
             pdk_store=pdk_store,
             mode=mode,
             transport=transport,
+            handshake_versions=handshake_versions,
+            ticket_cache=ticket_cache,
+            early_data=early_data,
+            pool=pool,
         )
 
     def _ensure_binding_keypair(self) -> Tuple[bytes, bytes]:
@@ -167,7 +186,7 @@ class KEMTLSHttpClient:
             path,
             headers=effective_headers,
             body=body,
-            keep_alive=self.keep_alive,
+            keep_alive=self.keep_alive or self.client.pool is not None,
         )
         
         # Attach session metadata
@@ -177,6 +196,7 @@ class KEMTLSHttpClient:
             'session_id': session.session_id,
             'session_binding_id': session.session_binding_id,
             'trusted_key_id': session.trusted_key_id,
+            'resumed': session.resumed,
             'request_bytes': len(request_bytes),
             'response_bytes': len(raw_response),
         }
@@ -0,0 +1,171 @@
+"""
+Client-side cache of issuer discovery metadata and JWKS.
+
+Documents are cached per issuer and honour the server's ``Cache-Control:
+max-age``. Once an entry goes stale it is revalidated with ``If-None-Match``
+against its ``ETag``, so an unchanged document costs a 304 instead of a full
+body. Concurrent lookups of the same stale document wait on one in-flight
+fetch instead of each opening a request.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+
+from crypto.ml_dsa import MLDSA65
+
+
+CacheKey = Tuple[str, str]
+
+DISCOVERY_PATH = "/.well-known/openid-configuration"
+_DEFAULT_MAX_AGE_S = 60.0
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)")
+
+
+def _header(headers: Dict[str, str], name: str) -> Optional[str]:
+    lowered = name.lower()
+    for key, value in headers.items():
+        if key.lower() == lowered:
+            return value
+    return None
+
+
+def _max_age(headers: Dict[str, str], default: float) -> float:
+    cache_control = (_header(headers, "Cache-Control") or "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0.0
+    match = _MAX_AGE_RE.search(cache_control)
+    return float(match.group(1)) if match else default
+
+
+class MetadataCache:
+    """
+    Thread-safe cache of ``(issuer, document)`` to response bodies.
+
+    ``http_client`` is anything with the ``KEMTLSHttpClient.get`` shape; the
+    caller passes its own so the fetch reuses that client's connection.
+    Responses without ``Cache-Control`` stay fresh for ``default_max_age_s``.
+    """
+
+    def __init__(self, default_max_age_s: float = _DEFAULT_MAX_AGE_S):
+        self.default_max_age_s = default_max_age_s
+        # key -> (body, etag, fresh_until)
+        self._entries: Dict[CacheKey, Tuple[Dict[str, Any], Optional[str], float]] = {}
+        self._inflight: Dict[CacheKey, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.fetches = 0
+        self.revalidated = 0
+        self.coalesced = 0
+
+    def get_configuration(self, http_client, issuer_url: str) -> Dict[str, Any]:
+        """The issuer's discovery document."""
+        issuer_url = issuer_url.rstrip("/")
+        return self._get(http_client, (issuer_url, "configuration"), f"{issuer_url}{DISCOVERY_PATH}")
+
+    def get_jwks(self, http_client, issuer_url: str) -> Dict[str, Any]:
+        """The JWKS published at the issuer's ``jwks_uri``."""
+        issuer_url = issuer_url.rstrip("/")
+        jwks_uri = self.get_configuration(http_client, issuer_url).get("jwks_uri") or f"{issuer_url}/jwks"
+        return self._get(http_client, (issuer_url, "jwks"), jwks_uri)
+
+    def get_signing_keys(self, http_client, issuer_url: str) -> Dict[str, bytes]:
+        """The issuer's ML-DSA public keys by ``kid``, ready to pass to ``PQJWT``."""
+        return {
+            jwk["kid"]: MLDSA65.jwk_to_public_key(jwk)
+            for jwk in self.get_jwks(http_client, issuer_url).get("keys", [])
+            if jwk.get("kid")
+        }
+
+    def invalidate(self, issuer_url: Optional[str] = None) -> None:
+        """Forget one issuer's documents, or everything."""
+        with self._lock:
+            if issuer_url is None:
+                self._entries.clear()
+                return
+            issuer_url = issuer_url.rstrip("/")
+            for key in [key for key in self._entries if key[0] == issuer_url]:
+                del self._entries[key]
+
+    def _get(self, http_client, key: CacheKey, url: str) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[2]:
+                self.hits += 1
+                return entry[0]
+            inflight = self._inflight.get(key)
+            leader = inflight is None
+            if leader:
+                inflight = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return inflight.result()
+
+        try:
+            body = self._fetch(http_client, key, url, entry)
+        except BaseException as exc:
+            inflight.set_exception(exc)
+            raise
+        else:
+            inflight.set_result(body)
+            return body
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _fetch(
+        self,
+        http_client,
+        key: CacheKey,
+        url: str,
+        entry: Optional[Tuple[Dict[str, Any], Optional[str], float]],
+    ) -> Dict[str, Any]:
+        headers = {}
+        if entry is not None and entry[1]:
+            headers["If-None-Match"] = entry[1]
+        response = http_client.get(url, headers=headers)
+        status = response.get("status")
+        response_headers = response.get("headers") or {}
+        fresh_until = time.monotonic() + _max_age(response_headers, self.default_max_age_s)
+
+        if status == 304 and entry is not None:
+            body, etag = entry[0], _header(response_headers, "ETag") or entry[1]
+            counter = "revalidated"
+        elif status == 200 and isinstance(response.get("body"), dict):
+            body, etag = response["body"], _header(response_headers, "ETag")
+            counter = "fetches"
+        else:
+            raise ValueError(f"Failed to fetch {url} (Status {status})")
+
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            self._entries[key] = (body, etag, fresh_until)
+        return body
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "fetches": self.fetches,
+            "revalidated": self.revalidated,
+            "coalesced": self.coalesced,
+        }
+
+
+_shared_cache = MetadataCache()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """Process-wide cache shared by every OIDC client that does not bring its own."""
+    return _shared_cache
+
+
+__all__ = ["DISCOVERY_PATH", "MetadataCache", "get_metadata_cache"]
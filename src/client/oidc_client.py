@@ -12,6 +12,7 @@ import time
 from typing import Dict, Any, Optional, List
 from urllib.parse import urlencode
 from client.kemtls_http_client import KEMTLSHttpClient
+from client.metadata_cache import MetadataCache, get_metadata_cache
 from utils.helpers import generate_random_string
 from utils.telemetry import OIDCClientFlowCollector
 
@@ -26,7 +27,8 @@ class OIDCClient:
         http_client: KEMTLSHttpClient,
         client_id: str,
         issuer_url: str,
-        redirect_uri: str
+        redirect_uri: str,
+        metadata_cache: Optional[MetadataCache] = None,
     ):
         """
         Initialize the OIDC client.
@@ -36,11 +38,14 @@ class OIDCClient:
             client_id: Client identifier
             issuer_url: OIDC issuer base URL
             redirect_uri: Redirect URI for authorization
+            metadata_cache: Discovery/JWKS cache; defaults to the process-wide
+                one, so only the first flow per issuer fetches the metadata
         """
         self.http_client = http_client
         self.client_id = client_id
         self.issuer_url = issuer_url
         self.redirect_uri = redirect_uri
+        self.metadata_cache = metadata_cache if metadata_cache is not None else get_metadata_cache()
         
         # State and tokens
         self.code_verifier: Optional[str] = None
@@ -57,6 +62,18 @@ class OIDCClient:
         }
         self.flow_telemetry = OIDCClientFlowCollector()
 
+    def discover(self) -> Dict[str, Any]:
+        """
+        Return the issuer's discovery document, from the metadata cache when fresh.
+        """
+        return self.metadata_cache.get_configuration(self.http_client, self.issuer_url)
+
+    def get_signing_keys(self) -> Dict[str, bytes]:
+        """
+        Return the issuer's published signing keys by kid.
+        """
+        return self.metadata_cache.get_signing_keys(self.http_client, self.issuer_url)
+
     def start_auth(self, scope: str = "openid profile email") -> str:
         """
         Start the authorization flow.
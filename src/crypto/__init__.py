@@ -7,6 +7,7 @@ from importlib import import_module
 
 _LAZY_EXPORTS = {
     "AEADCipher": ("crypto.aead", "AEADCipher"),
+    "CryptoExecutor": ("crypto.executor", "CryptoExecutor"),
     "HASH_LEN": ("crypto.key_schedule", "HASH_LEN"),
     "KEY_SIZE": ("crypto.aead", "KEY_SIZE"),
     "MLDSA65": ("crypto.ml_dsa", "MLDSA65"),
@@ -14,8 +15,10 @@ _LAZY_EXPORTS = {
     "KeyDerivation": ("crypto.key_schedule", "KeyDerivation"),
     "NONCE_SIZE": ("crypto.aead", "NONCE_SIZE"),
     "TAG_SIZE": ("crypto.aead", "TAG_SIZE"),
+    "TranscriptHash": ("crypto.key_schedule", "TranscriptHash"),
     "DilithiumSignature": ("crypto.ml_dsa", "DilithiumSignature"),
     "compute_transcript_hash": ("crypto.key_schedule", "compute_transcript_hash"),
+    "configure_crypto_executor": ("crypto.executor", "configure_crypto_executor"),
     "derive_application_traffic_secrets": (
         "crypto.key_schedule",
         "derive_application_traffic_secrets",
@@ -26,6 +29,7 @@ _LAZY_EXPORTS = {
         "crypto.key_schedule",
         "derive_handshake_traffic_secrets",
     ),
+    "get_crypto_executor": ("crypto.executor", "get_crypto_executor"),
     "hkdf_expand_label": ("crypto.key_schedule", "hkdf_expand_label"),
     "hkdf_extract": ("crypto.key_schedule", "hkdf_extract"),
     "KyberKEM": ("crypto.ml_kem", "KyberKEM"),
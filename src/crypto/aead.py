@@ -37,22 +37,32 @@ class AEADCipher:
         return open_(self._key, nonce, payload, aad)
 
 
-def seal(key: bytes, nonce: bytes, plaintext: bytes, aad: bytes) -> bytes:
-    """Encrypt and authenticate plaintext with ChaCha20-Poly1305."""
+def seal(key: bytes, nonce: bytes, plaintext, aad: bytes) -> bytes:
+    """
+    Encrypt and authenticate plaintext with ChaCha20-Poly1305.
+
+    ``plaintext`` may be any bytes-like object, so large payloads can be
+    sealed fragment by fragment from a ``memoryview``.
+    """
     _validate_bytes("key", key, KEY_SIZE)
     _validate_bytes("nonce", nonce, NONCE_SIZE)
-    _validate_bytes("plaintext", plaintext)
+    _validate_buffer("plaintext", plaintext)
     _validate_bytes("aad", aad)
 
     return rust_aead.seal(key, nonce, plaintext, aad, fallback=_seal_python)
 
 
-def open_(key: bytes, nonce: bytes, ciphertext: bytes, aad: bytes) -> bytes:
-    """Decrypt and authenticate ciphertext with ChaCha20-Poly1305."""
+def open_(key: bytes, nonce: bytes, ciphertext, aad) -> bytes:
+    """
+    Decrypt and authenticate ciphertext with ChaCha20-Poly1305.
+
+    ``ciphertext`` and ``aad`` may be any bytes-like object (``bytearray`` or
+    ``memoryview``), so callers can decrypt straight from a receive buffer.
+    """
     _validate_bytes("key", key, KEY_SIZE)
     _validate_bytes("nonce", nonce, NONCE_SIZE)
-    _validate_bytes("ciphertext", ciphertext)
-    _validate_bytes("aad", aad)
+    _validate_buffer("ciphertext", ciphertext)
+    _validate_buffer("aad", aad)
     if len(ciphertext) < TAG_SIZE:
         raise ValueError(
             f"ciphertext must be at least {TAG_SIZE} bytes to include an authentication tag"
@@ -100,6 +110,11 @@ def _validate_bytes(name: str, value: bytes, expected_length: int | None = None)
         )
 
 
+def _validate_buffer(name: str, value) -> None:
+    if not isinstance(value, (bytes, bytearray, memoryview)):
+        raise TypeError(f"{name} must be bytes-like")
+
+
 def _load_chacha20_poly1305():
     try:
         from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
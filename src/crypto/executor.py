@@ -0,0 +1,238 @@
+"""Bounded worker pool for CPU-bound post-quantum operations.
+
+ML-KEM decapsulation and ML-DSA signing/verification dominate server CPU time.
+``CryptoExecutor`` lets the handshake and OIDC layers hand those calls to a
+thread or process pool sized by configuration, while keeping a synchronous
+call shape for existing callers. ``inline`` mode runs on the caller thread and
+is the default so behaviour is unchanged unless a pool is configured.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from crypto.ml_dsa import MLDSA65
+from crypto.ml_kem import MLKEM768
+
+
+EXECUTOR_KINDS = ("inline", "thread", "process")
+ENV_EXECUTOR_KIND = "KEMTLS_CRYPTO_EXECUTOR"
+ENV_EXECUTOR_WORKERS = "KEMTLS_CRYPTO_WORKERS"
+
+
+def _timed_call(fn: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[int, Any]:
+    # time.monotonic_ns is system-wide, so start times taken inside worker
+    # processes are comparable with submit times taken in the parent.
+    started_ns = time.monotonic_ns()
+    return started_ns, fn(*args)
+
+
+def _decapsulate(secret_key: bytes, ciphertext: bytes) -> bytes:
+    return MLKEM768.decapsulate(secret_key, ciphertext)
+
+
+def _generate_kem_keypair() -> Tuple[bytes, bytes]:
+    return MLKEM768.generate_keypair()
+
+
+def _sign(secret_key: bytes, message: bytes) -> bytes:
+    return MLDSA65.sign(secret_key, message)
+
+
+def _verify(public_key: bytes, message: bytes, signature: bytes) -> bool:
+    return MLDSA65.verify(public_key, message, signature)
+
+
+class CryptoExecutor:
+    """Runs PQ crypto calls on a bounded pool and records queueing metrics."""
+
+    def __init__(self, kind: str = "inline", max_workers: Optional[int] = None):
+        normalized = str(kind or "inline").lower()
+        if normalized not in EXECUTOR_KINDS:
+            raise ValueError(f"Unsupported crypto executor kind: {kind}")
+        if max_workers is not None and int(max_workers) < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.kind = normalized
+        self.max_workers = int(max_workers) if max_workers is not None else (os.cpu_count() or 1)
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._wait_ns_total = 0
+        self._wait_ns_max = 0
+        self._run_ns_total = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "CryptoExecutor":
+        """Build an executor from ``{"kind": ..., "max_workers": ...}``."""
+        config = config or {}
+        return cls(kind=config.get("kind", "inline"), max_workers=config.get("max_workers"))
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Submit ``fn(*args)``; ``fn`` must be picklable for process pools."""
+        submitted_ns = time.monotonic_ns()
+        with self._lock:
+            self._submitted += 1
+            self._queue_depth += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+
+        result: Future = Future()
+        if self.kind == "inline":
+            try:
+                started_ns, value = _timed_call(fn, args)
+            except BaseException as exc:
+                self._record_done(submitted_ns, None, failed=True)
+                result.set_exception(exc)
+            else:
+                self._record_done(submitted_ns, started_ns)
+                result.set_result(value)
+            return result
+
+        inner = self._ensure_pool().submit(_timed_call, fn, args)
+
+        def _on_done(done: Future) -> None:
+            try:
+                started_ns, value = done.result()
+            except BaseException as exc:
+                self._record_done(submitted_ns, None, failed=True)
+                result.set_exception(exc)
+            else:
+                self._record_done(submitted_ns, started_ns)
+                result.set_result(value)
+
+        inner.add_done_callback(_on_done)
+        return result
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Submit ``fn(*args)`` and block until it completes."""
+        return self.submit(fn, *args).result()
+
+    def submit_many(self, calls: Iterable[Tuple[Callable[..., Any], Sequence[Any]]]) -> List[Future]:
+        """Submit several calls at once; futures are returned in call order."""
+        return [self.submit(fn, *args) for fn, args in calls]
+
+    def run_many(self, calls: Iterable[Tuple[Callable[..., Any], Sequence[Any]]]) -> List[Any]:
+        """Submit several calls at once and return their results in order."""
+        return [future.result() for future in self.submit_many(calls)]
+
+    def decapsulate(self, secret_key: bytes, ciphertext: bytes) -> bytes:
+        return self.run(_decapsulate, secret_key, ciphertext)
+
+    def decapsulate_many(self, pairs: Iterable[Tuple[bytes, bytes]]) -> List[bytes]:
+        """Decapsulate ``(secret_key, ciphertext)`` pairs concurrently."""
+        return self.run_many((_decapsulate, pair) for pair in pairs)
+
+    def submit_decapsulate_many(self, pairs: Iterable[Tuple[bytes, bytes]]) -> List[Future]:
+        """Non-blocking ``decapsulate_many`` for callers that await the futures."""
+        return self.submit_many((_decapsulate, pair) for pair in pairs)
+
+    def generate_kem_keypair(self) -> Tuple[bytes, bytes]:
+        return self.run(_generate_kem_keypair)
+
+    def submit_generate_kem_keypair(self) -> Future:
+        return self.submit(_generate_kem_keypair)
+
+    def sign(self, secret_key: bytes, message: bytes) -> bytes:
+        return self.run(_sign, secret_key, message)
+
+    def verify(self, public_key: bytes, message: bytes, signature: bytes) -> bool:
+        return self.run(_verify, public_key, message, signature)
+
+    def verify_many(self, triples: Iterable[Tuple[bytes, bytes, bytes]]) -> List[bool]:
+        """Verify ``(public_key, message, signature)`` triples concurrently."""
+        return self.run_many((_verify, triple) for triple in triples)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "wait_ns_total": self._wait_ns_total,
+                "wait_ns_max": self._wait_ns_max,
+                "avg_wait_ms": (self._wait_ns_total / finished / 1_000_000.0) if finished else 0.0,
+                "run_ns_total": self._run_ns_total,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool = self._pool
+            self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def _ensure_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.kind == "process":
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="kemtls-crypto",
+                    )
+            return self._pool
+
+    def _record_done(self, submitted_ns: int, started_ns: Optional[int], failed: bool = False) -> None:
+        finished_ns = time.monotonic_ns()
+        with self._lock:
+            self._queue_depth -= 1
+            if failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+            if started_ns is not None:
+                wait_ns = max(0, started_ns - submitted_ns)
+                self._wait_ns_total += wait_ns
+                self._wait_ns_max = max(self._wait_ns_max, wait_ns)
+                self._run_ns_total += max(0, finished_ns - started_ns)
+
+
+_default_executor: Optional[CryptoExecutor] = None
+_default_lock = threading.Lock()
+
+
+def get_crypto_executor() -> CryptoExecutor:
+    """Return the process-wide executor, created from the environment on first use."""
+    global _default_executor
+    with _default_lock:
+        if _default_executor is None:
+            workers = os.environ.get(ENV_EXECUTOR_WORKERS)
+            _default_executor = CryptoExecutor(
+                kind=os.environ.get(ENV_EXECUTOR_KIND, "inline"),
+                max_workers=int(workers) if workers else None,
+            )
+        return _default_executor
+
+
+def configure_crypto_executor(kind: str = "inline", max_workers: Optional[int] = None) -> CryptoExecutor:
+    """Replace the process-wide executor, shutting down the previous pool."""
+    global _default_executor
+    executor = CryptoExecutor(kind=kind, max_workers=max_workers)
+    with _default_lock:
+        previous = _default_executor
+        _default_executor = executor
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return executor
+
+
+__all__ = [
+    "CryptoExecutor",
+    "EXECUTOR_KINDS",
+    "configure_crypto_executor",
+    "get_crypto_executor",
+]
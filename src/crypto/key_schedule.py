@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import hashlib
 import hmac
-from typing import Dict, Sequence
+from typing import Dict, List, Sequence
 
 from rust_ext import key_schedule as rust_key_schedule
 
@@ -57,6 +57,54 @@ def compute_transcript_hash(messages: Sequence[bytes]) -> bytes:
     )
 
 
+class TranscriptHash:
+    """
+    Running SHA-256 over handshake messages.
+
+    ``digest_at(n)`` equals ``compute_transcript_hash(messages[:n])`` but each
+    message is hashed once when appended, and the digest at every message
+    boundary is kept so later prefixes never re-hash earlier messages.
+    """
+
+    def __init__(self):
+        self._hasher = hashlib.new(HASH_NAME)
+        self._messages: List[bytes] = []
+        self._snapshots: List[bytes] = [self._hasher.digest()]
+
+    def append(self, message: bytes) -> bytes:
+        """Add a message and return the transcript hash up to and including it."""
+        if not isinstance(message, bytes):
+            raise TypeError("transcript message must be bytes")
+        self._hasher.update(message)
+        self._messages.append(message)
+        digest = self._hasher.digest()
+        self._snapshots.append(digest)
+        return digest
+
+    def digest_at(self, count: int) -> bytes:
+        """Transcript hash over the first ``count`` messages."""
+        if not 0 <= count <= len(self._messages):
+            raise IndexError("transcript prefix out of range")
+        return self._snapshots[count]
+
+    def digest(self) -> bytes:
+        return self._snapshots[-1]
+
+    def fork(self) -> "TranscriptHash":
+        """Independent copy that can diverge from this transcript."""
+        clone = TranscriptHash.__new__(TranscriptHash)
+        clone._hasher = self._hasher.copy()
+        clone._messages = list(self._messages)
+        clone._snapshots = list(self._snapshots)
+        return clone
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __getitem__(self, index):
+        return self._messages[index]
+
+
 def derive_handshake_secret(shared_secrets: Sequence[bytes]) -> bytes:
     """Derive the handshake secret from the ordered KEM shared secrets."""
     if not isinstance(shared_secrets, Sequence):
@@ -204,6 +252,7 @@ class KeyDerivation:
 __all__ = [
     "HASH_LEN",
     "KeyDerivation",
+    "TranscriptHash",
     "compute_transcript_hash",
     "derive_application_traffic_secrets",
     "derive_finished_keys",
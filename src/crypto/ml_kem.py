@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import os
+import threading
 from pathlib import Path
-from typing import Any, Callable, Tuple
+from typing import Any, Callable, Optional, Tuple
 
 
 def _has_oqs_shared_library() -> bool:
@@ -20,7 +21,11 @@ def _has_oqs_shared_library() -> bool:
     return False
 
 
-def _load_oqs_backend():
+BACKEND_ENV = "KEMTLS_MLKEM_BACKEND"
+BACKEND_CHOICES = ("auto", "oqs", "pqcrypto")
+
+
+def _load_oqs():
     if os.name != "nt" and not _has_oqs_shared_library():
         return None
     try:
@@ -45,14 +50,83 @@ def _load_pqcrypto_backend():
     return ml_kem_768
 
 
+class _BackendRegistry:
+    """
+    Resolves the ML-KEM backend once per process.
+
+    The liboqs probe walks the filesystem and opens a throwaway KEM context, so
+    it must not run per operation. ``KEMTLS_MLKEM_BACKEND`` (or ``configure``)
+    pins the choice; ``auto`` prefers liboqs and falls back to pqcrypto.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requested: Optional[str] = None
+        self._name: Optional[str] = None
+        self._module: Any = None
+        self._local = threading.local()
+
+    def configure(self, name: Optional[str]) -> None:
+        normalized = str(name).lower() if name is not None else None
+        if normalized is not None and normalized not in BACKEND_CHOICES:
+            raise ValueError(f"Unsupported ML-KEM backend: {name}")
+        with self._lock:
+            self._requested = normalized
+            self._name = None
+            self._module = None
+            self._local = threading.local()
+
+    def resolve(self) -> Tuple[str, Any]:
+        name, module = self._name, self._module
+        if name is not None:
+            return name, module
+        with self._lock:
+            if self._name is None:
+                self._name, self._module = self._probe()
+            return self._name, self._module
+
+    def oqs_context(self, oqs_module):
+        """Per-thread KEM context for operations that do not bind a secret key."""
+        kem = getattr(self._local, "kem", None)
+        if kem is None:
+            kem = oqs_module.KeyEncapsulation(MLKEM768.ALGORITHM)
+            self._local.kem = kem
+        return kem
+
+    def _probe(self) -> Tuple[str, Any]:
+        requested = self._requested or os.environ.get(BACKEND_ENV, "auto").lower()
+        if requested not in BACKEND_CHOICES:
+            raise RuntimeError(f"{BACKEND_ENV} must be one of {', '.join(BACKEND_CHOICES)}")
+        if requested in ("auto", "oqs"):
+            oqs = _load_oqs()
+            if oqs is not None:
+                return "oqs", oqs
+            if requested == "oqs":
+                raise RuntimeError("ML-KEM backend 'oqs' was requested but liboqs is not available")
+        return "pqcrypto", _load_pqcrypto_backend()
+
+
+_registry = _BackendRegistry()
+
+
+def configure_backend(name: Optional[str]) -> None:
+    """Pin the ML-KEM backend ('auto', 'oqs' or 'pqcrypto'); ``None`` re-reads the environment."""
+    _registry.configure(name)
+
+
+def get_backend_name() -> str:
+    """Return the active ML-KEM backend: 'oqs' or 'pqcrypto'."""
+    return _registry.resolve()[0]
+
+
 def _with_backend(
     oqs_op: Callable[[Any], Tuple[bytes, ...] | bytes],
     pqcrypto_op: Callable[[Any], Tuple[bytes, ...] | bytes],
 ):
-    oqs = _load_oqs_backend()
-    if oqs is not None:
-        return oqs_op(oqs)
-    return pqcrypto_op(_load_pqcrypto_backend())
+    name, backend = _registry.resolve()
+    if name == "oqs":
+        return oqs_op(backend)
+    return pqcrypto_op(backend)
 
 
 class MLKEM768:
@@ -69,6 +143,7 @@ class MLKEM768:
         """Generate a fresh ML-KEM-768 keypair."""
 
         def _oqs_generate(oqs_module):
+            # A fresh context: keygen leaves the secret key in it until free().
             with oqs_module.KeyEncapsulation(cls.ALGORITHM) as kem:
                 public_key = kem.generate_keypair()
                 secret_key = kem.export_secret_key()
@@ -88,8 +163,7 @@ class MLKEM768:
         cls._validate_public_key(public_key)
 
         def _oqs_encap(oqs_module):
-            with oqs_module.KeyEncapsulation(cls.ALGORITHM) as kem:
-                return kem.encap_secret(public_key)
+            return _registry.oqs_context(oqs_module).encap_secret(public_key)
 
         def _pq_encap(backend):
             return backend.encrypt(public_key)
@@ -146,4 +220,4 @@ class KyberKEM(MLKEM768):
     """Backward-compatible alias for the renamed ML-KEM implementation."""
 
 
-__all__ = ["KyberKEM", "MLKEM768"]
+__all__ = ["KyberKEM", "MLKEM768", "configure_backend", "get_backend_name"]
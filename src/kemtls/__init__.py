@@ -12,8 +12,14 @@ Modules:
     - handshake: KEMTLS handshake protocol state machines
     - record_layer: Encrypted communication record layer
     - session: Session state model
+    - keypool: Pre-generated ephemeral ML-KEM keypair pool
+    - certs: ML-DSA-65 certificates and the client certificate cache
+    - resumption: PSK resumption tickets and the client ticket cache
+    - early_data: 0-RTT early data policy and replay cache
+    - pool: Client-side pool of established connections
     - exporter: Session binding/exporter helpers
     - tcp_server: TCP server for KEMTLS + HTTP bridge
+    - async_tcp_server: asyncio TCP server for KEMTLS + HTTP bridge
     - client: Socket-based KEMTLS client
 """
 
@@ -30,6 +36,11 @@ from .record_layer import (
     unprotect,
 )
 from .session import KEMTLSSession
+from .keypool import EphemeralKeyPool
+from .certs import CertificateCache
+from .resumption import ResumptionTicket, TicketCache, TicketIssuer
+from .early_data import EarlyDataPolicy, ReplayCache
+from .pool import ConnectionPool
 from .exporter import (
     derive_exporter_secret,
     derive_session_binding_id,
@@ -46,6 +57,11 @@ try:
 except ModuleNotFoundError:
     KEMTLSTCPServer = None
 
+try:
+    from .async_tcp_server import AsyncKEMTLSTCPServer
+except ModuleNotFoundError:
+    AsyncKEMTLSTCPServer = None
+
 try:
     from .quic_server import KEMTLSQUICServer
 except ModuleNotFoundError:
@@ -65,6 +81,14 @@ __all__ = [
     "frame_tcp_record",
     "parse_tcp_record",
     "KEMTLSSession",
+    "EphemeralKeyPool",
+    "CertificateCache",
+    "ResumptionTicket",
+    "TicketCache",
+    "TicketIssuer",
+    "EarlyDataPolicy",
+    "ReplayCache",
+    "ConnectionPool",
     "derive_exporter_secret",
     "derive_session_binding_id",
     "derive_refresh_binding_id",
@@ -77,5 +101,8 @@ __all__ = [
 if KEMTLSTCPServer is not None:
     __all__.append("KEMTLSTCPServer")
 
+if AsyncKEMTLSTCPServer is not None:
+    __all__.append("AsyncKEMTLSTCPServer")
+
 if KEMTLSQUICServer is not None:
     __all__.append("KEMTLSQUICServer")
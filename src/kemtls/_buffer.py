@@ -0,0 +1,141 @@
+"""
+Buffered socket I/O helpers for the KEMTLS TCP transport.
+
+Reads with ``recv_into`` into one reusable ``bytearray`` and hands out
+``memoryview`` slices, so a record is copied once from the kernel and then
+decrypted straight out of the buffer. Reads ahead across message boundaries;
+the same reader must therefore be shared by the handshake and the record
+layer that follows it on a socket.
+
+``send_buffers`` is the write-side counterpart: it hands a list of buffers to
+``sendmsg`` in one call instead of joining them first.
+
+Lengths read off the wire are unauthenticated, so the buffer never grows past
+``max_capacity`` and handshake messages are capped at
+``MAX_HANDSHAKE_MESSAGE_SIZE`` before any of their body is read.
+"""
+
+from __future__ import annotations
+
+from typing import Any, List, Sequence
+
+
+_DEFAULT_CAPACITY = 64 * 1024
+_DEFAULT_MAX_CAPACITY = 1024 * 1024
+_MAX_IOVECS = 512
+
+# Comfortably above ServerHello plus a certificate, or a 0-RTT early-data record.
+MAX_HANDSHAKE_MESSAGE_SIZE = 64 * 1024
+
+
+def handshake_message_length(header: Any) -> int:
+    """Decode a 4-byte handshake length prefix, rejecting oversized messages."""
+    length = int.from_bytes(header, "big")
+    if length > MAX_HANDSHAKE_MESSAGE_SIZE:
+        raise ValueError(f"handshake message too large: {length} bytes")
+    return length
+
+
+class SocketReader:
+    """Read-ahead buffer over a stream socket."""
+
+    def __init__(
+        self,
+        sock: Any,
+        capacity: int = _DEFAULT_CAPACITY,
+        max_capacity: int = _DEFAULT_MAX_CAPACITY,
+    ):
+        if capacity > max_capacity:
+            raise ValueError("capacity exceeds max_capacity")
+        self.sock = sock
+        self.max_capacity = max_capacity
+        self._buf = bytearray(capacity)
+        self._start = 0
+        self._end = 0
+        self._recv_into = getattr(sock, "recv_into", None)
+
+    @property
+    def buffered(self) -> int:
+        """Bytes already received but not yet consumed."""
+        return self._end - self._start
+
+    def peek(self, n: int, *, eof_message: str = "Connection closed by peer") -> memoryview:
+        """
+        Return a view of the next ``n`` bytes without consuming them.
+
+        The view is only valid until the next ``peek``/``read`` call.
+        """
+        self._fill(n, eof_message)
+        return memoryview(self._buf)[self._start:self._start + n]
+
+    def read(self, n: int, *, eof_message: str = "Connection closed by peer") -> memoryview:
+        """Consume and return a view of the next ``n`` bytes (valid until the next call)."""
+        view = self.peek(n, eof_message=eof_message)
+        self._start += n
+        if self._start == self._end:
+            self._start = self._end = 0
+        return view
+
+    def read_bytes(self, n: int, *, eof_message: str = "Connection closed by peer") -> bytes:
+        return bytes(self.read(n, eof_message=eof_message))
+
+    def _fill(self, n: int, eof_message: str) -> None:
+        if self._end - self._start >= n:
+            return
+        self._make_room(n)
+        while self._end - self._start < n:
+            target = memoryview(self._buf)[self._end:]
+            if self._recv_into is not None:
+                received = self._recv_into(target)
+            else:
+                chunk = self.sock.recv(len(target))
+                received = len(chunk)
+                target[:received] = chunk
+            if not received:
+                raise EOFError(eof_message)
+            self._end += received
+
+    def _make_room(self, n: int) -> None:
+        pending = self._end - self._start
+        if self._start + n <= len(self._buf):
+            return
+        if n > len(self._buf):
+            if n > self.max_capacity:
+                raise ValueError(f"read of {n} bytes exceeds buffer limit of {self.max_capacity}")
+            # Swap in a larger buffer instead of resizing, so views handed
+            # out earlier keep pointing at valid (if stale) memory.
+            grown = bytearray(min(max(n, 2 * len(self._buf)), self.max_capacity))
+            grown[:pending] = self._buf[self._start:self._end]
+            self._buf = grown
+        elif pending:
+            self._buf[:pending] = self._buf[self._start:self._end]
+        self._start = 0
+        self._end = pending
+
+
+def send_buffers(sock: Any, buffers: Sequence[Any]) -> None:
+    """
+    Write ``buffers`` in order with scatter/gather ``sendmsg``.
+
+    Partial writes are resumed from the first unsent byte. Sockets without
+    ``sendmsg`` get a single joined ``sendall``.
+    """
+    sendmsg = getattr(sock, "sendmsg", None)
+    if sendmsg is None:
+        sock.sendall(b"".join(buffers))
+        return
+
+    views: List[memoryview] = [memoryview(buf) for buf in buffers if len(buf)]
+    index = 0
+    while index < len(views):
+        sent = sendmsg(views[index:index + _MAX_IOVECS])
+        while sent:
+            size = len(views[index])
+            if sent < size:
+                views[index] = views[index][sent:]
+                break
+            sent -= size
+            index += 1
+
+
+__all__ = ["MAX_HANDSHAKE_MESSAGE_SIZE", "SocketReader", "handshake_message_length", "send_buffers"]
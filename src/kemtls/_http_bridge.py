@@ -2,11 +2,12 @@
 KEMTLS HTTP Bridge (In-Process Flask Integration)
 
 Parses simple HTTP/1.1 requests from bytes and calls a Flask app’s 
-internal WSGI handler.
+internal WSGI handler. ``HTTPRequestFramer`` splits a persistent connection's
+decrypted stream into requests, so clients may pipeline them.
 """
 
 from io import BytesIO
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from flask import Flask, request, g
 from .session import KEMTLSSession
 from rust_ext import http as rust_http
@@ -53,11 +54,81 @@ def _parse_http_request_python(raw_data: bytes) -> Dict[str, Any]:
     }
 
 
+# Bound on a header block, or a body, waiting for the rest of its bytes.
+MAX_REQUEST_BUFFER = 1024 * 1024
+
+
+class HTTPRequestFramer:
+    """
+    Splits a decrypted byte stream into HTTP/1.1 requests.
+
+    Requests may arrive several to a record (pipelining) or span records;
+    each is framed by its header block and ``Content-Length`` and parsed
+    exactly once. Chunked request bodies are not supported.
+    """
+
+    def __init__(self, max_buffer: int = MAX_REQUEST_BUFFER):
+        self.max_buffer = max_buffer
+        self._buffer = bytearray()
+        self._head: Optional[Dict[str, Any]] = None
+        self._body_length = 0
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        """Absorb ``data`` and return every request it completes, in order."""
+        self._buffer += data
+        requests = []
+        while True:
+            if self._head is None:
+                end = self._buffer.find(b"\r\n\r\n")
+                if end == -1:
+                    if len(self._buffer) > self.max_buffer:
+                        raise ValueError("HTTP request header too large")
+                    break
+                self._head = parse_http_request(bytes(self._buffer[:end + 4]))
+                del self._buffer[:end + 4]
+                self._body_length = _content_length(self._head['headers'])
+                if self._body_length > self.max_buffer:
+                    raise ValueError("HTTP request body too large")
+            if len(self._buffer) < self._body_length:
+                break
+            self._head['body'] = bytes(self._buffer[:self._body_length])
+            del self._buffer[:self._body_length]
+            requests.append(self._head)
+            self._head = None
+        return requests
+
+    @property
+    def pending(self) -> bool:
+        """True while a partial request is buffered."""
+        return bool(self._buffer) or self._head is not None
+
+
+def _content_length(headers: Dict[str, str]) -> int:
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise ValueError("Chunked request bodies are not supported")
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise ValueError("Invalid Content-Length")
+    if length < 0:
+        raise ValueError("Invalid Content-Length")
+    return length
+
+
+def wants_close(req: Dict[str, Any]) -> bool:
+    """True if the request asks the server to close the connection after answering."""
+    return str(req.get('headers', {}).get('connection', '')).lower() == 'close'
+
+
 def call_flask_app(app: Flask, session: KEMTLSSession, raw_request: bytes) -> bytes:
     """
     Injects KEMTLS session and calls the Flask app's WSGI interface.
     """
-    req = parse_http_request(raw_request)
+    return dispatch_request(app, session, parse_http_request(raw_request))
+
+
+def dispatch_request(app: Flask, session: KEMTLSSession, req: Dict[str, Any]) -> bytes:
+    """Like ``call_flask_app`` for a request that has already been parsed."""
     path, _, query = req['path'].partition('?')
     req_headers = req['headers']
     content_type = req_headers.get('content-type', '')
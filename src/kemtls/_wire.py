@@ -0,0 +1,150 @@
+"""
+Compact binary (TLV) encoding for KEMTLS/1.1 handshake messages.
+
+KEMTLS/1.0 carries every handshake message as canonical JSON with base64url
+key material. KEMTLS/1.1 keeps ClientHello in JSON (it is what advertises the
+version) and encodes ServerHello, ClientKeyExchange and the Finished messages
+as::
+
+    type(1) | (tag(1) | length(2) | value)*
+
+Raw KEM keys and ciphertexts go on the wire as-is. The first byte of a binary
+message is never ``{``, so a decoder can tell the two formats apart.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, List, Tuple
+
+from utils.serialization import deserialize_message, serialize_message
+
+
+VERSION_JSON = "KEMTLS/1.0"
+VERSION_BINARY = "KEMTLS/1.1"
+
+_TLV_HEADER = struct.Struct(">BH")
+_MAX_VALUE_LEN = 0xFFFF
+
+_TYPE_CODES = {
+    "ServerHello": 0x02,
+    "ClientKeyExchange": 0x03,
+    "ServerFinished": 0x04,
+    "ClientFinished": 0x05,
+    "NewSessionTicket": 0x06,
+}
+_TYPE_NAMES = {code: name for name, code in _TYPE_CODES.items()}
+
+# Field tags: (tag, kind) where kind is "bytes", "str" or "json".
+_FIELDS: Dict[str, Dict[str, Tuple[int, str]]] = {
+    "ServerHello": {
+        "session_id": (0x01, "str"),
+        "mode": (0x02, "str"),
+        "eph_pk": (0x03, "bytes"),
+        "cert": (0x04, "json"),
+        "key_id": (0x05, "str"),
+        "resumption": (0x06, "str"),
+        "early_data": (0x07, "str"),
+        "cert_ref": (0x08, "bytes"),
+    },
+    "ClientKeyExchange": {
+        "ct_ephemeral": (0x01, "bytes"),
+        "ct_longterm": (0x02, "bytes"),
+    },
+    "ServerFinished": {"mac": (0x01, "bytes")},
+    "ClientFinished": {"mac": (0x01, "bytes")},
+    "NewSessionTicket": {
+        "ticket": (0x01, "bytes"),
+        "nonce": (0x02, "bytes"),
+        "lifetime": (0x03, "str"),
+    },
+}
+_FIELDS_BY_TAG = {
+    message_type: {tag: (name, kind) for name, (tag, kind) in fields.items()}
+    for message_type, fields in _FIELDS.items()
+}
+
+
+def is_binary_message(data: bytes) -> bool:
+    """True when ``data`` is a KEMTLS/1.1 binary handshake message."""
+    return bool(data) and data[0] in _TYPE_NAMES
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode a handshake message dict as KEMTLS/1.1 TLV bytes."""
+    message_type = message.get("type")
+    if message_type not in _TYPE_CODES:
+        raise ValueError(f"Message type {message_type!r} has no binary encoding")
+
+    parts: List[bytes] = [bytes((_TYPE_CODES[message_type],))]
+    for name, (tag, kind) in _FIELDS[message_type].items():
+        value = message.get(name)
+        if value is None:
+            continue
+        if kind == "bytes":
+            if not isinstance(value, bytes):
+                raise TypeError(f"{name} must be bytes")
+            raw = value
+        elif kind == "str":
+            raw = str(value).encode("utf-8")
+        else:
+            raw = serialize_message(value)
+        if len(raw) > _MAX_VALUE_LEN:
+            raise ValueError(f"{name} is too large for a TLV field")
+        parts.append(_TLV_HEADER.pack(tag, len(raw)))
+        parts.append(raw)
+    return b"".join(parts)
+
+
+def decode_message(data: bytes) -> Dict[str, Any]:
+    """Decode KEMTLS/1.1 TLV bytes into a message dict with raw bytes fields."""
+    if not isinstance(data, bytes):
+        raise TypeError("Data must be bytes")
+    if not is_binary_message(data):
+        raise ValueError("Not a KEMTLS/1.1 binary handshake message")
+
+    message_type = _TYPE_NAMES[data[0]]
+    fields = _FIELDS_BY_TAG[message_type]
+    message: Dict[str, Any] = {"type": message_type, "version": VERSION_BINARY}
+
+    view = memoryview(data)
+    offset = 1
+    while offset < len(data):
+        if offset + _TLV_HEADER.size > len(data):
+            raise ValueError("Truncated TLV header")
+        tag, length = _TLV_HEADER.unpack_from(data, offset)
+        offset += _TLV_HEADER.size
+        end = offset + length
+        if end > len(data):
+            raise ValueError("Truncated TLV value")
+        if tag not in fields:
+            raise ValueError(f"Unknown TLV tag 0x{tag:02x} in {message_type}")
+        name, kind = fields[tag]
+        if name in message:
+            raise ValueError(f"Duplicate TLV field {name} in {message_type}")
+        raw = bytes(view[offset:end])
+        if kind == "bytes":
+            message[name] = raw
+        elif kind == "str":
+            message[name] = raw.decode("utf-8")
+        else:
+            message[name] = deserialize_message(raw)
+        offset = end
+    return message
+
+
+def decode_handshake_message(data: bytes) -> Dict[str, Any]:
+    """Decode either wire format, sniffing binary vs JSON from the first byte."""
+    if isinstance(data, bytes) and is_binary_message(data):
+        return decode_message(data)
+    return deserialize_message(data)
+
+
+__all__ = [
+    "VERSION_BINARY",
+    "VERSION_JSON",
+    "decode_handshake_message",
+    "decode_message",
+    "encode_message",
+    "is_binary_message",
+]
@@ -0,0 +1,392 @@
+"""
+Asyncio KEMTLS TCP Server
+
+Event-loop based alternative to ``KEMTLSTCPServer``. Connections are driven
+by asyncio streams instead of one thread per accepted socket; only the Flask
+dispatch is handed to a bounded worker pool so slow handlers cannot stall the
+loop. Handshake KEM operations are awaited on the crypto executor
+(``KEMTLS_CRYPTO_EXECUTOR``); the default ``inline`` kind runs them on the
+loop thread, a ``thread`` or ``process`` executor takes them off it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from flask import Flask
+
+from crypto.executor import CryptoExecutor
+
+from ._buffer import handshake_message_length
+from ._http_bridge import HTTPRequestFramer, call_flask_app, dispatch_request, wants_close
+from .early_data import TOO_EARLY_RESPONSE, EarlyDataPolicy, mark_early_request
+from .handshake import ServerHandshake
+from .keypool import EphemeralKeyPool
+from .record_layer import COALESCE_LIMIT, RECORD_HEADER_SIZE, for_server, has_more_fragments
+from .resumption import TicketIssuer
+
+
+class AsyncKEMTLSTCPServerConnection:
+    """Server-side KEMTLS connection bound to an asyncio stream pair."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.session = None
+        self.record_layer = None
+
+    async def send_handshake(self, payload: bytes) -> None:
+        header = len(payload).to_bytes(4, "big")
+        self.writer.write(header + payload)
+        await self.writer.drain()
+
+    async def recv_handshake(self) -> bytes:
+        header = await self._read_exactly(4, eof_message="Socket closed during handshake")
+        length = handshake_message_length(header)
+        return await self._read_exactly(length, eof_message="Socket closed during handshake data read")
+
+    async def send_application(self, payload: bytes) -> None:
+        await self.send_applications((payload,))
+
+    async def send_applications(self, payloads: Iterable[bytes]) -> None:
+        """Send several application messages, one record each, in one flush."""
+        if self.record_layer is None:
+            raise RuntimeError("No active record layer")
+        pending_bytes = 0
+        for payload in payloads:
+            for header, ciphertext in self.record_layer.seal_fragments(payload):
+                self.writer.writelines((header, ciphertext))
+                pending_bytes += RECORD_HEADER_SIZE + len(ciphertext)
+                if pending_bytes >= COALESCE_LIMIT:
+                    await self.writer.drain()
+                    pending_bytes = 0
+        await self.writer.drain()
+
+    async def recv_application(self) -> bytes:
+        if self.record_layer is None:
+            raise RuntimeError("No active record layer")
+        fragments = []
+        received = 0
+        while True:
+            header = await self._read_exactly(RECORD_HEADER_SIZE, eof_message="Connection closed by peer")
+            length = self.record_layer.parse_record_header(header)
+            ciphertext = await self._read_exactly(length, eof_message="Connection closed by peer")
+            fragments.append(self.record_layer.open_record(header, ciphertext))
+            received += len(fragments[-1])
+            self.record_layer.check_message_size(received)
+            if not has_more_fragments(header):
+                return b"".join(fragments) if len(fragments) > 1 else fragments[0]
+
+    async def complete_handshake(
+        self,
+        *,
+        server_identity: str,
+        server_lt_sk: bytes,
+        cert: Optional[Dict[str, Any]] = None,
+        pdk_key_id: Optional[str] = None,
+        collector: Optional[Any] = None,
+        crypto_executor: Optional[CryptoExecutor] = None,
+        key_pool: Optional[EphemeralKeyPool] = None,
+        ticket_issuer: Optional[TicketIssuer] = None,
+        early_data: Optional[EarlyDataPolicy] = None,
+        early_data_handler: Optional[Callable[[Any, bytes], Awaitable[bytes]]] = None,
+    ):
+        handshake = ServerHandshake(
+            server_identity,
+            server_lt_sk,
+            cert,
+            pdk_key_id,
+            collector=collector,
+            crypto_executor=crypto_executor,
+            key_pool=key_pool,
+            ticket_issuer=ticket_issuer,
+            early_data=early_data if early_data_handler is not None else None,
+        )
+
+        crypto = handshake.crypto_executor
+        client_hello = await self.recv_handshake()
+        full_handshake = handshake.accept_client_hello(client_hello)
+        if full_handshake and (key_pool is None or not len(key_pool)):
+            # A pool miss would generate the ephemeral keypair on the loop thread.
+            handshake.provide_spare_keypair(await asyncio.wrap_future(crypto.submit_generate_kem_keypair()))
+        server_hello = handshake.server_hello()
+        await self.send_handshake(server_hello)
+
+        early_request = None
+        if handshake.early_data_offered:
+            early_record = await self.recv_handshake()
+            if handshake.early_data_accepted:
+                early_request = handshake.open_early_data(early_record)
+
+        if handshake.resumed:
+            server_finished = handshake.resumed_server_finished()
+        else:
+            # Await the decapsulations on the crypto executor so other
+            # connections keep making progress meanwhile.
+            client_key_exchange = await self.recv_handshake()
+            pairs = handshake.decapsulation_inputs(client_key_exchange)
+            shared_secrets = await asyncio.gather(
+                *(asyncio.wrap_future(future) for future in crypto.submit_decapsulate_many(pairs))
+            )
+            server_finished = handshake.finish_client_key_exchange(shared_secrets)
+        await self.send_handshake(server_finished)
+
+        new_session_ticket = handshake.new_session_ticket()
+        if new_session_ticket is not None:
+            await self.send_handshake(new_session_ticket)
+
+        session = handshake.application_session()
+        session.transport = "tcp"
+        self.session = session
+        self.record_layer = for_server(session, None)
+        if early_request is not None:
+            if early_data.allows(early_request):
+                response = await early_data_handler(session, mark_early_request(early_request))
+            else:
+                response = TOO_EARLY_RESPONSE
+            await self.send_application(response)
+
+        client_finished = await self.recv_handshake()
+        handshake.verify_client_finished(client_finished)
+        return session
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (OSError, ConnectionError):
+            pass
+        self.record_layer = None
+        self.session = None
+
+    async def _read_exactly(self, n: int, *, eof_message: str) -> bytes:
+        try:
+            return await self.reader.readexactly(n)
+        except asyncio.IncompleteReadError as exc:
+            raise EOFError(eof_message) from exc
+        except ConnectionError as exc:
+            raise EOFError(eof_message) from exc
+
+
+async def handle_application_session_async(
+    app: Flask,
+    connection: AsyncKEMTLSTCPServerConnection,
+    executor: Optional[ThreadPoolExecutor] = None,
+) -> None:
+    """
+    Serve decrypted HTTP requests on an established asyncio connection.
+
+    Pipelined requests completed by one record run in a single executor hop
+    and their responses go out in one flush, in request order.
+    """
+    if connection.session is None:
+        raise RuntimeError("transport session has not been established")
+
+    loop = asyncio.get_running_loop()
+    framer = HTTPRequestFramer()
+    while True:
+        try:
+            record = await connection.recv_application()
+        except EOFError:
+            break
+
+        requests = framer.feed(record)
+        if not requests:
+            continue
+        responses, close = await loop.run_in_executor(
+            executor,
+            _dispatch_pipelined,
+            app,
+            connection.session,
+            requests,
+        )
+        await connection.send_applications(responses)
+        if close:
+            break
+
+
+def _dispatch_pipelined(app: Flask, session, requests: List[Dict[str, Any]]) -> Tuple[List[bytes], bool]:
+    """Answer requests in order, stopping after one that asks to close the connection."""
+    responses = []
+    for request_map in requests:
+        responses.append(dispatch_request(app, session, request_map))
+        if wants_close(request_map):
+            return responses, True
+    return responses, False
+
+
+class AsyncKEMTLSTCPServer:
+    """
+    Asyncio TCP server for KEMTLS transport sessions.
+
+    Mirrors the ``KEMTLSTCPServer`` constructor and hooks (``get_collector``
+    and ``on_handshake_complete``) so it can be swapped in wherever the
+    threaded server is used.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        server_identity: str,
+        server_lt_sk: bytes,
+        cert: Optional[Dict[str, Any]] = None,
+        pdk_key_id: Optional[str] = None,
+        host: str = "0.0.0.0",
+        port: int = 4433,
+        backlog: int = 1024,
+        app_workers: Optional[int] = None,
+        crypto_executor: Optional[CryptoExecutor] = None,
+        key_pool: Optional[EphemeralKeyPool] = None,
+        ticket_issuer: Optional[TicketIssuer] = None,
+        early_data: Optional[EarlyDataPolicy] = None,
+    ):
+        self.app = app
+        self.server_identity = server_identity
+        self.server_lt_sk = server_lt_sk
+        self.cert = cert
+        self.pdk_key_id = pdk_key_id
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.app_workers = app_workers
+        self.crypto_executor = crypto_executor
+        self._owns_key_pool = key_pool is None
+        self.key_pool = key_pool if key_pool is not None else EphemeralKeyPool()
+        self.ticket_issuer = ticket_issuer if ticket_issuer is not None else TicketIssuer()
+        self.early_data = early_data if early_data is not None else EarlyDataPolicy()
+        self._stop_requested = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._client_tasks: Set[asyncio.Task] = set()
+
+    def stop(self):
+        """Request server shutdown; safe to call from any thread."""
+        self._stop_requested.set()
+        loop = self._loop
+        stop_event = self._stop_event
+        if loop is None or stop_event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(stop_event.set)
+        except RuntimeError:
+            pass
+
+    def start(self):
+        """Run the asyncio accept loop until ``stop`` is called."""
+        previous_sigint = None
+        previous_sigterm = None
+
+        if threading.current_thread() is threading.main_thread():
+
+            def _handle_signal(signum, _frame):
+                print(f"Signal {signum} received. Stopping server...")
+                self.stop()
+
+            previous_sigint = signal.getsignal(signal.SIGINT)
+            signal.signal(signal.SIGINT, _handle_signal)
+
+            if hasattr(signal, "SIGTERM"):
+                previous_sigterm = signal.getsignal(signal.SIGTERM)
+                signal.signal(signal.SIGTERM, _handle_signal)
+
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            print("Server stopping...")
+        finally:
+            if previous_sigint is not None:
+                signal.signal(signal.SIGINT, previous_sigint)
+            if previous_sigterm is not None and hasattr(signal, "SIGTERM"):
+                signal.signal(signal.SIGTERM, previous_sigterm)
+
+    async def serve(self):
+        """Coroutine form of ``start`` for callers that already own a loop."""
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        if self._stop_requested.is_set():
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.app_workers,
+            thread_name_prefix="kemtls-app",
+        )
+        server = await asyncio.start_server(
+            self._handle_client,
+            self.host,
+            self.port,
+            backlog=self.backlog,
+            reuse_address=True,
+        )
+        self._executor = executor
+        self.key_pool.start()
+        print(f"KEMTLS Async Server listening on {self.host}:{self.port}")
+
+        try:
+            await self._stop_event.wait()
+        finally:
+            server.close()
+            for task in list(self._client_tasks):
+                task.cancel()
+            if self._client_tasks:
+                await asyncio.gather(*self._client_tasks, return_exceptions=True)
+            await server.wait_closed()
+            executor.shutdown(wait=False)
+            if self._owns_key_pool:
+                self.key_pool.close()
+            self._executor = None
+            self._loop = None
+            self._stop_event = None
+
+    async def _run_early_request(self, session, raw_request: bytes) -> bytes:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, call_flask_app, self.app, session, raw_request)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handle a single accepted asyncio stream connection."""
+        task = asyncio.current_task()
+        if task is not None:
+            self._client_tasks.add(task)
+
+        connection = AsyncKEMTLSTCPServerConnection(reader, writer)
+        try:
+            collector = None
+            if hasattr(self, "get_collector") and callable(self.get_collector):
+                collector = self.get_collector()
+
+            if collector:
+                collector.start_hct()
+
+            session = await connection.complete_handshake(
+                server_identity=self.server_identity,
+                server_lt_sk=self.server_lt_sk,
+                cert=self.cert,
+                pdk_key_id=self.pdk_key_id,
+                collector=collector,
+                crypto_executor=self.crypto_executor,
+                key_pool=self.key_pool,
+                ticket_issuer=self.ticket_issuer,
+                early_data=self.early_data,
+                early_data_handler=self._run_early_request,
+            )
+
+            if collector:
+                collector.end_hct()
+                if hasattr(self, "on_handshake_complete") and callable(self.on_handshake_complete):
+                    self.on_handshake_complete(collector.get_metrics())
+
+            await handle_application_session_async(self.app, connection, self._executor)
+        except (EOFError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            print(f"Error handling client: {e!r}")
+            traceback.print_exc()
+        finally:
+            await connection.close()
+            if task is not None:
+                self._client_tasks.discard(task)
@@ -4,7 +4,10 @@ KEMTLS Certificate Handling
 Functions for creating and validating post-quantum certificates signed with ML-DSA-65.
 """
 
+import hashlib
 import json
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Tuple
 from crypto.ml_dsa import MLDSA65
 from utils.serialization import serialize_message, deserialize_message
@@ -109,3 +112,104 @@ def validate_certificate(
         
     # 7. Decode and return the embedded ML-KEM public key
     return base64url_decode(cert['kem_public_key'])
+
+
+def certificate_digest(cert: Dict[str, Any]) -> bytes:
+    """SHA-256 over the canonical encoding of the whole certificate, signature included."""
+    return hashlib.sha256(serialize_message(cert)).digest()
+
+
+class CertificateCache:
+    """
+    Bounded LRU of certificates that already passed ``validate_certificate``.
+
+    Keyed by (certificate digest, CA key id, expected identity), so a hit
+    means the same bytes were verified against the same CA for the same
+    identity. Entries are only served inside the certificate's validity
+    window; an expired entry is dropped and the certificate re-validated.
+
+    The cache also remembers the latest certificate per (CA, identity), which
+    a client offers back to the server as a cached-certificate reference.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[bytes, bytes, str], Tuple[bytes, Dict[str, Any]]]" = OrderedDict()
+        self._latest: Dict[Tuple[bytes, str], bytes] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def validate(self, cert: Dict[str, Any], ca_pk: bytes, expected_identity: str) -> Tuple[bytes, bool]:
+        """
+        Validate ``cert`` like ``validate_certificate``.
+
+        Returns:
+            Tuple[bytes, bool]: The ML-KEM public key and whether it came from the cache
+        """
+        digest = certificate_digest(cert)
+        ca_id = hashlib.sha256(ca_pk).digest()
+        key = (digest, ca_id, expected_identity)
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], True
+
+        kem_pk = validate_certificate(cert, ca_pk, expected_identity)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (kem_pk, cert)
+            self._entries.move_to_end(key)
+            self._latest[(ca_id, expected_identity)] = digest
+            while len(self._entries) > self.max_entries:
+                (old_digest, old_ca_id, old_identity), _ = self._entries.popitem(last=False)
+                if self._latest.get((old_ca_id, old_identity)) == old_digest:
+                    del self._latest[(old_ca_id, old_identity)]
+        return kem_pk, False
+
+    def cached_certificate(self, ca_pk: bytes, expected_identity: str) -> Optional[Dict[str, Any]]:
+        """The most recently validated, still-valid certificate for this CA and identity."""
+        ca_id = hashlib.sha256(ca_pk).digest()
+        with self._lock:
+            digest = self._latest.get((ca_id, expected_identity))
+            if digest is None:
+                return None
+            entry = self._live_entry((digest, ca_id, expected_identity))
+            if entry is None:
+                del self._latest[(ca_id, expected_identity)]
+                return None
+            return entry[1]
+
+    def _live_entry(self, key: Tuple[bytes, bytes, str]) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        # Caller holds the lock.
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        cert = entry[1]
+        if cert['valid_from'] <= get_timestamp() <= cert['valid_to']:
+            return entry
+        del self._entries[key]
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_shared_cache = CertificateCache()
+
+
+def get_certificate_cache() -> CertificateCache:
+    """Process-wide cache shared by every client handshake that does not bring its own."""
+    return _shared_cache
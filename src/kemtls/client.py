@@ -7,14 +7,19 @@ implementation internally.
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .pdk import PDKTrustStore
+from .pool import ConnectionPool, pool_key, trust_anchor_digest
 from .quic_client import KEMTLSQUICClientTransport
 from .quic_client import request_over_transport as request_over_quic_transport
+from .resumption import TicketCache
 from .tcp_transport import KEMTLSTCPClientTransport, request_over_transport
 
 
+_RETRYABLE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
 class KEMTLSClient:
     """
     KEMTLS client for making secure requests.
@@ -28,12 +33,20 @@ class KEMTLSClient:
         mode: str = "auto",
         collector: Optional[Any] = None,
         transport: str = "tcp",
+        handshake_versions: Optional[List[str]] = None,
+        ticket_cache: Optional[TicketCache] = None,
+        early_data: bool = False,
+        pool: Optional[ConnectionPool] = None,
     ):
         self.expected_identity = expected_identity
         self.ca_pk = ca_pk
         self.pdk_store = pdk_store
         self.mode = mode
         self.collector = collector
+        self.handshake_versions = handshake_versions
+        self.ticket_cache = ticket_cache
+        self.early_data = early_data
+        self.pool = pool
         self.transport_name = transport
         self.transport = self._create_transport(transport)
         self.session = None
@@ -50,6 +63,9 @@ class KEMTLSClient:
                 pdk_store=self.pdk_store,
                 mode=self.mode,
                 collector=self.collector,
+                handshake_versions=self.handshake_versions,
+                ticket_cache=self.ticket_cache,
+                early_data=self.early_data,
             )
         if transport == "quic":
             return KEMTLSQUICClientTransport(
@@ -58,15 +74,22 @@ class KEMTLSClient:
                 pdk_store=self.pdk_store,
                 mode=self.mode,
                 collector=self.collector,
+                handshake_versions=self.handshake_versions,
+                ticket_cache=self.ticket_cache,
+                early_data=self.early_data,
             )
         raise ValueError(f"Unsupported transport: {transport}")
 
-    def _sync_transport_config(self) -> None:
-        self.transport.expected_identity = self.expected_identity
-        self.transport.ca_pk = self.ca_pk
-        self.transport.pdk_store = self.pdk_store
-        self.transport.mode = self.mode
-        self.transport.collector = self.collector
+    def _sync_transport_config(self, transport=None) -> None:
+        transport = transport or self.transport
+        transport.expected_identity = self.expected_identity
+        transport.ca_pk = self.ca_pk
+        transport.pdk_store = self.pdk_store
+        transport.mode = self.mode
+        transport.collector = self.collector
+        transport.handshake_versions = self.handshake_versions
+        transport.ticket_cache = self.ticket_cache
+        transport.early_data = self.early_data
 
     def _sync_transport_state(self) -> None:
         self.session = self.transport.session
@@ -93,33 +116,24 @@ class KEMTLSClient:
     ) -> Tuple[bytes, Any]:
         """
         Connect to a server, perform handshake, and send an encrypted request.
+
+        With a ``pool`` the connection is checked out of it for this request
+        and handed back afterwards, so ``keep_alive`` is implied.
         """
+        request_kwargs = dict(
+            host=host,
+            port=port,
+            method=method,
+            path=path,
+            headers=headers,
+            body=body,
+            header_mutator=header_mutator,
+        )
+        if self.pool is not None:
+            return self._pooled_request(request_kwargs)
         try:
             self._sync_transport_config()
-            if self.transport_name == "quic":
-                response, session = request_over_quic_transport(
-                    self.transport,
-                    host=host,
-                    port=port,
-                    method=method,
-                    path=path,
-                    headers=headers,
-                    body=body,
-                    keep_alive=keep_alive,
-                    header_mutator=header_mutator,
-                )
-            else:
-                response, session = request_over_transport(
-                    self.transport,
-                    host=host,
-                    port=port,
-                    method=method,
-                    path=path,
-                    headers=headers,
-                    body=body,
-                    keep_alive=keep_alive,
-                    header_mutator=header_mutator,
-                )
+            response, session = self._request_over(self.transport, keep_alive=keep_alive, **request_kwargs)
             self._sync_transport_state()
             return response, session
         except Exception as e:
@@ -129,3 +143,44 @@ class KEMTLSClient:
         finally:
             if not keep_alive:
                 self.close()
+
+    def _request_over(self, transport, **kwargs) -> Tuple[bytes, Any]:
+        if self.transport_name == "quic":
+            return request_over_quic_transport(transport, **kwargs)
+        return request_over_transport(transport, **kwargs)
+
+    def _pooled_request(self, request_kwargs: Dict[str, Any]) -> Tuple[bytes, Any]:
+        key = pool_key(
+            self.transport_name,
+            request_kwargs["host"],
+            request_kwargs["port"],
+            self.expected_identity,
+            self.mode,
+            trust_anchor_digest(self.expected_identity, self.ca_pk, self.pdk_store),
+        )
+        # A connection owned outside the pool would otherwise leak.
+        self.close()
+        transport = self.pool.acquire(key)
+        reused = transport is not None
+        while True:
+            if transport is None:
+                transport = self._create_transport(self.transport_name)
+            self._sync_transport_config(transport)
+            try:
+                response, session = self._request_over(transport, keep_alive=True, **request_kwargs)
+            except Exception as e:
+                transport.close()
+                # A pooled connection can die between its health check and the request;
+                # retry idempotent requests once on a fresh connection.
+                if (
+                    reused
+                    and request_kwargs["method"] in _RETRYABLE_METHODS
+                    and isinstance(e, (EOFError, ConnectionError, TimeoutError))
+                ):
+                    transport, reused = None, False
+                    continue
+                print(f"Error in client: {e}")
+                raise
+            self.session = session
+            self.pool.release(key, transport)
+            return response, session
@@ -0,0 +1,213 @@
+"""
+0-RTT early data for resumed KEMTLS connections.
+
+A client resuming with a ticket may send one HTTP request right behind its
+ClientHello, sealed under keys derived from the resumption secret and the
+ClientHello hash. The server accepts it only when the ticket resumes, the
+ClientHello timestamp is inside the replay window and the binder has not been
+seen before. It then answers the request straight after ServerFinished with
+its application keys, so the response lands one round trip sooner.
+
+Early data can be replayed by anyone who captured it, so the server only runs
+allow-listed, side-effect-free GET routes from it. Any other request gets
+``425 Too Early`` (RFC 8470) and the client repeats it after the handshake.
+Clients only offer requests to those routes, and never ones carrying
+credentials, so bearer tokens and binding proofs stay out of replayable data.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from crypto.aead import KEY_SIZE, NONCE_SIZE, open_, seal
+from crypto.key_schedule import HASH_LEN, hkdf_expand_label
+
+
+EARLY_DATA_WINDOW_S = 10.0
+DEFAULT_EARLY_DATA_ROUTES = frozenset({"/.well-known/openid-configuration", "/jwks"})
+MAX_EARLY_DATA_SIZE = 16 * 1024
+
+_EARLY_DATA_AAD = b"kemtls early data"
+_CREDENTIAL_HEADERS = frozenset({
+    "authorization",
+    "proxy-authorization",
+    "cookie",
+    "x-kemtls-binding-public-key",
+    "x-kemtls-binding-signature",
+})
+_DEFAULT_REPLAY_ENTRIES = 65536
+
+TOO_EARLY_RESPONSE = (
+    b"HTTP/1.1 425 Too Early\r\n"
+    b"Content-Type: text/plain\r\n"
+    b"Content-Length: 9\r\n"
+    b"\r\n"
+    b"Too Early"
+)
+
+
+def derive_early_data_keys(resumption_secret: bytes, client_hello_digest: bytes) -> Tuple[bytes, bytes]:
+    """Client early traffic key and nonce for one ClientHello."""
+    secret = hkdf_expand_label(resumption_secret, b"c e traffic", client_hello_digest, HASH_LEN)
+    key = hkdf_expand_label(secret, b"key", b"", KEY_SIZE)
+    nonce = hkdf_expand_label(secret, b"iv", b"", NONCE_SIZE)
+    return key, nonce
+
+
+def seal_early_data(keys: Tuple[bytes, bytes], plaintext: bytes) -> bytes:
+    if len(plaintext) > MAX_EARLY_DATA_SIZE:
+        raise ValueError("early data too large")
+    key, nonce = keys
+    return seal(key, nonce, plaintext, _EARLY_DATA_AAD)
+
+
+def open_early_data(keys: Tuple[bytes, bytes], ciphertext: bytes) -> bytes:
+    key, nonce = keys
+    return open_(key, nonce, ciphertext, _EARLY_DATA_AAD)
+
+
+def early_data_eligible(
+    method: str,
+    path: str,
+    headers: Optional[Dict[str, str]] = None,
+    body: bytes = b"",
+    routes: Iterable[str] = DEFAULT_EARLY_DATA_ROUTES,
+) -> bool:
+    """True if a client may send this request as early data."""
+    if method != "GET" or body or path.split("?", 1)[0] not in routes:
+        return False
+    return not any(name.lower() in _CREDENTIAL_HEADERS for name in (headers or {}))
+
+
+def is_too_early(response: bytes) -> bool:
+    """True if the server refused to run an early request."""
+    return response.startswith(b"HTTP/1.1 425 ")
+
+
+class ReplayCache:
+    """
+    Binders seen within the replay window.
+
+    Only ClientHellos whose timestamp is inside the window can carry early
+    data, so an entry can be dropped once it is older than the window: any
+    replay of it would be rejected as stale anyway. Live entries are never
+    evicted; when the cache is full of them, new binders are refused and the
+    client falls back to a 1-RTT handshake.
+    """
+
+    def __init__(self, window_s: float = EARLY_DATA_WINDOW_S, max_entries: int = _DEFAULT_REPLAY_ENTRIES):
+        if window_s <= 0:
+            raise ValueError("window_s must be positive")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.window_s = window_s
+        self.max_entries = max_entries
+        self._seen: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.replays = 0
+        self.overflows = 0
+
+    def check_and_store(self, binder: bytes, now: Optional[float] = None) -> bool:
+        """Record ``binder``; returns False if it was already seen or the cache is full."""
+        now = time.time() if now is None else now
+        key = hashlib.sha256(binder).digest()
+        with self._lock:
+            while self._seen:
+                seen_at = next(iter(self._seen.values()))
+                if now - seen_at <= self.window_s:
+                    break
+                self._seen.popitem(last=False)
+            if key in self._seen:
+                self.replays += 1
+                return False
+            if len(self._seen) >= self.max_entries:
+                self.overflows += 1
+                return False
+            self._seen[key] = now
+            return True
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+class EarlyDataPolicy:
+    """Server-side rules for accepting early data: freshness, replay and routes."""
+
+    def __init__(
+        self,
+        routes: Iterable[str] = DEFAULT_EARLY_DATA_ROUTES,
+        window_s: float = EARLY_DATA_WINDOW_S,
+        replay_cache: Optional[ReplayCache] = None,
+    ):
+        self.routes = frozenset(routes)
+        self.window_s = window_s
+        self.replay_cache = replay_cache if replay_cache is not None else ReplayCache(window_s)
+        self.accepted = 0
+        self.rejected = 0
+
+    def accepts_client_hello(self, sent_at_ms: object, binder: bytes, now: Optional[float] = None) -> bool:
+        """Freshness and replay check for a resumed ClientHello offering early data."""
+        now = time.time() if now is None else now
+        try:
+            sent_at = int(str(sent_at_ms)) / 1000.0
+        except ValueError:
+            sent_at = None
+        ok = (
+            sent_at is not None
+            and abs(now - sent_at) <= self.window_s
+            and self.replay_cache.check_and_store(binder, now)
+        )
+        if ok:
+            self.accepted += 1
+        else:
+            self.rejected += 1
+        return ok
+
+    def allows(self, raw_request: bytes) -> bool:
+        """True for a bodiless GET to an allow-listed route."""
+        head, _, body = raw_request.partition(b"\r\n\r\n")
+        request_line, _, header_block = head.partition(b"\r\n")
+        parts = request_line.split(b" ")
+        if len(parts) != 3 or parts[0] != b"GET" or body:
+            return False
+        for line in header_block.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length" and value.strip() not in (b"", b"0"):
+                return False
+        path = parts[1].split(b"?", 1)[0].decode("ascii", "replace")
+        return path in self.routes
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "replays": self.replay_cache.replays,
+            "replay_cache_overflows": self.replay_cache.overflows,
+            "routes": sorted(self.routes),
+        }
+
+
+def mark_early_request(raw_request: bytes) -> bytes:
+    """Add ``Early-Data: 1`` (RFC 8470) so the application can tell."""
+    request_line, sep, rest = raw_request.partition(b"\r\n")
+    return request_line + sep + b"Early-Data: 1\r\n" + rest
+
+
+__all__ = [
+    "DEFAULT_EARLY_DATA_ROUTES",
+    "EARLY_DATA_WINDOW_S",
+    "MAX_EARLY_DATA_SIZE",
+    "TOO_EARLY_RESPONSE",
+    "EarlyDataPolicy",
+    "ReplayCache",
+    "derive_early_data_keys",
+    "early_data_eligible",
+    "is_too_early",
+    "mark_early_request",
+    "open_early_data",
+    "seal_early_data",
+]
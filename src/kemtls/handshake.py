@@ -3,28 +3,57 @@ KEMTLS Handshake Protocol (Post-Quantum)
 
 Implements the KEM-based handshake protocol for establishing a secure KEMTLS session,
 supporting both certificate-based (baseline) and pre-distributed key (pdk) authentication.
+A client holding a resumption ticket can instead resume with a PSK (mode "psk"),
+which skips both KEM operations; see ``resumption``. A resuming client may also
+send one early (0-RTT) request with its ClientHello; see ``early_data``.
+
+In baseline mode a client that already validated the server's certificate
+offers its digest in ClientHello (``cached_cert``). If it matches, ServerHello
+carries only that digest (``cert_ref``); both sides still hash the ServerHello
+as if it held the full certificate, so the transcript binds the certificate.
 """
 
 import hmac
 import hashlib
+import os
+import time
 from typing import Dict, Any, List, Optional, Tuple
 from rust_ext import handshake as rust_handshake
 from rust_ext import hashing as rust_hashing
 from crypto.ml_kem import MLKEM768
 from crypto.ml_kem import KyberKEM
 from crypto.ml_dsa import DilithiumSignature
+from crypto.executor import CryptoExecutor, get_crypto_executor
 from crypto.key_schedule import KeyDerivation
 from crypto.key_schedule import (
     hkdf_expand_label,
-    compute_transcript_hash,
+    TranscriptHash,
     derive_handshake_secret,
     derive_handshake_traffic_secrets,
     derive_finished_keys,
     derive_application_traffic_secrets,
     HASH_LEN
 )
-from .certs import validate_certificate
+from ._wire import (
+    VERSION_BINARY,
+    VERSION_JSON,
+    decode_handshake_message,
+    encode_message,
+    is_binary_message,
+)
+from .certs import CertificateCache, certificate_digest, get_certificate_cache
+from .early_data import EarlyDataPolicy, derive_early_data_keys, open_early_data, seal_early_data
+from .keypool import EphemeralKeyPool
 from .pdk import PDKTrustStore
+from .resumption import (
+    RESUMPTION_MODE,
+    TICKET_NONCE_LEN,
+    ResumptionTicket,
+    TicketIssuer,
+    compute_binder,
+    derive_psk_handshake_secret,
+    derive_resumption_secret,
+)
 from .session import KEMTLSSession
 from .exporter import (
     derive_exporter_secret,
@@ -36,6 +65,26 @@ from utils.serialization import serialize_message, deserialize_message
 from utils.helpers import generate_random_string
 
 
+SUPPORTED_VERSIONS = (VERSION_BINARY, VERSION_JSON)
+
+
+def _validate_versions(versions: Optional[List[str]], default: List[str]) -> List[str]:
+    selected = list(versions) if versions is not None else list(default)
+    if not selected:
+        raise ValueError("At least one KEMTLS version must be enabled")
+    for version in selected:
+        if version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported KEMTLS version: {version}")
+    return selected
+
+
+def _decode_for_version(msg_bytes: bytes, version: str) -> Dict[str, Any]:
+    """Decode a post-ServerHello message, enforcing the negotiated wire format."""
+    if is_binary_message(msg_bytes) != (version == VERSION_BINARY):
+        raise ValueError(f"Handshake message does not match negotiated version {version}")
+    return decode_handshake_message(msg_bytes)
+
+
 def _decode_bytes_field(message: Dict[str, Any], field_name: str) -> bytes:
     """Decode a serialized Base64url field back to bytes."""
     value = message.get(field_name)
@@ -62,6 +111,43 @@ def _encode_client_hello_python(
     )
 
 
+def _encode_client_hello_versions(
+    client_random: str,
+    expected_identity: str,
+    modes: List[str],
+    versions: List[str],
+) -> bytes:
+    # "version" stays 1.0 so servers that predate negotiation still answer.
+    return serialize_message(
+        {
+            'type': 'ClientHello',
+            'version': VERSION_JSON,
+            'versions': versions,
+            'random': client_random,
+            'modes': modes,
+            'expected_identity': expected_identity,
+        }
+    )
+
+
+def _client_hello_fields(
+    client_random: str,
+    expected_identity: str,
+    modes: List[str],
+    versions: List[str],
+) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {
+        'type': 'ClientHello',
+        'version': VERSION_JSON,
+        'random': client_random,
+        'modes': modes,
+        'expected_identity': expected_identity,
+    }
+    if versions != [VERSION_JSON]:
+        fields['versions'] = versions
+    return fields
+
+
 def _encode_client_key_exchange_python(ct_eph: bytes, ct_lt: bytes) -> bytes:
     return serialize_message(
         {
@@ -101,6 +187,16 @@ def _encode_finished_message(message_type: str, mac: bytes) -> bytes:
     )
 
 
+def _encode_server_hello(version: str, sh: Dict[str, Any]) -> bytes:
+    return encode_message(sh) if version == VERSION_BINARY else serialize_message(sh)
+
+
+def _encode_finished_for_version(version: str, message_type: str, mac: bytes) -> bytes:
+    if version == VERSION_BINARY:
+        return encode_message({'type': message_type, 'mac': mac})
+    return _encode_finished_message(message_type, mac)
+
+
 class ClientHandshake:
     """
     Client-side KEMTLS handshake state machine.
@@ -111,44 +207,126 @@ class ClientHandshake:
         ca_pk: Optional[bytes] = None,
         pdk_store: Optional[PDKTrustStore] = None,
         mode: str = "auto",
-        collector: Optional[Any] = None
+        collector: Optional[Any] = None,
+        versions: Optional[List[str]] = None,
+        ticket: Optional[ResumptionTicket] = None,
+        request_ticket: bool = False,
+        early_data: bool = False,
+        cert_cache: Optional[CertificateCache] = None,
     ):
         self.expected_identity = expected_identity
         self.ca_pk = ca_pk
         self.pdk_store = pdk_store
         self.mode = mode
         self.collector = collector
-        self.transcript: List[bytes] = []
+        self.versions = _validate_versions(versions, [VERSION_JSON])
+        self.cert_cache = cert_cache if cert_cache is not None else get_certificate_cache()
+        self.version: Optional[str] = None
+        self.transcript = TranscriptHash()
         self.client_random = generate_random_string(32)
+        self.server_hello: Optional[Dict[str, Any]] = None
+        self._cached_cert: Optional[Dict[str, Any]] = None
+
+        # Resumption: a ticket is only offered to the identity it was issued by.
+        if ticket is not None and (ticket.server_identity != expected_identity or not ticket.is_valid()):
+            ticket = None
+        self.ticket = ticket
+        self.request_ticket = request_ticket
+        self.resumed = False
+        self.expects_ticket = False
+        self.early_data_offered = early_data and ticket is not None
+        self.early_data_accepted = False
+        self._early_data_keys: Optional[Tuple[bytes, bytes]] = None
         
         # Internal state
         self.ss_eph: Optional[bytes] = None
         self.ss_lt: Optional[bytes] = None
         self.handshake_secret: Optional[bytes] = None
+        self.exporter_secret: Optional[bytes] = None
         self.client_fin_key: Optional[bytes] = None
         self.server_fin_key: Optional[bytes] = None
 
     def client_hello(self) -> bytes:
         """Generate ClientHello."""
         supported_modes = ["baseline", "pdk"] if self.mode == "auto" else [self.mode]
-        msg = _encode_client_hello(self.client_random, self.expected_identity, supported_modes)
+        if self.ca_pk and "baseline" in supported_modes:
+            self._cached_cert = self.cert_cache.cached_certificate(self.ca_pk, self.expected_identity)
+        if self.ticket is not None or self.request_ticket or self._cached_cert is not None:
+            hello = _client_hello_fields(self.client_random, self.expected_identity, supported_modes, self.versions)
+            if self._cached_cert is not None:
+                hello['cached_cert'] = certificate_digest(self._cached_cert)
+            if self.ticket is not None or self.request_ticket:
+                hello['resumption'] = [RESUMPTION_MODE]
+            if self.ticket is not None:
+                hello['psk_identity'] = self.ticket.ticket
+                if self.early_data_offered:
+                    hello['early_data'] = str(int(time.time() * 1000))
+                hello['psk_binder'] = compute_binder(self.ticket.resumption_secret, hello)
+            msg = serialize_message(hello)
+        elif self.versions == [VERSION_JSON]:
+            msg = _encode_client_hello(self.client_random, self.expected_identity, supported_modes)
+        else:
+            msg = _encode_client_hello_versions(
+                self.client_random,
+                self.expected_identity,
+                supported_modes,
+                self.versions,
+            )
         if self.collector:
             self.collector.client_hello_size = len(msg)
         self.transcript.append(msg)
+        if self.early_data_offered:
+            self._early_data_keys = derive_early_data_keys(self.ticket.resumption_secret, self.transcript.digest_at(1))
         return msg
 
-    def process_server_hello(self, msg_bytes: bytes) -> Tuple[bytes, KEMTLSSession]:
-        """Process ServerHello and return ClientKeyExchange."""
-        sh = deserialize_message(msg_bytes)
+    def seal_early_data(self, plaintext: bytes) -> bytes:
+        """Encrypt the 0-RTT request that follows the ClientHello."""
+        if self._early_data_keys is None:
+            raise RuntimeError("Early data was not offered")
+        return seal_early_data(self._early_data_keys, plaintext)
+
+    def process_server_hello(self, msg_bytes: bytes) -> Tuple[Optional[bytes], KEMTLSSession]:
+        """Process ServerHello and return ClientKeyExchange (None when the server resumed)."""
+        sh = decode_handshake_message(msg_bytes)
         if self.collector:
             self.collector.server_hello_size = len(msg_bytes)
             self.collector.mode = sh.get('mode', 'kemtls')
-        self.transcript.append(msg_bytes)
         
-        if sh.get('version') != 'KEMTLS/1.0':
+        version = sh.get('version')
+        if version not in self.versions:
+            raise ValueError("Incompatible KEMTLS version")
+        if is_binary_message(msg_bytes) != (version == VERSION_BINARY):
             raise ValueError("Incompatible KEMTLS version")
+        self.version = version
+
+        if 'cert_ref' in sh:
+            # Hash the ServerHello the server would have sent with the full certificate.
+            if self._cached_cert is None or _decode_bytes_field(sh, 'cert_ref') != certificate_digest(self._cached_cert):
+                raise ValueError("Server referenced a certificate the client did not offer")
+            del sh['cert_ref']
+            sh['cert'] = self._cached_cert
+            self.transcript.append(_encode_server_hello(version, sh))
+        else:
+            self.transcript.append(msg_bytes)
+        self.server_hello = sh
+        self.expects_ticket = self.request_ticket and sh.get('resumption') == RESUMPTION_MODE
             
         mode = sh.get('mode')
+        if mode == 'psk':
+            if self.ticket is None:
+                raise ValueError("Server selected psk mode without an offered ticket")
+            # The server proves it can open the ticket through its Finished MAC.
+            self.resumed = True
+            self.early_data_accepted = self.early_data_offered and sh.get('early_data') == 'accepted'
+            self.handshake_secret = derive_psk_handshake_secret(self.ticket.resumption_secret)
+            self._derive_finished_keys()
+            session = KEMTLSSession(
+                session_id=sh['session_id'],
+                peer_identity=self.expected_identity,
+                handshake_mode=mode,
+            )
+            return None, session
+
         server_eph_pk = _decode_bytes_field(sh, 'eph_pk')
         
         # 1. Identity Validation
@@ -157,11 +335,10 @@ class ClientHandshake:
             if not self.ca_pk:
                 raise ValueError("Baseline mode requires CA public key")
             
-            import time
             start_ns = time.perf_counter_ns()
-            server_lt_pk = validate_certificate(cert, self.ca_pk, self.expected_identity)
+            server_lt_pk, cache_hit = self.cert_cache.validate(cert, self.ca_pk, self.expected_identity)
             if self.collector:
-                self.collector.cert_verify_ns = time.perf_counter_ns() - start_ns
+                self.collector.record_cert_verify(time.perf_counter_ns() - start_ns, cache_hit)
             
             trusted_key_id = None
         elif mode == 'pdk':
@@ -169,7 +346,6 @@ class ClientHandshake:
             if not self.pdk_store:
                 raise ValueError("PDK mode requires PDK trust store")
             
-            import time
             start_ns = time.perf_counter_ns()
             entry = self.pdk_store.resolve_expected_identity(self.expected_identity, key_id)
             if self.collector:
@@ -184,7 +360,10 @@ class ClientHandshake:
         ct_eph, self.ss_eph = MLKEM768.encapsulate(server_eph_pk)
         ct_lt, self.ss_lt = MLKEM768.encapsulate(server_lt_pk)
         
-        msg = _encode_client_key_exchange(ct_eph, ct_lt)
+        if self.version == VERSION_BINARY:
+            msg = encode_message({'type': 'ClientKeyExchange', 'ct_ephemeral': ct_eph, 'ct_longterm': ct_lt})
+        else:
+            msg = _encode_client_key_exchange(ct_eph, ct_lt)
         if self.collector:
             self.collector.client_key_exchange_size = len(msg)
             self.collector.client_finish_size = len(msg)
@@ -192,14 +371,7 @@ class ClientHandshake:
         
         # 3. Derive Handshake Secrets
         self.handshake_secret = derive_handshake_secret([self.ss_eph, self.ss_lt])
-        t1 = compute_transcript_hash(self.transcript[:2]) # Up to SH
-        traffic = derive_handshake_traffic_secrets(self.handshake_secret, t1)
-        fin_keys = derive_finished_keys(
-            traffic['client_handshake_traffic_secret'],
-            traffic['server_handshake_traffic_secret']
-        )
-        self.client_fin_key = fin_keys['client_finished_key']
-        self.server_fin_key = fin_keys['server_finished_key']
+        self._derive_finished_keys()
         
         session = KEMTLSSession(
             session_id=sh['session_id'],
@@ -210,14 +382,24 @@ class ClientHandshake:
 
         return msg, session
 
+    def _derive_finished_keys(self) -> None:
+        t1 = self.transcript.digest_at(2) # Up to SH
+        traffic = derive_handshake_traffic_secrets(self.handshake_secret, t1)
+        fin_keys = derive_finished_keys(
+            traffic['client_handshake_traffic_secret'],
+            traffic['server_handshake_traffic_secret']
+        )
+        self.client_fin_key = fin_keys['client_finished_key']
+        self.server_fin_key = fin_keys['server_finished_key']
+
     def process_server_finished(
         self,
         msg_bytes: bytes,
         session: Optional[KEMTLSSession] = None,
     ) -> KEMTLSSession:
         """Verify ServerFinished and finalize session."""
-        t1 = compute_transcript_hash(self.transcript[:2])
-        sf = deserialize_message(msg_bytes)
+        t1 = self.transcript.digest_at(2)
+        sf = _decode_for_version(msg_bytes, self.version)
         
         # Verify MAC
         server_mac = _decode_bytes_field(sf, 'mac')
@@ -232,15 +414,13 @@ class ClientHandshake:
         if self.collector:
             self.collector.server_finish_size = len(msg_bytes)
 
-        self.transcript.append(msg_bytes)
-        t2 = compute_transcript_hash(self.transcript[:3]) # Up to CKE
-        t3 = compute_transcript_hash(self.transcript)    # Up to SF
+        t3 = self.transcript.append(msg_bytes) # Up to SF
         
         # Finalize Application Keys
         app_traffic = derive_application_traffic_secrets(self.handshake_secret, t3)
         exporter_secret = derive_exporter_secret(self.handshake_secret, t3)
         
-        sh = deserialize_message(self.transcript[1])
+        sh = self.server_hello
         
         # Use simple key derivation for IVs (8 bytes from secret)
         client_iv = hkdf_expand_label(app_traffic['client_application_traffic_secret'], b"iv", b"", 12)
@@ -263,18 +443,35 @@ class ClientHandshake:
         session.exporter_secret = exporter_secret
         session.session_binding_id = derive_session_binding_id(exporter_secret)
         session.refresh_binding_id = derive_refresh_binding_id(exporter_secret)
+        session.resumed = self.resumed
+        self.exporter_secret = exporter_secret
 
         return session
 
+    def process_new_session_ticket(self, msg_bytes: bytes) -> ResumptionTicket:
+        """Turn the server's NewSessionTicket into a ticket for the next connection."""
+        if self.exporter_secret is None:
+            raise RuntimeError("NewSessionTicket before ServerFinished")
+        nst = _decode_for_version(msg_bytes, self.version)
+        if nst.get('type') != 'NewSessionTicket':
+            raise ValueError("Expected NewSessionTicket")
+        nonce = _decode_bytes_field(nst, 'nonce')
+        return ResumptionTicket(
+            ticket=_decode_bytes_field(nst, 'ticket'),
+            resumption_secret=derive_resumption_secret(self.exporter_secret, nonce),
+            server_identity=self.expected_identity,
+            expires_at=time.time() + int(nst['lifetime']),
+        )
+
     def client_finished(self) -> bytes:
         """Generate ClientFinished."""
-        t2 = compute_transcript_hash(self.transcript[:3])
+        t2 = self.transcript.digest_at(3)
         mac = rust_handshake.hmac_sha256(
             self.client_fin_key,
             t2,
             fallback=_hmac_sha256_python,
         )
-        msg = _encode_finished_message('ClientFinished', mac)
+        msg = _encode_finished_for_version(self.version, 'ClientFinished', mac)
         if self.collector:
             self.collector.client_finished_size = len(msg)
         self.transcript.append(msg)
@@ -295,76 +492,214 @@ class ServerHandshake:
         server_lt_sk: bytes,
         cert: Optional[Dict[str, Any]] = None,
         pdk_key_id: Optional[str] = None,
-        collector: Optional[Any] = None
+        collector: Optional[Any] = None,
+        crypto_executor: Optional[CryptoExecutor] = None,
+        key_pool: Optional[EphemeralKeyPool] = None,
+        versions: Optional[List[str]] = None,
+        ticket_issuer: Optional[TicketIssuer] = None,
+        early_data: Optional[EarlyDataPolicy] = None,
     ):
         self.server_identity = server_identity
         self.server_lt_sk = server_lt_sk
         self.cert = cert
         self.pdk_key_id = pdk_key_id
         self.collector = collector
-        self.transcript: List[bytes] = []
+        self.crypto_executor = crypto_executor or get_crypto_executor()
+        self.versions = _validate_versions(versions, list(SUPPORTED_VERSIONS))
+        self.version: Optional[str] = None
+        self.mode: Optional[str] = None
+        self.transcript = TranscriptHash()
         self.session_id = generate_random_string(16)
-        
-        # Ephemeral keys
-        self.eph_pk, self.eph_sk = MLKEM768.generate_keypair()
+        self.ticket_issuer = ticket_issuer
+        self.ticket_requested = False
+        self.resumed = False
+        self.early_data = early_data
+        self.early_data_offered = False
+        self.early_data_accepted = False
+        self._early_data_keys: Optional[Tuple[bytes, bytes]] = None
+        self._psk_binder: Optional[bytes] = None
+
+        # Ephemeral keys (single-use; popped from the pool when one is supplied).
+        # Acquired on first use so a resumed handshake never pays for one.
+        self._key_pool = key_pool
+        self._eph_keypair: Optional[Tuple[bytes, bytes]] = None
+        self._spare_keypair: Optional[Tuple[bytes, bytes]] = None
+        self._client_hello: Optional[Dict[str, Any]] = None
+        self._resumption_secret: Optional[bytes] = None
         
         # Internal state
         self.handshake_secret: Optional[bytes] = None
         self.client_fin_key: Optional[bytes] = None
         self.server_fin_key: Optional[bytes] = None
+        self._server_finished_index: Optional[int] = None
+        self._session: Optional[KEMTLSSession] = None
+
+    @property
+    def eph_pk(self) -> bytes:
+        return self._ephemeral_keypair()[0]
+
+    @property
+    def eph_sk(self) -> bytes:
+        return self._ephemeral_keypair()[1]
+
+    def _ephemeral_keypair(self) -> Tuple[bytes, bytes]:
+        if self._eph_keypair is None:
+            generate = self._generate_ephemeral_keypair
+            if self._key_pool is not None:
+                eph_pk, eph_sk, pool_hit = self._key_pool.acquire(generate)
+                if self.collector:
+                    if pool_hit:
+                        self.collector.eph_keypool_hits += 1
+                    else:
+                        self.collector.eph_keypool_misses += 1
+            else:
+                eph_pk, eph_sk = generate()
+            self._eph_keypair = (eph_pk, eph_sk)
+        return self._eph_keypair
+
+    def _generate_ephemeral_keypair(self) -> Tuple[bytes, bytes]:
+        if self._spare_keypair is not None:
+            keypair, self._spare_keypair = self._spare_keypair, None
+            return keypair
+        return self.crypto_executor.generate_kem_keypair()
+
+    def provide_spare_keypair(self, keypair: Tuple[bytes, bytes]) -> None:
+        """Keypair to use instead of generating one if the key pool misses."""
+        self._spare_keypair = keypair
 
     def process_client_hello(self, msg_bytes: bytes) -> bytes:
         """Process ClientHello and return ServerHello."""
+        self.accept_client_hello(msg_bytes)
+        return self.server_hello()
+
+    def accept_client_hello(self, msg_bytes: bytes) -> bool:
+        """
+        Validate ClientHello and negotiate the mode, without building ServerHello.
+
+        Returns True when the handshake is a full one whose ServerHello needs
+        an ephemeral keypair, so a caller can prepare one (see
+        ``provide_spare_keypair``) before calling ``server_hello``.
+        """
         ch = deserialize_message(msg_bytes)
         if self.collector:
             self.collector.client_hello_size = len(msg_bytes)
         self.transcript.append(msg_bytes)
         
+        offered_versions = ch.get('versions') or [ch.get('version', VERSION_JSON)]
+        version = next((v for v in offered_versions if v in self.versions), None)
+        if version is None:
+            raise ValueError("Incompatible KEMTLS version")
+        self.version = version
+
+        self.ticket_requested = self.ticket_issuer is not None and RESUMPTION_MODE in (ch.get('resumption') or [])
+        resumption_secret = self._accept_ticket(ch)
+        self.early_data_offered = ch.get('early_data') is not None
+        self.early_data_accepted = (
+            self.early_data_offered
+            and resumption_secret is not None
+            and self.early_data is not None
+            and self.early_data.accepts_client_hello(ch['early_data'], self._psk_binder)
+        )
+        if self.early_data_accepted:
+            self._early_data_keys = derive_early_data_keys(resumption_secret, self.transcript.digest_at(1))
+
         modes = ch.get('modes', [])
         # Negotiation logic
-        if self.pdk_key_id and 'pdk' in modes:
+        if resumption_secret is not None:
+            mode = 'psk'
+        elif self.pdk_key_id and 'pdk' in modes:
             mode = 'pdk'
         elif self.cert and 'baseline' in modes:
             mode = 'baseline'
         else:
             raise ValueError("No mutually supported authentication modes")
-            
+        self.mode = mode
+        self._client_hello = ch
+        self._resumption_secret = resumption_secret
+        return mode != 'psk'
+
+    def server_hello(self) -> bytes:
+        """ServerHello for the ClientHello passed to ``accept_client_hello``."""
+        if self._client_hello is None:
+            raise RuntimeError("ClientHello has not been accepted")
+        ch, resumption_secret = self._client_hello, self._resumption_secret
+        self._client_hello = self._resumption_secret = None
+        version, mode = self.version, self.mode
         sh = {
             'type': 'ServerHello',
-            'version': 'KEMTLS/1.0',
+            'version': version,
             'session_id': self.session_id,
             'mode': mode,
-            'eph_pk': self.eph_pk
         }
         if mode == 'baseline':
+            sh['eph_pk'] = self.eph_pk
             sh['cert'] = self.cert
-        else:
+        elif mode == 'pdk':
+            sh['eph_pk'] = self.eph_pk
             sh['key_id'] = self.pdk_key_id
+        if self.ticket_requested:
+            sh['resumption'] = RESUMPTION_MODE
+        if self.early_data_accepted:
+            sh['early_data'] = 'accepted'
             
-        msg = serialize_message(sh)
+        # The transcript always covers the full certificate, even when only its digest is sent.
+        transcript_msg = _encode_server_hello(version, sh)
+        if mode == 'baseline' and self._client_has_certificate(ch):
+            del sh['cert']
+            sh['cert_ref'] = certificate_digest(self.cert)
+            msg = _encode_server_hello(version, sh)
+        else:
+            msg = transcript_msg
         if self.collector:
             self.collector.server_hello_size = len(msg)
             self.collector.mode = mode
-        self.transcript.append(msg)
+        self.transcript.append(transcript_msg)
+
+        if resumption_secret is not None:
+            self.resumed = True
+            self.handshake_secret = derive_psk_handshake_secret(resumption_secret)
+            self._derive_finished_keys()
         return msg
 
-    def process_client_key_exchange(self, msg_bytes: bytes) -> bytes:
-        """Process ClientKeyExchange and return ServerFinished."""
-        cke = deserialize_message(msg_bytes)
-        if self.collector:
-            self.collector.client_key_exchange_size = len(msg_bytes)
-            self.collector.client_finish_size = len(msg_bytes)
-        self.transcript.append(msg_bytes)
-        
-        # 1. Decapsulate
-        ct_eph = _decode_bytes_field(cke, 'ct_ephemeral')
-        ct_lt = _decode_bytes_field(cke, 'ct_longterm')
-        ss_eph = MLKEM768.decapsulate(self.eph_sk, ct_eph)
-        ss_lt = MLKEM768.decapsulate(self.server_lt_sk, ct_lt)
-        
-        # 2. Derive Handshake Secrets
-        self.handshake_secret = derive_handshake_secret([ss_eph, ss_lt])
-        t1 = compute_transcript_hash(self.transcript[:2])
+    def _client_has_certificate(self, ch: Dict[str, Any]) -> bool:
+        """True if the ClientHello offers the digest of this server's certificate."""
+        offered = ch.get('cached_cert')
+        if not isinstance(offered, str):
+            return False
+        try:
+            return hmac.compare_digest(base64url_decode(offered), certificate_digest(self.cert))
+        except Exception:
+            return False
+
+    def _accept_ticket(self, ch: Dict[str, Any]) -> Optional[bytes]:
+        """Resumption secret of a valid offered ticket, or None to run a full handshake."""
+        if self.ticket_issuer is None:
+            return None
+        identity, binder = ch.get('psk_identity'), ch.get('psk_binder')
+        if not isinstance(identity, str) or not isinstance(binder, str):
+            return None
+        if ch.get('expected_identity') != self.server_identity:
+            return None
+        try:
+            state = self.ticket_issuer.open(base64url_decode(identity))
+            binder = base64url_decode(binder)
+        except Exception:
+            return None
+        if state is None or state.get('identity') != self.server_identity:
+            return None
+        if not hmac.compare_digest(compute_binder(state['secret'], ch), binder):
+            return None
+        self._psk_binder = binder
+        return state['secret']
+
+    def open_early_data(self, ciphertext: bytes) -> bytes:
+        """Decrypt the client's 0-RTT request; only valid once early data was accepted."""
+        if not self.early_data_accepted:
+            raise RuntimeError("Early data was not accepted")
+        return open_early_data(self._early_data_keys, ciphertext)
+
+    def _derive_finished_keys(self) -> None:
+        t1 = self.transcript.digest_at(2)
         traffic = derive_handshake_traffic_secrets(self.handshake_secret, t1)
         fin_keys = derive_finished_keys(
             traffic['client_handshake_traffic_secret'],
@@ -372,24 +707,78 @@ class ServerHandshake:
         )
         self.client_fin_key = fin_keys['client_finished_key']
         self.server_fin_key = fin_keys['server_finished_key']
-        
-        # 3. Generate ServerFinished
+
+    def _server_finished(self) -> bytes:
         mac = rust_handshake.hmac_sha256(
             self.server_fin_key,
-            t1,
+            self.transcript.digest_at(2),
             fallback=_hmac_sha256_python,
         )
-        msg = _encode_finished_message('ServerFinished', mac)
+        msg = _encode_finished_for_version(self.version, 'ServerFinished', mac)
         if self.collector:
             self.collector.server_finished_size = len(msg)
             self.collector.server_finish_size = len(msg)
         self.transcript.append(msg)
+        self._server_finished_index = len(self.transcript)
         return msg
 
+    def resumed_server_finished(self) -> bytes:
+        """ServerFinished sent straight after ServerHello on a resumed handshake."""
+        if not self.resumed:
+            raise RuntimeError("Handshake is not resumed")
+        return self._server_finished()
+
+    def new_session_ticket(self) -> Optional[bytes]:
+        """NewSessionTicket to send after ServerFinished, or None if the client did not ask."""
+        if not self.ticket_requested or self._server_finished_index is None:
+            return None
+        exporter_secret = self.application_session().exporter_secret
+        nonce = os.urandom(TICKET_NONCE_LEN)
+        nst = {
+            'type': 'NewSessionTicket',
+            'ticket': self.ticket_issuer.issue(
+                resumption_secret=derive_resumption_secret(exporter_secret, nonce),
+                server_identity=self.server_identity,
+                handshake_mode=self.mode,
+            ),
+            'nonce': nonce,
+            'lifetime': str(self.ticket_issuer.lifetime_s),
+        }
+        return encode_message(nst) if self.version == VERSION_BINARY else serialize_message(nst)
+
+    def process_client_key_exchange(self, msg_bytes: bytes) -> bytes:
+        """Process ClientKeyExchange and return ServerFinished."""
+        pairs = self.decapsulation_inputs(msg_bytes)
+        return self.finish_client_key_exchange(self.crypto_executor.decapsulate_many(pairs))
+
+    def decapsulation_inputs(self, msg_bytes: bytes) -> List[Tuple[bytes, bytes]]:
+        """
+        Record ClientKeyExchange and return its ``(secret_key, ciphertext)`` pairs.
+
+        Together with ``finish_client_key_exchange`` this splits
+        ``process_client_key_exchange`` around the decapsulations, so an event
+        loop can await them instead of blocking on the crypto executor.
+        """
+        cke = _decode_for_version(msg_bytes, self.version)
+        if self.collector:
+            self.collector.client_key_exchange_size = len(msg_bytes)
+            self.collector.client_finish_size = len(msg_bytes)
+        self.transcript.append(msg_bytes)
+
+        ct_eph = _decode_bytes_field(cke, 'ct_ephemeral')
+        ct_lt = _decode_bytes_field(cke, 'ct_longterm')
+        return [(self.eph_sk, ct_eph), (self.server_lt_sk, ct_lt)]
+
+    def finish_client_key_exchange(self, shared_secrets: List[bytes]) -> bytes:
+        """Derive handshake secrets from the decapsulated secrets and return ServerFinished."""
+        self.handshake_secret = derive_handshake_secret(list(shared_secrets))
+        self._derive_finished_keys()
+        return self._server_finished()
+
     def verify_client_finished(self, msg_bytes: bytes) -> KEMTLSSession:
         """Verify ClientFinished and finalize session."""
-        t2 = compute_transcript_hash(self.transcript[:3])
-        cf = deserialize_message(msg_bytes)
+        t2 = self.transcript.digest_at(3)
+        cf = _decode_for_version(msg_bytes, self.version)
         
         client_mac = _decode_bytes_field(cf, 'mac')
         if rust_handshake.hmac_sha256(
@@ -402,22 +791,35 @@ class ServerHandshake:
         if self.collector:
             self.collector.client_finished_size = len(msg_bytes)
         self.transcript.append(msg_bytes)
-        # SF is msg 4 in transcript
-        t3 = compute_transcript_hash(self.transcript[:4])
+        return self.application_session()
+
+    def application_session(self) -> KEMTLSSession:
+        """
+        Session keyed from the transcript through ServerFinished.
+
+        Available as soon as ServerFinished is sent, so a server can answer
+        accepted early data before ClientFinished arrives; that data must be
+        safe to send to a client that has not yet proven its handshake.
+        """
+        if self._session is not None:
+            return self._session
+        if self._server_finished_index is None:
+            raise RuntimeError("ServerFinished has not been sent")
+        # SF is msg 4 in the transcript (msg 3 when resumed: there is no CKE)
+        t3 = self.transcript.digest_at(self._server_finished_index)
         
         # Finalize Application Keys
         app_traffic = derive_application_traffic_secrets(self.handshake_secret, t3)
         exporter_secret = derive_exporter_secret(self.handshake_secret, t3)
         
-        sh = deserialize_message(self.transcript[1])
         client_iv = hkdf_expand_label(app_traffic['client_application_traffic_secret'], b"iv", b"", 12)
         server_iv = hkdf_expand_label(app_traffic['server_application_traffic_secret'], b"iv", b"", 12)
 
-        return KEMTLSSession(
+        self._session = KEMTLSSession(
             session_id=self.session_id,
             peer_identity="client", # In this simplified flow, client is anonymous
-            handshake_mode=sh['mode'],
-            trusted_key_id=self.pdk_key_id if sh['mode'] == 'pdk' else None,
+            handshake_mode=self.mode,
+            trusted_key_id=self.pdk_key_id if self.mode == 'pdk' else None,
             client_app_secret=app_traffic['client_application_traffic_secret'],
             server_app_secret=app_traffic['server_application_traffic_secret'],
             client_write_key=app_traffic['client_application_traffic_secret'],
@@ -426,8 +828,10 @@ class ServerHandshake:
             server_write_iv=server_iv,
             exporter_secret=exporter_secret,
             session_binding_id=derive_session_binding_id(exporter_secret),
-            refresh_binding_id=derive_refresh_binding_id(exporter_secret)
+            refresh_binding_id=derive_refresh_binding_id(exporter_secret),
+            resumed=self.resumed,
         )
+        return self._session
 
 
 class KEMTLSHandshake:
@@ -0,0 +1,161 @@
+"""
+Ephemeral ML-KEM Keypair Pool
+
+Keeps a small stock of pre-generated ephemeral ML-KEM-768 keypairs so server
+handshakes do not pay keygen latency on the accept path. A background thread
+refills the pool whenever it drops to the low-water mark. Every keypair is
+handed out exactly once; when the pool is empty the caller generates inline.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from crypto.ml_kem import MLKEM768
+
+
+class EphemeralKeyPool:
+    """Background-refilled pool of single-use ephemeral ML-KEM keypairs."""
+
+    def __init__(
+        self,
+        target_size: int = 32,
+        low_water: int = 8,
+        generator: Callable[[], Tuple[bytes, bytes]] = MLKEM768.generate_keypair,
+        prefill: bool = False,
+    ):
+        if target_size < 1:
+            raise ValueError("target_size must be at least 1")
+        if not 0 <= low_water < target_size:
+            raise ValueError("low_water must be in [0, target_size)")
+
+        self.target_size = target_size
+        self.low_water = low_water
+        self._generator = generator
+        self._keys: Deque[Tuple[bytes, bytes]] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._refill_requested = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+
+        if prefill:
+            self._fill_to_target()
+
+    def start(self) -> None:
+        """Start the refill thread; safe to call more than once."""
+        with self._cond:
+            if self._thread is not None or self._closed:
+                return
+            self._refill_requested = True
+            self._thread = threading.Thread(
+                target=self._refill_loop,
+                name="kemtls-keypool",
+                daemon=True,
+            )
+            self._thread.start()
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def spawn_empty(self) -> "EphemeralKeyPool":
+        """
+        A new, empty, unstarted pool with the same settings.
+
+        For use after ``fork``: a child must never reuse keypairs copied from
+        the parent, and the parent's refill thread does not exist in the child.
+        """
+        return EphemeralKeyPool(
+            target_size=self.target_size,
+            low_water=self.low_water,
+            generator=self._generator,
+        )
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._keys.clear()
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        self._thread = None
+
+    def acquire(self, generator: Optional[Callable[[], Tuple[bytes, bytes]]] = None) -> Tuple[bytes, bytes, bool]:
+        """
+        Pop a ready keypair.
+
+        Returns ``(public_key, secret_key, hit)``. On a miss the keypair comes
+        from ``generator``, or is generated inline on the caller thread.
+        """
+        self.start()
+        with self._cond:
+            if self._keys:
+                public_key, secret_key = self._keys.popleft()
+                self.hits += 1
+                hit = True
+            else:
+                public_key = secret_key = b""
+                self.misses += 1
+                hit = False
+            if len(self._keys) <= self.low_water:
+                self._refill_requested = True
+                self._cond.notify()
+
+        if not hit:
+            public_key, secret_key = (generator or self._generator)()
+        return public_key, secret_key, hit
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._keys)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._keys),
+                "target_size": self.target_size,
+                "low_water": self.low_water,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "generated": self.generated,
+            }
+
+    def _refill_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._refill_requested and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                self._refill_requested = False
+            self._fill_to_target()
+
+    def _fill_to_target(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed or len(self._keys) >= self.target_size:
+                    return
+            try:
+                keypair = self._generator()
+            except Exception:
+                # Leave the pool short; acquire() falls back to inline keygen.
+                time.sleep(0.1)
+                return
+            with self._cond:
+                if self._closed:
+                    return
+                self._keys.append(keypair)
+                self.generated += 1
+
+
+__all__ = ["EphemeralKeyPool"]
@@ -61,6 +61,21 @@ class PDKTrustStore:
             raise KeyError(f"Key ID '{key_id}' not found in PDK trust store")
         return self._store[key_id]
     
+    def entries_for_identity(self, identity: str) -> List[Dict[str, Any]]:
+        """
+        Return every trusted key entry for an identity, ordered by key ID.
+        
+        Args:
+            identity: Identity to search for
+            
+        Returns:
+            List: Matching key entries, empty if none
+        """
+        return sorted(
+            (entry for entry in self._store.values() if entry['identity'] == identity),
+            key=lambda entry: entry['key_id'],
+        )
+    
     def get_entry_by_identity(self, identity: str) -> Dict[str, Any]:
         """
         Retrieve a trusted key entry by identity.
@@ -74,7 +89,7 @@ class PDKTrustStore:
         Raises:
             ValueError: If no key or more than one key is found for this identity
         """
-        matches = [entry for entry in self._store.values() if entry['identity'] == identity]
+        matches = self.entries_for_identity(identity)
         
         if not matches:
             raise ValueError(f"No trusted keys found for identity '{identity}'")
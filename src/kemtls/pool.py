@@ -0,0 +1,203 @@
+"""
+Client-side pool of established KEMTLS connections.
+
+A pooled connection is keyed by ``(transport, host, port, expected_identity,
+mode, trust_anchors)``, so a connection is only reused for the server
+identity, authentication mode and trust anchors (CA key and pinned PDK keys)
+it was handshaken with. Clients check a connection out for
+one request and hand it back afterwards; several clients (for example the
+authorization and resource server clients of one OIDC flow) can share a pool.
+
+Idle connections are dropped after ``idle_timeout_s``, which should stay
+below the server's own idle timeout, and are health-checked before reuse.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .pdk import PDKTrustStore
+
+
+PoolKey = Tuple[str, str, int, str, str, str]
+
+_DEFAULT_MAX_SIZE = 64
+_DEFAULT_MAX_PER_KEY = 4
+_DEFAULT_IDLE_TIMEOUT_S = 15.0
+
+
+def pool_key(
+    transport: str,
+    host: str,
+    port: int,
+    expected_identity: str,
+    mode: str,
+    trust_anchors: str = "",
+) -> PoolKey:
+    return (transport, host, port, expected_identity, mode, trust_anchors)
+
+
+def trust_anchor_digest(
+    expected_identity: str,
+    ca_pk: Optional[bytes] = None,
+    pdk_store: Optional[PDKTrustStore] = None,
+) -> str:
+    """Digest of the CA key and the PDK entries a handshake with ``expected_identity`` would trust."""
+    digest = hashlib.sha256()
+    fields: List[bytes] = [b"ca", ca_pk or b""]
+    if pdk_store is not None:
+        for entry in pdk_store.entries_for_identity(expected_identity):
+            fields += [b"pdk", entry["key_id"].encode("utf-8"), entry["ml_kem_public_key"]]
+    for field in fields:
+        digest.update(len(field).to_bytes(4, "big"))
+        digest.update(field)
+    return digest.hexdigest()
+
+
+class ConnectionPool:
+    """
+    Thread-safe store of idle, established client transports.
+
+    ``max_size`` bounds idle connections overall and ``max_per_key`` per
+    endpoint; a connection released into a full pool replaces the least
+    recently used idle one. ``acquire`` hands out the most recently used
+    connection for a key, since it is the least likely to have gone stale.
+    """
+
+    def __init__(
+        self,
+        max_size: int = _DEFAULT_MAX_SIZE,
+        max_per_key: int = _DEFAULT_MAX_PER_KEY,
+        idle_timeout_s: float = _DEFAULT_IDLE_TIMEOUT_S,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if max_per_key < 1:
+            raise ValueError("max_per_key must be at least 1")
+        if idle_timeout_s <= 0:
+            raise ValueError("idle_timeout_s must be positive")
+        self.max_size = max_size
+        self.max_per_key = max_per_key
+        self.idle_timeout_s = idle_timeout_s
+        # Idle connections in release order (oldest first), tagged with a sequence number.
+        self._idle: "OrderedDict[int, Tuple[PoolKey, Any, float]]" = OrderedDict()
+        self._by_key: Dict[PoolKey, List[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.unhealthy = 0
+        self.evicted = 0
+
+    def acquire(self, key: PoolKey) -> Optional[Any]:
+        """Check out a live idle connection for ``key``, or None to open a new one."""
+        while True:
+            stale: List[Any] = []
+            with self._lock:
+                stale.extend(self._pop_expired(time.monotonic()))
+                ids = self._by_key.get(key)
+                if not ids:
+                    self.misses += 1
+                    transport = None
+                else:
+                    transport = self._remove(ids[-1])
+            _close_all(stale)
+            if transport is None:
+                return None
+            if _is_alive(transport):
+                with self._lock:
+                    self.hits += 1
+                return transport
+            with self._lock:
+                self.unhealthy += 1
+            _close_all([transport])
+
+    def release(self, key: PoolKey, transport: Any) -> None:
+        """Return a connection after a successful request; it is closed if it cannot be kept."""
+        if not _is_alive(transport):
+            with self._lock:
+                self.unhealthy += 1
+            _close_all([transport])
+            return
+        now = time.monotonic()
+        with self._lock:
+            evicted = self._pop_expired(now)
+            ids = self._by_key.setdefault(key, [])
+            if len(ids) >= self.max_per_key:
+                evicted.append(self._remove(ids[0]))
+                self.evicted += 1
+            while len(self._idle) >= self.max_size:
+                evicted.append(self._remove(next(iter(self._idle))))
+                self.evicted += 1
+            connection_id = self._next_id
+            self._next_id += 1
+            self._idle[connection_id] = (key, transport, now)
+            self._by_key.setdefault(key, []).append(connection_id)
+        _close_all(evicted)
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            transports = [transport for _, transport, _ in self._idle.values()]
+            self._idle.clear()
+            self._by_key.clear()
+        _close_all(transports)
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "endpoints": len(self._by_key),
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "unhealthy": self.unhealthy,
+                "evicted": self.evicted,
+            }
+
+    def _remove(self, connection_id: int) -> Any:
+        # Caller holds the lock.
+        key, transport, _ = self._idle.pop(connection_id)
+        ids = self._by_key[key]
+        ids.remove(connection_id)
+        if not ids:
+            del self._by_key[key]
+        return transport
+
+    def _pop_expired(self, now: float) -> List[Any]:
+        # Caller holds the lock. Release order is idle order, so stop at the first live entry.
+        cutoff = now - self.idle_timeout_s
+        expired = []
+        while self._idle:
+            connection_id, (_, _, released_at) = next(iter(self._idle.items()))
+            if released_at > cutoff:
+                break
+            expired.append(self._remove(connection_id))
+            self.expired += 1
+        return expired
+
+
+def _is_alive(transport: Any) -> bool:
+    try:
+        return bool(transport.is_alive())
+    except Exception:
+        return False
+
+
+def _close_all(transports: List[Any]) -> None:
+    for transport in transports:
+        try:
+            transport.close()
+        except Exception:
+            pass
+
+
+__all__ = ["ConnectionPool", "PoolKey", "pool_key", "trust_anchor_digest"]
@@ -10,12 +10,34 @@ from __future__ import annotations
 import os
 import socket
 import time
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from crypto.aead import TAG_SIZE
+
+from ._datagram import DatagramIO
+from .early_data import early_data_eligible, is_too_early
 from .handshake import ClientHandshake
 from .quic_crypto import QUICPacketProtector, build_packet_aad
-from .quic_packets import ACK, APP_DATA, CONNECTION_CLOSE, HANDSHAKE, INITIAL, decode_packet, encode_packet
-from .quic_state import QUICConnectionState
+from .quic_packets import (
+    ACK,
+    APP_DATA,
+    CONNECTION_CLOSE,
+    HANDSHAKE,
+    INITIAL,
+    MAX_DATAGRAM_SIZE,
+    STREAM_FRAME_OVERHEAD,
+    AckFrame,
+    decode_ack_frame,
+    decode_packet,
+    decode_stream_frame,
+    encode_ack_frame,
+    encode_packet,
+    encode_stream_frame,
+    packet_overhead,
+    split_stream,
+)
+from .quic_state import QUICConnectionState, StreamMessage
+from .resumption import TicketCache
 from .tcp_transport import build_http_request
 from .transport import KEMTLSTransport
 
@@ -23,6 +45,8 @@ from .transport import KEMTLSTransport
 _HANDSHAKE_RETRY_TIMEOUT_S = 0.35
 _APP_RETRY_TIMEOUT_S = 0.25
 _MAX_RETRIES = 4
+# APP_DATA that beats the keys to install them (0.5-RTT replies) is held, not dropped.
+_MAX_BUFFERED_APP_PACKETS = 16
 
 
 class KEMTLSQUICClientTransport(KEMTLSTransport):
@@ -35,6 +59,10 @@ class KEMTLSQUICClientTransport(KEMTLSTransport):
         pdk_store=None,
         mode: str = "auto",
         collector: Optional[Any] = None,
+        handshake_versions: Optional[List[str]] = None,
+        batch_io: bool = True,
+        ticket_cache: Optional[TicketCache] = None,
+        early_data: bool = False,
     ):
         super().__init__()
         self.expected_identity = expected_identity
@@ -42,66 +70,107 @@ class KEMTLSQUICClientTransport(KEMTLSTransport):
         self.pdk_store = pdk_store
         self.mode = mode
         self.collector = collector
+        self.handshake_versions = handshake_versions
+        self.batch_io = batch_io
+        self.ticket_cache = ticket_cache
+        self.early_data = early_data
+        self.early_response: Optional[bytes] = None
 
         self.sock: Optional[socket.socket] = None
+        self._io: Optional[DatagramIO] = None
         self.connected_host: Optional[str] = None
         self.connected_port: Optional[int] = None
         self.connection_id = os.urandom(8)
         self.state = QUICConnectionState(connection_id=self.connection_id)
+        self._connection_id_confirmed = False
 
         self.sender: Optional[QUICPacketProtector] = None
         self.receiver: Optional[QUICPacketProtector] = None
         self.pending_packets: Dict[int, Dict[str, Any]] = {}
-        self.processed_app_packets: set[int] = set()
-
-    def connect(self, host: str, port: int) -> None:
+        self._buffered_app_packets: List[bytes] = []
+
+    def connect(self, host: str, port: int, early_data: Optional[bytes] = None) -> None:
+        """
+        Handshake with ``host:port``. ``early_data`` is a request to send as
+        0-RTT data if a ticket allows it; when the server answers it, the
+        response is left in ``early_response``.
+        """
+        self.early_response = None
+        self._buffered_app_packets.clear()
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.connect((host, port))
-        sock.settimeout(_HANDSHAKE_RETRY_TIMEOUT_S)
+        sock.setblocking(False)
         self.sock = sock
+        self._io = DatagramIO(sock, connected=True, batched=self.batch_io)
+        # Stream ids and packet numbers start over with each connection.
+        self.connection_id = os.urandom(8)
+        self.state = QUICConnectionState(connection_id=self.connection_id)
+        self._connection_id_confirmed = False
+        self.pending_packets.clear()
         self.connected_host = host
         self.connected_port = port
 
         if self.collector:
             self.collector.start_hct()
 
+        ticket = None
+        if self.ticket_cache is not None:
+            ticket = self.ticket_cache.take(host, port, self.expected_identity)
+
         handshake = ClientHandshake(
             self.expected_identity,
             self.ca_pk,
             self.pdk_store,
             self.mode,
             collector=self.collector,
+            versions=self.handshake_versions,
+            ticket=ticket,
+            request_ticket=self.ticket_cache is not None,
+            early_data=early_data is not None,
         )
 
         client_hello = handshake.client_hello()
-        server_hello_packet = self._transmit_with_retry(
+        server_hello_message = self._transmit_with_retry(
             packet_type=INITIAL,
             payload=client_hello,
             epoch=0,
             expect_packet_type=HANDSHAKE,
+            follow_up=handshake.seal_early_data(early_data) if handshake.early_data_offered else None,
         )
-        server_hello = server_hello_packet.payload
+        server_hello = server_hello_message.payload
 
         if self.collector and hasattr(self.collector, "record_ttfb"):
             self.collector.record_ttfb()
 
         client_key_exchange, session = handshake.process_server_hello(server_hello)
-        server_finished_packet = self._transmit_with_retry(
-            packet_type=HANDSHAKE,
-            payload=client_key_exchange,
-            epoch=0,
-            expect_packet_type=HANDSHAKE,
-        )
-        server_finished = server_finished_packet.payload
+        if client_key_exchange is None:
+            # Resumed: ServerFinished follows ServerHello in the same flight.
+            server_finished = self._await_handshake_message()
+        else:
+            server_finished_message = self._transmit_with_retry(
+                packet_type=HANDSHAKE,
+                payload=client_key_exchange,
+                epoch=0,
+                expect_packet_type=HANDSHAKE,
+            )
+            server_finished = server_finished_message.payload
 
         session = handshake.process_server_finished(server_finished, session)
+        self.sender = QUICPacketProtector(session.client_write_key, session.client_write_iv)
+        self.receiver = QUICPacketProtector(session.server_write_key, session.server_write_iv)
+        buffered, self._buffered_app_packets = self._buffered_app_packets, []
+        for raw_packet in buffered:
+            self._process_datagram(raw_packet, time.monotonic())
+        if handshake.expects_ticket:
+            new_ticket = handshake.process_new_session_ticket(self._await_handshake_message())
+            self.ticket_cache.put(host, port, self.expected_identity, new_ticket)
         client_finished = handshake.client_finished()
-        self._send_packet(packet_type=HANDSHAKE, payload=client_finished, epoch=0, reliable=False)
+        self._send_message(packet_type=HANDSHAKE, payload=client_finished, epoch=0)
 
         session.transport = "quic"
         self.session = session
-        self.sender = QUICPacketProtector(session.client_write_key, session.client_write_iv)
-        self.receiver = QUICPacketProtector(session.server_write_key, session.server_write_iv)
+        if handshake.early_data_accepted:
+            self.early_response = self.recv_application()
 
         if self.collector:
             self.collector.end_hct()
@@ -112,16 +181,25 @@ class KEMTLSQUICClientTransport(KEMTLSTransport):
         raise NotImplementedError("QUIC client transport cannot accept inbound connections")
 
     def send_handshake(self, payload: bytes) -> None:
-        self._send_packet(packet_type=HANDSHAKE, payload=payload, epoch=0, reliable=True)
+        self._send_message(packet_type=HANDSHAKE, payload=payload, epoch=0)
 
     def recv_handshake(self) -> bytes:
-        packet = self._recv_loop(expect_packet_type=HANDSHAKE)
-        return packet.payload
+        message = self._recv_loop(expect_packet_type=HANDSHAKE)
+        return message.payload
+
+    def _await_handshake_message(self) -> bytes:
+        """Wait for the rest of the server's flight; the server retransmits it if lost."""
+        for _ in range(_MAX_RETRIES):
+            try:
+                return self.recv_handshake()
+            except TimeoutError:
+                continue
+        raise TimeoutError("timed out waiting for the server handshake flight")
 
     def send_application(self, payload: bytes) -> None:
         if self.sender is None or self.session is None:
             raise RuntimeError("No active QUIC session")
-        self._send_packet(packet_type=APP_DATA, payload=payload, epoch=1, reliable=True)
+        self._send_message(packet_type=APP_DATA, payload=payload, epoch=1)
 
     def recv_application(self) -> bytes:
         if self.receiver is None:
@@ -130,26 +208,12 @@ class KEMTLSQUICClientTransport(KEMTLSTransport):
         overall_deadline = time.monotonic() + (_APP_RETRY_TIMEOUT_S * (_MAX_RETRIES + 3))
         while True:
             try:
-                packet = self._recv_loop(expect_packet_type=APP_DATA)
+                message = self._recv_loop(expect_packet_type=APP_DATA)
             except TimeoutError:
                 if time.monotonic() >= overall_deadline:
                     raise
                 continue
-            self._send_ack(packet.packet_number, epoch=packet.epoch)
-
-            if packet.packet_number in self.processed_app_packets:
-                continue
-
-            aad = build_packet_aad(
-                packet_type=APP_DATA,
-                connection_id=self.connection_id,
-                packet_number=packet.packet_number,
-                epoch=packet.epoch,
-                payload_length=0,
-            )
-            plaintext = self.receiver.unprotect_packet(packet.packet_number, packet.payload, aad)
-            self.processed_app_packets.add(packet.packet_number)
-            return plaintext
+            return message.payload
 
     def close(self) -> None:
         if self.sock is not None:
@@ -161,7 +225,7 @@ class KEMTLSQUICClientTransport(KEMTLSTransport):
                     payload=b"close",
                     epoch=0,
                 )
-                self.sock.send(close_packet)
+                self._io.send(close_packet)
             except Exception:
                 pass
             try:
@@ -170,13 +234,13 @@ class KEMTLSQUICClientTransport(KEMTLSTransport):
                 pass
 
         self.sock = None
+        self._io = None
         self.session = None
         self.sender = None
         self.receiver = None
         self.connected_host = None
         self.connected_port = None
         self.pending_packets.clear()
-        self.processed_app_packets.clear()
 
     def matches_endpoint(self, host: str, port: int) -> bool:
         return (
@@ -186,8 +250,34 @@ class KEMTLSQUICClientTransport(KEMTLSTransport):
             and self.connected_port == port
         )
 
+    def is_alive(self) -> bool:
+        """True if the connection is established and the server has not closed it."""
+        if self._io is None or self.session is None:
+            return False
+        try:
+            # Absorb late ACKs and notice a CONNECTION_CLOSE (e.g. LRU eviction).
+            for raw_packet, _ in self._io.drain():
+                self._process_datagram(raw_packet, time.monotonic())
+        except (EOFError, OSError, ValueError):
+            return False
+        return True
+
+    def _send_message(self, *, packet_type: int, payload: bytes, epoch: int) -> List[int]:
+        """Send one message as its own stream, one reliable packet per frame."""
+        max_frame_data = MAX_DATAGRAM_SIZE - packet_overhead(self.connection_id) - STREAM_FRAME_OVERHEAD
+        if packet_type == APP_DATA:
+            max_frame_data -= TAG_SIZE
+        if self._io is None:
+            raise RuntimeError("QUIC transport is not connected")
+        frames = split_stream(self.state.next_stream_id(), payload, max_frame_data)
+        with self._io.batch():
+            return [
+                self._send_packet(packet_type=packet_type, payload=encode_stream_frame(frame), epoch=epoch, reliable=True)
+                for frame in frames
+            ]
+
     def _send_packet(self, *, packet_type: int, payload: bytes, epoch: int, reliable: bool) -> int:
-        if self.sock is None:
+        if self._io is None:
             raise RuntimeError("QUIC transport is not connected")
 
         packet_number = self.state.next_packet_number()
@@ -212,7 +302,7 @@ class KEMTLSQUICClientTransport(KEMTLSTransport):
             payload=packet_payload,
             epoch=epoch,
         )
-        self.sock.send(packet_bytes)
+        self._io.send(packet_bytes)
 
         if reliable:
             deadline = time.monotonic() + (_APP_RETRY_TIMEOUT_S if packet_type == APP_DATA else _HANDSHAKE_RETRY_TIMEOUT_S)
@@ -226,87 +316,177 @@ class KEMTLSQUICClientTransport(KEMTLSTransport):
 
         return packet_number
 
-    def _transmit_with_retry(self, *, packet_type: int, payload: bytes, epoch: int, expect_packet_type: int):
-        packet_number = self._send_packet(packet_type=packet_type, payload=payload, epoch=epoch, reliable=True)
+    def _transmit_with_retry(
+        self,
+        *,
+        packet_type: int,
+        payload: bytes,
+        epoch: int,
+        expect_packet_type: int,
+        follow_up: Optional[bytes] = None,
+    ) -> StreamMessage:
+        """
+        Send ``payload`` and wait for the reply, resending on timeout.
+        ``follow_up`` goes out right behind it as its own stream; the reply
+        does not imply it arrived, so it waits for an explicit ACK.
+        """
+        with self._io.batch():
+            packet_numbers = self._send_message(packet_type=packet_type, payload=payload, epoch=epoch)
+            if follow_up is not None:
+                self._send_message(packet_type=packet_type, payload=follow_up, epoch=epoch)
 
         while True:
             try:
-                packet = self._recv_loop(expect_packet_type=expect_packet_type)
-                self.pending_packets.pop(packet_number, None)
-                self.state.acknowledge_packet(packet_number)
-                self._send_ack(packet.packet_number, epoch=packet.epoch)
-                return packet
+                message = self._recv_loop(expect_packet_type=expect_packet_type)
+                # The reply implicitly acknowledges the whole request.
+                for packet_number in packet_numbers:
+                    self.pending_packets.pop(packet_number, None)
+                    self.state.acknowledge_packet(packet_number)
+                return message
             except TimeoutError:
-                entry = self.pending_packets.get(packet_number)
-                if entry is None:
+                entries = [
+                    self.pending_packets[packet_number]
+                    for packet_number in packet_numbers
+                    if packet_number in self.pending_packets
+                ]
+                if not entries:
                     continue
-                if entry["attempts"] >= _MAX_RETRIES:
+                if all(entry["attempts"] >= _MAX_RETRIES for entry in entries):
                     raise TimeoutError("handshake retransmission budget exhausted")
-                self.sock.send(entry["bytes"])
-                entry["attempts"] += 1
-                entry["deadline"] = time.monotonic() + entry["timeout"]
-
-    def _recv_loop(self, *, expect_packet_type: int):
-        if self.sock is None:
+                with self._io.batch():
+                    for entry in entries:
+                        if entry["attempts"] >= _MAX_RETRIES:
+                            continue
+                        self._io.send(entry["bytes"])
+                        entry["attempts"] += 1
+                        entry["deadline"] = time.monotonic() + entry["timeout"]
+
+    def _recv_loop(self, *, expect_packet_type: int) -> StreamMessage:
+        """Receive until the next complete message of ``expect_packet_type`` is reassembled."""
+        if self._io is None:
             raise RuntimeError("QUIC transport is not connected")
 
         deadline = time.monotonic() + _HANDSHAKE_RETRY_TIMEOUT_S
         while True:
-            timeout_remaining = max(0.01, deadline - time.monotonic())
-            self.sock.settimeout(timeout_remaining)
-            try:
-                raw_packet = self.sock.recv(65535)
-            except socket.timeout:
-                self._process_expired_retransmissions()
-                raise TimeoutError("timed out waiting for QUIC packet")
-
-            packet = decode_packet(raw_packet)
-            if packet.connection_id != self.connection_id:
+            message = self.state.streams.pop()
+            if message is not None:
+                if message.packet_type == expect_packet_type:
+                    return message
                 continue
 
-            if packet.packet_type == ACK:
-                if len(packet.payload) == 8:
-                    acked_number = int.from_bytes(packet.payload, "big")
-                    self.pending_packets.pop(acked_number, None)
-                    self.state.acknowledge_packet(acked_number)
-                continue
-
-            if packet.packet_type != expect_packet_type:
-                if packet.packet_type == CONNECTION_CLOSE:
-                    raise EOFError("QUIC peer closed connection")
-                continue
+            now = time.monotonic()
+            if self.state.ack_due(now):
+                self._send_ack(epoch=1 if self.receiver is not None else 0)
+            if now >= deadline:
+                self._process_expired_retransmissions()
+                raise TimeoutError("timed out waiting for QUIC packet")
 
-            self.state.note_received_packet(packet.packet_number)
-            return packet
+            timeout_remaining = deadline - now
+            if self.state.ack_deadline is not None:
+                timeout_remaining = min(timeout_remaining, self.state.ack_deadline - now)
+
+            # Handle the whole burst, then answer it with a single ACK.
+            ack_epoch = None
+            for raw_packet, _ in self._io.recv_batch(max(0.001, timeout_remaining)):
+                epoch = self._process_datagram(raw_packet, time.monotonic())
+                if epoch is not None:
+                    ack_epoch = epoch
+            if ack_epoch is not None:
+                self._send_ack(epoch=ack_epoch)
+
+    def _process_datagram(self, raw_packet: bytes, now: float) -> Optional[int]:
+        """Absorb one datagram; returns the epoch to ACK in right away, if any."""
+        packet = decode_packet(raw_packet)
+        if packet.connection_id != self.connection_id:
+            if self._connection_id_confirmed or packet.packet_type == APP_DATA:
+                return None
+            self._adopt_connection_id(packet.connection_id)
+        self._connection_id_confirmed = True
+
+        if packet.packet_type == ACK:
+            try:
+                ack_frame = decode_ack_frame(packet.payload)
+            except ValueError:
+                return None
+            for acked_number in self.state.acknowledge_ranges(ack_frame.ranges):
+                self.pending_packets.pop(acked_number, None)
+            return None
+
+        if packet.packet_type == CONNECTION_CLOSE:
+            raise EOFError("QUIC peer closed connection")
+
+        payload = packet.payload
+        if packet.packet_type == APP_DATA:
+            if self.receiver is None:
+                if len(self._buffered_app_packets) < _MAX_BUFFERED_APP_PACKETS:
+                    self._buffered_app_packets.append(raw_packet)
+                return None
+            aad = build_packet_aad(
+                packet_type=APP_DATA,
+                connection_id=self.connection_id,
+                packet_number=packet.packet_number,
+                epoch=packet.epoch,
+                payload_length=0,
+            )
+            payload = self.receiver.unprotect_packet(packet.packet_number, payload, aad)
+
+        frame = decode_stream_frame(payload)
+        # Handshake packets are unauthenticated: the stream data, not the
+        # packet number, tells a retransmission from new data.
+        is_new = self.state.note_received_packet(
+            packet.packet_number,
+            now,
+            authenticated=packet.packet_type == APP_DATA,
+        )
+        is_new = self.state.streams.push(
+            packet.packet_type,
+            frame,
+            epoch=packet.epoch,
+            packet_number=packet.packet_number,
+        ) and is_new
+        # A completed message is acked before it is handed back: the caller
+        # may go idle and leave the delayed-ACK timer unserviced.
+        if not is_new or self.state.streams.has_ready() or self.state.ack_due(now):
+            return packet.epoch
+        return None
+
+    def _adopt_connection_id(self, connection_id: bytes) -> None:
+        """Switch to the connection ID the server chose; it routes our packets to its worker."""
+        self.connection_id = connection_id
+        self.state.connection_id = connection_id
 
     def _process_expired_retransmissions(self) -> None:
-        if self.sock is None:
+        if self._io is None:
             return
 
         now = time.monotonic()
-        for entry in list(self.state.expired_retransmissions(now)):
-            packet_state = self.pending_packets.get(entry.packet_number)
-            if packet_state is None:
-                continue
-            if packet_state["attempts"] >= _MAX_RETRIES:
-                continue
-            self.sock.send(packet_state["bytes"])
-            packet_state["attempts"] += 1
-            packet_state["deadline"] = now + packet_state["timeout"]
-            self.state.schedule_retransmission(entry.packet_number, packet_state["deadline"])
-
-    def _send_ack(self, packet_number: int, *, epoch: int) -> None:
-        if self.sock is None:
+        with self._io.batch():
+            for entry in list(self.state.expired_retransmissions(now)):
+                packet_state = self.pending_packets.get(entry.packet_number)
+                if packet_state is None:
+                    continue
+                if packet_state["attempts"] >= _MAX_RETRIES:
+                    continue
+                self._io.send(packet_state["bytes"])
+                packet_state["attempts"] += 1
+                packet_state["deadline"] = now + packet_state["timeout"]
+                self.state.schedule_retransmission(entry.packet_number, packet_state["deadline"])
+
+    def _send_ack(self, *, epoch: int) -> None:
+        """Send one ranged ACK covering everything received since the last one."""
+        if self._io is None:
+            return
+        ranges, ack_delay_us = self.state.take_ack_ranges()
+        if not ranges:
             return
         ack_packet = encode_packet(
             packet_type=ACK,
             connection_id=self.connection_id,
             packet_number=self.state.next_packet_number(),
-            payload=packet_number.to_bytes(8, "big"),
+            payload=encode_ack_frame(AckFrame(ranges=tuple(ranges), ack_delay_us=ack_delay_us)),
             epoch=epoch,
         )
-        self.sock.send(ack_packet)
-
+        self._io.send(ack_packet)
 
 def request_over_transport(
     transport: KEMTLSQUICClientTransport,
@@ -323,7 +503,13 @@ def request_over_transport(
     reuse = keep_alive and transport.matches_endpoint(host, port)
     if not reuse:
         transport.close()
-        transport.connect(host, port)
+        early_request = None
+        if transport.early_data and early_data_eligible(method, path, headers, body):
+            # Sent before a session exists, so it carries no binding proof.
+            early_request = build_http_request(host, method, path, headers=headers, keep_alive=keep_alive)
+        transport.connect(host, port, early_data=early_request)
+        if transport.early_response is not None and not is_too_early(transport.early_response):
+            return transport.early_response, transport.session
 
     effective_headers = dict(headers or {})
     if header_mutator is not None:
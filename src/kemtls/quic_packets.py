@@ -1,9 +1,26 @@
-"""Packet codec for the QUIC-style KEMTLS transport core."""
+"""Packet codec for the QUIC-style KEMTLS transport core.
+
+INITIAL, HANDSHAKE and APP_DATA payloads carry one stream frame::
+
+    flags(1) | stream_id(4) | offset(4) | data
+
+Every handshake message and HTTP request/response is its own stream, split
+into frames that fit ``MAX_DATAGRAM_SIZE`` so each packet can be acknowledged
+and retransmitted on its own. APP_DATA frames are encrypted as a whole.
+
+ACK payloads carry ranges of received packet numbers, QUIC-style::
+
+    largest(8) | ack_delay_us(4) | first_range(4) | block_count(2) | (gap(4) | range(4))*
+
+``first_range`` counts the packets acknowledged below ``largest``; each block
+skips ``gap + 1`` unacknowledged packets and then acknowledges ``range + 1``.
+"""
 
 from __future__ import annotations
 
 import struct
 from dataclasses import dataclass
+from typing import Iterable, List, Tuple
 
 
 PACKET_VERSION = 1
@@ -25,6 +42,18 @@ PACKET_TYPES = {
 _HEADER_STRUCT = struct.Struct(">BBBBQI")
 _MAX_CONNECTION_ID_LEN = 255
 
+MAX_DATAGRAM_SIZE = 1200
+STREAM_FIN = 0x01
+
+_STREAM_FRAME_STRUCT = struct.Struct(">BII")
+STREAM_FRAME_OVERHEAD = _STREAM_FRAME_STRUCT.size
+
+_ACK_HEAD_STRUCT = struct.Struct(">QIIH")
+_ACK_BLOCK_STRUCT = struct.Struct(">II")
+MAX_ACK_RANGES = 64
+
+AckRange = Tuple[int, int]
+
 
 @dataclass(frozen=True)
 class QUICPacket:
@@ -120,6 +149,136 @@ def decode_packet(data: bytes) -> QUICPacket:
     )
 
 
+@dataclass(frozen=True)
+class StreamFrame:
+    stream_id: int
+    offset: int
+    data: bytes
+    fin: bool = False
+
+
+def encode_stream_frame(frame: StreamFrame) -> bytes:
+    if not isinstance(frame.data, bytes):
+        raise TypeError("stream data must be bytes")
+    if not 0 <= frame.stream_id < 1 << 32:
+        raise ValueError("stream_id must be between 0 and 2^32 - 1")
+    if frame.offset < 0 or frame.offset + len(frame.data) >= 1 << 32:
+        raise ValueError("stream offset out of range")
+
+    flags = STREAM_FIN if frame.fin else 0
+    return _STREAM_FRAME_STRUCT.pack(flags, frame.stream_id, frame.offset) + frame.data
+
+
+def decode_stream_frame(payload: bytes) -> StreamFrame:
+    if not isinstance(payload, bytes):
+        raise TypeError("payload must be bytes")
+    if len(payload) < _STREAM_FRAME_STRUCT.size:
+        raise ValueError("stream frame too short")
+
+    flags, stream_id, offset = _STREAM_FRAME_STRUCT.unpack_from(payload)
+    if flags & ~STREAM_FIN:
+        raise ValueError(f"unsupported stream frame flags: {flags:#x}")
+    return StreamFrame(
+        stream_id=stream_id,
+        offset=offset,
+        data=payload[_STREAM_FRAME_STRUCT.size:],
+        fin=bool(flags & STREAM_FIN),
+    )
+
+
+def packet_overhead(connection_id: bytes) -> int:
+    """Bytes a packet header adds in front of its payload."""
+    return _HEADER_STRUCT.size + len(connection_id)
+
+
+def split_stream(stream_id: int, data: bytes, max_frame_data: int) -> List[StreamFrame]:
+    """Cut one stream into frames of at most ``max_frame_data`` bytes; the last carries FIN."""
+    if max_frame_data <= 0:
+        raise ValueError("max_frame_data must be positive")
+
+    frames = []
+    offset = 0
+    while True:
+        chunk = data[offset:offset + max_frame_data]
+        end = offset + len(chunk)
+        frames.append(StreamFrame(stream_id=stream_id, offset=offset, data=chunk, fin=end >= len(data)))
+        if end >= len(data):
+            return frames
+        offset = end
+
+
+@dataclass(frozen=True)
+class AckFrame:
+    """Acknowledged ``(low, high)`` packet-number ranges, highest range first."""
+
+    ranges: Tuple[AckRange, ...]
+    ack_delay_us: int = 0
+
+    @property
+    def largest(self) -> int:
+        return self.ranges[0][1]
+
+
+def ack_ranges(packet_numbers: Iterable[int]) -> List[AckRange]:
+    """Collapse packet numbers into inclusive ``(low, high)`` ranges, highest first."""
+    ranges: List[AckRange] = []
+    for packet_number in sorted(set(packet_numbers), reverse=True):
+        if ranges and ranges[-1][0] == packet_number + 1:
+            ranges[-1] = (packet_number, ranges[-1][1])
+        else:
+            ranges.append((packet_number, packet_number))
+    return ranges
+
+
+def encode_ack_frame(frame: AckFrame) -> bytes:
+    ranges = frame.ranges
+    if not ranges:
+        raise ValueError("ACK frame needs at least one range")
+    if len(ranges) > MAX_ACK_RANGES:
+        raise ValueError("too many ACK ranges")
+    if not 0 <= frame.ack_delay_us < 1 << 32:
+        raise ValueError("ack_delay_us out of range")
+
+    low, high = ranges[0]
+    _validate_packet_number(high)
+    if not 0 <= low <= high:
+        raise ValueError("invalid ACK range")
+    parts = [_ACK_HEAD_STRUCT.pack(high, frame.ack_delay_us, high - low, len(ranges) - 1)]
+    previous_low = low
+    for low, high in ranges[1:]:
+        if not 0 <= low <= high or high + 1 >= previous_low:
+            raise ValueError("ACK ranges must be disjoint and descending")
+        parts.append(_ACK_BLOCK_STRUCT.pack(previous_low - high - 2, high - low))
+        previous_low = low
+    return b"".join(parts)
+
+
+def decode_ack_frame(payload: bytes) -> AckFrame:
+    if not isinstance(payload, bytes):
+        raise TypeError("payload must be bytes")
+    if len(payload) < _ACK_HEAD_STRUCT.size:
+        raise ValueError("ACK frame too short")
+
+    largest, ack_delay_us, first_range, block_count = _ACK_HEAD_STRUCT.unpack_from(payload)
+    if len(payload) != _ACK_HEAD_STRUCT.size + block_count * _ACK_BLOCK_STRUCT.size:
+        raise ValueError("ACK frame length mismatch")
+    if block_count >= MAX_ACK_RANGES or first_range > largest:
+        raise ValueError("invalid ACK frame")
+
+    low = largest - first_range
+    ranges = [(low, largest)]
+    offset = _ACK_HEAD_STRUCT.size
+    for _ in range(block_count):
+        gap, length = _ACK_BLOCK_STRUCT.unpack_from(payload, offset)
+        offset += _ACK_BLOCK_STRUCT.size
+        high = low - gap - 2
+        low = high - length
+        if low < 0:
+            raise ValueError("ACK range below zero")
+        ranges.append((low, high))
+    return AckFrame(ranges=tuple(ranges), ack_delay_us=ack_delay_us)
+
+
 def _validate_packet_type(packet_type: int) -> None:
     if not isinstance(packet_type, int):
         raise TypeError("packet_type must be an integer")
@@ -171,8 +330,21 @@ __all__ = [
     "APP_DATA",
     "ACK",
     "CONNECTION_CLOSE",
+    "MAX_ACK_RANGES",
+    "MAX_DATAGRAM_SIZE",
+    "STREAM_FIN",
+    "STREAM_FRAME_OVERHEAD",
+    "AckFrame",
     "QUICPacket",
+    "StreamFrame",
     "encode_header",
     "encode_packet",
     "decode_packet",
+    "encode_stream_frame",
+    "decode_stream_frame",
+    "ack_ranges",
+    "encode_ack_frame",
+    "decode_ack_frame",
+    "packet_overhead",
+    "split_stream",
 ]
@@ -1,26 +1,72 @@
-"""QUIC-style UDP server transport for KEMTLS + HTTP/1.1 bridge."""
+"""QUIC-style UDP server transport for KEMTLS + HTTP/1.1 bridge.
+
+The receive loop drains every queued datagram per wakeup and writes the
+packets it produces (ACKs, retransmissions) together; see ``_datagram``. It
+only decodes, acknowledges and reassembles packets. Complete
+handshake messages and HTTP requests are handed to a thread pool, one
+message at a time per connection, so a slow handshake or Flask view does not
+stop the socket from being drained. With ``workers > 1`` the server forks one
+process per worker, each binding the port with ``SO_REUSEPORT``; see
+``quic_workers`` for how stray datagrams reach the worker that owns them.
+"""
 
 from __future__ import annotations
 
+import multiprocessing
+import select
 import socket
 import threading
 import time
 import traceback
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
 
 from flask import Flask
 
-from ._http_bridge import call_flask_app, parse_http_request
+from ._http_bridge import call_flask_app
+from .early_data import TOO_EARLY_RESPONSE, EarlyDataPolicy, mark_early_request
 from .handshake import ServerHandshake
+from .keypool import EphemeralKeyPool
 from .quic_crypto import QUICPacketProtector, build_packet_aad
-from .quic_packets import ACK, APP_DATA, CONNECTION_CLOSE, HANDSHAKE, INITIAL, decode_packet, encode_packet
-from .quic_state import QUICConnectionState
-from utils.serialization import deserialize_message
+from ._datagram import DatagramIO
+from .quic_packets import (
+    ACK,
+    APP_DATA,
+    CONNECTION_CLOSE,
+    HANDSHAKE,
+    INITIAL,
+    MAX_DATAGRAM_SIZE,
+    STREAM_FRAME_OVERHEAD,
+    AckFrame,
+    decode_ack_frame,
+    decode_packet,
+    decode_stream_frame,
+    encode_ack_frame,
+    encode_packet,
+    encode_stream_frame,
+    packet_overhead,
+    split_stream,
+)
+from .quic_state import QUICConnectionState, RetransmissionTimer, StreamMessage
+from .quic_workers import (
+    MAX_WORKERS,
+    connection_id_worker,
+    issue_connection_id,
+    reuse_port_supported,
+    unwrap_forwarded,
+    wrap_forwarded,
+)
+from .resumption import TicketIssuer
+from crypto.aead import TAG_SIZE
+from crypto.executor import CryptoExecutor
 
 
-_RETRY_TIMEOUT_S = 0.25
 _MAX_RETRIES = 4
+_IDLE_POLL_S = 0.1
+_DEFAULT_IDLE_TIMEOUT_S = 30.0
+_DEFAULT_MAX_CONNECTIONS = 10_000
 
 
 @dataclass
@@ -33,9 +79,11 @@ class _ServerConnection:
     sender: Optional[QUICPacketProtector] = None
     receiver: Optional[QUICPacketProtector] = None
     sent_packets: Dict[int, Dict[str, Any]] = field(default_factory=dict)
-    processed_app_packets: set[int] = field(default_factory=set)
-    cached_server_hello: Optional[bytes] = None
-    cached_server_finished: Optional[bytes] = None
+    last_activity: float = 0.0
+    # Client-chosen ID from the INITIAL, routed here until the client switches over.
+    initial_connection_id: Optional[bytes] = None
+    inbox: Deque[StreamMessage] = field(default_factory=deque)
+    busy: bool = False
 
 
 class KEMTLSQUICServer:
@@ -50,7 +98,28 @@ class KEMTLSQUICServer:
         pdk_key_id: Optional[str] = None,
         host: str = "0.0.0.0",
         port: int = 4433,
+        crypto_executor: Optional[CryptoExecutor] = None,
+        key_pool: Optional[EphemeralKeyPool] = None,
+        idle_timeout: float = _DEFAULT_IDLE_TIMEOUT_S,
+        max_connections: int = _DEFAULT_MAX_CONNECTIONS,
+        workers: int = 1,
+        app_workers: Optional[int] = None,
+        batch_io: bool = True,
+        ticket_issuer: Optional[TicketIssuer] = None,
+        early_data: Optional[EarlyDataPolicy] = None,
     ):
+        if idle_timeout <= 0:
+            raise ValueError("idle_timeout must be positive")
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+        if not 1 <= workers <= MAX_WORKERS:
+            raise ValueError(f"workers must be in [1, {MAX_WORKERS}]")
+        if workers > 1 and not reuse_port_supported():
+            raise RuntimeError("workers > 1 requires SO_REUSEPORT")
+        if workers > 1 and key_pool is not None and (len(key_pool) or key_pool.started):
+            # Forked workers would each inherit the same ephemeral keypairs.
+            raise ValueError("workers > 1 needs an empty key pool that has not been started")
+
         self.app = app
         self.server_identity = server_identity
         self.server_lt_sk = server_lt_sk
@@ -58,13 +127,56 @@ class KEMTLSQUICServer:
         self.pdk_key_id = pdk_key_id
         self.host = host
         self.port = port
-
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.sock.settimeout(0.1)
+        self.crypto_executor = crypto_executor
+        self.idle_timeout = idle_timeout
+        self.max_connections = max_connections
+        self.workers = workers
+        self.app_workers = app_workers
+        self.batch_io = batch_io
+        self._owns_key_pool = key_pool is None
+        self.key_pool = key_pool if key_pool is not None else EphemeralKeyPool()
+        # Created before any fork so every worker opens every worker's tickets.
+        self.ticket_issuer = ticket_issuer if ticket_issuer is not None else TicketIssuer()
+        # Each forked worker would hold a private replay cache, and SO_REUSEPORT
+        # can route a replayed Initial to a worker that has not seen its binder,
+        # so 0-RTT is only accepted by a single-process server.
+        self.early_data = early_data if early_data is not None else EarlyDataPolicy()
+        self.accepts_early_data = workers == 1
+
+        self.sock = self._make_socket(reuse_port=False)
+        self._io = DatagramIO(self.sock, batched=batch_io)
 
         self._stop_event = threading.Event()
-        self._connections: Dict[bytes, _ServerConnection] = {}
+        # Guards connection state shared by the receive loop and dispatch threads.
+        self._lock = threading.RLock()
+        self._dispatcher: Optional[ThreadPoolExecutor] = None
+        # Least recently active first; every received packet moves its connection to the end.
+        self._connections: "OrderedDict[bytes, _ServerConnection]" = OrderedDict()
+        self._aliases: Dict[bytes, bytes] = {}
+        self._delayed_acks: Set[bytes] = set()
+        self._timers = RetransmissionTimer()
+
+        self.worker_index = 0
+        self._forward_sock: Optional[socket.socket] = None
+        self._forward_io: Optional[DatagramIO] = None
+        self._forward_addresses: Tuple[Tuple[str, int], ...] = ()
+        self._worker_processes: List[Any] = []
+
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.evicted_idle = 0
+        self.evicted_lru = 0
+        self.max_table_size = 0
+        self.forwarded_datagrams = 0
+
+    @staticmethod
+    def _make_socket(*, reuse_port: bool) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.setblocking(False)
+        return sock
 
     def stop(self) -> None:
         self._stop_event.set()
@@ -72,36 +184,187 @@ class KEMTLSQUICServer:
             self.sock.close()
         except OSError:
             pass
+        if self._owns_key_pool:
+            self.key_pool.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self._connections),
+            "max_connections": self.max_connections,
+            "max_table_size": self.max_table_size,
+            "idle_timeout_s": self.idle_timeout,
+            "connections_opened": self.connections_opened,
+            "connections_closed": self.connections_closed,
+            "evicted_idle": self.evicted_idle,
+            "evicted_lru": self.evicted_lru,
+            "pending_timers": len(self._timers),
+            "worker_index": self.worker_index,
+            "workers": self.workers,
+            "forwarded_datagrams": self.forwarded_datagrams,
+            "early_data": dict(self.early_data.get_metrics(), enabled=self.accepts_early_data),
+            "io": self._io.get_metrics(),
+        }
 
     def start(self) -> None:
+        if self.workers > 1:
+            self._run_supervisor()
+            return
         self.sock.bind((self.host, self.port))
         print(f"KEMTLS QUIC Server listening on {self.host}:{self.port} (udp)")
+        self._serve()
+
+    def _run_supervisor(self) -> None:
+        """Fork one worker per core; each owns a SO_REUSEPORT socket and a forwarding socket."""
+        context = multiprocessing.get_context("fork")
+        forward_socks = []
+        for _ in range(self.workers):
+            forward_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            forward_sock.bind(("127.0.0.1", 0))
+            forward_socks.append(forward_sock)
+        forward_addresses = [forward_sock.getsockname() for forward_sock in forward_socks]
+        self.sock.close()
+
+        processes = []
+        for index in range(self.workers):
+            process = context.Process(
+                target=self._worker_main,
+                args=(index, forward_socks, forward_addresses),
+                name=f"kemtls-quic-{index}",
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+        for forward_sock in forward_socks:
+            forward_sock.close()
+        self._worker_processes = processes
+        print(f"KEMTLS QUIC Server listening on {self.host}:{self.port} (udp, {self.workers} workers)")
 
-        while not self._stop_event.is_set():
-            try:
-                raw, addr = self.sock.recvfrom(65535)
-            except socket.timeout:
-                self._retransmit_expired_packets()
-                continue
-            except OSError:
-                if self._stop_event.is_set():
+        try:
+            while not self._stop_event.wait(0.2):
+                if not any(process.is_alive() for process in processes):
                     break
-                raise
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join(timeout=1.0)
+
+    def _worker_main(
+        self,
+        worker_index: int,
+        forward_socks: Sequence[socket.socket],
+        forward_addresses: Sequence[Tuple[str, int]],
+    ) -> None:
+        self.worker_index = worker_index
+        # Each worker generates its own ephemeral keys; none are shared across the fork.
+        self.key_pool = self.key_pool.spawn_empty()
+        self._owns_key_pool = True
+        for index, forward_sock in enumerate(forward_socks):
+            if index != worker_index:
+                forward_sock.close()
+        self._forward_sock = forward_socks[worker_index]
+        self._forward_sock.setblocking(False)
+        self._forward_io = DatagramIO(self._forward_sock, batched=self.batch_io)
+        self._forward_addresses = tuple(forward_addresses)
+        self._worker_processes = []
+        self.sock = self._make_socket(reuse_port=True)
+        self._io = DatagramIO(self.sock, batched=self.batch_io)
+        self.sock.bind((self.host, self.port))
+        self._serve()
 
-            try:
-                packet = decode_packet(raw)
-            except Exception:
-                continue
+    def _serve(self) -> None:
+        self.key_pool.start()
+        self._dispatcher = ThreadPoolExecutor(
+            max_workers=self.app_workers,
+            thread_name_prefix="kemtls-quic-app",
+        )
+        try:
+            while not self._stop_event.is_set():
+                with self._lock:
+                    timeout = self._poll_timeout()
+                try:
+                    datagrams = self._receive(timeout)
+                except (OSError, ValueError):
+                    # ValueError: select() on the socket stop() just closed.
+                    if self._stop_event.is_set():
+                        break
+                    raise
+
+                try:
+                    with self._io.batch():
+                        for raw, addr in datagrams:
+                            self._receive_datagram(raw, addr)
+
+                        with self._lock:
+                            self._flush_delayed_acks()
+                            self._retransmit_expired_packets()
+                            self._evict_idle_connections()
+                except OSError as exc:
+                    if self._stop_event.is_set():
+                        break
+                    print(f"Error sending QUIC datagrams: {exc!r}")
+        finally:
+            self._dispatcher.shutdown(wait=False)
+            self._dispatcher = None
+
+    def _receive(self, timeout: float) -> List[Tuple[bytes, Tuple[str, int]]]:
+        if self._forward_io is None:
+            return self._io.recv_batch(timeout)
+
+        readable, _, _ = select.select([self.sock, self._forward_sock], [], [], timeout)
+        datagrams = self._io.drain() if self.sock in readable else []
+        if self._forward_sock in readable:
+            for raw, source in self._forward_io.drain():
+                # Only sibling workers may hand over datagrams; the wrapped
+                # client address is trusted, so anything else is dropped.
+                if source not in self._forward_addresses:
+                    continue
+                try:
+                    addr, datagram = unwrap_forwarded(raw)
+                except ValueError:
+                    continue
+                datagrams.append((datagram, addr))
+        return datagrams
 
+    def _receive_datagram(self, raw: bytes, addr: Tuple[str, int]) -> None:
+        try:
+            packet = decode_packet(raw)
+        except Exception:
+            return
+
+        with self._lock:
+            if self._forward_stray(packet, raw, addr):
+                return
             try:
                 self._handle_packet(packet, addr)
             except EOFError:
-                continue
+                pass
             except Exception as exc:
                 print(f"Error handling QUIC packet: {exc!r}")
                 traceback.print_exc()
 
-            self._retransmit_expired_packets()
+    def _forward_stray(self, packet, raw: bytes, addr: Tuple[str, int]) -> bool:
+        """Send a datagram for another worker's connection to that worker."""
+        if self._forward_sock is None or packet.packet_type == INITIAL:
+            return False
+        if self._lookup(packet.connection_id) is not None:
+            return False
+        owner = connection_id_worker(packet.connection_id)
+        if owner is None or owner == self.worker_index or owner >= len(self._forward_addresses):
+            return False
+        try:
+            self._forward_sock.sendto(wrap_forwarded(addr, raw), self._forward_addresses[owner])
+        except OSError:
+            return False
+        self.forwarded_datagrams += 1
+        return True
+
+    def _lookup(self, connection_id: bytes) -> Optional[_ServerConnection]:
+        connection = self._connections.get(connection_id)
+        if connection is None and connection_id in self._aliases:
+            connection = self._connections.get(self._aliases[connection_id])
+        return connection
 
     def _new_connection(self, connection_id: bytes, addr: Tuple[str, int]) -> _ServerConnection:
         collector = None
@@ -114,6 +377,10 @@ class KEMTLSQUICServer:
             self.cert,
             self.pdk_key_id,
             collector=collector,
+            crypto_executor=self.crypto_executor,
+            key_pool=self.key_pool,
+            ticket_issuer=self.ticket_issuer,
+            early_data=self.early_data if self.accepts_early_data else None,
         )
         return _ServerConnection(
             state=QUICConnectionState(connection_id=connection_id, peer_address=addr),
@@ -122,69 +389,157 @@ class KEMTLSQUICServer:
         )
 
     def _handle_packet(self, packet, addr: Tuple[str, int]) -> None:
-        connection = self._connections.get(packet.connection_id)
+        connection = self._lookup(packet.connection_id)
         if connection is None:
             if packet.packet_type != INITIAL:
                 return
-            connection = self._new_connection(packet.connection_id, addr)
-            self._connections[packet.connection_id] = connection
+            while len(self._connections) >= self.max_connections:
+                self._evict_least_recent()
+            server_connection_id = issue_connection_id(self.worker_index)
+            connection = self._new_connection(server_connection_id, addr)
+            connection.initial_connection_id = packet.connection_id
+            self._connections[server_connection_id] = connection
+            self._aliases[packet.connection_id] = server_connection_id
+            self.connections_opened += 1
+            self.max_table_size = max(self.max_table_size, len(self._connections))
+
+        connection_id = connection.state.connection_id
+        if packet.connection_id == connection_id and connection.initial_connection_id is not None:
+            # The client has switched to our connection ID; retire its initial one.
+            self._aliases.pop(connection.initial_connection_id, None)
+            connection.initial_connection_id = None
+        connection.last_activity = time.monotonic()
+        self._connections.move_to_end(connection_id)
 
         if packet.packet_type == CONNECTION_CLOSE:
-            connection.state.mark_closed()
-            self._connections.pop(packet.connection_id, None)
+            self._drop_connection(connection_id)
+            self.connections_closed += 1
             return
 
         if packet.packet_type == ACK:
             self._process_ack(connection, packet.payload)
             return
 
-        connection.state.note_received_packet(packet.packet_number)
+        payload = packet.payload
+        if packet.packet_type == APP_DATA:
+            if connection.receiver is None:
+                # Sent ahead of ClientFinished; the client retransmits it.
+                return
+            aad = build_packet_aad(
+                packet_type=APP_DATA,
+                connection_id=connection.state.connection_id,
+                packet_number=packet.packet_number,
+                epoch=packet.epoch,
+                payload_length=0,
+            )
+            payload = connection.receiver.unprotect_packet(packet.packet_number, payload, aad)
+            # Authenticated, so follow the client if its address changed (NAT rebinding).
+            connection.peer_address = connection.state.peer_address = addr
+
+        frame = decode_stream_frame(payload)
+        now = time.monotonic()
+        # Handshake packets are unauthenticated: the stream data, not the
+        # packet number, tells a retransmission from new data.
+        is_new = connection.state.note_received_packet(
+            packet.packet_number,
+            now,
+            authenticated=packet.packet_type == APP_DATA,
+        )
+        is_new = connection.state.streams.push(
+            packet.packet_type,
+            frame,
+            epoch=packet.epoch,
+            packet_number=packet.packet_number,
+        ) and is_new
+
+        # ACK at once for duplicates (our ACK was lost) and completed messages
+        # (the peer is waiting on them); otherwise let the delayed-ACK timer run.
+        message = connection.state.streams.pop()
+        if not is_new or message is not None or connection.state.ack_due(now):
+            self._send_ack(connection, epoch=packet.epoch)
+        else:
+            self._delayed_acks.add(connection.state.connection_id)
+
+        while message is not None:
+            connection.inbox.append(message)
+            message = connection.state.streams.pop()
+        self._dispatch(connection)
+
+    def _dispatch(self, connection: _ServerConnection) -> None:
+        """Start draining a connection's inbox unless a thread already is."""
+        if connection.busy or not connection.inbox:
+            return
+        connection.busy = True
+        if self._dispatcher is None:
+            self._drain_inbox(connection)
+        else:
+            self._dispatcher.submit(self._drain_inbox, connection)
+
+    def _drain_inbox(self, connection: _ServerConnection) -> None:
+        # Messages of one connection are handled in order, never concurrently.
+        while True:
+            with self._lock:
+                if not connection.inbox:
+                    connection.busy = False
+                    return
+                message = connection.inbox.popleft()
+            try:
+                with self._io.batch():
+                    self._handle_message(connection, message)
+            except Exception as exc:
+                print(f"Error handling QUIC message: {exc!r}")
+                traceback.print_exc()
+
+    def _send_server_finished(self, connection: _ServerConnection, server_finished: bytes) -> None:
+        self._send_message(connection, HANDSHAKE, server_finished, epoch=0)
+        new_session_ticket = connection.handshake.new_session_ticket()
+        if new_session_ticket is not None:
+            self._send_message(connection, HANDSHAKE, new_session_ticket, epoch=0)
+        connection.phase = "await_cf"
 
+    def _handle_message(self, connection: _ServerConnection, message: StreamMessage) -> None:
         if connection.phase == "await_initial":
-            if packet.packet_type != INITIAL:
+            if message.packet_type != INITIAL:
                 return
-            self._send_ack(connection, packet.packet_number, epoch=packet.epoch)
-            server_hello = connection.handshake.process_client_hello(packet.payload)
-            connection.cached_server_hello = server_hello
-            self._send_packet(connection, HANDSHAKE, server_hello, epoch=0, reliable=True)
-            connection.phase = "await_cke"
+            handshake = connection.handshake
+            server_hello = handshake.process_client_hello(message.payload)
+            self._send_message(connection, HANDSHAKE, server_hello, epoch=0)
+            if handshake.early_data_accepted:
+                connection.phase = "await_early_data"
+            elif handshake.resumed:
+                self._send_server_finished(connection, handshake.resumed_server_finished())
+            else:
+                connection.phase = "await_cke"
             return
 
-        if connection.phase == "await_cke":
-            if packet.packet_type != HANDSHAKE:
-                if packet.packet_type == INITIAL and connection.cached_server_hello is not None:
-                    self._send_ack(connection, packet.packet_number, epoch=packet.epoch)
-                    self._send_packet(connection, HANDSHAKE, connection.cached_server_hello, epoch=0, reliable=True)
+        if connection.phase == "await_early_data":
+            if message.packet_type != INITIAL:
                 return
-            self._send_ack(connection, packet.packet_number, epoch=packet.epoch)
-            server_finished = connection.handshake.process_client_key_exchange(packet.payload)
-            connection.cached_server_finished = server_finished
-            self._send_packet(connection, HANDSHAKE, server_finished, epoch=0, reliable=True)
-            connection.phase = "await_cf"
+            handshake = connection.handshake
+            early_request = handshake.open_early_data(message.payload)
+            self._send_server_finished(connection, handshake.resumed_server_finished())
+            # 0.5-RTT: answer with the application keys before ClientFinished.
+            session = handshake.application_session()
+            session.transport = "quic"
+            connection.sender = QUICPacketProtector(session.server_write_key, session.server_write_iv)
+            if self.early_data.allows(early_request):
+                response_bytes = call_flask_app(self.app, session, mark_early_request(early_request))
+            else:
+                response_bytes = TOO_EARLY_RESPONSE
+            self._send_message(connection, APP_DATA, response_bytes, epoch=1)
             return
 
-        if connection.phase == "await_cf":
-            if packet.packet_type != HANDSHAKE:
-                if packet.packet_type == INITIAL and connection.cached_server_hello is not None:
-                    self._send_ack(connection, packet.packet_number, epoch=packet.epoch)
-                    self._send_packet(connection, HANDSHAKE, connection.cached_server_hello, epoch=0, reliable=True)
+        if connection.phase == "await_cke":
+            if message.packet_type != HANDSHAKE:
                 return
+            server_finished = connection.handshake.process_client_key_exchange(message.payload)
+            self._send_server_finished(connection, server_finished)
+            return
 
-            message_type = None
-            try:
-                message = deserialize_message(packet.payload)
-                if isinstance(message, dict):
-                    message_type = message.get("type")
-            except Exception:
-                message_type = None
-
-            if message_type == "ClientKeyExchange" and connection.cached_server_finished is not None:
-                self._send_ack(connection, packet.packet_number, epoch=packet.epoch)
-                self._send_packet(connection, HANDSHAKE, connection.cached_server_finished, epoch=0, reliable=True)
+        if connection.phase == "await_cf":
+            if message.packet_type != HANDSHAKE:
                 return
-
-            self._send_ack(connection, packet.packet_number, epoch=packet.epoch)
-            session = connection.handshake.verify_client_finished(packet.payload)
+            session = connection.handshake.verify_client_finished(message.payload)
             session.transport = "quic"
             connection.session = session
             connection.sender = QUICPacketProtector(session.server_write_key, session.server_write_iv)
@@ -197,29 +552,23 @@ class KEMTLSQUICServer:
                     self.on_handshake_complete(collector.get_metrics())
             return
 
-        if connection.phase != "established" or packet.packet_type != APP_DATA:
+        if connection.phase != "established" or message.packet_type != APP_DATA:
             return
 
-        if connection.receiver is None:
-            return
-
-        self._send_ack(connection, packet.packet_number, epoch=packet.epoch)
-
-        aad = build_packet_aad(
-            packet_type=APP_DATA,
-            connection_id=connection.state.connection_id,
-            packet_number=packet.packet_number,
-            epoch=packet.epoch,
-            payload_length=0,
-        )
-        if packet.packet_number in connection.processed_app_packets:
-            return
-        plaintext = connection.receiver.unprotect_packet(packet.packet_number, packet.payload, aad)
-        connection.processed_app_packets.add(packet.packet_number)
+        response_bytes = call_flask_app(self.app, connection.session, message.payload)
+        self._send_message(connection, APP_DATA, response_bytes, epoch=1)
 
-        parse_http_request(plaintext)
-        response_bytes = call_flask_app(self.app, connection.session, plaintext)
-        self._send_packet(connection, APP_DATA, response_bytes, epoch=1, reliable=True)
+    def _send_message(self, connection: _ServerConnection, packet_type: int, payload: bytes, *, epoch: int) -> List[int]:
+        """Send one message as its own stream, one reliable packet per frame."""
+        max_frame_data = MAX_DATAGRAM_SIZE - packet_overhead(connection.state.connection_id) - STREAM_FRAME_OVERHEAD
+        if packet_type == APP_DATA:
+            max_frame_data -= TAG_SIZE
+        with self._lock:
+            frames = split_stream(connection.state.next_stream_id(), payload, max_frame_data)
+            return [
+                self._send_packet(connection, packet_type, encode_stream_frame(frame), epoch=epoch, reliable=True)
+                for frame in frames
+            ]
 
     def _send_packet(self, connection: _ServerConnection, packet_type: int, payload: bytes, *, epoch: int, reliable: bool) -> int:
         packet_number = connection.state.next_packet_number()
@@ -244,51 +593,136 @@ class KEMTLSQUICServer:
             payload=packet_payload,
             epoch=epoch,
         )
-        self.sock.sendto(packet_bytes, connection.peer_address)
+        self._io.send(packet_bytes, connection.peer_address)
 
         if reliable:
-            deadline = time.monotonic() + _RETRY_TIMEOUT_S
-            connection.state.schedule_retransmission(packet_number, deadline)
+            now = time.monotonic()
             connection.sent_packets[packet_number] = {
                 "bytes": packet_bytes,
-                "deadline": deadline,
+                "sent_at": now,
                 "attempts": 0,
             }
+            self._schedule_retransmission(connection, packet_number, now + connection.state.rtt.rto)
 
         return packet_number
 
-    def _send_ack(self, connection: _ServerConnection, packet_number: int, *, epoch: int) -> None:
-        ack_payload = packet_number.to_bytes(8, "big")
+    def _send_ack(self, connection: _ServerConnection, *, epoch: int) -> None:
+        """Send one ranged ACK covering everything received since the last one."""
+        ranges, ack_delay_us = connection.state.take_ack_ranges()
+        if not ranges:
+            return
+        if connection.state.pending_acks:
+            self._delayed_acks.add(connection.state.connection_id)
+        else:
+            self._delayed_acks.discard(connection.state.connection_id)
         ack_packet = encode_packet(
             packet_type=ACK,
             connection_id=connection.state.connection_id,
             packet_number=connection.state.next_packet_number(),
-            payload=ack_payload,
+            payload=encode_ack_frame(AckFrame(ranges=tuple(ranges), ack_delay_us=ack_delay_us)),
             epoch=epoch,
         )
-        self.sock.sendto(ack_packet, connection.peer_address)
+        self._io.send(ack_packet, connection.peer_address)
+
+    def _flush_delayed_acks(self) -> None:
+        if not self._delayed_acks:
+            return
+        now = time.monotonic()
+        for connection_id in list(self._delayed_acks):
+            connection = self._connections.get(connection_id)
+            if connection is None or not connection.state.pending_acks:
+                self._delayed_acks.discard(connection_id)
+                continue
+            if connection.state.ack_due(now):
+                self._send_ack(connection, epoch=1 if connection.phase == "established" else 0)
+
+    def _poll_timeout(self) -> float:
+        """Socket timeout that wakes up for the earliest delayed ACK or retransmission."""
+        deadlines = [
+            connection.state.ack_deadline
+            for connection in map(self._connections.get, self._delayed_acks)
+            if connection is not None and connection.state.ack_deadline is not None
+        ]
+        next_retransmission = self._timers.next_deadline()
+        if next_retransmission is not None:
+            deadlines.append(next_retransmission)
+        if not deadlines:
+            return _IDLE_POLL_S
+        return min(_IDLE_POLL_S, max(0.001, min(deadlines) - time.monotonic()))
 
     def _process_ack(self, connection: _ServerConnection, payload: bytes) -> None:
-        if len(payload) != 8:
+        try:
+            frame = decode_ack_frame(payload)
+        except ValueError:
             return
-        acked_packet_number = int.from_bytes(payload, "big")
-        connection.state.acknowledge_packet(acked_packet_number)
-        connection.sent_packets.pop(acked_packet_number, None)
+        now = time.monotonic()
+        for packet_number in connection.state.acknowledge_ranges(frame.ranges):
+            packet_state = connection.sent_packets.pop(packet_number, None)
+            # Karn: only never-retransmitted packets give an unambiguous RTT sample.
+            if packet_number == frame.largest and packet_state is not None and packet_state["attempts"] == 0:
+                connection.state.rtt.on_sample(now - packet_state["sent_at"], frame.ack_delay_us / 1_000_000)
+
+    def _drop_connection(self, connection_id: bytes) -> Optional[_ServerConnection]:
+        # Timers and delayed ACKs of a dropped connection are skipped lazily.
+        connection = self._connections.pop(connection_id, None)
+        self._delayed_acks.discard(connection_id)
+        if connection is not None:
+            if connection.initial_connection_id is not None:
+                self._aliases.pop(connection.initial_connection_id, None)
+            connection.state.mark_closed()
+        return connection
+
+    def _evict_idle_connections(self) -> None:
+        """Drop connections silent for ``idle_timeout``; O(evicted) thanks to LRU order."""
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._connections:
+            connection_id, connection = next(iter(self._connections.items()))
+            if connection.last_activity > cutoff:
+                return
+            self._drop_connection(connection_id)
+            self.evicted_idle += 1
+
+    def _evict_least_recent(self) -> None:
+        """Make room in a full table, telling the evicted (possibly live) peer to go away."""
+        connection_id = next(iter(self._connections))
+        connection = self._drop_connection(connection_id)
+        self.evicted_lru += 1
+        try:
+            self._io.send(
+                encode_packet(
+                    packet_type=CONNECTION_CLOSE,
+                    connection_id=connection_id,
+                    packet_number=connection.state.next_packet_number(),
+                    payload=b"evicted",
+                ),
+                connection.peer_address,
+            )
+        except OSError:
+            pass
 
     def _retransmit_expired_packets(self) -> None:
         now = time.monotonic()
-        for connection_id, connection in list(self._connections.items()):
-            if connection.state.close_state == "closed":
-                self._connections.pop(connection_id, None)
+        for deadline, connection_id, packet_number in self._timers.pop_expired(now):
+            connection = self._connections.get(connection_id)
+            if connection is None:
                 continue
+            entry = connection.state.retransmissions.get(packet_number)
+            packet_state = connection.sent_packets.get(packet_number)
+            if entry is None or packet_state is None or entry.deadline != deadline:
+                continue  # acknowledged or rescheduled since this timer was set
+            if packet_state["attempts"] >= _MAX_RETRIES:
+                connection.state.retransmissions.pop(packet_number, None)
+                connection.sent_packets.pop(packet_number, None)
+                continue
+            self._io.send(packet_state["bytes"], connection.peer_address)
+            packet_state["attempts"] += 1
+            self._schedule_retransmission(
+                connection,
+                packet_number,
+                now + connection.state.rtt.backoff(packet_state["attempts"]),
+            )
 
-            for entry in list(connection.state.expired_retransmissions(now)):
-                packet_state = connection.sent_packets.get(entry.packet_number)
-                if packet_state is None:
-                    continue
-                if packet_state["attempts"] >= _MAX_RETRIES:
-                    continue
-                self.sock.sendto(packet_state["bytes"], connection.peer_address)
-                packet_state["attempts"] += 1
-                packet_state["deadline"] = now + _RETRY_TIMEOUT_S
-                connection.state.schedule_retransmission(entry.packet_number, packet_state["deadline"])
+    def _schedule_retransmission(self, connection: _ServerConnection, packet_number: int, deadline: float) -> None:
+        connection.state.schedule_retransmission(packet_number, deadline)
+        connection.sent_packets[packet_number]["deadline"] = deadline
+        self._timers.schedule(deadline, connection.state.connection_id, packet_number)
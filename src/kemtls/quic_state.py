@@ -2,12 +2,40 @@
 
 from __future__ import annotations
 
+import bisect
+import heapq
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Set, Tuple
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ._buffer import MAX_HANDSHAKE_MESSAGE_SIZE
+from .quic_packets import HANDSHAKE, INITIAL, MAX_ACK_RANGES, AckRange, StreamFrame, ack_ranges
 
 
 PeerAddress = Tuple[str, int]
 
+_MAX_OPEN_STREAMS = 64
+_MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+# Total undelivered stream data per connection, across all open streams.
+_MAX_BUFFERED_BYTES = _MAX_MESSAGE_SIZE
+# INITIAL/HANDSHAKE frames arrive before any packet is authenticated, so they
+# get the TCP handshake-message bound and a small share of the buffer.
+_MAX_HANDSHAKE_BUFFERED_BYTES = 4 * MAX_HANDSHAKE_MESSAGE_SIZE
+_HANDSHAKE_PACKET_TYPES = frozenset({INITIAL, HANDSHAKE})
+
+# Delayed ACK: acknowledge every second packet, or after ACK_DELAY_S at most.
+ACK_DELAY_S = 0.025
+ACK_EVERY = 2
+
+# Retransmission timeout bounds; INITIAL_RTO_S applies until the first RTT sample.
+INITIAL_RTO_S = 0.25
+MIN_RTO_S = 0.05
+MAX_RTO_S = 2.0
+_TIMER_GRANULARITY_S = 0.001
+
+PACKET_WINDOW_SIZE = 1024
+
 
 @dataclass
 class RetransmissionEntry:
@@ -16,41 +44,367 @@ class RetransmissionEntry:
     attempts: int = 0
 
 
+class PacketNumberWindow:
+    """
+    Sliding-window record of recently seen packet numbers (anti-replay bitmap).
+
+    Tracks the largest packet number plus a bitmap of the ``size`` numbers
+    below it, so memory stays constant however long the connection lives.
+    Anything older than the window counts as already seen.
+    """
+
+    __slots__ = ("size", "largest", "_mask")
+
+    def __init__(self, size: int = PACKET_WINDOW_SIZE):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.largest = -1
+        self._mask = 0
+
+    def add(self, packet_number: int) -> bool:
+        """Record ``packet_number``; returns False if it was seen or is too old."""
+        if packet_number > self.largest:
+            shift = packet_number - self.largest
+            self._mask = 1 if shift >= self.size else ((self._mask << shift) | 1) & ((1 << self.size) - 1)
+            self.largest = packet_number
+            return True
+        bit = self._bit(packet_number)
+        if bit is None or self._mask & bit:
+            return False
+        self._mask |= bit
+        return True
+
+    def __contains__(self, packet_number: object) -> bool:
+        if not isinstance(packet_number, int) or packet_number > self.largest or packet_number < 0:
+            return False
+        bit = self._bit(packet_number)
+        return bit is None or bool(self._mask & bit)
+
+    def __iter__(self) -> Iterator[int]:
+        for offset in range(min(self.size, self.largest + 1)):
+            if self._mask >> offset & 1:
+                yield self.largest - offset
+
+    def __len__(self) -> int:
+        return bin(self._mask).count("1")
+
+    def _bit(self, packet_number: int) -> Optional[int]:
+        offset = self.largest - packet_number
+        return None if offset >= self.size else 1 << offset
+
+
+@dataclass
+class RttEstimator:
+    """Smoothed RTT and retransmission timeout, following RFC 9002 section 5."""
+
+    smoothed_rtt: Optional[float] = None
+    rttvar: float = 0.0
+    min_rtt: Optional[float] = None
+    latest_rtt: Optional[float] = None
+
+    def on_sample(self, rtt: float, ack_delay: float = 0.0) -> None:
+        if rtt <= 0:
+            return
+        self.latest_rtt = rtt
+        self.min_rtt = rtt if self.min_rtt is None else min(self.min_rtt, rtt)
+        # Take out the peer's ACK delay unless that would go below min_rtt.
+        adjusted = rtt - ack_delay if rtt - ack_delay >= self.min_rtt else rtt
+        if self.smoothed_rtt is None:
+            self.smoothed_rtt = adjusted
+            self.rttvar = adjusted / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.smoothed_rtt - adjusted)
+            self.smoothed_rtt = 0.875 * self.smoothed_rtt + 0.125 * adjusted
+
+    @property
+    def rto(self) -> float:
+        if self.smoothed_rtt is None:
+            return INITIAL_RTO_S
+        rto = self.smoothed_rtt + max(4 * self.rttvar, _TIMER_GRANULARITY_S) + ACK_DELAY_S
+        return min(MAX_RTO_S, max(MIN_RTO_S, rto))
+
+    def backoff(self, attempts: int) -> float:
+        """Timeout before retransmission number ``attempts + 1`` (exponential backoff)."""
+        return min(MAX_RTO_S, self.rto * (2 ** attempts))
+
+
+class RetransmissionTimer:
+    """
+    Deadline heap of ``(deadline, connection_id, packet_number)`` shared by
+    every connection on a server.
+
+    Entries are never removed early: an acknowledged or rescheduled packet
+    leaves a stale entry behind, which callers recognise because it no longer
+    matches the connection's ``RetransmissionEntry.deadline``.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, bytes, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, deadline: float, connection_id: bytes, packet_number: int) -> None:
+        heapq.heappush(self._heap, (deadline, connection_id, packet_number))
+
+    def next_deadline(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_expired(self, now: float) -> List[Tuple[float, bytes, int]]:
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            expired.append(heapq.heappop(self._heap))
+        return expired
+
+
+@dataclass(frozen=True)
+class StreamMessage:
+    """A fully reassembled stream, tagged with the packet that completed it."""
+
+    packet_type: int
+    payload: bytes
+    epoch: int
+    packet_number: int
+
+
+@dataclass
+class _PartialStream:
+    packet_type: int
+    epoch: int
+    chunks: Dict[int, bytes] = field(default_factory=dict)
+    offsets: List[int] = field(default_factory=list)
+    received: int = 0
+    final_size: Optional[int] = None
+
+
+class StreamReassembler:
+    """
+    Rebuilds messages from stream frames that may arrive out of order or twice.
+
+    Streams are delivered strictly in stream-id order, so a retransmitted
+    frame of an already delivered message is recognised and dropped.
+    Undelivered data is bounded per connection (``max_buffered_bytes``), and
+    more tightly for the unauthenticated INITIAL/HANDSHAKE packet types.
+    """
+
+    def __init__(
+        self,
+        max_open_streams: int = _MAX_OPEN_STREAMS,
+        max_message_size: int = _MAX_MESSAGE_SIZE,
+        max_buffered_bytes: int = _MAX_BUFFERED_BYTES,
+        max_handshake_message_size: int = MAX_HANDSHAKE_MESSAGE_SIZE,
+        max_handshake_buffered_bytes: int = _MAX_HANDSHAKE_BUFFERED_BYTES,
+    ):
+        self.max_open_streams = max_open_streams
+        self.max_message_size = max_message_size
+        self.max_buffered_bytes = max_buffered_bytes
+        self.max_handshake_message_size = max_handshake_message_size
+        self.max_handshake_buffered_bytes = max_handshake_buffered_bytes
+        self.next_stream_id = 0
+        self.buffered = 0
+        self.handshake_buffered = 0
+        self._streams: Dict[int, _PartialStream] = {}
+        self._ready: Deque[StreamMessage] = deque()
+
+    def push(self, packet_type: int, frame: StreamFrame, *, epoch: int = 0, packet_number: int = 0) -> bool:
+        """Buffer one frame; returns False when it duplicates data already held or delivered."""
+        if frame.stream_id < self.next_stream_id:
+            return False
+        if frame.stream_id >= self.next_stream_id + self.max_open_streams:
+            raise ValueError("too many open streams")
+
+        handshake = packet_type in _HANDSHAKE_PACKET_TYPES
+        size = len(frame.data)
+        end = frame.offset + size
+        if end > (self.max_handshake_message_size if handshake else self.max_message_size):
+            raise ValueError("stream message too large")
+
+        stream = self._streams.get(frame.stream_id)
+        if stream is not None and stream.packet_type != packet_type:
+            raise ValueError("stream packet type changed mid-stream")
+        if stream is not None and frame.offset in stream.chunks:
+            if len(stream.chunks[frame.offset]) != size:
+                raise ValueError("overlapping stream frames")
+            return False
+
+        final_size = stream.final_size if stream is not None else None
+        if frame.fin:
+            if final_size is not None and final_size != end:
+                raise ValueError("conflicting stream final size")
+            final_size = end
+        if final_size is not None and end > final_size:
+            raise ValueError("stream data beyond final size")
+
+        if stream is not None:
+            index = bisect.bisect_left(stream.offsets, frame.offset)
+            if index and stream.offsets[index - 1] + len(stream.chunks[stream.offsets[index - 1]]) > frame.offset:
+                raise ValueError("overlapping stream frames")
+            if index < len(stream.offsets) and end > stream.offsets[index]:
+                raise ValueError("overlapping stream frames")
+        if self.buffered + size > self.max_buffered_bytes:
+            raise ValueError("too much buffered stream data")
+        if handshake and self.handshake_buffered + size > self.max_handshake_buffered_bytes:
+            raise ValueError("too much buffered handshake data")
+
+        if stream is None:
+            stream = _PartialStream(packet_type=packet_type, epoch=epoch)
+            self._streams[frame.stream_id] = stream
+            index = 0
+        stream.final_size = final_size
+        stream.chunks[frame.offset] = frame.data
+        stream.offsets.insert(index, frame.offset)
+        stream.received += size
+        self.buffered += size
+        if handshake:
+            self.handshake_buffered += size
+        self._deliver(packet_number)
+        return True
+
+    def has_ready(self) -> bool:
+        return bool(self._ready)
+
+    def pop(self) -> Optional[StreamMessage]:
+        """Next complete message in stream order, if any."""
+        return self._ready.popleft() if self._ready else None
+
+    def _deliver(self, packet_number: int) -> None:
+        while True:
+            stream = self._streams.get(self.next_stream_id)
+            if stream is None or stream.final_size is None or stream.received < stream.final_size:
+                return
+
+            # Overlaps are refused on arrival, so the sorted chunks tile the stream.
+            parts = [stream.chunks[offset] for offset in stream.offsets]
+            self.buffered -= stream.received
+            if stream.packet_type in _HANDSHAKE_PACKET_TYPES:
+                self.handshake_buffered -= stream.received
+
+            del self._streams[self.next_stream_id]
+            self.next_stream_id += 1
+            self._ready.append(
+                StreamMessage(
+                    packet_type=stream.packet_type,
+                    payload=b"".join(parts),
+                    epoch=stream.epoch,
+                    packet_number=packet_number,
+                )
+            )
+
+
 @dataclass
 class QUICConnectionState:
     connection_id: bytes
     peer_address: Optional[PeerAddress] = None
     send_packet_number: int = 0
     recv_packet_number: int = -1
-    acked_packets: Set[int] = field(default_factory=set)
-    received_packets: Set[int] = field(default_factory=set)
+    acked_packets: PacketNumberWindow = field(default_factory=PacketNumberWindow)
+    received_packets: PacketNumberWindow = field(default_factory=PacketNumberWindow)
     pending_acks: Set[int] = field(default_factory=set)
     retransmissions: Dict[int, RetransmissionEntry] = field(default_factory=dict)
     handshake_epoch: int = 0
     close_state: str = "open"
+    send_stream_id: int = 0
+    streams: StreamReassembler = field(default_factory=StreamReassembler)
+    ack_deadline: Optional[float] = None
+    first_pending_ack_at: Optional[float] = None
+    rtt: RttEstimator = field(default_factory=RttEstimator)
 
     def next_packet_number(self) -> int:
         packet_number = self.send_packet_number
         self.send_packet_number += 1
         return packet_number
 
-    def note_received_packet(self, packet_number: int) -> None:
+    def next_stream_id(self) -> int:
+        stream_id = self.send_stream_id
+        self.send_stream_id += 1
+        return stream_id
+
+    def note_received_packet(
+        self,
+        packet_number: int,
+        now: Optional[float] = None,
+        *,
+        authenticated: bool = True,
+    ) -> bool:
+        """
+        Record an ack-eliciting packet; returns False if it was seen before.
+
+        INITIAL and HANDSHAKE packets are not AEAD-protected, so they are
+        passed with ``authenticated=False``: they are acknowledged but never
+        advance the duplicate window, or a spoofed high packet number would
+        make the genuine packets look too old.
+        """
         if not isinstance(packet_number, int):
             raise TypeError("packet_number must be an integer")
         if packet_number < 0:
             raise ValueError("packet_number must be non-negative")
 
-        self.received_packets.add(packet_number)
+        if authenticated:
+            is_new = self.received_packets.add(packet_number)
+            if packet_number > self.recv_packet_number:
+                self.recv_packet_number = packet_number
+        else:
+            is_new = packet_number not in self.received_packets
         self.pending_acks.add(packet_number)
-        if packet_number > self.recv_packet_number:
-            self.recv_packet_number = packet_number
+        if self.ack_deadline is None:
+            now = time.monotonic() if now is None else now
+            self.first_pending_ack_at = now
+            self.ack_deadline = now + ACK_DELAY_S
+        return is_new
+
+    def ack_due(self, now: float) -> bool:
+        """True once enough packets are waiting or the delayed-ACK timer expired."""
+        if not self.pending_acks:
+            return False
+        return len(self.pending_acks) >= ACK_EVERY or (
+            self.ack_deadline is not None and self.ack_deadline <= now
+        )
+
+    def take_ack_ranges(self, now: Optional[float] = None) -> Tuple[List[AckRange], int]:
+        """
+        Drain pending ACKs into ranges for one ACK frame.
+
+        Returns ``(ranges, ack_delay_us)``. Ranges beyond ``MAX_ACK_RANGES``
+        (the oldest packets) stay pending for the next frame.
+        """
+        ranges = ack_ranges(self.pending_acks)[:MAX_ACK_RANGES]
+        for low, high in ranges:
+            if high - low + 1 >= len(self.pending_acks):
+                self.pending_acks.clear()
+                break
+            for packet_number in range(low, high + 1):
+                self.pending_acks.discard(packet_number)
+
+        now = time.monotonic() if now is None else now
+        delay = 0.0 if self.first_pending_ack_at is None else max(0.0, now - self.first_pending_ack_at)
+        if self.pending_acks:
+            self.first_pending_ack_at = now
+            self.ack_deadline = now
+        else:
+            self.first_pending_ack_at = None
+            self.ack_deadline = None
+        return ranges, round(delay * 1_000_000)
 
     def acknowledge_packet(self, packet_number: int) -> bool:
         if packet_number in self.retransmissions:
             del self.retransmissions[packet_number]
-        already_acked = packet_number in self.acked_packets
-        self.acked_packets.add(packet_number)
-        return not already_acked
+        return self.acked_packets.add(packet_number)
+
+    def acknowledge_ranges(self, ranges: Iterable[AckRange]) -> List[int]:
+        """Retire every in-flight packet covered by ``ranges``; returns the packet numbers retired."""
+        retired: List[int] = []
+        for low, high in ranges:
+            if high - low + 1 <= len(self.retransmissions):
+                candidates = [n for n in range(low, high + 1) if n in self.retransmissions]
+            else:
+                candidates = [n for n in self.retransmissions if low <= n <= high]
+            for packet_number in candidates:
+                del self.retransmissions[packet_number]
+            retired.extend(candidates)
+        for packet_number in sorted(retired):
+            self.acked_packets.add(packet_number)
+        return retired
 
     def schedule_retransmission(self, packet_number: int, deadline: float) -> None:
         if not isinstance(packet_number, int):
@@ -85,4 +439,14 @@ class QUICConnectionState:
         self.close_state = "closed"
 
 
-__all__ = ["PeerAddress", "QUICConnectionState", "RetransmissionEntry"]
+__all__ = [
+    "PACKET_WINDOW_SIZE",
+    "PacketNumberWindow",
+    "PeerAddress",
+    "QUICConnectionState",
+    "RetransmissionEntry",
+    "RetransmissionTimer",
+    "RttEstimator",
+    "StreamMessage",
+    "StreamReassembler",
+]
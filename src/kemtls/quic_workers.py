@@ -0,0 +1,67 @@
+"""
+Connection-ID routing for the multi-process QUIC-style server.
+
+Each worker process binds the public port with ``SO_REUSEPORT``; the kernel
+spreads datagrams by 4-tuple hash. Server-issued connection IDs carry the
+owning worker's index in their first byte, so a worker that receives a
+datagram for a connection it does not own (after a client rebinds its port,
+or when the worker set changes) forwards it over a private loopback socket to
+the right worker, wrapped with the original peer address.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import struct
+from typing import Optional, Tuple
+
+
+SERVER_CONNECTION_ID_LEN = 8
+MAX_WORKERS = 256
+
+_FORWARD_MAGIC = b"KQFW"
+_FORWARD_HEADER = struct.Struct(">4s4sH")
+
+
+def reuse_port_supported() -> bool:
+    return hasattr(socket, "SO_REUSEPORT")
+
+
+def issue_connection_id(worker_index: int) -> bytes:
+    """Random server connection ID whose first byte names the owning worker."""
+    if not 0 <= worker_index < MAX_WORKERS:
+        raise ValueError(f"worker_index must be in [0, {MAX_WORKERS})")
+    return bytes((worker_index,)) + os.urandom(SERVER_CONNECTION_ID_LEN - 1)
+
+
+def connection_id_worker(connection_id: bytes) -> Optional[int]:
+    """Worker index encoded in a server-issued connection ID, if it is one."""
+    if len(connection_id) != SERVER_CONNECTION_ID_LEN:
+        return None
+    return connection_id[0]
+
+
+def wrap_forwarded(peer_address: Tuple[str, int], datagram: bytes) -> bytes:
+    host, port = peer_address
+    return _FORWARD_HEADER.pack(_FORWARD_MAGIC, socket.inet_aton(host), port) + datagram
+
+
+def unwrap_forwarded(data: bytes) -> Tuple[Tuple[str, int], bytes]:
+    if len(data) < _FORWARD_HEADER.size:
+        raise ValueError("forwarded datagram too short")
+    magic, host, port = _FORWARD_HEADER.unpack_from(data)
+    if magic != _FORWARD_MAGIC:
+        raise ValueError("not a forwarded datagram")
+    return (socket.inet_ntoa(host), port), data[_FORWARD_HEADER.size:]
+
+
+__all__ = [
+    "MAX_WORKERS",
+    "SERVER_CONNECTION_ID_LEN",
+    "connection_id_worker",
+    "issue_connection_id",
+    "reuse_port_supported",
+    "unwrap_forwarded",
+    "wrap_forwarded",
+]
@@ -3,27 +3,49 @@ KEMTLS Record Layer
 
 Provides secure framing and authenticated encryption (AEAD) for KEMTLS traffic.
 Wire format: seq_number(8) | length(4) | ciphertext
+
+The top bit of the length field marks a fragment with more to follow, so one
+application message can span several bounded records. Inbound records longer
+than ``max_fragment_size + TAG_SIZE`` are rejected, and a reassembled message
+may not exceed ``max_message_size``.
 """
 
 from __future__ import annotations
 
 import struct
 from socket import socket
-from typing import Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
 from crypto.aead import TAG_SIZE, open_, seal, xor_iv_with_seq
 from rust_ext import record_layer as rust_record_layer
 
+from ._buffer import SocketReader, send_buffers
 from .session import KEMTLSSession
 
 
+RECORD_HEADER_SIZE = 12
+MAX_FRAGMENT_SIZE = 16 * 1024
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+COALESCE_LIMIT = 64 * 1024
+
+_MORE_FRAGMENTS = 0x8000_0000
+_LENGTH_MASK = _MORE_FRAGMENTS - 1
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def has_more_fragments(header: BytesLike) -> bool:
+    """True when a record header marks a fragment that is not the last one."""
+    return bool(header[8] & 0x80)
+
+
 def protect(key: bytes, iv: bytes, seq: int, plaintext: bytes, aad: bytes) -> bytes:
     """Encrypt a payload for a given sequence number and authenticated context."""
     nonce = xor_iv_with_seq(iv, seq)
     return seal(key, nonce, plaintext, aad)
 
 
-def unprotect(key: bytes, iv: bytes, seq: int, ciphertext: bytes, aad: bytes) -> bytes:
+def unprotect(key: bytes, iv: bytes, seq: int, ciphertext: BytesLike, aad: BytesLike) -> bytes:
     """Decrypt a payload for a given sequence number and authenticated context."""
     nonce = xor_iv_with_seq(iv, seq)
     return open_(key, nonce, ciphertext, aad)
@@ -39,7 +61,7 @@ class AEADPacketProtection:
     def protect(self, seq: int, plaintext: bytes, aad: bytes) -> bytes:
         return protect(self.key, self.iv, seq, plaintext, aad)
 
-    def unprotect(self, seq: int, ciphertext: bytes, aad: bytes) -> bytes:
+    def unprotect(self, seq: int, ciphertext: BytesLike, aad: BytesLike) -> bytes:
         return unprotect(self.key, self.iv, seq, ciphertext, aad)
 
 
@@ -65,10 +87,26 @@ class KEMTLSRecordLayer:
     Manages the encryption, decryption, and framing of KEMTLS TCP records.
     """
 
-    def __init__(self, session: KEMTLSSession, sock: socket, is_client: bool):
+    def __init__(
+        self,
+        session: KEMTLSSession,
+        sock: socket,
+        is_client: bool,
+        reader: Optional[SocketReader] = None,
+        max_fragment_size: int = MAX_FRAGMENT_SIZE,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+    ):
+        if not 0 < max_fragment_size <= _LENGTH_MASK - TAG_SIZE:
+            raise ValueError("max_fragment_size out of range")
+        if max_message_size < 0:
+            raise ValueError("max_message_size out of range")
         self.session = session
+        self.max_fragment_size = max_fragment_size
+        self.max_message_size = max_message_size
         self.sock = sock
         self.is_client = is_client
+        # Shared with the handshake when given, since it may have read ahead.
+        self.reader = reader if reader is not None or sock is None else SocketReader(sock)
 
         # Sequence numbers
         self.send_seq = 0
@@ -92,58 +130,123 @@ class KEMTLSRecordLayer:
     def protect(self, seq: int, plaintext: bytes, aad: bytes) -> bytes:
         return self.sender.protect(seq, plaintext, aad)
 
-    def unprotect(self, seq: int, ciphertext: bytes, aad: bytes) -> bytes:
+    def unprotect(self, seq: int, ciphertext: BytesLike, aad: BytesLike) -> bytes:
         return self.receiver.unprotect(seq, ciphertext, aad)
 
-    def send_record(self, plaintext: bytes):
-        """Encrypt and send a TCP record."""
+    def seal_fragments(self, plaintext: BytesLike) -> Iterator[Tuple[bytes, bytes]]:
+        """
+        Protect one application message as ``(header, ciphertext)`` records.
+
+        Messages larger than ``max_fragment_size`` are split; every record but
+        the last carries the more-fragments bit. Records are sealed lazily, so
+        a caller that writes as it iterates holds one fragment at a time.
+        """
+        view = memoryview(plaintext)
+        size = self.max_fragment_size
+        offset = 0
+        while True:
+            end = offset + size
+            more = end < len(view)
+            yield self._seal_fragment(view[offset:end], more=more)
+            if not more:
+                return
+            offset = end
+
+    def _seal_fragment(self, plaintext: BytesLike, *, more: bool) -> Tuple[bytes, bytes]:
         if self.send_seq >= 1 << 64:
             raise OverflowError("Sequence number overflow")
 
-        ciphertext_len = len(plaintext) + TAG_SIZE
-        header = struct.pack(">QI", self.send_seq, ciphertext_len)
+        length = len(plaintext) + TAG_SIZE
+        header = struct.pack(">QI", self.send_seq, length | (_MORE_FRAGMENTS if more else 0))
         ciphertext = self.protect(self.send_seq, plaintext, header)
-        framed = frame_tcp_record(self.send_seq, ciphertext)
 
-        self.sock.sendall(framed)
         self.send_seq += 1
+        return header, ciphertext
 
-    def recv_record(self) -> bytes:
-        """Receive and decrypt a TCP record."""
-        header = self._read_n_bytes(12)
+    def parse_record_header(self, header: BytesLike) -> int:
+        """Validate an inbound record header and return the ciphertext length."""
         seq = int.from_bytes(header[:8], "big")
-        length = int.from_bytes(header[8:12], "big")
+        length = int.from_bytes(header[8:RECORD_HEADER_SIZE], "big") & _LENGTH_MASK
 
         if seq != self.recv_seq:
             raise ValueError(f"Sequence mismatch: expected {self.recv_seq}, got {seq}")
+        if length > self.max_fragment_size + TAG_SIZE:
+            raise ValueError(f"record too large: {length} bytes")
+        return length
 
-        ciphertext = self._read_n_bytes(length)
-        parsed_seq, payload = parse_tcp_record(header + ciphertext)
-        if parsed_seq != seq:
-            raise ValueError("record framing parse mismatch")
-
-        plaintext = self.unprotect(self.recv_seq, payload, header)
+    def check_message_size(self, received: int) -> None:
+        """Reject a message whose reassembled plaintext has grown past the limit."""
+        if received > self.max_message_size:
+            raise ValueError(f"message exceeds {self.max_message_size} bytes")
 
-        self.recv_seq += 1
-        return plaintext
+    def open_record(self, header: BytesLike, ciphertext: BytesLike) -> bytes:
+        """
+        Authenticate and decrypt one inbound record body for a validated header.
 
-    def _read_n_bytes(self, n: int) -> bytes:
-        """Helper to read exactly n bytes from the socket."""
-        data = b""
-        while len(data) < n:
-            chunk = self.sock.recv(n - len(data))
-            if not chunk:
-                raise EOFError("Connection closed by peer")
-            data += chunk
-        return data
+        ``ciphertext`` may be a view into the receive buffer; it is decrypted
+        in place of a copy.
+        """
+        length = int.from_bytes(header[8:RECORD_HEADER_SIZE], "big") & _LENGTH_MASK
+        if len(header) != RECORD_HEADER_SIZE or len(ciphertext) != length:
+            raise ValueError("invalid record length")
 
+        plaintext = self.unprotect(self.recv_seq, ciphertext, bytes(header))
 
-def for_client(session: KEMTLSSession, sock: socket) -> KEMTLSRecordLayer:
-    return KEMTLSRecordLayer(session, sock, True)
+        self.recv_seq += 1
+        return plaintext
 
+    def send_record(self, plaintext: bytes):
+        """Encrypt and send one application message, fragmenting it if large."""
+        self.send_records((plaintext,))
+
+    def send_records(self, messages: Iterable[BytesLike]) -> None:
+        """
+        Encrypt and send several application messages.
+
+        Headers and ciphertexts go to ``sendmsg`` as separate buffers; small
+        records are coalesced into one write of up to ``COALESCE_LIMIT`` bytes.
+        """
+        pending: List[bytes] = []
+        pending_bytes = 0
+        for message in messages:
+            for header, ciphertext in self.seal_fragments(message):
+                pending.append(header)
+                pending.append(ciphertext)
+                pending_bytes += RECORD_HEADER_SIZE + len(ciphertext)
+                if pending_bytes >= COALESCE_LIMIT:
+                    send_buffers(self.sock, pending)
+                    pending = []
+                    pending_bytes = 0
+        if pending:
+            send_buffers(self.sock, pending)
 
-def for_server(session: KEMTLSSession, sock: socket) -> KEMTLSRecordLayer:
-    return KEMTLSRecordLayer(session, sock, False)
+    def recv_record(self) -> bytes:
+        """Receive and decrypt one application message, reassembling fragments."""
+        if self.reader is None:
+            raise RuntimeError("record layer has no socket to read from")
+        fragments: List[bytes] = []
+        received = 0
+        while True:
+            length = self.parse_record_header(self.reader.peek(RECORD_HEADER_SIZE))
+            record = self.reader.read(RECORD_HEADER_SIZE + length)
+            header = record[:RECORD_HEADER_SIZE]
+            more = has_more_fragments(header)
+            plaintext = self.open_record(header, record[RECORD_HEADER_SIZE:])
+            received += len(plaintext)
+            self.check_message_size(received)
+            if not more and not fragments:
+                return plaintext
+            fragments.append(plaintext)
+            if not more:
+                return b"".join(fragments)
+
+
+def for_client(session: KEMTLSSession, sock: socket, reader: Optional[SocketReader] = None) -> KEMTLSRecordLayer:
+    return KEMTLSRecordLayer(session, sock, True, reader=reader)
+
+
+def for_server(session: KEMTLSSession, sock: socket, reader: Optional[SocketReader] = None) -> KEMTLSRecordLayer:
+    return KEMTLSRecordLayer(session, sock, False, reader=reader)
 
 
 def _frame_record_python(seq: int, payload: bytes) -> bytes:
@@ -0,0 +1,185 @@
+"""
+Session resumption tickets for KEMTLS.
+
+After a full handshake the server may hand the client a ticket: the server's
+own encrypted record of a resumption secret derived from the session's
+``exporter_secret``. A later ClientHello that presents the ticket, with a
+binder MAC proving knowledge of the secret, lets the server skip the
+ephemeral keygen, both KEM operations and the certificate check. The PSK
+seeds the handshake secret, so the connection costs one HKDF chain and one
+round trip.
+
+A resumed session still derives a fresh exporter secret, because its
+transcript carries new randoms. OIDC binding IDs therefore never carry over
+from the connection that issued the ticket.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from crypto.aead import KEY_SIZE, NONCE_SIZE, open_, seal
+from crypto.key_schedule import HASH_LEN, derive_handshake_secret, hkdf_expand_label
+from utils.encoding import base64url_decode
+from utils.serialization import deserialize_message, serialize_message
+
+
+RESUMPTION_MODE = "psk_ke"
+TICKET_LIFETIME_S = 3600
+TICKET_NONCE_LEN = 16
+
+_KEY_ID_LEN = 4
+_DEFAULT_CACHE_ENTRIES = 256
+
+
+def derive_resumption_secret(exporter_secret: bytes, ticket_nonce: bytes) -> bytes:
+    """Per-ticket resumption secret, bound to the issuing session's exporter secret."""
+    return hkdf_expand_label(exporter_secret, b"resumption", ticket_nonce, HASH_LEN)
+
+
+def derive_psk_handshake_secret(resumption_secret: bytes) -> bytes:
+    """Handshake secret for a resumed connection, in place of the KEM shared secrets."""
+    return derive_handshake_secret([hkdf_expand_label(resumption_secret, b"psk", b"", HASH_LEN)])
+
+
+def compute_binder(resumption_secret: bytes, client_hello: Dict[str, Any]) -> bytes:
+    """MAC over the canonical ClientHello without its binder field."""
+    binder_key = hkdf_expand_label(resumption_secret, b"res binder", b"", HASH_LEN)
+    unbound = {name: value for name, value in client_hello.items() if name != "psk_binder"}
+    return hmac.new(binder_key, hashlib.sha256(serialize_message(unbound)).digest(), hashlib.sha256).digest()
+
+
+@dataclass
+class ResumptionTicket:
+    """A ticket as the client keeps it: the opaque blob plus the secret it stands for."""
+
+    ticket: bytes
+    resumption_secret: bytes
+    server_identity: str
+    expires_at: float
+
+    def is_valid(self, now: Optional[float] = None) -> bool:
+        return (time.time() if now is None else now) < self.expires_at
+
+
+class TicketCache:
+    """
+    Client-side ticket store keyed by ``(host, port, identity)``.
+
+    Tickets are single-use: ``take`` removes the ticket it returns, and the
+    server issues a replacement on every handshake that asks for one.
+    """
+
+    def __init__(self, max_entries: int = _DEFAULT_CACHE_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._tickets: "OrderedDict[Tuple[str, int, str], ResumptionTicket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, host: str, port: int, identity: str, ticket: ResumptionTicket) -> None:
+        key = (host, port, identity)
+        with self._lock:
+            self._tickets[key] = ticket
+            self._tickets.move_to_end(key)
+            while len(self._tickets) > self.max_entries:
+                self._tickets.popitem(last=False)
+
+    def take(self, host: str, port: int, identity: str) -> Optional[ResumptionTicket]:
+        with self._lock:
+            ticket = self._tickets.pop((host, port, identity), None)
+            if ticket is None or not ticket.is_valid():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return ticket
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tickets.clear()
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"entries": len(self._tickets), "hits": self.hits, "misses": self.misses}
+
+
+class TicketIssuer:
+    """
+    Server-side ticket sealing.
+
+    A ticket is ``key_id(4) | nonce(12) | ChaCha20-Poly1305(state)``; the
+    server keeps no per-ticket state. ``rotate`` starts a new key and keeps
+    the previous one so outstanding tickets stay valid for one more period.
+    """
+
+    def __init__(self, lifetime_s: int = TICKET_LIFETIME_S):
+        if lifetime_s <= 0:
+            raise ValueError("lifetime_s must be positive")
+        self.lifetime_s = lifetime_s
+        self._keys: Dict[bytes, bytes] = {}
+        self._current_key_id = b""
+        self.rotate()
+
+    def rotate(self) -> None:
+        previous = self._keys.get(self._current_key_id)
+        key_id = os.urandom(_KEY_ID_LEN)
+        self._keys = {key_id: os.urandom(KEY_SIZE)}
+        if previous is not None:
+            self._keys[self._current_key_id] = previous
+        self._current_key_id = key_id
+
+    def issue(self, *, resumption_secret: bytes, server_identity: str, handshake_mode: str) -> bytes:
+        state = serialize_message(
+            {
+                "secret": resumption_secret,
+                "identity": server_identity,
+                "mode": handshake_mode,
+                "expires_at": int(time.time()) + self.lifetime_s,
+            }
+        )
+        nonce = os.urandom(NONCE_SIZE)
+        key_id = self._current_key_id
+        return key_id + nonce + seal(self._keys[key_id], nonce, state, key_id)
+
+    def open(self, ticket: bytes) -> Optional[Dict[str, Any]]:
+        """Return the ticket's state, or None if it is forged, foreign or expired."""
+        header = _KEY_ID_LEN + NONCE_SIZE
+        if not isinstance(ticket, bytes) or len(ticket) <= header:
+            return None
+        key_id, nonce = ticket[:_KEY_ID_LEN], ticket[_KEY_ID_LEN:header]
+        key = self._keys.get(key_id)
+        if key is None:
+            return None
+        try:
+            state = deserialize_message(open_(key, nonce, ticket[header:], key_id))
+            secret = base64url_decode(state["secret"])
+            expires_at = int(state["expires_at"])
+        except Exception:
+            return None
+        if time.time() >= expires_at or len(secret) != HASH_LEN:
+            return None
+        return {**state, "secret": secret}
+
+
+__all__ = [
+    "RESUMPTION_MODE",
+    "TICKET_LIFETIME_S",
+    "TICKET_NONCE_LEN",
+    "ResumptionTicket",
+    "TicketCache",
+    "TicketIssuer",
+    "compute_binder",
+    "derive_psk_handshake_secret",
+    "derive_resumption_secret",
+]
@@ -28,3 +28,4 @@ class KEMTLSSession:
 
     transport: Optional[str] = None
     alpn: Optional[str] = None
+    resumed: bool = False
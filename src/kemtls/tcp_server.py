@@ -14,6 +14,12 @@ from typing import Any, Dict, Optional
 
 from flask import Flask
 
+from crypto.executor import CryptoExecutor
+
+from ._http_bridge import call_flask_app
+from .early_data import EarlyDataPolicy
+from .keypool import EphemeralKeyPool
+from .resumption import TicketIssuer
 from .tcp_transport import KEMTLSTCPServerConnection, handle_application_session
 
 
@@ -31,6 +37,11 @@ class KEMTLSTCPServer:
         pdk_key_id: Optional[str] = None,
         host: str = "0.0.0.0",
         port: int = 4433,
+        backlog: int = 128,
+        crypto_executor: Optional[CryptoExecutor] = None,
+        key_pool: Optional[EphemeralKeyPool] = None,
+        ticket_issuer: Optional[TicketIssuer] = None,
+        early_data: Optional[EarlyDataPolicy] = None,
     ):
         self.app = app
         self.server_identity = server_identity
@@ -39,6 +50,12 @@ class KEMTLSTCPServer:
         self.pdk_key_id = pdk_key_id
         self.host = host
         self.port = port
+        self.backlog = backlog
+        self.crypto_executor = crypto_executor
+        self._owns_key_pool = key_pool is None
+        self.key_pool = key_pool if key_pool is not None else EphemeralKeyPool()
+        self.ticket_issuer = ticket_issuer if ticket_issuer is not None else TicketIssuer()
+        self.early_data = early_data if early_data is not None else EarlyDataPolicy()
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.sock.settimeout(1.0)
@@ -51,11 +68,14 @@ class KEMTLSTCPServer:
             self.sock.close()
         except OSError:
             pass
+        if self._owns_key_pool:
+            self.key_pool.close()
 
     def start(self):
         """Start the TCP accept loop."""
         self.sock.bind((self.host, self.port))
-        self.sock.listen(5)
+        self.sock.listen(self.backlog)
+        self.key_pool.start()
         print(f"KEMTLS Server listening on {self.host}:{self.port}")
         previous_sigint = None
         previous_sigterm = None
@@ -115,6 +135,11 @@ class KEMTLSTCPServer:
                 cert=self.cert,
                 pdk_key_id=self.pdk_key_id,
                 collector=collector,
+                crypto_executor=self.crypto_executor,
+                key_pool=self.key_pool,
+                ticket_issuer=self.ticket_issuer,
+                early_data=self.early_data,
+                early_data_handler=lambda session, raw_request: call_flask_app(self.app, session, raw_request),
             )
 
             if collector:
@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
+import select
 import socket
-from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
-
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from crypto.executor import CryptoExecutor
+
+from ._buffer import SocketReader, handshake_message_length
+from .early_data import (
+    TOO_EARLY_RESPONSE,
+    EarlyDataPolicy,
+    early_data_eligible,
+    is_too_early,
+    mark_early_request,
+)
 from .handshake import ClientHandshake, ServerHandshake
+from .keypool import EphemeralKeyPool
 from .record_layer import for_client, for_server
+from .resumption import TicketCache, TicketIssuer
 from .transport import KEMTLSTransport
 
 if TYPE_CHECKING:
@@ -17,24 +30,35 @@ def handle_application_session(
     app: "Flask",
     transport: "KEMTLSTCPServerConnection",
 ) -> None:
-    """Process one or more decrypted HTTP requests on an established session."""
-    from ._http_bridge import call_flask_app, parse_http_request
+    """
+    Process decrypted HTTP requests on an established session.
+
+    Requests are framed across records, so a client may pipeline them; the
+    responses to everything one record completed go out in a single flush,
+    in request order.
+    """
+    from ._http_bridge import HTTPRequestFramer, dispatch_request, wants_close
 
     if transport.session is None:
         raise RuntimeError("transport session has not been established")
 
+    framer = HTTPRequestFramer()
     while True:
         try:
-            raw_request = transport.recv_application()
+            record = transport.recv_application()
         except EOFError:
             break
 
-        request_map = parse_http_request(raw_request)
-        response_bytes = call_flask_app(app, transport.session, raw_request)
-        transport.send_application(response_bytes)
-
-        connection_header = str(request_map.get("headers", {}).get("connection", "")).lower()
-        if connection_header == "close":
+        responses = []
+        close = False
+        for request_map in framer.feed(record):
+            responses.append(dispatch_request(app, transport.session, request_map))
+            if wants_close(request_map):
+                close = True
+                break
+        if responses:
+            transport.send_applications(responses)
+        if close:
             break
 
 
@@ -48,6 +72,9 @@ class KEMTLSTCPClientTransport(KEMTLSTransport):
         pdk_store=None,
         mode: str = "auto",
         collector: Optional[Any] = None,
+        handshake_versions: Optional[List[str]] = None,
+        ticket_cache: Optional[TicketCache] = None,
+        early_data: bool = False,
     ):
         super().__init__()
         self.expected_identity = expected_identity
@@ -55,38 +82,63 @@ class KEMTLSTCPClientTransport(KEMTLSTransport):
         self.pdk_store = pdk_store
         self.mode = mode
         self.collector = collector
+        self.handshake_versions = handshake_versions
+        self.ticket_cache = ticket_cache
+        self.early_data = early_data
+        self.early_response: Optional[bytes] = None
         self.sock: Optional[socket.socket] = None
+        self.reader: Optional[SocketReader] = None
         self.record_layer = None
         self.connected_host: Optional[str] = None
         self.connected_port: Optional[int] = None
 
-    def connect(self, host: str, port: int) -> None:
+    def connect(self, host: str, port: int, early_data: Optional[bytes] = None) -> None:
+        """
+        Handshake with ``host:port``. ``early_data`` is a request to send as
+        0-RTT data if a ticket allows it; when the server answers it, the
+        response is left in ``early_response``.
+        """
+        self.early_response = None
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.connect((host, port))
 
         if self.collector:
             self.collector.start_hct()
 
+        ticket = None
+        if self.ticket_cache is not None:
+            ticket = self.ticket_cache.take(host, port, self.expected_identity)
+
         handshake = ClientHandshake(
             self.expected_identity,
             self.ca_pk,
             self.pdk_store,
             self.mode,
             collector=self.collector,
+            versions=self.handshake_versions,
+            ticket=ticket,
+            request_ticket=self.ticket_cache is not None,
+            early_data=early_data is not None,
         )
 
         client_hello = handshake.client_hello()
         self.send_handshake(client_hello, sock=sock)
+        if handshake.early_data_offered:
+            self.send_handshake(handshake.seal_early_data(early_data), sock=sock)
 
         server_hello = self.recv_handshake(sock=sock)
         if self.collector and hasattr(self.collector, "record_ttfb"):
             self.collector.record_ttfb()
 
         client_key_exchange, session = handshake.process_server_hello(server_hello)
-        self.send_handshake(client_key_exchange, sock=sock)
+        if client_key_exchange is not None:
+            self.send_handshake(client_key_exchange, sock=sock)
 
         server_finished = self.recv_handshake(sock=sock)
         session = handshake.process_server_finished(server_finished, session)
+        if handshake.expects_ticket:
+            new_ticket = handshake.process_new_session_ticket(self.recv_handshake(sock=sock))
+            self.ticket_cache.put(host, port, self.expected_identity, new_ticket)
 
         client_finished = handshake.client_finished()
         self.send_handshake(client_finished, sock=sock)
@@ -94,9 +146,11 @@ class KEMTLSTCPClientTransport(KEMTLSTransport):
         session.transport = "tcp"
         self.session = session
         self.sock = sock
-        self.record_layer = for_client(session, sock)
+        self.record_layer = for_client(session, sock, reader=self._reader_for(sock))
         self.connected_host = host
         self.connected_port = port
+        if handshake.early_data_accepted:
+            self.early_response = self.recv_application()
 
         if self.collector:
             self.collector.end_hct()
@@ -117,13 +171,10 @@ class KEMTLSTCPClientTransport(KEMTLSTransport):
         target = sock or self.sock
         if target is None:
             raise RuntimeError("TCP transport is not connected")
-        header = self._read_n_bytes(target, 4, eof_message="Socket closed during handshake")
-        length = int.from_bytes(header, "big")
-        return self._read_n_bytes(
-            target,
-            length,
-            eof_message="Socket closed during handshake data read",
-        )
+        reader = self._reader_for(target)
+        header = reader.read(4, eof_message="Socket closed during handshake")
+        length = handshake_message_length(header)
+        return reader.read_bytes(length, eof_message="Socket closed during handshake data read")
 
     def send_application(self, payload: bytes) -> None:
         if self.record_layer is None:
@@ -142,6 +193,7 @@ class KEMTLSTCPClientTransport(KEMTLSTransport):
             except OSError:
                 pass
         self.sock = None
+        self.reader = None
         self.record_layer = None
         self.connected_host = None
         self.connected_port = None
@@ -154,15 +206,26 @@ class KEMTLSTCPClientTransport(KEMTLSTransport):
             and self.connected_port == port
         )
 
-    @staticmethod
-    def _read_n_bytes(target: socket.socket, n: int, *, eof_message: str) -> bytes:
-        data = b""
-        while len(data) < n:
-            chunk = target.recv(n - len(data))
-            if not chunk:
-                raise EOFError(eof_message)
-            data += chunk
-        return data
+    def is_alive(self) -> bool:
+        """
+        True if the connection is established and idle: between requests the
+        peer sends nothing, so a readable socket means EOF, a reset or stray bytes.
+        """
+        if self.sock is None or self.record_layer is None:
+            return False
+        if self.reader is not None and self.reader.buffered:
+            return False
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+
+    def _reader_for(self, target: socket.socket) -> SocketReader:
+        # One read-ahead buffer per socket, shared by handshake and records.
+        if self.reader is None or self.reader.sock is not target:
+            self.reader = SocketReader(target)
+        return self.reader
 
 
 class KEMTLSTCPServerConnection(KEMTLSTransport):
@@ -171,6 +234,7 @@ class KEMTLSTCPServerConnection(KEMTLSTransport):
     def __init__(self, sock: socket.socket):
         super().__init__()
         self.sock = sock
+        self.reader = SocketReader(sock)
         self.record_layer = None
 
     def connect(self, *args, **kwargs):
@@ -184,15 +248,21 @@ class KEMTLSTCPServerConnection(KEMTLSTransport):
         self.sock.sendall(header + payload)
 
     def recv_handshake(self) -> bytes:
-        header = self._read_n_bytes(4, eof_message="Socket closed during handshake")
-        length = int.from_bytes(header, "big")
-        return self._read_n_bytes(length, eof_message="Socket closed during handshake data read")
+        header = self.reader.read(4, eof_message="Socket closed during handshake")
+        length = handshake_message_length(header)
+        return self.reader.read_bytes(length, eof_message="Socket closed during handshake data read")
 
     def send_application(self, payload: bytes) -> None:
         if self.record_layer is None:
             raise RuntimeError("No active record layer")
         self.record_layer.send_record(payload)
 
+    def send_applications(self, payloads: List[bytes]) -> None:
+        """Send several application messages, one record each, in one flush."""
+        if self.record_layer is None:
+            raise RuntimeError("No active record layer")
+        self.record_layer.send_records(payloads)
+
     def recv_application(self) -> bytes:
         if self.record_layer is None:
             raise RuntimeError("No active record layer")
@@ -214,38 +284,66 @@ class KEMTLSTCPServerConnection(KEMTLSTransport):
         cert: Optional[Dict[str, Any]] = None,
         pdk_key_id: Optional[str] = None,
         collector: Optional[Any] = None,
+        crypto_executor: Optional[CryptoExecutor] = None,
+        key_pool: Optional[EphemeralKeyPool] = None,
+        ticket_issuer: Optional[TicketIssuer] = None,
+        early_data: Optional[EarlyDataPolicy] = None,
+        early_data_handler: Optional[Callable[[Any, bytes], bytes]] = None,
     ):
+        """
+        Run the server side of the handshake. Early data is only accepted when
+        both ``early_data`` and ``early_data_handler`` are given; the handler
+        maps (session, raw request) to raw response bytes.
+        """
         handshake = ServerHandshake(
             server_identity,
             server_lt_sk,
             cert,
             pdk_key_id,
             collector=collector,
+            crypto_executor=crypto_executor,
+            key_pool=key_pool,
+            ticket_issuer=ticket_issuer,
+            early_data=early_data if early_data_handler is not None else None,
         )
 
         client_hello = self.recv_handshake()
         server_hello = handshake.process_client_hello(client_hello)
         self.send_handshake(server_hello)
 
-        client_key_exchange = self.recv_handshake()
-        server_finished = handshake.process_client_key_exchange(client_key_exchange)
+        early_request = None
+        if handshake.early_data_offered:
+            # Always read it off the stream, even when declined.
+            early_record = self.recv_handshake()
+            if handshake.early_data_accepted:
+                early_request = handshake.open_early_data(early_record)
+
+        if handshake.resumed:
+            server_finished = handshake.resumed_server_finished()
+        else:
+            client_key_exchange = self.recv_handshake()
+            server_finished = handshake.process_client_key_exchange(client_key_exchange)
         self.send_handshake(server_finished)
 
-        client_finished = self.recv_handshake()
-        session = handshake.verify_client_finished(client_finished)
+        new_session_ticket = handshake.new_session_ticket()
+        if new_session_ticket is not None:
+            self.send_handshake(new_session_ticket)
+
+        session = handshake.application_session()
         session.transport = "tcp"
         self.session = session
-        self.record_layer = for_server(session, self.sock)
-        return session
+        self.record_layer = for_server(session, self.sock, reader=self.reader)
+        if early_request is not None:
+            # 0.5-RTT: answer before ClientFinished, which is what saves the round trip.
+            if early_data.allows(early_request):
+                response = early_data_handler(session, mark_early_request(early_request))
+            else:
+                response = TOO_EARLY_RESPONSE
+            self.send_application(response)
 
-    def _read_n_bytes(self, n: int, *, eof_message: str) -> bytes:
-        data = b""
-        while len(data) < n:
-            chunk = self.sock.recv(n - len(data))
-            if not chunk:
-                raise EOFError(eof_message)
-            data += chunk
-        return data
+        client_finished = self.recv_handshake()
+        handshake.verify_client_finished(client_finished)
+        return session
 
 
 def build_http_request(
@@ -282,7 +380,13 @@ def request_over_transport(
     reuse = keep_alive and transport.matches_endpoint(host, port)
     if not reuse:
         transport.close()
-        transport.connect(host, port)
+        early_request = None
+        if transport.early_data and early_data_eligible(method, path, headers, body):
+            # Sent before a session exists, so it carries no binding proof.
+            early_request = build_http_request(host, method, path, headers=headers, keep_alive=keep_alive)
+        transport.connect(host, port, early_data=early_request)
+        if transport.early_response is not None and not is_too_early(transport.early_response):
+            return transport.early_response, transport.session
 
     effective_headers = dict(headers or {})
     if header_mutator is not None:
@@ -11,6 +11,7 @@ from . import (
     refresh_store,
     session_binding,
     token,
+    token_cache,
     token_endpoints,
     userinfo_endpoints,
 )
@@ -26,6 +27,7 @@ __all__ = [
     "refresh_store",
     "session_binding",
     "token",
+    "token_cache",
     "token_endpoints",
     "userinfo_endpoints",
 ]
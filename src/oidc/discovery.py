@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, Optional
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from flask import Response, request
 
 from crypto.ml_dsa import MLDSA65
 
@@ -22,6 +26,7 @@ class DiscoveryEndpoint:
         kemtls_default_transport: str = "tcp",
         kemtls_session_binding_supported: bool = True,
         scopes_supported: Optional[Iterable[str]] = None,
+        max_age_seconds: int = 300,
     ):
         self.issuer_url = issuer_url.rstrip("/")
         self.authorization_endpoint = authorization_endpoint or f"{self.issuer_url}/authorize"
@@ -34,6 +39,7 @@ class DiscoveryEndpoint:
         self.kemtls_default_transport = kemtls_default_transport
         self.kemtls_session_binding_supported = bool(kemtls_session_binding_supported)
         self.scopes_supported = list(scopes_supported or ("openid", "profile", "email"))
+        self.max_age_seconds = max_age_seconds
 
     def get_configuration(self) -> Dict[str, Any]:
         metadata = {
@@ -59,5 +65,22 @@ class DiscoveryEndpoint:
             metadata["introspection_endpoint"] = self.introspection_endpoint
         return metadata
 
+    def get_document(self) -> Tuple[bytes, str]:
+        """The serialized configuration and its ETag."""
+        body = json.dumps(self.get_configuration(), separators=(",", ":")).encode("utf-8")
+        return body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+    def register_routes(self, app) -> None:
+        @app.route("/.well-known/openid-configuration", methods=["GET"])
+        def openid_configuration():
+            body, etag = self.get_document()
+            headers = {
+                "ETag": etag,
+                "Cache-Control": f"public, max-age={self.max_age_seconds}",
+            }
+            if etag in request.headers.get("If-None-Match", ""):
+                return Response(status=304, headers=headers)
+            return Response(body, mimetype="application/json", headers=headers)
+
 
 __all__ = ["DiscoveryEndpoint"]
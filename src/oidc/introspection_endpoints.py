@@ -6,9 +6,11 @@ from typing import Any, Dict, Optional
 
 from flask import g, jsonify, request
 
-from oidc.jwt_handler import PQJWT
+from crypto.executor import CryptoExecutor
+from oidc.jwt_handler import IssuerKeys, PQJWT
 from oidc.session_binding import extract_binding_proof_from_headers
 from oidc.session_binding import verify_access_token_binding_claim
+from oidc.token_cache import VerifiedTokenCache, get_token_cache
 
 
 class IntrospectionEndpoint:
@@ -16,16 +18,20 @@ class IntrospectionEndpoint:
 
     def __init__(
         self,
-        issuer_pk: bytes,
+        issuer_pk: IssuerKeys,
         *,
         issuer: Optional[str] = None,
         audience: Optional[str] = None,
         jwt_handler: Optional[PQJWT] = None,
+        crypto_executor: Optional[CryptoExecutor] = None,
+        token_cache: Optional[VerifiedTokenCache] = None,
     ):
         self.issuer_pk = issuer_pk
         self.issuer = issuer
         self.audience = audience
-        self.jwt_handler = jwt_handler or PQJWT()
+        self.token_cache = token_cache if token_cache is not None else get_token_cache()
+        self.crypto_executor = crypto_executor
+        self.jwt_handler = jwt_handler or PQJWT(crypto_executor=crypto_executor)
 
     def introspect(
         self,
@@ -40,7 +46,8 @@ class IntrospectionEndpoint:
             return {"active": False}
 
         try:
-            claims = self.jwt_handler.validate_access_token(
+            claims, _ = self.token_cache.validate(
+                self.jwt_handler,
                 token,
                 self.issuer_pk,
                 issuer=self.issuer,
@@ -63,6 +70,7 @@ class IntrospectionEndpoint:
                 binding_proof=binding_proof,
                 method=method,
                 path=path,
+                crypto_executor=self.crypto_executor,
             )
             response["binding_status"] = binding_ok
             response["active"] = bool(binding_ok)
@@ -2,45 +2,173 @@
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+import hashlib
+import json
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from flask import jsonify
+from flask import Response, request
 
 from crypto.ml_dsa import MLDSA65
 
 
-class JWKSEndpoint:
-    """Publishes a normal JWKS document with one or more ML-DSA signing keys."""
+_KeyRingState = Tuple[Dict[str, bytes], Dict[str, bytes], Optional[str], Tuple[Dict[str, list], bytes, str]]
+
+
+class SigningKeyRing(Mapping):
+    """
+    ML-DSA keys indexed by ``kid``: one active signing key plus retiring keys.
+
+    Retiring keys stay published and accepted for verification until they are
+    removed, so tokens signed before a rotation keep validating. The ring is a
+    read-only ``Mapping`` from kid to public key, which ``PQJWT`` accepts in
+    place of a single issuer key. Writers swap in one immutable snapshot under a
+    lock, so lookups never block. The JWKS document is serialized once per change.
+    """
 
     def __init__(self, keys: Optional[Dict[str, bytes]] = None):
-        self._keys: Dict[str, bytes] = {}
-        if keys:
-            for kid, public_key in keys.items():
-                self.add_key(kid, public_key)
+        self._lock = threading.Lock()
+        self._state: _KeyRingState = ({}, {}, None, _serialize_jwks({}, None))
+        for kid, public_key in (keys or {}).items():
+            self.add_key(kid, public_key)
 
-    def add_key(self, kid: str, public_key: bytes) -> None:
+    def add_key(
+        self,
+        kid: str,
+        public_key: bytes,
+        secret_key: Optional[bytes] = None,
+        *,
+        activate: bool = False,
+    ) -> None:
+        """Publish ``public_key``; with ``activate`` it also becomes the signing key."""
+        self._add_key(kid, public_key, secret_key, activate)
+
+    def rotate(self, kid: str, public_key: bytes, secret_key: bytes) -> Optional[str]:
+        """Make ``kid`` the signing key; returns the previous active kid, now retiring."""
+        previous = self._add_key(kid, public_key, secret_key, True)
+        return previous if previous != kid else None
+
+    def _add_key(self, kid: str, public_key: bytes, secret_key: Optional[bytes], activate: bool) -> Optional[str]:
+        # Returns the kid that was active before this change.
         if not isinstance(kid, str) or not kid:
             raise ValueError("kid must be a non-empty string")
         MLDSA65._validate_public_key(public_key)
-        self._keys[kid] = public_key
+        if secret_key is not None:
+            MLDSA65._validate_secret_key(secret_key)
+        if activate and secret_key is None:
+            raise ValueError("an active signing key needs its secret key")
+        with self._lock:
+            old_public, old_secret, previous, _ = self._state
+            public = dict(old_public)
+            public[kid] = public_key
+            secret = dict(old_secret)
+            if secret_key is not None:
+                secret[kid] = secret_key
+            elif old_public.get(kid) != public_key:
+                secret.pop(kid, None)
+            active_kid = kid if activate else previous
+            if active_kid == kid and kid not in secret:
+                active_kid = None
+            self._publish(public, secret, active_kid)
+            return previous
+
+    def remove_key(self, kid: str) -> None:
+        """Stop publishing and accepting a retired key."""
+        with self._lock:
+            old_public, old_secret, active_kid, _ = self._state
+            if kid == active_kid:
+                raise ValueError("cannot remove the active signing key; rotate first")
+            if kid not in old_public:
+                return
+            public = {k: v for k, v in old_public.items() if k != kid}
+            secret = {k: v for k, v in old_secret.items() if k != kid}
+            self._publish(public, secret, active_kid)
+
+    @property
+    def active_kid(self) -> Optional[str]:
+        return self._state[2]
+
+    @property
+    def retiring_kids(self) -> List[str]:
+        public, _, active_kid, _ = self._state
+        return [kid for kid in public if kid != active_kid]
+
+    def signing_key(self) -> Tuple[str, bytes]:
+        """The ``(kid, secret_key)`` new tokens are signed with."""
+        _, secret, kid, _ = self._state
+        if kid is None:
+            raise LookupError("key ring has no active signing key")
+        return kid, secret[kid]
+
+    def get_jwks(self) -> Dict[str, list]:
+        return self._state[3][0]
+
+    def jwks_document(self) -> Tuple[bytes, str]:
+        """The serialized JWKS and its ETag."""
+        _, body, etag = self._state[3]
+        return body, etag
+
+    def _publish(self, public: Dict[str, bytes], secret: Dict[str, bytes], active_kid: Optional[str]) -> None:
+        # Caller holds the lock. Readers load ``_state`` once, so they never see a half-applied change.
+        self._state = (public, secret, active_kid, _serialize_jwks(public, active_kid))
+
+    def __getitem__(self, kid: str) -> bytes:
+        return self._state[0][kid]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._state[0])
+
+    def __len__(self) -> int:
+        return len(self._state[0])
+
+
+def _serialize_jwks(public: Dict[str, bytes], active_kid: Optional[str]) -> Tuple[Dict[str, list], bytes, str]:
+    # The active key is listed first; verifiers that try keys in order hit it soonest.
+    kids = sorted(public, key=lambda kid: kid != active_kid)
+    document = {"keys": [MLDSA65.public_key_to_jwk(public[kid], kid=kid) for kid in kids]}
+    body = json.dumps(document, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return document, body, etag
+
+
+class JWKSEndpoint:
+    """Publishes a normal JWKS document with one or more ML-DSA signing keys."""
+
+    def __init__(
+        self,
+        keys: Optional[Dict[str, bytes]] = None,
+        *,
+        key_ring: Optional[SigningKeyRing] = None,
+        max_age_seconds: int = 300,
+    ):
+        self.key_ring = key_ring if key_ring is not None else SigningKeyRing()
+        self.max_age_seconds = max_age_seconds
+        for kid, public_key in (keys or {}).items():
+            self.add_key(kid, public_key)
+
+    def add_key(self, kid: str, public_key: bytes) -> None:
+        self.key_ring.add_key(kid, public_key)
 
     def get_key(self, kid: str) -> Optional[bytes]:
         if not isinstance(kid, str) or not kid:
             return None
-        return self._keys.get(kid)
+        return self.key_ring.get(kid)
 
     def get_jwks(self) -> Dict[str, list]:
-        return {
-            "keys": [
-                MLDSA65.public_key_to_jwk(public_key, kid=kid)
-                for kid, public_key in self._keys.items()
-            ]
-        }
+        return self.key_ring.get_jwks()
 
     def register_routes(self, app) -> None:
         @app.route("/jwks", methods=["GET"])
         def jwks_route():
-            return jsonify(self.get_jwks())
+            body, etag = self.key_ring.jwks_document()
+            headers = {
+                "ETag": etag,
+                "Cache-Control": f"public, max-age={self.max_age_seconds}",
+            }
+            if etag in request.headers.get("If-None-Match", ""):
+                return Response(status=304, headers=headers)
+            return Response(body, mimetype="application/json", headers=headers)
 
 
-__all__ = ["JWKSEndpoint"]
+__all__ = ["JWKSEndpoint", "SigningKeyRing"]
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 from rust_ext import jwt as rust_jwt
 
+from crypto.executor import CryptoExecutor, get_crypto_executor
 from crypto.ml_dsa import MLDSA65
 from utils.encoding import base64url_decode, base64url_encode
 from utils.serialization import deserialize_message, serialize_message
@@ -15,10 +16,20 @@ ID_TOKEN_TYPE = "JWT"
 ACCESS_TOKEN_TYPE = "at+jwt"
 DEFAULT_KID = "signing-key-1"
 
+# One issuer public key, or a kid-indexed key set such as ``SigningKeyRing``.
+IssuerKeys = Union[bytes, Mapping[str, bytes]]
+
 
 class PQJWT:
     """Signs and validates standard-shaped JWTs with ML-DSA-65."""
 
+    def __init__(self, crypto_executor: Optional[CryptoExecutor] = None):
+        self._crypto_executor = crypto_executor
+
+    @property
+    def crypto_executor(self) -> CryptoExecutor:
+        return self._crypto_executor or get_crypto_executor()
+
     def sign_jwt(
         self,
         claims: Dict[str, Any],
@@ -58,7 +69,7 @@ class PQJWT:
             payload_b64,
             fallback=_jwt_signing_input_python,
         )
-        signature = MLDSA65.sign(issuer_sk, signing_input)
+        signature = self.crypto_executor.sign(issuer_sk, signing_input)
         
         if collector:
             self._record_signing_metrics(collector, start_ns, header_b64, payload_b64, signature)
@@ -77,7 +88,7 @@ class PQJWT:
     def verify_jwt(
         self,
         token: str,
-        issuer_pk: bytes,
+        issuer_pk: IssuerKeys,
         expected_type: Optional[str] = None,
         collector: Optional[Any] = None,
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
@@ -85,34 +96,8 @@ class PQJWT:
             import time
             start_ns = time.perf_counter_ns()
             
-        if not isinstance(token, str):
-            raise TypeError("token must be a string")
-
-        header_b64, payload_b64, signature_b64 = rust_jwt.split_jwt(
-            token,
-            fallback=_split_jwt_python,
-        )
-        header = deserialize_message(base64url_decode(header_b64))
-        payload = deserialize_message(base64url_decode(payload_b64))
-        if not isinstance(header, dict):
-            raise ValueError("JWT header must decode to an object")
-        if not isinstance(payload, dict):
-            raise ValueError("JWT payload must decode to an object")
-
-        if header.get("alg") != MLDSA65.ALGORITHM:
-            raise ValueError(f"unsupported JWT algorithm: {header.get('alg')}")
-        if expected_type and header.get("typ") != expected_type:
-            raise ValueError(
-                f"unexpected JWT type: expected {expected_type}, got {header.get('typ')}"
-            )
-
-        signing_input = rust_jwt.jwt_signing_input(
-            header_b64,
-            payload_b64,
-            fallback=_jwt_signing_input_python,
-        )
-        signature = base64url_decode(signature_b64)
-        if not MLDSA65.verify(issuer_pk, signing_input, signature):
+        header, payload, signing_input, signature = _decode_jwt(token, expected_type)
+        if not MLDSA65.verify(_resolve_issuer_key(issuer_pk, header), signing_input, signature):
             raise ValueError("invalid JWT signature")
 
         if collector:
@@ -121,6 +106,56 @@ class PQJWT:
 
         return header, payload
 
+    def verify_many(
+        self,
+        tokens: Sequence[str],
+        issuer_keys: IssuerKeys,
+        expected_type: Optional[str] = None,
+    ) -> List[Union[Tuple[Dict[str, Any], Dict[str, Any]], Exception]]:
+        """
+        Verify a batch of JWTs, fanning the signature checks out on the crypto executor.
+
+        ``issuer_keys`` is either one public key for every token or a mapping
+        from ``kid`` to public key. Identical tokens are decoded and verified
+        once. Returns ``(header, payload)`` or the exception that rejected the
+        token, in input order.
+        """
+        outcomes: Dict[str, Union[Tuple[Dict[str, Any], Dict[str, Any]], Exception]] = {}
+        pending: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        by_kid: Dict[Optional[str], List[Tuple[str, bytes, bytes]]] = {}
+        for token in tokens:
+            if token in outcomes or token in pending:
+                continue
+            try:
+                header, payload, signing_input, signature = _decode_jwt(token, expected_type)
+                if len(signature) != MLDSA65.SIGNATURE_SIZE:
+                    raise ValueError("invalid JWT signature")
+            except Exception as exc:
+                outcomes[token] = exc
+                continue
+            pending[token] = (header, payload)
+            kid = header.get("kid") if isinstance(header.get("kid"), str) else None
+            by_kid.setdefault(kid, []).append((token, signing_input, signature))
+
+        batch: List[str] = []
+        triples: List[Tuple[bytes, bytes, bytes]] = []
+        for kid, entries in by_kid.items():
+            try:
+                public_key = _resolve_issuer_key(issuer_keys, {"kid": kid})
+                MLDSA65._validate_public_key(public_key)
+            except ValueError as exc:
+                for token, _, _ in entries:
+                    outcomes[token] = exc
+                continue
+            for token, signing_input, signature in entries:
+                batch.append(token)
+                triples.append((public_key, signing_input, signature))
+
+        for token, valid in zip(batch, self.crypto_executor.verify_many(triples)):
+            outcomes[token] = pending[token] if valid else ValueError("invalid JWT signature")
+
+        return [outcomes[token] for token in tokens]
+
     def create_id_token(
         self,
         claims: Dict[str, Any],
@@ -152,7 +187,7 @@ class PQJWT:
     def validate_id_token(
         self,
         token: str,
-        issuer_pk: bytes,
+        issuer_pk: IssuerKeys,
         issuer: Optional[str] = None,
         audience: Optional[str] = None,
         nonce: Optional[str] = None,
@@ -167,7 +202,7 @@ class PQJWT:
     def validate_access_token(
         self,
         token: str,
-        issuer_pk: bytes,
+        issuer_pk: IssuerKeys,
         issuer: Optional[str] = None,
         audience: Optional[str] = None,
         collector: Optional[Any] = None,
@@ -179,7 +214,7 @@ class PQJWT:
     def verify_id_token(
         self,
         token: str,
-        issuer_pk: bytes,
+        issuer_pk: IssuerKeys,
         issuer: Optional[str] = None,
         audience: Optional[str] = None,
         nonce: Optional[str] = None,
@@ -221,6 +256,59 @@ class PQJWT:
             raise ValueError("audience mismatch")
 
 
+def get_unverified_header(token: str) -> Dict[str, Any]:
+    """Decode a JWT header without checking the signature, e.g. to read its ``kid``."""
+    header_b64, _, _ = rust_jwt.split_jwt(token, fallback=_split_jwt_python)
+    header = deserialize_message(base64url_decode(header_b64))
+    if not isinstance(header, dict):
+        raise ValueError("JWT header must decode to an object")
+    return header
+
+
+def _resolve_issuer_key(issuer_keys: IssuerKeys, header: Dict[str, Any]) -> bytes:
+    """One issuer key is used as-is; a kid-indexed key set is looked up by the header kid."""
+    if isinstance(issuer_keys, bytes):
+        return issuer_keys
+    kid = header.get("kid")
+    public_key = issuer_keys.get(kid) if isinstance(kid, str) else None
+    if public_key is None or len(public_key) != MLDSA65.PUBLIC_KEY_SIZE:
+        raise ValueError(f"unknown JWT signing key: {kid}")
+    return public_key
+
+
+def _decode_jwt(
+    token: str,
+    expected_type: Optional[str],
+) -> Tuple[Dict[str, Any], Dict[str, Any], bytes, bytes]:
+    if not isinstance(token, str):
+        raise TypeError("token must be a string")
+
+    header_b64, payload_b64, signature_b64 = rust_jwt.split_jwt(
+        token,
+        fallback=_split_jwt_python,
+    )
+    header = deserialize_message(base64url_decode(header_b64))
+    payload = deserialize_message(base64url_decode(payload_b64))
+    if not isinstance(header, dict):
+        raise ValueError("JWT header must decode to an object")
+    if not isinstance(payload, dict):
+        raise ValueError("JWT payload must decode to an object")
+
+    if header.get("alg") != MLDSA65.ALGORITHM:
+        raise ValueError(f"unsupported JWT algorithm: {header.get('alg')}")
+    if expected_type and header.get("typ") != expected_type:
+        raise ValueError(
+            f"unexpected JWT type: expected {expected_type}, got {header.get('typ')}"
+        )
+
+    signing_input = rust_jwt.jwt_signing_input(
+        header_b64,
+        payload_b64,
+        fallback=_jwt_signing_input_python,
+    )
+    return header, payload, signing_input, base64url_decode(signature_b64)
+
+
 def _split_jwt_python(token: str) -> Tuple[str, str, str]:
     parts = token.split(".")
     if len(parts) != 3:
@@ -232,4 +320,4 @@ def _jwt_signing_input_python(header_b64: str, payload_b64: str) -> bytes:
     return f"{header_b64}.{payload_b64}".encode("ascii")
 
 
-__all__ = ["ACCESS_TOKEN_TYPE", "DEFAULT_KID", "ID_TOKEN_TYPE", "PQJWT"]
+__all__ = ["ACCESS_TOKEN_TYPE", "DEFAULT_KID", "ID_TOKEN_TYPE", "IssuerKeys", "PQJWT", "get_unverified_header"]
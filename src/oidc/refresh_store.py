@@ -1,33 +1,79 @@
-"""Opaque refresh-token storage with rotation and replay detection."""
+"""
+Opaque refresh-token storage with rotation and replay detection.
+
+Records are indexed by token hash, by rotation family and by (subject,
+client), so consuming a token, revoking a family and revoking everything a
+user holds at one client each touch only the records involved. Expiry times
+sit in a min-heap; every issue sweeps a few expired records off it, which
+keeps memory proportional to the live tokens. ``sweep_expired`` can also be
+called from a background task.
+"""
 
 from __future__ import annotations
 
 import hashlib
-from dataclasses import dataclass
-from typing import Dict, Optional
+import heapq
+import threading
+from typing import Dict, List, Optional, Set, Tuple
 from rust_ext import hashing as rust_hashing
 
 from utils.helpers import generate_random_string, get_timestamp
 
 
-@dataclass
+# Expired records removed per issued token; enough to outpace issuance.
+_SWEEP_BATCH = 8
+
+
 class RefreshTokenRecord:
-    token_hash: str
-    family_id: str
-    subject: str
-    client_id: str
-    binding_meta: dict
-    issued_at: int
-    expires_at: int
-    used_at: Optional[int] = None
-    revoked: bool = False
+    __slots__ = (
+        "token_hash",
+        "family_id",
+        "subject",
+        "client_id",
+        "binding_meta",
+        "issued_at",
+        "expires_at",
+        "used_at",
+        "revoked",
+    )
+
+    def __init__(
+        self,
+        token_hash: str,
+        family_id: str,
+        subject: str,
+        client_id: str,
+        binding_meta: dict,
+        issued_at: int,
+        expires_at: int,
+        used_at: Optional[int] = None,
+        revoked: bool = False,
+    ):
+        self.token_hash = token_hash
+        self.family_id = family_id
+        self.subject = subject
+        self.client_id = client_id
+        self.binding_meta = binding_meta
+        self.issued_at = issued_at
+        self.expires_at = expires_at
+        self.used_at = used_at
+        self.revoked = revoked
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"RefreshTokenRecord({fields})"
 
 
 class RefreshTokenStore:
     """Stores only hashed refresh tokens and enforces single-use rotation."""
 
-    def __init__(self):
+    def __init__(self, sweep_batch: int = _SWEEP_BATCH):
+        self.sweep_batch = sweep_batch
         self._records: Dict[str, RefreshTokenRecord] = {}
+        self._families: Dict[str, Set[str]] = {}
+        self._subject_families: Dict[Tuple[str, str], Set[str]] = {}
+        self._expiry_heap: List[Tuple[int, str]] = []
+        self._lock = threading.RLock()
 
     def issue_token(
         self,
@@ -46,20 +92,21 @@ class RefreshTokenStore:
         )
 
     def consume_token(self, token_value: str) -> Optional[RefreshTokenRecord]:
-        record = self._lookup_token(token_value)
-        if record is None:
-            return None
-        if record.revoked:
-            return None
-        if get_timestamp() >= record.expires_at:
-            record.revoked = True
-            return None
-        if record.used_at is not None:
-            self.revoke_family(token_value)
-            return None
-
-        record.used_at = get_timestamp()
-        return record
+        with self._lock:
+            record = self._lookup_token(token_value)
+            if record is None:
+                return None
+            if record.revoked:
+                return None
+            if get_timestamp() >= record.expires_at:
+                record.revoked = True
+                return None
+            if record.used_at is not None:
+                self.revoke_family(token_value)
+                return None
+
+            record.used_at = get_timestamp()
+            return record
 
     def rotate_token(
         self,
@@ -85,14 +132,64 @@ class RefreshTokenStore:
         )
 
     def revoke_family(self, token_value: str) -> bool:
-        record = self._lookup_token(token_value)
-        if record is None:
-            return False
-
-        for family_record in self._records.values():
-            if family_record.family_id == record.family_id:
-                family_record.revoked = True
-        return True
+        with self._lock:
+            record = self._lookup_token(token_value)
+            if record is None:
+                return False
+            self._revoke_families((record.family_id,))
+            return True
+
+    def revoke_subject(self, subject: str, client_id: str) -> int:
+        """Revoke every refresh-token family ``subject`` holds at ``client_id``; returns the family count."""
+        with self._lock:
+            family_ids = tuple(self._subject_families.get((subject, client_id), ()))
+            self._revoke_families(family_ids)
+            return len(family_ids)
+
+    def sweep_expired(self, limit: Optional[int] = None) -> int:
+        """Drop up to ``limit`` (default: all) expired records; returns how many were removed."""
+        now = get_timestamp()
+        removed = 0
+        with self._lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now and (limit is None or removed < limit):
+                _, token_hash = heapq.heappop(heap)
+                record = self._records.get(token_hash)
+                if record is None:
+                    continue
+                if record.expires_at > now:
+                    # Expiry was pushed back after issue; requeue at the new time.
+                    heapq.heappush(heap, (record.expires_at, token_hash))
+                    continue
+                self._remove(record)
+                removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _revoke_families(self, family_ids) -> None:
+        # Caller holds the lock.
+        for family_id in family_ids:
+            for token_hash in self._families.get(family_id, ()):
+                self._records[token_hash].revoked = True
+
+    def _remove(self, record: RefreshTokenRecord) -> None:
+        # Caller holds the lock.
+        del self._records[record.token_hash]
+        family = self._families.get(record.family_id)
+        if family is None:
+            return
+        family.discard(record.token_hash)
+        if family:
+            return
+        del self._families[record.family_id]
+        owner = (record.subject, record.client_id)
+        families = self._subject_families.get(owner)
+        if families is not None:
+            families.discard(record.family_id)
+            if not families:
+                del self._subject_families[owner]
 
     def _issue_token(
         self,
@@ -105,7 +202,7 @@ class RefreshTokenStore:
     ) -> str:
         token_value = generate_random_string(64)
         token_hash = self._hash_token(token_value)
-        self._records[token_hash] = RefreshTokenRecord(
+        record = RefreshTokenRecord(
             token_hash=token_hash,
             family_id=family_id,
             subject=subject,
@@ -114,6 +211,12 @@ class RefreshTokenStore:
             issued_at=get_timestamp(),
             expires_at=expiry,
         )
+        with self._lock:
+            self._records[token_hash] = record
+            self._families.setdefault(family_id, set()).add(token_hash)
+            self._subject_families.setdefault((subject, client_id), set()).add(family_id)
+            heapq.heappush(self._expiry_heap, (expiry, token_hash))
+            self.sweep_expired(limit=self.sweep_batch)
         return token_value
 
     def _lookup_token(self, token_value: str) -> Optional[RefreshTokenRecord]:
@@ -6,6 +6,7 @@ import hashlib
 from typing import Any, Dict, Optional
 from rust_ext import hashing as rust_hashing
 
+from crypto.executor import CryptoExecutor, get_crypto_executor
 from crypto.ml_dsa import MLDSA65
 from utils.encoding import base64url_encode
 from utils.encoding import base64url_decode
@@ -101,6 +102,7 @@ def verify_binding_proof(
     *,
     method: str,
     path: str,
+    crypto_executor: Optional[CryptoExecutor] = None,
 ) -> Optional[bytes]:
     """Verify a presented PoP binding proof and return the proven public key."""
     if not isinstance(binding_proof, dict):
@@ -116,7 +118,8 @@ def verify_binding_proof(
     except ValueError:
         return None
 
-    if MLDSA65.verify(public_key, message, signature):
+    executor = crypto_executor or get_crypto_executor()
+    if executor.verify(public_key, message, signature):
         return public_key
     return None
 
@@ -128,6 +131,7 @@ def verify_access_token_binding_claim(
     binding_proof: Optional[Dict[str, Any]] = None,
     method: str = "GET",
     path: str = "/userinfo",
+    crypto_executor: Optional[CryptoExecutor] = None,
 ) -> bool:
     """Verify that an access token confirmation claim matches the active session."""
     if not isinstance(claim, dict):
@@ -151,6 +155,7 @@ def verify_access_token_binding_claim(
             binding_proof,
             method=method,
             path=path,
+            crypto_executor=crypto_executor,
         )
         return presented_public_key == expected_public_key
     if binding_method != BINDING_METHOD:
@@ -0,0 +1,111 @@
+"""Cache of access tokens that already passed signature and claim validation."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from oidc.jwt_handler import IssuerKeys, PQJWT, get_unverified_header
+
+
+CacheKey = Tuple[bytes, Optional[str], Optional[str]]
+CacheEntry = Tuple[float, Dict[str, Any], Optional[str], bytes]
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU from SHA-256(token) to the claims ``validate_access_token`` returned.
+
+    Keyed by (token digest, expected issuer, expected audience), and each
+    entry remembers which issuer key (and ``kid``) verified it. A hit is only
+    served while that same key is still accepted: rotating a key ring keeps
+    tokens signed by the retiring key cached, removing the key drops them.
+    Entries expire at the token's ``exp`` (capped at ``max_ttl_s``); failed
+    validations are never cached. Only the signature and registered claims are
+    cached: callers still check the session binding every request.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_ttl_s: float = 3600.0):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.max_ttl_s = max_ttl_s
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def validate(
+        self,
+        jwt_handler: PQJWT,
+        token: str,
+        issuer_pk: IssuerKeys,
+        issuer: Optional[str] = None,
+        audience: Optional[str] = None,
+        collector: Optional[Any] = None,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Validate ``token`` like ``PQJWT.validate_access_token``.
+
+        Returns:
+            Tuple[Dict, bool]: A copy of the token claims and whether they came from the cache
+        """
+        key = (hashlib.sha256(token.encode("utf-8")).digest(), issuer, audience)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, claims, kid, key_digest = entry
+                if now < expires_at and _key_digest(issuer_pk, kid) == key_digest:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(claims), True
+                del self._entries[key]
+
+        claims = jwt_handler.validate_access_token(
+            token,
+            issuer_pk,
+            issuer=issuer,
+            audience=audience,
+            collector=collector,
+        )
+        kid = None if isinstance(issuer_pk, bytes) else get_unverified_header(token).get("kid")
+        expires_at = now + self.max_ttl_s
+        if "exp" in claims:
+            expires_at = min(expires_at, float(claims["exp"]))
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (expires_at, dict(claims), kid, _key_digest(issuer_pk, kid))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return claims, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def _key_digest(issuer_pk: IssuerKeys, kid: Optional[str]) -> Optional[bytes]:
+    public_key = issuer_pk if isinstance(issuer_pk, bytes) else issuer_pk.get(kid)
+    return hashlib.sha256(public_key).digest() if public_key is not None else None
+
+
+_shared_cache = VerifiedTokenCache()
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    """Process-wide cache shared by the userinfo and introspection endpoints."""
+    return _shared_cache
+
+
+__all__ = ["VerifiedTokenCache", "get_token_cache"]
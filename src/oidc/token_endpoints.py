@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import hashlib
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+from crypto.executor import CryptoExecutor
 from oidc.auth_endpoints import AuthorizationCodeRecord, InMemoryAuthorizationCodeStore
 from oidc.claims import ClaimsProcessor
+from oidc.jwks import SigningKeyRing
 from oidc.jwt_handler import DEFAULT_KID, PQJWT
 from oidc.refresh_store import RefreshTokenStore
 from oidc.session_binding import (
@@ -35,6 +37,8 @@ class TokenEndpoint:
         access_token_lifetime_seconds: int = 900,
         id_token_lifetime_seconds: int = 3600,
         refresh_token_lifetime_seconds: int = 604800,
+        crypto_executor: Optional[CryptoExecutor] = None,
+        key_ring: Optional[SigningKeyRing] = None,
     ):
         self.issuer_url = issuer_url
         self.issuer_sk = issuer_sk
@@ -48,7 +52,15 @@ class TokenEndpoint:
         self.access_token_lifetime_seconds = access_token_lifetime_seconds
         self.id_token_lifetime_seconds = id_token_lifetime_seconds
         self.refresh_token_lifetime_seconds = refresh_token_lifetime_seconds
-        self.jwt_handler = PQJWT()
+        self.crypto_executor = crypto_executor
+        self.key_ring = key_ring
+        self.jwt_handler = PQJWT(crypto_executor=crypto_executor)
+
+    def _signing_key(self) -> Tuple[str, bytes]:
+        # With a key ring, tokens are signed by whichever key is active at issue time.
+        if self.key_ring is not None:
+            return self.key_ring.signing_key()
+        return self.signing_kid, self.issuer_sk
 
     def handle_token_request(
         self,
@@ -229,7 +241,13 @@ class TokenEndpoint:
         )
         try:
             if binding_proof is not None:
-                public_key = verify_binding_proof(session, binding_proof, method="POST", path="/token")
+                public_key = verify_binding_proof(
+                    session,
+                    binding_proof,
+                    method="POST",
+                    path="/token",
+                    crypto_executor=self.crypto_executor,
+                )
                 if public_key is None:
                     return {
                         "error": "invalid_request",
@@ -244,10 +262,11 @@ class TokenEndpoint:
                 "error_description": "session binding material is missing from the active KEMTLS session",
             }
 
+        signing_kid, signing_sk = self._signing_key()
         access_token = self.jwt_handler.create_access_token(
             access_claims,
-            self.issuer_sk,
-            kid=self.signing_kid,
+            signing_sk,
+            kid=signing_kid,
             cnf_claim=access_cnf_claim,
             collector=collector
         )
@@ -287,10 +306,11 @@ class TokenEndpoint:
             scope=code_data["scope"],
         )
 
+        signing_kid, signing_sk = self._signing_key()
         id_token = self.jwt_handler.create_id_token(
             id_claims,
-            self.issuer_sk,
-            kid=self.signing_kid,
+            signing_sk,
+            kid=signing_kid,
             collector=collector
         )
         if binding_proof is not None:
@@ -299,6 +319,7 @@ class TokenEndpoint:
                 binding_proof,
                 method="POST",
                 path="/token",
+                crypto_executor=self.crypto_executor,
             )
             if public_key is None:
                 raise ValueError("binding proof verification failed for the active KEMTLS session")
@@ -320,8 +341,8 @@ class TokenEndpoint:
 
         access_token = self.jwt_handler.create_access_token(
             access_claims,
-            self.issuer_sk,
-            kid=self.signing_kid,
+            signing_sk,
+            kid=signing_kid,
             cnf_claim=access_cnf_claim,
             collector=collector
         )
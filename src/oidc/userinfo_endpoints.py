@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import time
 from typing import Any, Dict, Optional, Tuple
 
 from flask import g, jsonify, request
 
+from crypto.executor import CryptoExecutor
 from oidc.claims import ClaimsProcessor
-from oidc.jwt_handler import PQJWT
+from oidc.jwt_handler import IssuerKeys, PQJWT
 from oidc.session_binding import extract_binding_proof_from_headers
 from oidc.session_binding import verify_access_token_binding_claim
+from oidc.token_cache import VerifiedTokenCache, get_token_cache
 
 
 class UserInfoEndpoint:
@@ -17,18 +20,22 @@ class UserInfoEndpoint:
 
     def __init__(
         self,
-        issuer_pk: bytes,
+        issuer_pk: IssuerKeys,
         *,
         issuer: Optional[str] = None,
         audience: Optional[str] = None,
         claims_processor: Optional[ClaimsProcessor] = None,
         jwt_handler: Optional[PQJWT] = None,
+        crypto_executor: Optional[CryptoExecutor] = None,
+        token_cache: Optional[VerifiedTokenCache] = None,
     ):
         self.issuer_pk = issuer_pk
         self.issuer = issuer
         self.audience = audience
+        self.token_cache = token_cache if token_cache is not None else get_token_cache()
         self.claims_processor = claims_processor or ClaimsProcessor()
-        self.jwt_handler = jwt_handler or PQJWT()
+        self.crypto_executor = crypto_executor
+        self.jwt_handler = jwt_handler or PQJWT(crypto_executor=crypto_executor)
 
     def handle_userinfo_request(
         self,
@@ -53,19 +60,21 @@ class UserInfoEndpoint:
             return {"error": "missing_session_context"}, 401
 
         try:
-            claims = self.jwt_handler.validate_access_token(
+            claims, cache_hit = self.token_cache.validate(
+                self.jwt_handler,
                 access_token,
                 self.issuer_pk,
                 issuer=self.issuer,
                 audience=self.audience,
-                collector=collector
+                collector=collector,
             )
         except Exception:
             if collector:
                 collector.end_userinfo_request()
             return {"error": "invalid_token"}, 401
-            
-        import time
+        if collector:
+            collector.record_token_cache(cache_hit)
+
         start_binding_ns = time.perf_counter_ns()
         binding_valid = verify_access_token_binding_claim(
             claims,
@@ -73,6 +82,7 @@ class UserInfoEndpoint:
             binding_proof=binding_proof,
             method=method,
             path=path,
+            crypto_executor=self.crypto_executor,
         )
         if collector:
             collector.t_binding_verify_ns = time.perf_counter_ns() - start_binding_ns
@@ -238,7 +238,7 @@ class _AeadBackend:
         fallback: Optional[Callable[[bytes, bytes, bytes, bytes], bytes]] = None,
     ) -> bytes:
         if _core is not None:
-            return _core.aead_seal(key, nonce, plaintext, aad)
+            return _core.aead_seal(key, nonce, bytes(plaintext), aad)
         if fallback is not None:
             return fallback(key, nonce, plaintext, aad)
         raise RuntimeError("Rust backend unavailable and no fallback provided")
@@ -252,7 +252,7 @@ class _AeadBackend:
         fallback: Optional[Callable[[bytes, bytes, bytes, bytes], bytes]] = None,
     ) -> bytes:
         if _core is not None:
-            return _core.aead_open(key, nonce, ciphertext, aad)
+            return _core.aead_open(key, nonce, bytes(ciphertext), bytes(aad))
         if fallback is not None:
             return fallback(key, nonce, ciphertext, aad)
         raise RuntimeError("Rust backend unavailable and no fallback provided")
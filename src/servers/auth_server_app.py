@@ -6,6 +6,7 @@ from typing import Any, Dict, Optional
 
 from flask import Flask, g, jsonify, request
 
+from crypto.executor import CryptoExecutor
 from oidc.session_binding import extract_binding_proof_from_headers
 from oidc.auth_endpoints import (
     AuthorizationEndpoint,
@@ -15,7 +16,7 @@ from oidc.auth_endpoints import (
 from oidc.claims import ClaimsProcessor
 from oidc.discovery import DiscoveryEndpoint
 from oidc.introspection_endpoints import IntrospectionEndpoint
-from oidc.jwks import JWKSEndpoint
+from oidc.jwks import JWKSEndpoint, SigningKeyRing
 from oidc.refresh_store import RefreshTokenStore
 from oidc.token_endpoints import TokenEndpoint
 
@@ -31,6 +32,10 @@ def create_auth_server_app(
     issuer_pk = config["issuer_public_key"]
     issuer_sk = config["issuer_secret_key"]
     signing_kid = config.get("signing_kid", "signing-key-1")
+    key_ring = stores.get("key_ring")
+    if key_ring is None:
+        key_ring = SigningKeyRing()
+        key_ring.add_key(signing_kid, issuer_pk, issuer_sk, activate=True)
 
     client_registry = stores.get("client_registry") or InMemoryClientRegistry(
         config.get("clients", {})
@@ -38,6 +43,9 @@ def create_auth_server_app(
     auth_code_store = stores.get("auth_code_store") or InMemoryAuthorizationCodeStore()
     refresh_token_store = stores.get("refresh_token_store") or RefreshTokenStore()
     claims_processor = stores.get("claims_processor") or ClaimsProcessor()
+    crypto_executor = stores.get("crypto_executor")
+    if crypto_executor is None and config.get("crypto_executor"):
+        crypto_executor = CryptoExecutor.from_config(config["crypto_executor"])
 
     auth_endpoint = AuthorizationEndpoint(
         client_registry=client_registry,
@@ -55,6 +63,8 @@ def create_auth_server_app(
         access_token_lifetime_seconds=config.get("access_token_lifetime_seconds", 900),
         id_token_lifetime_seconds=config.get("id_token_lifetime_seconds", 3600),
         refresh_token_lifetime_seconds=config.get("refresh_token_lifetime_seconds", 604800),
+        crypto_executor=crypto_executor,
+        key_ring=key_ring,
     )
     discovery_endpoint = DiscoveryEndpoint(
         issuer,
@@ -71,18 +81,25 @@ def create_auth_server_app(
             True,
         ),
         scopes_supported=config.get("scopes_supported"),
+        max_age_seconds=config.get("discovery_max_age_seconds", 300),
+    )
+    jwks_endpoint = JWKSEndpoint(
+        key_ring=key_ring,
+        max_age_seconds=config.get("jwks_max_age_seconds", 300),
     )
-    jwks_endpoint = JWKSEndpoint({signing_kid: issuer_pk})
     introspection_endpoint = IntrospectionEndpoint(
-        issuer_pk,
+        key_ring,
         issuer=issuer,
         audience=config.get("introspection_audience"),
+        crypto_executor=crypto_executor,
+        token_cache=stores.get("token_cache"),
     )
 
     app.extensions["auth_endpoint"] = auth_endpoint
     app.extensions["token_endpoint"] = token_endpoint
     app.extensions["discovery_endpoint"] = discovery_endpoint
     app.extensions["jwks_endpoint"] = jwks_endpoint
+    app.extensions["key_ring"] = key_ring
     app.extensions["introspection_endpoint"] = introspection_endpoint
     app.extensions["auth_server_stores"] = {
         "client_registry": client_registry,
@@ -98,10 +115,7 @@ def create_auth_server_app(
             session = getattr(g, "active_kemtls_session", None)
         return session
 
-    @app.route("/.well-known/openid-configuration", methods=["GET"])
-    def openid_configuration():
-        return jsonify(discovery_endpoint.get_configuration())
-
+    discovery_endpoint.register_routes(app)
     jwks_endpoint.register_routes(app)
     introspection_endpoint.register_routes(app, get_session=_resolve_session)
 
@@ -6,6 +6,7 @@ from typing import Any, Dict, Optional
 
 from flask import Flask, g, jsonify, request
 
+from crypto.executor import CryptoExecutor
 from oidc.claims import ClaimsProcessor
 from oidc.jwt_handler import PQJWT
 from oidc.session_binding import extract_binding_proof_from_headers
@@ -19,13 +20,21 @@ def create_resource_server_app(
     stores = stores or {}
     app = Flask(__name__)
 
-    issuer_pk = config["issuer_public_key"]
+    # A shared SigningKeyRing lets the issuer rotate keys without restarting this server.
+    issuer_pk = stores.get("key_ring")
+    if issuer_pk is None:
+        issuer_pk = config["issuer_public_key"]
+    crypto_executor = stores.get("crypto_executor")
+    if crypto_executor is None and config.get("crypto_executor"):
+        crypto_executor = CryptoExecutor.from_config(config["crypto_executor"])
     userinfo_endpoint = UserInfoEndpoint(
         issuer_pk,
         issuer=config.get("issuer"),
         audience=config.get("resource_audience"),
         claims_processor=stores.get("claims_processor") or ClaimsProcessor(),
-        jwt_handler=stores.get("jwt_handler") or PQJWT(),
+        jwt_handler=stores.get("jwt_handler") or PQJWT(crypto_executor=crypto_executor),
+        crypto_executor=crypto_executor,
+        token_cache=stores.get("token_cache"),
     )
 
     app.extensions["userinfo_endpoint"] = userinfo_endpoint
@@ -53,7 +53,15 @@ class KEMTLSHandshakeCollector(BaseCollector):
         # Mode and timing
         self.mode: str = "unknown"  # "baseline" or "pdk"
         self.cert_verify_ns: int = 0  # Baseline mode: certificate verification time
+        self.cert_verify_hit_ns: int = 0  # ...when served from the client certificate cache
+        self.cert_verify_miss_ns: int = 0  # ...when the ML-DSA signature was checked
+        self.cert_cache_hits: int = 0
+        self.cert_cache_misses: int = 0
         self.pdk_lookup_ns: int = 0  # PDK mode: key store lookup time
+
+        # Server ephemeral keypair pool
+        self.eph_keypool_hits: int = 0
+        self.eph_keypool_misses: int = 0
         
         # Session
         self.session_id: Optional[str] = None
@@ -67,6 +75,16 @@ class KEMTLSHandshakeCollector(BaseCollector):
         """End handshake timing and compute total (called from server)."""
         self.end()
 
+    def record_cert_verify(self, elapsed_ns: int, cache_hit: bool):
+        """Record certificate validation time, split by certificate cache outcome."""
+        self.cert_verify_ns = elapsed_ns
+        if cache_hit:
+            self.cert_verify_hit_ns = elapsed_ns
+            self.cert_cache_hits += 1
+        else:
+            self.cert_verify_miss_ns = elapsed_ns
+            self.cert_cache_misses += 1
+
     def get_metrics(self) -> Dict[str, Any]:
         """Return all handshake metrics as a dict."""
         client_key_exchange_size = max(self.client_key_exchange_size, self.client_finish_size)
@@ -89,8 +107,14 @@ class KEMTLSHandshakeCollector(BaseCollector):
             ),
             "cert_verify_ns": self.cert_verify_ns,
             "cert_verify_ms": self.cert_verify_ns / 1_000_000 if self.cert_verify_ns > 0 else 0,
+            "cert_verify_hit_ns": self.cert_verify_hit_ns,
+            "cert_verify_miss_ns": self.cert_verify_miss_ns,
+            "cert_cache_hits": self.cert_cache_hits,
+            "cert_cache_misses": self.cert_cache_misses,
             "pdk_lookup_ns": self.pdk_lookup_ns,
             "pdk_lookup_ms": self.pdk_lookup_ns / 1_000_000 if self.pdk_lookup_ns > 0 else 0,
+            "eph_keypool_hits": self.eph_keypool_hits,
+            "eph_keypool_misses": self.eph_keypool_misses,
             "session_id": self.session_id,
             "peer_identity": self.peer_identity,
         }
@@ -161,6 +185,8 @@ class OIDCUserinfoCollector(BaseCollector):
         self.t_userinfo_request_ns: int = 0  # Total time for userinfo request
         self.t_verify_ns: int = 0  # JWT verification time
         self.t_binding_verify_ns: int = 0  # Session binding verification time
+        self.token_cache_hits: int = 0  # Access token claims served from the verified-token cache
+        self.token_cache_misses: int = 0
         
         # Status
         self.error: Optional[str] = None
@@ -175,6 +201,13 @@ class OIDCUserinfoCollector(BaseCollector):
         self.end()
         self.t_userinfo_request_ns = self.t_total_ns
 
+    def record_token_cache(self, cache_hit: bool):
+        """Record whether access token validation was served from the verified-token cache."""
+        if cache_hit:
+            self.token_cache_hits += 1
+        else:
+            self.token_cache_misses += 1
+
     def get_metrics(self) -> Dict[str, Any]:
         """Return all userinfo metrics as a dict."""
         return {
@@ -188,6 +221,8 @@ class OIDCUserinfoCollector(BaseCollector):
             "t_binding_verify_ms": self.t_binding_verify_ns / 1_000_000
             if self.t_binding_verify_ns > 0
             else 0,
+            "token_cache_hits": self.token_cache_hits,
+            "token_cache_misses": self.token_cache_misses,
             "binding_valid": self.binding_valid,
             "error": self.error,
         }
@@ -0,0 +1,182 @@
+import asyncio
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask, jsonify, request
+
+from client.kemtls_http_client import KEMTLSHttpClient
+from crypto.executor import CryptoExecutor
+from crypto.ml_dsa import MLDSA65
+from crypto.ml_kem import MLKEM768
+from kemtls.async_tcp_server import AsyncKEMTLSTCPServer, AsyncKEMTLSTCPServerConnection
+from kemtls.certs import create_certificate
+from kemtls.keypool import EphemeralKeyPool
+from kemtls.record_layer import KEMTLSRecordLayer
+from kemtls.session import KEMTLSSession
+
+
+CA_PUBLIC_KEY, CA_SECRET_KEY = MLDSA65.generate_keypair()
+SERVER_LT_PUBLIC_KEY, SERVER_LT_SECRET_KEY = MLKEM768.generate_keypair()
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _build_app() -> Flask:
+    app = Flask(__name__)
+
+    @app.route("/echo")
+    def echo():
+        return jsonify({"value": request.args.get("value")})
+
+    return app
+
+
+def _start_server(port: int, **kwargs) -> AsyncKEMTLSTCPServer:
+    cert = create_certificate(
+        subject="async-server",
+        kem_pk=SERVER_LT_PUBLIC_KEY,
+        ca_sk=CA_SECRET_KEY,
+        issuer="Root CA",
+        valid_from=0,
+        valid_to=4_000_000_000,
+    )
+    server = AsyncKEMTLSTCPServer(
+        app=_build_app(),
+        server_identity="async-server",
+        server_lt_sk=SERVER_LT_SECRET_KEY,
+        cert=cert,
+        host="127.0.0.1",
+        port=port,
+        app_workers=4,
+        **kwargs,
+    )
+    thread = threading.Thread(target=server.start, daemon=True)
+    thread.start()
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                break
+        except OSError:
+            time.sleep(0.05)
+    return server
+
+
+def _client() -> KEMTLSHttpClient:
+    return KEMTLSHttpClient(
+        ca_pk=CA_PUBLIC_KEY,
+        expected_identity="async-server",
+        mode="baseline",
+        keep_alive=True,
+    )
+
+
+def test_async_server_serves_keep_alive_requests():
+    port = _free_port()
+    server = _start_server(port)
+    client = _client()
+    try:
+        for value in ("one", "two", "three"):
+            response = client.get(f"kemtls://127.0.0.1:{port}/echo", params={"value": value})
+            assert response["status"] == 200
+            assert response["body"]["value"] == value
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_async_server_handles_concurrent_clients():
+    port = _free_port()
+    server = _start_server(port)
+
+    def _run(index: int) -> str:
+        client = _client()
+        try:
+            response = client.get(f"kemtls://127.0.0.1:{port}/echo", params={"value": str(index)})
+            assert response["status"] == 200
+            return response["body"]["value"]
+        finally:
+            client.close()
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            values = list(pool.map(_run, range(8)))
+        assert values == [str(index) for index in range(8)]
+    finally:
+        server.stop()
+
+
+def test_async_server_runs_handshake_kem_on_the_crypto_executor():
+    port = _free_port()
+    crypto = CryptoExecutor(kind="thread", max_workers=1)
+    generator_threads = []
+
+    def _generator():
+        generator_threads.append(threading.current_thread().name)
+        return MLKEM768.generate_keypair()
+
+    # An empty, never-refilled pool forces the keygen-on-miss path.
+    key_pool = EphemeralKeyPool(target_size=1, low_water=0, generator=_generator)
+    key_pool.start = lambda: None
+    server = _start_server(port, crypto_executor=crypto, key_pool=key_pool)
+    client = _client()
+    try:
+        response = client.get(f"kemtls://127.0.0.1:{port}/echo", params={"value": "x"})
+        assert response["status"] == 200
+        # One ephemeral keygen plus two decapsulations.
+        assert crypto.get_metrics()["completed"] == 3
+        assert key_pool.get_metrics()["misses"] == 1
+        assert generator_threads == []
+    finally:
+        client.close()
+        server.stop()
+        crypto.shutdown()
+
+
+def test_async_server_skips_spare_keygen_for_invalid_client_hello():
+    port = _free_port()
+    crypto = CryptoExecutor(kind="thread", max_workers=1)
+    key_pool = EphemeralKeyPool(target_size=1, low_water=0)
+    key_pool.start = lambda: None
+    server = _start_server(port, crypto_executor=crypto, key_pool=key_pool)
+    try:
+        garbage = b"not a client hello"
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(len(garbage).to_bytes(4, "big") + garbage)
+            assert sock.recv(1) == b""
+        assert crypto.get_metrics()["completed"] == 0
+        assert key_pool.get_metrics()["misses"] == 0
+    finally:
+        server.stop()
+        crypto.shutdown()
+
+
+def test_async_recv_application_bounds_reassembled_message_size():
+    session = KEMTLSSession(
+        session_id="sess-1",
+        peer_identity="server-1",
+        handshake_mode="baseline",
+        client_write_key=b"A" * 32,
+        client_write_iv=b"I" * 12,
+        server_write_key=b"B" * 32,
+        server_write_iv=b"J" * 12,
+    )
+    client = KEMTLSRecordLayer(session, None, is_client=True, max_fragment_size=1024)
+
+    async def receive():
+        reader = asyncio.StreamReader()
+        for header, ciphertext in client.seal_fragments(b"x" * 4096):
+            reader.feed_data(header + ciphertext)
+        connection = AsyncKEMTLSTCPServerConnection(reader, None)
+        connection.record_layer = KEMTLSRecordLayer(session, None, is_client=False, max_message_size=2048)
+        return await connection.recv_application()
+
+    with pytest.raises(ValueError, match="message exceeds 2048 bytes"):
+        asyncio.run(receive())
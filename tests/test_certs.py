@@ -2,7 +2,8 @@ import hashlib
 
 import pytest
 
-from kemtls.certs import create_certificate, validate_certificate
+from crypto.ml_dsa import MLDSA65
+from kemtls.certs import CertificateCache, create_certificate, validate_certificate
 
 
 def test_certificate_roundtrip(monkeypatch, mldsa_keypair, mlkem_keypair):
@@ -90,3 +91,71 @@ def test_certificate_rejects_time_window_and_identity_errors(monkeypatch, mldsa_
 
     with pytest.raises(ValueError, match="Identity mismatch"):
         validate_certificate(valid, ca_pk, "wrong-server")
+
+
+def _count_verifies(monkeypatch):
+    calls = {"n": 0}
+    real_verify = MLDSA65.verify
+
+    def _verify(*args):
+        calls["n"] += 1
+        return real_verify(*args)
+
+    monkeypatch.setattr("kemtls.certs.MLDSA65.verify", _verify)
+    return calls
+
+
+def test_certificate_cache_skips_signature_check_on_repeat(monkeypatch, mldsa_keypair, mlkem_keypair):
+    clock = {"now": 1_700_000_000}
+    monkeypatch.setattr("kemtls.certs.get_timestamp", lambda: clock["now"])
+    calls = _count_verifies(monkeypatch)
+
+    ca_pk, ca_sk = mldsa_keypair
+    kem_pk, _ = mlkem_keypair
+    cert = create_certificate(
+        subject="server-1",
+        kem_pk=kem_pk,
+        ca_sk=ca_sk,
+        issuer="Root CA",
+        valid_from=1_699_999_900,
+        valid_to=1_700_000_100,
+    )
+    cache = CertificateCache()
+
+    assert cache.validate(cert, ca_pk, "server-1") == (kem_pk, False)
+    assert cache.validate(dict(cert), ca_pk, "server-1") == (kem_pk, True)
+    assert calls["n"] == 1
+
+    # A different expected identity is a different key, and still fails.
+    with pytest.raises(ValueError, match="Identity mismatch"):
+        cache.validate(cert, ca_pk, "wrong-server")
+
+    # A hit is never served past valid_to.
+    clock["now"] = 1_700_000_101
+    with pytest.raises(ValueError, match="expired"):
+        cache.validate(cert, ca_pk, "server-1")
+    assert cache.get_metrics() == {"entries": 0, "hits": 1, "misses": 1}
+
+
+def test_certificate_cache_is_bounded(monkeypatch, mldsa_keypair, mlkem_keypair):
+    monkeypatch.setattr("kemtls.certs.get_timestamp", lambda: 1_700_000_000)
+    ca_pk, ca_sk = mldsa_keypair
+    kem_pk, _ = mlkem_keypair
+    cache = CertificateCache(max_entries=2)
+
+    certs = [
+        create_certificate(
+            subject=f"server-{index}",
+            kem_pk=kem_pk,
+            ca_sk=ca_sk,
+            issuer="Root CA",
+            valid_from=1_699_999_900,
+            valid_to=1_700_000_100,
+        )
+        for index in range(3)
+    ]
+    for index, cert in enumerate(certs):
+        cache.validate(cert, ca_pk, f"server-{index}")
+
+    assert len(cache) == 2
+    assert cache.validate(certs[0], ca_pk, "server-0")[1] is False
@@ -0,0 +1,238 @@
+import socket
+import threading
+import time
+
+import pytest
+from flask import Flask, jsonify
+
+from client.kemtls_http_client import KEMTLSHttpClient
+from crypto.ml_kem import MLKEM768
+from kemtls._http_bridge import call_flask_app
+from kemtls.async_tcp_server import AsyncKEMTLSTCPServer
+from kemtls.pdk import PDKTrustStore
+from kemtls.pool import ConnectionPool, pool_key, trust_anchor_digest
+from kemtls.quic_server import KEMTLSQUICServer
+from kemtls.tcp_server import KEMTLSTCPServer
+
+
+AUTH_LT_PUBLIC_KEY, AUTH_LT_SECRET_KEY = MLKEM768.generate_keypair()
+RESOURCE_LT_PUBLIC_KEY, RESOURCE_LT_SECRET_KEY = MLKEM768.generate_keypair()
+
+
+class _FakeTransport:
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+
+    def is_alive(self):
+        return self.alive and not self.closed
+
+    def close(self):
+        self.closed = True
+
+
+KEY_A = pool_key("tcp", "127.0.0.1", 1, "server-a", "pdk")
+KEY_B = pool_key("tcp", "127.0.0.1", 2, "server-b", "pdk")
+
+
+def test_pool_reuses_most_recent_connection_per_key():
+    pool = ConnectionPool()
+    first, second = _FakeTransport(), _FakeTransport()
+    pool.release(KEY_A, first)
+    pool.release(KEY_A, second)
+
+    assert pool.acquire(KEY_B) is None
+    assert pool.acquire(KEY_A) is second
+    assert pool.acquire(KEY_A) is first
+    assert pool.acquire(KEY_A) is None
+    assert pool.get_metrics()["hits"] == 2
+
+
+def test_pool_enforces_limits_and_closes_what_it_drops():
+    pool = ConnectionPool(max_size=3, max_per_key=2)
+    a1, a2, a3, b1, b2 = (_FakeTransport() for _ in range(5))
+    for transport in (a1, a2, a3):
+        pool.release(KEY_A, transport)
+    assert a1.closed and len(pool) == 2
+
+    pool.release(KEY_B, b1)
+    pool.release(KEY_B, b2)
+    assert a2.closed and len(pool) == 3
+    assert pool.get_metrics()["evicted"] == 2
+
+    pool.close()
+    assert a3.closed and b1.closed and b2.closed and len(pool) == 0
+
+
+def test_pool_drops_idle_and_unhealthy_connections(monkeypatch):
+    clock = {"now": 100.0}
+    monkeypatch.setattr("kemtls.pool.time.monotonic", lambda: clock["now"])
+    pool = ConnectionPool(idle_timeout_s=10)
+    stale, dead = _FakeTransport(), _FakeTransport()
+    pool.release(KEY_A, stale)
+    clock["now"] = 105.0
+    pool.release(KEY_B, dead)
+
+    clock["now"] = 111.0
+    dead.alive = False
+    assert pool.acquire(KEY_B) is None
+    assert stale.closed and dead.closed
+    assert pool.get_metrics()["expired"] == 1
+    assert pool.get_metrics()["unhealthy"] == 1
+
+    pool.release(KEY_A, _FakeTransport(alive=False))
+    assert len(pool) == 0
+
+
+def _pdk_store():
+    store = PDKTrustStore()
+    store.add_entry("auth-key", "auth-server", AUTH_LT_PUBLIC_KEY)
+    store.add_entry("resource-key", "resource-server", RESOURCE_LT_PUBLIC_KEY)
+    return store
+
+
+def _free_port(kind):
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _build_app(name):
+    app = Flask(name)
+
+    @app.route("/whoami")
+    def whoami():
+        return jsonify({"server": name})
+
+    return app
+
+
+def _start(server_cls, identity, lt_sk, key_id):
+    kind = socket.SOCK_DGRAM if server_cls is KEMTLSQUICServer else socket.SOCK_STREAM
+    port = _free_port(kind)
+    server = server_cls(
+        app=_build_app(identity),
+        server_identity=identity,
+        server_lt_sk=lt_sk,
+        pdk_key_id=key_id,
+        host="127.0.0.1",
+        port=port,
+    )
+    threading.Thread(target=server.start, daemon=True).start()
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        if kind == socket.SOCK_DGRAM:
+            if server.sock.getsockname()[1] == port:
+                break
+        else:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                    break
+            except OSError:
+                pass
+        time.sleep(0.02)
+    return server, port
+
+
+@pytest.mark.parametrize(
+    "server_cls, transport",
+    [
+        (KEMTLSTCPServer, "tcp"),
+        (AsyncKEMTLSTCPServer, "tcp"),
+        (KEMTLSQUICServer, "quic"),
+    ],
+)
+def test_http_clients_share_one_pool_across_servers(server_cls, transport):
+    auth_server, auth_port = _start(server_cls, "auth-server", AUTH_LT_SECRET_KEY, "auth-key")
+    resource_server, resource_port = _start(server_cls, "resource-server", RESOURCE_LT_SECRET_KEY, "resource-key")
+    pool = ConnectionPool()
+
+    def _client(identity):
+        return KEMTLSHttpClient(
+            pdk_store=_pdk_store(),
+            expected_identity=identity,
+            mode="pdk",
+            transport=transport,
+            pool=pool,
+        )
+
+    try:
+        session_ids = {"auth": set(), "resource": set()}
+        for _ in range(3):
+            auth = _client("auth-server").get(f"kemtls://127.0.0.1:{auth_port}/whoami")
+            resource = _client("resource-server").get(f"kemtls://127.0.0.1:{resource_port}/whoami")
+            assert auth["body"] == {"server": "auth-server"}
+            assert resource["body"] == {"server": "resource-server"}
+            session_ids["auth"].add(auth["kemtls_metadata"]["session_id"])
+            session_ids["resource"].add(resource["kemtls_metadata"]["session_id"])
+
+        # One handshake per server; every later request reused its connection.
+        assert len(session_ids["auth"]) == len(session_ids["resource"]) == 1
+        assert pool.get_metrics()["hits"] == 4
+        assert len(pool) == 2
+    finally:
+        pool.close()
+        auth_server.stop()
+        resource_server.stop()
+
+
+def test_trust_anchor_digest_covers_ca_key_and_pinned_pdk_keys():
+    other_store = PDKTrustStore()
+    other_store.add_entry("auth-key", "auth-server", RESOURCE_LT_PUBLIC_KEY)
+    digests = {
+        trust_anchor_digest("auth-server"),
+        trust_anchor_digest("auth-server", ca_pk=b"ca-1"),
+        trust_anchor_digest("auth-server", ca_pk=b"ca-2"),
+        trust_anchor_digest("auth-server", pdk_store=_pdk_store()),
+        trust_anchor_digest("auth-server", pdk_store=other_store),
+    }
+
+    assert len(digests) == 5
+    # Entries pinned for other identities do not split the pool.
+    auth_only = PDKTrustStore()
+    auth_only.add_entry("auth-key", "auth-server", AUTH_LT_PUBLIC_KEY)
+    assert trust_anchor_digest("auth-server", pdk_store=auth_only) == trust_anchor_digest(
+        "auth-server", pdk_store=_pdk_store()
+    )
+
+
+def test_pooled_connection_is_not_reused_under_other_trust_anchors():
+    server, port = _start(KEMTLSTCPServer, "auth-server", AUTH_LT_SECRET_KEY, "auth-key")
+    pool = ConnectionPool()
+    wrong_store = PDKTrustStore()
+    wrong_store.add_entry("auth-key", "auth-server", RESOURCE_LT_PUBLIC_KEY)
+    trusted = KEMTLSHttpClient(pdk_store=_pdk_store(), expected_identity="auth-server", mode="pdk", pool=pool)
+    untrusted = KEMTLSHttpClient(pdk_store=wrong_store, expected_identity="auth-server", mode="pdk", pool=pool)
+    try:
+        assert trusted.get(f"kemtls://127.0.0.1:{port}/whoami")["status"] == 200
+        assert len(pool) == 1
+
+        # The connection verified under the right key must not serve a client pinning another one.
+        with pytest.raises(ValueError, match="ServerFinished MAC"):
+            untrusted.get(f"kemtls://127.0.0.1:{port}/whoami")
+        assert pool.get_metrics()["hits"] == 0
+    finally:
+        pool.close()
+        server.stop()
+
+
+def test_pooled_connection_closed_by_server_is_replaced(monkeypatch):
+    def _one_request_then_close(app, connection):
+        raw_request = connection.recv_application()
+        connection.send_application(call_flask_app(app, connection.session, raw_request))
+
+    monkeypatch.setattr("kemtls.tcp_server.handle_application_session", _one_request_then_close)
+    server, port = _start(KEMTLSTCPServer, "auth-server", AUTH_LT_SECRET_KEY, "auth-key")
+    pool = ConnectionPool()
+    client = KEMTLSHttpClient(pdk_store=_pdk_store(), expected_identity="auth-server", mode="pdk", pool=pool)
+    try:
+        first = client.get(f"kemtls://127.0.0.1:{port}/whoami")
+        time.sleep(0.1)
+        second = client.get(f"kemtls://127.0.0.1:{port}/whoami")
+
+        assert second["status"] == 200
+        assert second["kemtls_metadata"]["session_id"] != first["kemtls_metadata"]["session_id"]
+        assert pool.get_metrics()["unhealthy"] == 1
+    finally:
+        pool.close()
+        server.stop()
@@ -0,0 +1,76 @@
+import pytest
+
+from crypto.executor import CryptoExecutor, configure_crypto_executor, get_crypto_executor
+from crypto.ml_dsa import MLDSA65
+from crypto.ml_kem import MLKEM768
+from oidc.jwt_handler import PQJWT
+
+
+def _boom():
+    raise RuntimeError("boom")
+
+
+@pytest.mark.parametrize("kind", ["inline", "thread", "process"])
+def test_executor_runs_kem_and_signature_operations(kind):
+    executor = CryptoExecutor(kind=kind, max_workers=2)
+    try:
+        public_key, secret_key = MLKEM768.generate_keypair()
+        ciphertext_a, shared_a = MLKEM768.encapsulate(public_key)
+        ciphertext_b, shared_b = MLKEM768.encapsulate(public_key)
+        assert executor.decapsulate_many([(secret_key, ciphertext_a), (secret_key, ciphertext_b)]) == [
+            shared_a,
+            shared_b,
+        ]
+
+        sig_pk, sig_sk = MLDSA65.generate_keypair()
+        signature = executor.sign(sig_sk, b"message")
+        assert executor.verify(sig_pk, b"message", signature) is True
+        assert executor.verify(sig_pk, b"other", signature) is False
+
+        metrics = executor.get_metrics()
+        assert metrics["kind"] == kind
+        assert metrics["submitted"] == metrics["completed"] == 5
+        assert metrics["queue_depth"] == 0
+        assert metrics["max_queue_depth"] >= 1
+        assert metrics["wait_ns_total"] >= 0
+    finally:
+        executor.shutdown()
+
+
+def test_executor_propagates_errors_and_counts_failures():
+    executor = CryptoExecutor(kind="thread", max_workers=1)
+    try:
+        with pytest.raises(RuntimeError, match="boom"):
+            executor.run(_boom)
+        metrics = executor.get_metrics()
+        assert metrics["failed"] == 1
+        assert metrics["queue_depth"] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_executor_rejects_unknown_kind():
+    with pytest.raises(ValueError, match="Unsupported crypto executor kind"):
+        CryptoExecutor(kind="gpu")
+
+
+def test_pqjwt_signs_through_configured_executor():
+    executor = CryptoExecutor(kind="thread", max_workers=1)
+    public_key, secret_key = MLDSA65.generate_keypair()
+    try:
+        handler = PQJWT(crypto_executor=executor)
+        token = handler.sign_jwt({"sub": "alice"}, secret_key)
+        _header, claims = handler.verify_jwt(token, public_key)
+        assert claims["sub"] == "alice"
+        assert executor.get_metrics()["completed"] == 1
+    finally:
+        executor.shutdown()
+
+
+def test_configure_replaces_process_default():
+    previous = get_crypto_executor()
+    try:
+        executor = configure_crypto_executor("thread", max_workers=1)
+        assert get_crypto_executor() is executor
+    finally:
+        configure_crypto_executor(previous.kind, previous.max_workers)
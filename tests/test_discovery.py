@@ -1,3 +1,5 @@
+from flask import Flask
+
 from oidc.discovery import DiscoveryEndpoint
 
 
@@ -49,3 +51,22 @@ def test_discovery_omits_optional_introspection_when_not_configured():
 
     assert "introspection_endpoint" not in config
     assert config["issuer"] == "https://issuer.example"
+
+
+def test_discovery_route_emits_cache_headers_and_honours_if_none_match():
+    app = Flask(__name__)
+    DiscoveryEndpoint("https://issuer.example", max_age_seconds=120).register_routes(app)
+    client = app.test_client()
+
+    response = client.get("/.well-known/openid-configuration")
+    revalidated = client.get(
+        "/.well-known/openid-configuration",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["issuer"] == "https://issuer.example"
+    assert response.headers["Cache-Control"] == "public, max-age=120"
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b""
+
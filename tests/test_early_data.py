@@ -0,0 +1,230 @@
+import socket
+import threading
+import time
+
+import pytest
+from flask import Flask, jsonify, request
+
+from client.kemtls_http_client import KEMTLSHttpClient
+from crypto.ml_kem import MLKEM768
+from kemtls.async_tcp_server import AsyncKEMTLSTCPServer
+from kemtls.early_data import EarlyDataPolicy, ReplayCache, early_data_eligible
+from kemtls.handshake import ClientHandshake, ServerHandshake
+from kemtls.pdk import PDKTrustStore
+from kemtls.quic_server import KEMTLSQUICServer
+from kemtls.resumption import TicketCache, TicketIssuer
+from kemtls.tcp_server import KEMTLSTCPServer
+
+
+SERVER_LT_PUBLIC_KEY, SERVER_LT_SECRET_KEY = MLKEM768.generate_keypair()
+
+
+def _pdk_store():
+    store = PDKTrustStore()
+    store.add_entry("key-1", "server-1", SERVER_LT_PUBLIC_KEY)
+    return store
+
+
+def _server(issuer, policy):
+    return ServerHandshake(
+        server_identity="server-1",
+        server_lt_sk=SERVER_LT_SECRET_KEY,
+        pdk_key_id="key-1",
+        ticket_issuer=issuer,
+        early_data=policy,
+    )
+
+
+def _client(ticket=None, early_data=False):
+    return ClientHandshake(
+        expected_identity="server-1",
+        pdk_store=_pdk_store(),
+        mode="pdk",
+        ticket=ticket,
+        request_ticket=True,
+        early_data=early_data,
+    )
+
+
+def _issue_ticket(issuer):
+    server, client = _server(issuer, None), _client()
+    cke, session = client.process_server_hello(server.process_client_hello(client.client_hello()))
+    sf = server.process_client_key_exchange(cke)
+    client.process_server_finished(sf, session)
+    return client.process_new_session_ticket(server.new_session_ticket())
+
+
+def test_early_data_is_accepted_once_per_client_hello():
+    issuer = TicketIssuer()
+    policy = EarlyDataPolicy()
+    client = _client(_issue_ticket(issuer), early_data=True)
+    client_hello = client.client_hello()
+    early = client.seal_early_data(b"GET /jwks HTTP/1.1\r\nHost: a\r\n\r\n")
+
+    server = _server(issuer, policy)
+    client.process_server_hello(server.process_client_hello(client_hello))
+    assert server.early_data_accepted and client.early_data_accepted
+    assert server.open_early_data(early).startswith(b"GET /jwks ")
+
+    replayed = _server(issuer, policy)
+    replayed.process_client_hello(client_hello)
+    assert replayed.resumed is True
+    assert replayed.early_data_accepted is False
+    assert policy.get_metrics()["replays"] == 1
+
+
+def test_stale_early_data_is_declined(monkeypatch):
+    issuer = TicketIssuer()
+    client = _client(_issue_ticket(issuer), early_data=True)
+    client_hello = client.client_hello()
+
+    monkeypatch.setattr("kemtls.early_data.time.time", lambda: time.time_ns() / 1e9 + 60)
+    server = _server(issuer, EarlyDataPolicy(window_s=10))
+    client.process_server_hello(server.process_client_hello(client_hello))
+
+    assert server.resumed is True
+    assert client.early_data_accepted is False
+
+
+def test_policy_only_allows_bodiless_gets_to_listed_routes():
+    policy = EarlyDataPolicy()
+
+    assert policy.allows(b"GET /jwks HTTP/1.1\r\nHost: a\r\n\r\n")
+    assert policy.allows(b"GET /.well-known/openid-configuration?x=1 HTTP/1.1\r\n\r\n")
+    assert not policy.allows(b"POST /jwks HTTP/1.1\r\n\r\n")
+    assert not policy.allows(b"GET /token HTTP/1.1\r\n\r\n")
+    assert not policy.allows(b"GET /jwks HTTP/1.1\r\nContent-Length: 2\r\n\r\nhi")
+
+
+def test_clients_only_offer_credential_free_gets_to_listed_routes():
+    assert early_data_eligible("GET", "/jwks?x=1", {"Host": "a"})
+    assert not early_data_eligible("GET", "/userinfo", {"Host": "a"})
+    assert not early_data_eligible("GET", "/jwks", {"Authorization": "Bearer t"})
+    assert not early_data_eligible("GET", "/jwks", {"x-kemtls-binding-signature": "s"})
+    assert not early_data_eligible("POST", "/jwks")
+    assert early_data_eligible("GET", "/private", routes={"/private"})
+
+
+def test_replay_cache_forgets_entries_outside_the_window():
+    cache = ReplayCache(window_s=5)
+
+    assert cache.check_and_store(b"binder", now=100.0)
+    assert not cache.check_and_store(b"binder", now=104.0)
+    assert cache.check_and_store(b"binder", now=110.0)
+
+
+def test_full_replay_cache_refuses_instead_of_evicting_live_binders():
+    cache = ReplayCache(window_s=5, max_entries=2)
+
+    assert cache.check_and_store(b"first", now=100.0)
+    assert cache.check_and_store(b"second", now=101.0)
+    assert not cache.check_and_store(b"third", now=102.0)
+    assert not cache.check_and_store(b"first", now=103.0)
+    assert cache.overflows == 1 and cache.replays == 1
+
+    assert cache.check_and_store(b"third", now=105.5)
+
+
+def test_multi_worker_quic_server_declines_early_data():
+    server = KEMTLSQUICServer(
+        app=Flask(__name__),
+        server_identity="auth-server",
+        server_lt_sk=SERVER_LT_SECRET_KEY,
+        host="127.0.0.1",
+        port=0,
+        workers=2,
+    )
+    try:
+        handshake = server._new_connection(b"cid", ("127.0.0.1", 1)).handshake
+        assert handshake.early_data is None
+        assert server.get_metrics()["early_data"]["enabled"] is False
+    finally:
+        server.stop()
+
+
+def _free_port(kind):
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _build_app():
+    app = Flask(__name__)
+
+    @app.route("/jwks")
+    def jwks():
+        return jsonify({"early": request.headers.get("Early-Data")})
+
+    @app.route("/private")
+    def private():
+        return jsonify({"early": request.headers.get("Early-Data")})
+
+    return app
+
+
+def _start(server_cls, kind):
+    port = _free_port(kind)
+    server = server_cls(
+        app=_build_app(),
+        server_identity="server-1",
+        server_lt_sk=SERVER_LT_SECRET_KEY,
+        pdk_key_id="key-1",
+        host="127.0.0.1",
+        port=port,
+    )
+    threading.Thread(target=server.start, daemon=True).start()
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        if kind == socket.SOCK_DGRAM:
+            if server.sock.getsockname()[1] == port:
+                break
+        else:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                    break
+            except OSError:
+                pass
+        time.sleep(0.02)
+    return server, port
+
+
+@pytest.mark.parametrize(
+    "server_cls, transport",
+    [
+        (KEMTLSTCPServer, "tcp"),
+        (AsyncKEMTLSTCPServer, "tcp"),
+        (KEMTLSQUICServer, "quic"),
+    ],
+)
+def test_resumed_get_is_answered_from_early_data(server_cls, transport):
+    server, port = _start(server_cls, socket.SOCK_DGRAM if transport == "quic" else socket.SOCK_STREAM)
+    cache = TicketCache()
+
+    def _get(path):
+        client = KEMTLSHttpClient(
+            pdk_store=_pdk_store(),
+            expected_identity="server-1",
+            mode="pdk",
+            transport=transport,
+            ticket_cache=cache,
+            early_data=True,
+        )
+        try:
+            return client.get(f"kemtls://127.0.0.1:{port}{path}")
+        finally:
+            client.close()
+
+    try:
+        first = _get("/jwks")
+        resumed = _get("/jwks")
+        private = _get("/private")
+
+        assert first["body"] == {"early": None}
+        assert resumed["body"] == {"early": "1"}
+        assert resumed["kemtls_metadata"]["mode"] == "psk"
+        # Not allow-listed: the client does not offer it as early data at all.
+        assert private["status"] == 200
+        assert private["body"] == {"early": None}
+        assert server.early_data.get_metrics()["accepted"] == 1
+    finally:
+        server.stop()
@@ -2,7 +2,8 @@ import pytest
 
 from crypto.ml_dsa import MLDSA65
 from crypto.ml_kem import MLKEM768
-from kemtls.certs import create_certificate
+from kemtls._wire import VERSION_BINARY, VERSION_JSON, decode_handshake_message
+from kemtls.certs import CertificateCache, create_certificate
 from kemtls.handshake import ClientHandshake, ServerHandshake
 from utils.serialization import deserialize_message, serialize_message
 
@@ -119,3 +120,88 @@ def test_baseline_handshake_rejects_tampered_server_finished(monkeypatch):
 
     with pytest.raises(ValueError, match="ServerFinished MAC verification failed"):
         client.process_server_finished(serialize_message(sf), session_client)
+
+
+def _run_baseline(cert, cache, versions):
+    server = ServerHandshake(server_identity="server-1", server_lt_sk=SERVER_LT_SECRET_KEY, cert=cert)
+    client = ClientHandshake(
+        expected_identity="server-1",
+        ca_pk=CA_PUBLIC_KEY,
+        mode="baseline",
+        versions=versions,
+        cert_cache=cache,
+    )
+    sh = server.process_client_hello(client.client_hello())
+    cke, session_client = client.process_server_hello(sh)
+    sf = server.process_client_key_exchange(cke)
+    session_client = client.process_server_finished(sf, session_client)
+    session_server = server.verify_client_finished(client.client_finished())
+    return sh, session_client, session_server
+
+
+@pytest.mark.parametrize("versions", [[VERSION_JSON], [VERSION_BINARY]])
+def test_cached_certificate_is_sent_by_reference(versions):
+    cert = create_certificate(
+        subject="server-1",
+        kem_pk=SERVER_LT_PUBLIC_KEY,
+        ca_sk=CA_SECRET_KEY,
+        issuer="Root CA",
+        valid_from=0,
+        valid_to=4_000_000_000,
+    )
+    cache = CertificateCache()
+
+    full_sh, _, _ = _run_baseline(cert, cache, versions)
+    sh, session_client, session_server = _run_baseline(cert, cache, versions)
+
+    assert "cert" in decode_handshake_message(full_sh)
+    assert "cert" not in decode_handshake_message(sh)
+    assert len(sh) < len(full_sh) // 2
+    assert session_client.client_write_key == session_server.client_write_key
+    assert session_client.session_binding_id == session_server.session_binding_id
+    assert cache.get_metrics()["hits"] == 1
+
+
+def test_stale_cached_certificate_gets_the_full_certificate():
+    old_cert, new_cert = (
+        create_certificate(
+            subject="server-1",
+            kem_pk=SERVER_LT_PUBLIC_KEY,
+            ca_sk=CA_SECRET_KEY,
+            issuer="Root CA",
+            valid_from=0,
+            valid_to=valid_to,
+        )
+        for valid_to in (4_000_000_000, 4_000_000_001)
+    )
+    cache = CertificateCache()
+    _run_baseline(old_cert, cache, None)
+
+    sh, session_client, session_server = _run_baseline(new_cert, cache, None)
+
+    assert deserialize_message(sh)["cert"] == new_cert
+    assert session_client.session_binding_id == session_server.session_binding_id
+
+
+def test_client_rejects_reference_to_a_certificate_it_did_not_offer():
+    cert = create_certificate(
+        subject="server-1",
+        kem_pk=SERVER_LT_PUBLIC_KEY,
+        ca_sk=CA_SECRET_KEY,
+        issuer="Root CA",
+        valid_from=0,
+        valid_to=4_000_000_000,
+    )
+    cache = CertificateCache()
+    _run_baseline(cert, cache, None)
+    server = ServerHandshake(server_identity="server-1", server_lt_sk=SERVER_LT_SECRET_KEY, cert=cert)
+    sh = server.process_client_hello(
+        ClientHandshake(expected_identity="server-1", ca_pk=CA_PUBLIC_KEY, mode="baseline", cert_cache=cache).client_hello()
+    )
+    fresh_client = ClientHandshake(
+        expected_identity="server-1", ca_pk=CA_PUBLIC_KEY, mode="baseline", cert_cache=CertificateCache()
+    )
+    fresh_client.client_hello()
+
+    with pytest.raises(ValueError, match="did not offer"):
+        fresh_client.process_server_hello(sh)
@@ -0,0 +1,102 @@
+import pytest
+
+from crypto.ml_dsa import MLDSA65
+from crypto.ml_kem import MLKEM768
+from kemtls._wire import VERSION_BINARY, VERSION_JSON, decode_message, encode_message, is_binary_message
+from kemtls.certs import create_certificate
+from kemtls.handshake import ClientHandshake, ServerHandshake, _encode_client_key_exchange
+
+
+CA_PUBLIC_KEY, CA_SECRET_KEY = MLDSA65.generate_keypair()
+SERVER_LT_PUBLIC_KEY, SERVER_LT_SECRET_KEY = MLKEM768.generate_keypair()
+CERT = create_certificate(
+    subject="server-1",
+    kem_pk=SERVER_LT_PUBLIC_KEY,
+    ca_sk=CA_SECRET_KEY,
+    issuer="Root CA",
+    valid_from=0,
+    valid_to=4_000_000_000,
+)
+
+
+def _run_handshake(client, server):
+    ch = client.client_hello()
+    sh = server.process_client_hello(ch)
+    cke, session_client = client.process_server_hello(sh)
+    sf = server.process_client_key_exchange(cke)
+    session_client = client.process_server_finished(sf, session_client)
+    cf = client.client_finished()
+    session_server = server.verify_client_finished(cf)
+    return [ch, sh, cke, sf, cf], session_client, session_server
+
+
+def test_binary_version_is_negotiated_and_derives_matching_keys():
+    client = ClientHandshake("server-1", ca_pk=CA_PUBLIC_KEY, mode="baseline", versions=[VERSION_BINARY, VERSION_JSON])
+    server = ServerHandshake("server-1", SERVER_LT_SECRET_KEY, cert=CERT)
+
+    messages, session_client, session_server = _run_handshake(client, server)
+
+    assert client.version == server.version == VERSION_BINARY
+    assert not is_binary_message(messages[0])
+    assert all(is_binary_message(message) for message in messages[1:])
+    assert session_client.client_app_secret == session_server.client_app_secret
+    assert session_client.session_binding_id == session_server.session_binding_id
+    assert session_server.handshake_mode == "baseline"
+
+
+def test_binary_format_is_smaller_than_json():
+    json_messages, _, _ = _run_handshake(
+        ClientHandshake("server-1", ca_pk=CA_PUBLIC_KEY, mode="baseline"),
+        ServerHandshake("server-1", SERVER_LT_SECRET_KEY, cert=CERT),
+    )
+    binary_messages, _, _ = _run_handshake(
+        ClientHandshake("server-1", ca_pk=CA_PUBLIC_KEY, mode="baseline", versions=[VERSION_BINARY]),
+        ServerHandshake("server-1", SERVER_LT_SECRET_KEY, cert=CERT),
+    )
+
+    # ClientKeyExchange carries two raw 1088-byte ciphertexts plus framing.
+    assert len(binary_messages[2]) == 1 + 2 * (3 + MLKEM768.CIPHERTEXT_SIZE)
+    assert sum(map(len, binary_messages)) < sum(map(len, json_messages))
+
+
+def test_legacy_client_keeps_json_with_new_server():
+    client = ClientHandshake("server-1", ca_pk=CA_PUBLIC_KEY, mode="baseline")
+    server = ServerHandshake("server-1", SERVER_LT_SECRET_KEY, cert=CERT)
+
+    messages, _, _ = _run_handshake(client, server)
+
+    assert server.version == VERSION_JSON
+    assert not any(is_binary_message(message) for message in messages)
+
+
+def test_binary_only_client_rejects_json_only_server():
+    client = ClientHandshake("server-1", ca_pk=CA_PUBLIC_KEY, mode="baseline", versions=[VERSION_BINARY])
+    server = ServerHandshake("server-1", SERVER_LT_SECRET_KEY, cert=CERT, versions=[VERSION_JSON])
+
+    with pytest.raises(ValueError, match="Incompatible KEMTLS version"):
+        server.process_client_hello(client.client_hello())
+
+
+def test_server_rejects_wire_format_downgrade_after_negotiation():
+    client = ClientHandshake("server-1", ca_pk=CA_PUBLIC_KEY, mode="baseline", versions=[VERSION_BINARY])
+    server = ServerHandshake("server-1", SERVER_LT_SECRET_KEY, cert=CERT)
+    server.process_client_hello(client.client_hello())
+
+    json_cke = _encode_client_key_exchange(b"\x00" * MLKEM768.CIPHERTEXT_SIZE, b"\x00" * MLKEM768.CIPHERTEXT_SIZE)
+    with pytest.raises(ValueError, match="negotiated version"):
+        server.process_client_key_exchange(json_cke)
+
+
+def test_tlv_roundtrip_and_truncation():
+    encoded = encode_message({"type": "ServerHello", "session_id": "abc", "mode": "pdk", "eph_pk": b"\x01\x02", "key_id": "k1"})
+    decoded = decode_message(encoded)
+    assert decoded == {
+        "type": "ServerHello",
+        "version": VERSION_BINARY,
+        "session_id": "abc",
+        "mode": "pdk",
+        "eph_pk": b"\x01\x02",
+        "key_id": "k1",
+    }
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_message(encoded[:-1])
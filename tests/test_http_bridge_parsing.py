@@ -2,7 +2,7 @@ import pytest
 
 import rust_ext
 from client.kemtls_http_client import KEMTLSHttpClient
-from kemtls._http_bridge import parse_http_request
+from kemtls._http_bridge import HTTPRequestFramer, parse_http_request
 
 
 def _run_with_python_fallback(monkeypatch, fn, *args):
@@ -43,6 +43,28 @@ def test_parse_http_request_rejects_malformed_request_line():
         parse_http_request(b"BROKEN\r\nHost: test\r\n\r\n")
 
 
+def test_framer_splits_pipelined_requests_and_waits_for_bodies():
+    framer = HTTPRequestFramer()
+    first = b"GET /a HTTP/1.1\r\nHost: x\r\n\r\n"
+    second = b"POST /b HTTP/1.1\r\nHost: x\r\nContent-Length: 5\r\n\r\nhello"
+
+    assert [r["path"] for r in framer.feed(first + second[:-3])] == ["/a"]
+    assert framer.pending
+    (completed,) = framer.feed(second[-3:])
+    assert completed["method"] == "POST"
+    assert completed["body"] == b"hello"
+    assert not framer.pending
+
+
+def test_framer_rejects_unsupported_framing():
+    with pytest.raises(ValueError, match="Chunked"):
+        HTTPRequestFramer().feed(b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n")
+    with pytest.raises(ValueError, match="Content-Length"):
+        HTTPRequestFramer().feed(b"POST / HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+    with pytest.raises(ValueError, match="too large"):
+        HTTPRequestFramer(max_buffer=16).feed(b"GET / HTTP/1.1\r\nHost: a-long-host-name")
+
+
 def test_parse_http_request_rust_matches_python_fallback(monkeypatch):
     raw_request = (
         b"GET /openid-configuration HTTP/1.1\r\n"
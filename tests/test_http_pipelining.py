@@ -0,0 +1,87 @@
+import socket
+import threading
+import time
+
+import pytest
+from flask import Flask, jsonify, request
+
+from crypto.ml_kem import MLKEM768
+from kemtls.async_tcp_server import AsyncKEMTLSTCPServer
+from kemtls.pdk import PDKTrustStore
+from kemtls.tcp_server import KEMTLSTCPServer
+from kemtls.tcp_transport import KEMTLSTCPClientTransport, build_http_request
+
+
+SERVER_LT_PUBLIC_KEY, SERVER_LT_SECRET_KEY = MLKEM768.generate_keypair()
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _build_app():
+    app = Flask(__name__)
+
+    @app.route("/echo", methods=["GET", "POST"])
+    def echo():
+        return jsonify({"value": request.args.get("value") or request.get_data(as_text=True)})
+
+    return app
+
+
+def _connect(port):
+    store = PDKTrustStore()
+    store.add_entry("key-1", "server-1", SERVER_LT_PUBLIC_KEY)
+    transport = KEMTLSTCPClientTransport(expected_identity="server-1", pdk_store=store, mode="pdk")
+    transport.connect("127.0.0.1", port)
+    return transport
+
+
+def _request(path, *, body=b"", keep_alive=True):
+    return build_http_request("127.0.0.1", "POST" if body else "GET", path, body=body, keep_alive=keep_alive)
+
+
+@pytest.mark.parametrize("server_cls", [KEMTLSTCPServer, AsyncKEMTLSTCPServer])
+def test_pipelined_requests_are_answered_in_order(server_cls):
+    port = _free_port()
+    server = server_cls(
+        app=_build_app(),
+        server_identity="server-1",
+        server_lt_sk=SERVER_LT_SECRET_KEY,
+        pdk_key_id="key-1",
+        host="127.0.0.1",
+        port=port,
+    )
+    threading.Thread(target=server.start, daemon=True).start()
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                break
+        except OSError:
+            time.sleep(0.02)
+
+    transport = _connect(port)
+    try:
+        # Three requests in one record, the last one's body split into the next record.
+        posted = _request("/echo", body=b"posted")
+        transport.send_application(
+            _request("/echo?value=one") + _request("/echo?value=two") + posted[:-4]
+        )
+        transport.send_application(posted[-4:] + _request("/echo?value=last", keep_alive=False))
+
+        bodies = [transport.recv_application().rsplit(b"\r\n\r\n", 1)[1].strip() for _ in range(4)]
+        assert bodies == [
+            b'{"value":"one"}',
+            b'{"value":"two"}',
+            b'{"value":"posted"}',
+            b'{"value":"last"}',
+        ]
+        # "Connection: close" on the last request ends the session.
+        with pytest.raises(EOFError):
+            transport.recv_application()
+    finally:
+        transport.close()
+        server.stop()
@@ -1,8 +1,13 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from flask import Flask
 
 from crypto.ml_dsa import MLDSA65
-from oidc.jwks import JWKSEndpoint
+from oidc.jwks import JWKSEndpoint, SigningKeyRing
+from oidc.jwt_handler import PQJWT
+from oidc.token_cache import VerifiedTokenCache
 
 
 def test_jwks_publishes_single_key_with_matching_kid():
@@ -56,3 +61,67 @@ def test_jwks_registers_route():
     assert response.status_code == 200
     payload = response.get_json()
     assert payload["keys"][0]["kid"] == "signing-key-1"
+
+
+def test_jwks_route_serves_etag_and_revalidates():
+    app = Flask(__name__)
+    endpoint = JWKSEndpoint({"signing-key-1": b"P" * MLDSA65.PUBLIC_KEY_SIZE}, max_age_seconds=60)
+    endpoint.register_routes(app)
+    client = app.test_client()
+
+    first = client.get("/jwks")
+    etag = first.headers["ETag"]
+    unchanged = client.get("/jwks", headers={"If-None-Match": etag})
+    endpoint.add_key("signing-key-2", b"Q" * MLDSA65.PUBLIC_KEY_SIZE)
+    changed = client.get("/jwks", headers={"If-None-Match": etag})
+
+    assert first.headers["Cache-Control"] == "public, max-age=60"
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert {entry["kid"] for entry in changed.get_json()["keys"]} == {"signing-key-1", "signing-key-2"}
+
+
+def test_key_ring_rotation_keeps_retiring_tokens_valid_until_removed():
+    old_pk, old_sk = MLDSA65.generate_keypair()
+    new_pk, new_sk = MLDSA65.generate_keypair()
+    ring = SigningKeyRing()
+    ring.add_key("old-key", old_pk, old_sk, activate=True)
+    jwt = PQJWT()
+    claims = {"iss": "https://issuer.example", "sub": "alice", "exp": int(time.time()) + 600}
+    old_token = jwt.create_access_token(claims, ring.signing_key()[1], kid=ring.active_kid)
+    cache = VerifiedTokenCache()
+    cache.validate(jwt, old_token, ring)
+
+    assert ring.rotate("new-key", new_pk, new_sk) == "old-key"
+    new_token = jwt.create_access_token(claims, ring.signing_key()[1], kid=ring.active_kid)
+
+    assert ring.retiring_kids == ["old-key"]
+    assert ring.get_jwks()["keys"][0]["kid"] == "new-key"
+    assert jwt.verify_jwt(new_token, ring)[0]["kid"] == "new-key"
+    # Rotation does not evict tokens the retiring key already verified.
+    assert cache.validate(jwt, old_token, ring)[1] is True
+
+    with pytest.raises(ValueError, match="active signing key"):
+        ring.remove_key("new-key")
+    ring.remove_key("old-key")
+
+    with pytest.raises(ValueError, match="unknown JWT signing key"):
+        cache.validate(jwt, old_token, ring)
+    assert cache.validate(jwt, new_token, ring)[0]["sub"] == "alice"
+
+
+
+def test_key_ring_concurrent_rotations_each_retire_a_distinct_key():
+    public_key = b"P" * MLDSA65.PUBLIC_KEY_SIZE
+    secret_key = b"S" * MLDSA65.SECRET_KEY_SIZE
+    ring = SigningKeyRing()
+    ring.add_key("key-0", public_key, secret_key, activate=True)
+    kids = [f"key-{index}" for index in range(1, 33)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        previous = list(executor.map(lambda kid: ring.rotate(kid, public_key, secret_key), kids))
+
+    # Rotations form one chain: every key but the final active one was retired exactly once.
+    assert sorted(previous) == sorted(set(["key-0"] + kids) - {ring.active_kid})
+    assert ring.signing_key() == (ring.active_kid, secret_key)
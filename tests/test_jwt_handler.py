@@ -3,6 +3,7 @@ import time
 import pytest
 
 from crypto.ml_dsa import MLDSA65
+from crypto.executor import CryptoExecutor
 from utils.encoding import base64url_encode
 from oidc.jwt_handler import ACCESS_TOKEN_TYPE, ID_TOKEN_TYPE, PQJWT
 from oidc.session_binding import build_access_token_binding_claim
@@ -215,3 +216,39 @@ def test_extract_confirmation_claim_handles_missing_or_bad_tokens(pqjwt, mldsa_k
         ),
     )
     assert pqjwt.extract_confirmation_claim(token)["kmt"] == "kemtls-exporter-v1"
+
+
+@pytest.mark.parametrize("kind", ["inline", "thread"])
+def test_verify_many_returns_per_token_results_in_input_order(kind, mldsa_keypair):
+    public_key, secret_key = mldsa_keypair
+    other_public_key, other_secret_key = MLDSA65.generate_keypair()
+    executor = CryptoExecutor(kind=kind, max_workers=2)
+    pqjwt = PQJWT(crypto_executor=executor)
+    claims = {"iss": "https://issuer.example", "exp": int(time.time()) + 600}
+    alice = pqjwt.create_access_token({**claims, "sub": "alice"}, secret_key)
+    bob = pqjwt.create_access_token({**claims, "sub": "bob"}, other_secret_key, kid="key-2")
+    unknown_kid = pqjwt.create_access_token({**claims, "sub": "carol"}, secret_key, kid="key-9")
+    header_b64, payload_b64, _ = bob.split(".")
+    forged = f"{header_b64}.{payload_b64}.{alice.split('.')[2]}"
+    id_token = pqjwt.create_id_token({**claims, "sub": "dave"}, secret_key)
+
+    signed = executor.get_metrics()["submitted"]
+    try:
+        results = pqjwt.verify_many(
+            [alice, "not-a-jwt", bob, forged, alice, unknown_kid, id_token],
+            {"signing-key-1": public_key, "key-2": other_public_key},
+            expected_type=ACCESS_TOKEN_TYPE,
+        )
+        metrics = executor.get_metrics()
+    finally:
+        executor.shutdown()
+
+    assert [r[1]["sub"] for r in results if isinstance(r, tuple)] == ["alice", "bob", "alice"]
+    assert results[0] is results[4]
+    assert isinstance(results[1], ValueError)
+    assert str(results[3]) == "invalid JWT signature"
+    assert "unknown JWT signing key" in str(results[5])
+    assert "unexpected JWT type" in str(results[6])
+    # alice (deduplicated), bob and the forged token reach ML-DSA.
+    assert metrics["submitted"] - signed == 3
+
@@ -2,6 +2,7 @@ import pytest
 
 from crypto.key_schedule import (
     HASH_LEN,
+    TranscriptHash,
     compute_transcript_hash,
     derive_application_traffic_secrets,
     derive_finished_keys,
@@ -21,6 +22,33 @@ def test_transcript_hash_is_deterministic():
     assert len(first) == HASH_LEN
 
 
+def test_running_transcript_matches_prefix_hashes():
+    messages = [b"ClientHello", b"ServerHello" * 100, b"ClientKeyExchange", b"ServerFinished"]
+    transcript = TranscriptHash()
+    for message in messages:
+        transcript.append(message)
+
+    for count in range(len(messages) + 1):
+        assert transcript.digest_at(count) == compute_transcript_hash(messages[:count])
+    assert transcript.digest() == compute_transcript_hash(messages)
+    assert transcript[1] == messages[1]
+    assert len(transcript) == len(messages)
+
+
+def test_forked_transcript_diverges_independently():
+    transcript = TranscriptHash()
+    transcript.append(b"ClientHello")
+    fork = transcript.fork()
+
+    transcript.append(b"ServerHello")
+    fork.append(b"HelloRetry")
+
+    assert transcript.digest() == compute_transcript_hash([b"ClientHello", b"ServerHello"])
+    assert fork.digest() == compute_transcript_hash([b"ClientHello", b"HelloRetry"])
+    with pytest.raises(IndexError):
+        fork.digest_at(3)
+
+
 def test_hkdf_expand_label_separates_labels():
     secret = b"\x01" * HASH_LEN
     context = b"\x02" * HASH_LEN
@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+from crypto.ml_kem import MLKEM768
+from kemtls.handshake import ServerHandshake
+from kemtls.keypool import EphemeralKeyPool
+from telemetry.collector import KEMTLSHandshakeCollector
+
+
+SERVER_LT_PUBLIC_KEY, SERVER_LT_SECRET_KEY = MLKEM768.generate_keypair()
+
+
+def _counting_generator():
+    counter = {"n": 0}
+
+    def _generate():
+        counter["n"] += 1
+        index = counter["n"].to_bytes(4, "big")
+        return b"pk" + index, b"sk" + index
+
+    return _generate
+
+
+def _wait_for_size(pool, size, timeout=2.0):
+    deadline = time.time() + timeout
+    while len(pool) < size and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_prefilled_pool_hands_out_each_keypair_once():
+    pool = EphemeralKeyPool(target_size=4, low_water=1, generator=_counting_generator(), prefill=True)
+    try:
+        seen = set()
+        for _ in range(4):
+            public_key, secret_key, hit = pool.acquire()
+            assert hit is True
+            assert (public_key, secret_key) not in seen
+            seen.add((public_key, secret_key))
+        assert pool.get_metrics()["hits"] == 4
+    finally:
+        pool.close()
+
+
+def test_pool_refills_in_background_after_low_water():
+    pool = EphemeralKeyPool(target_size=4, low_water=2, generator=_counting_generator())
+    try:
+        pool.start()
+        _wait_for_size(pool, 4)
+        assert len(pool) == 4
+        pool.acquire()
+        pool.acquire()
+        _wait_for_size(pool, 4)
+        assert len(pool) == 4
+        assert pool.get_metrics()["generated"] >= 6
+    finally:
+        pool.close()
+
+
+def test_empty_pool_falls_back_to_inline_generation():
+    pool = EphemeralKeyPool(target_size=2, low_water=0, generator=_counting_generator())
+    pool.close()
+    public_key, secret_key, hit = pool.acquire()
+    assert hit is False
+    assert public_key.startswith(b"pk") and secret_key.startswith(b"sk")
+    assert pool.get_metrics()["misses"] == 1
+
+
+def test_pool_rejects_invalid_low_water():
+    with pytest.raises(ValueError, match="low_water"):
+        EphemeralKeyPool(target_size=2, low_water=2)
+
+
+def test_server_handshake_reports_pool_hits_to_collector():
+    pool = EphemeralKeyPool(target_size=2, low_water=0, prefill=True)
+    try:
+        collector = KEMTLSHandshakeCollector()
+        handshake = ServerHandshake(
+            "server-1",
+            SERVER_LT_SECRET_KEY,
+            pdk_key_id="key-1",
+            collector=collector,
+            key_pool=pool,
+        )
+        assert len(handshake.eph_pk) == MLKEM768.PUBLIC_KEY_SIZE
+        metrics = collector.get_metrics()
+        assert metrics["eph_keypool_hits"] == 1
+        assert metrics["eph_keypool_misses"] == 0
+    finally:
+        pool.close()
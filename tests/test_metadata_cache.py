@@ -0,0 +1,106 @@
+import threading
+from urllib.parse import urlparse
+
+from flask import Flask
+
+from client.metadata_cache import MetadataCache
+from oidc.discovery import DiscoveryEndpoint
+from oidc.jwks import JWKSEndpoint, SigningKeyRing
+
+
+ISSUER = "kemtls://127.0.0.1:4433"
+
+
+class _AppHttpClient:
+    """KEMTLSHttpClient-shaped adapter over a Flask test client."""
+
+    def __init__(self, app, delay_event=None):
+        self.client = app.test_client()
+        self.requests = []
+        self.delay_event = delay_event
+
+    def get(self, url, headers=None, params=None):
+        if self.delay_event is not None:
+            self.delay_event.wait(5)
+        self.requests.append((url, dict(headers or {})))
+        response = self.client.get(urlparse(url).path, headers=headers or {})
+        return {
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "body": response.get_json(silent=True) or response.get_data(),
+        }
+
+
+def _issuer_app(mldsa_keypair, max_age_seconds=60):
+    public_key, secret_key = mldsa_keypair
+    ring = SigningKeyRing()
+    ring.add_key("signing-key-1", public_key, secret_key, activate=True)
+    app = Flask(__name__)
+    discovery = DiscoveryEndpoint(ISSUER, max_age_seconds=max_age_seconds)
+    discovery.register_routes(app)
+    JWKSEndpoint(key_ring=ring, max_age_seconds=max_age_seconds).register_routes(app)
+    return app, discovery
+
+
+def test_metadata_cache_serves_fresh_entries_and_revalidates_stale_ones(monkeypatch, mldsa_keypair):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr("client.metadata_cache.time.monotonic", lambda: clock["now"])
+    app, discovery = _issuer_app(mldsa_keypair)
+    http = _AppHttpClient(app)
+    cache = MetadataCache()
+
+    first = cache.get_configuration(http, ISSUER)
+    assert cache.get_configuration(http, ISSUER + "/") is first
+    assert len(http.requests) == 1
+
+    clock["now"] += 61
+    assert cache.get_configuration(http, ISSUER) is first
+    assert http.requests[-1][1]["If-None-Match"]
+
+    clock["now"] += 61
+    discovery.scopes_supported.append("offline_access")
+    assert "offline_access" in cache.get_configuration(http, ISSUER)["scopes_supported"]
+    assert cache.get_metrics() == {
+        "entries": 1,
+        "hits": 1,
+        "fetches": 2,
+        "revalidated": 1,
+        "coalesced": 0,
+    }
+
+
+def test_metadata_cache_coalesces_concurrent_refreshes(mldsa_keypair):
+    app, _ = _issuer_app(mldsa_keypair)
+    release = threading.Event()
+    http = _AppHttpClient(app, delay_event=release)
+    cache = MetadataCache()
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_configuration(http, ISSUER)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while cache.get_metrics()["coalesced"] < 4:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(http.requests) == 1
+    assert len(results) == 5 and all(result is results[0] for result in results)
+
+
+def test_metadata_cache_resolves_signing_keys_from_jwks(mldsa_keypair):
+    app, _ = _issuer_app(mldsa_keypair)
+    http = _AppHttpClient(app)
+    cache = MetadataCache()
+
+    keys = cache.get_signing_keys(http, ISSUER)
+
+    assert keys == {"signing-key-1": mldsa_keypair[0]}
+    assert [url for url, _ in http.requests] == [
+        f"{ISSUER}/.well-known/openid-configuration",
+        f"{ISSUER}/jwks",
+    ]
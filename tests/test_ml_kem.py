@@ -38,3 +38,84 @@ def test_different_encapsulations_can_produce_distinct_values(monkeypatch):
 
     assert ciphertext_1 != ciphertext_2
     assert shared_secret_1 != shared_secret_2
+
+
+def test_backend_is_resolved_once_per_process(monkeypatch):
+    from crypto import ml_kem
+
+    calls = []
+
+    def _no_oqs():
+        calls.append(1)
+        return None
+
+    monkeypatch.setattr("crypto.ml_kem._load_oqs", _no_oqs)
+    monkeypatch.delenv(ml_kem.BACKEND_ENV, raising=False)
+    ml_kem.configure_backend(None)
+    try:
+        public_key, secret_key = MLKEM768.generate_keypair()
+        ciphertext, shared_secret = MLKEM768.encapsulate(public_key)
+        assert MLKEM768.decapsulate(secret_key, ciphertext) == shared_secret
+        assert ml_kem.get_backend_name() == "pqcrypto"
+        assert len(calls) == 1
+    finally:
+        ml_kem.configure_backend(None)
+
+
+def test_backend_override_is_honoured(monkeypatch):
+    from crypto import ml_kem
+
+    monkeypatch.setattr("crypto.ml_kem._load_oqs", lambda: None)
+    try:
+        ml_kem.configure_backend("oqs")
+        with pytest.raises(RuntimeError, match="'oqs' was requested"):
+            MLKEM768.generate_keypair()
+
+        ml_kem.configure_backend(None)
+        monkeypatch.setenv(ml_kem.BACKEND_ENV, "pqcrypto")
+        assert ml_kem.get_backend_name() == "pqcrypto"
+
+        with pytest.raises(ValueError, match="Unsupported ML-KEM backend"):
+            ml_kem.configure_backend("rsa")
+    finally:
+        ml_kem.configure_backend(None)
+
+
+def test_oqs_keygen_frees_its_context(monkeypatch):
+    from crypto import ml_kem
+
+    contexts = []
+
+    class _FakeKEM:
+        def __init__(self, algorithm, secret_key=None):
+            self.secret_key = secret_key
+            self.freed = False
+            contexts.append(self)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self.freed = True
+            self.secret_key = None
+
+        def generate_keypair(self):
+            self.secret_key = b"s" * MLKEM768.SECRET_KEY_SIZE
+            return b"p" * MLKEM768.PUBLIC_KEY_SIZE
+
+        def export_secret_key(self):
+            return self.secret_key
+
+    class _FakeOQS:
+        KeyEncapsulation = _FakeKEM
+
+    monkeypatch.setattr("crypto.ml_kem._load_oqs", lambda: _FakeOQS)
+    ml_kem.configure_backend("oqs")
+    try:
+        MLKEM768.generate_keypair()
+        MLKEM768.generate_keypair()
+    finally:
+        ml_kem.configure_backend(None)
+
+    assert len(contexts) == 2
+    assert all(context.freed and context.secret_key is None for context in contexts)
@@ -1,9 +1,16 @@
 import json
+import multiprocessing
+import socket
 import threading
 import time
 from pathlib import Path
 
+import pytest
+from flask import Flask, jsonify, request
+
 from client.kemtls_http_client import KEMTLSHttpClient
+from crypto.ml_kem import MLKEM768
+from kemtls.keypool import EphemeralKeyPool
 from kemtls.pdk import PDKTrustStore
 from kemtls.quic_server import KEMTLSQUICServer
 from oidc.auth_endpoints import InMemoryClientRegistry
@@ -96,3 +103,132 @@ def test_quic_handshake_and_discovery_metadata():
     finally:
         client.close()
         server.stop()
+
+
+def test_quic_response_larger_than_one_datagram():
+    material = _load_material()
+    port = 45434
+    blob = "".join(chr(ord("a") + i % 26) for i in range(200_000))
+
+    app = Flask(__name__)
+
+    @app.post("/echo")
+    def echo():
+        return jsonify({"blob": blob, "echo_length": len(request.get_data())})
+
+    server = KEMTLSQUICServer(
+        app=app,
+        server_identity="auth-server",
+        server_lt_sk=material["auth_lt_sk"],
+        cert=material["auth_cert"],
+        pdk_key_id=material["auth_pdk_key_id"],
+        host="127.0.0.1",
+        port=port,
+    )
+    thread = threading.Thread(target=server.start, daemon=True)
+    thread.start()
+    time.sleep(0.2)
+
+    client = KEMTLSHttpClient(
+        ca_pk=material["ca_pk"],
+        pdk_store=material["pdk_store"],
+        expected_identity="auth-server",
+        mode="baseline",
+        transport="quic",
+    )
+
+    try:
+        response = client.request("POST", f"kemtls://127.0.0.1:{port}/echo", body=b"y" * 10_000)
+        assert response["status"] == 200
+        assert response["body"]["blob"] == blob
+        assert response["body"]["echo_length"] == 10_000
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_quic_multi_worker_server_routes_each_connection():
+    material = _load_material()
+    port = 45435
+
+    app = Flask(__name__)
+
+    @app.get("/whoami")
+    def whoami():
+        import os
+
+        return jsonify({"pid": os.getpid()})
+
+    server = KEMTLSQUICServer(
+        app=app,
+        server_identity="auth-server",
+        server_lt_sk=material["auth_lt_sk"],
+        cert=material["auth_cert"],
+        pdk_key_id=material["auth_pdk_key_id"],
+        host="127.0.0.1",
+        port=port,
+        workers=2,
+    )
+    thread = threading.Thread(target=server.start, daemon=True)
+    thread.start()
+    time.sleep(0.5)
+
+    pids = set()
+    try:
+        for _ in range(6):
+            client = KEMTLSHttpClient(
+                ca_pk=material["ca_pk"],
+                pdk_store=material["pdk_store"],
+                expected_identity="auth-server",
+                mode="baseline",
+                transport="quic",
+            )
+            try:
+                response = client.request("GET", f"kemtls://127.0.0.1:{port}/whoami")
+                assert response["status"] == 200
+                pids.add(response["body"]["pid"])
+            finally:
+                client.close()
+        assert len(pids) >= 1
+        assert all(process.is_alive() for process in server._worker_processes)
+    finally:
+        server.stop()
+        thread.join(timeout=5)
+
+
+def test_quic_workers_never_share_ephemeral_keys():
+    def _server(key_pool, port=0):
+        return KEMTLSQUICServer(
+            app=Flask(__name__),
+            server_identity="auth-server",
+            server_lt_sk=b"",
+            host="127.0.0.1",
+            port=port,
+            workers=2,
+            key_pool=key_pool,
+        )
+
+    with pytest.raises(ValueError, match="empty key pool"):
+        _server(EphemeralKeyPool(target_size=2, low_water=0, prefill=True))
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    key_pool = EphemeralKeyPool(target_size=2, low_water=0, generator=MLKEM768.generate_keypair)
+    server = _server(key_pool, port)
+    # Filled after construction, as a pool shared with another server could be.
+    key_pool._fill_to_target()
+    parent_keys = {public_key for public_key, _ in key_pool._keys}
+
+    reports = multiprocessing.get_context("fork").Queue()
+    server._serve = lambda: reports.put((server.worker_index, server.key_pool.acquire()[0]))
+    try:
+        server.start()
+        first_keys = dict(reports.get(timeout=5) for _ in range(2))
+    finally:
+        server.stop()
+        key_pool.close()
+
+    assert sorted(first_keys) == [0, 1]
+    assert first_keys[0] != first_keys[1]
+    assert not parent_keys & set(first_keys.values())
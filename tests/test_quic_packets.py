@@ -6,9 +6,17 @@ from kemtls.quic_packets import (
     CONNECTION_CLOSE,
     HANDSHAKE,
     INITIAL,
+    AckFrame,
     QUICPacket,
+    StreamFrame,
+    ack_ranges,
+    decode_ack_frame,
     decode_packet,
+    decode_stream_frame,
+    encode_ack_frame,
     encode_packet,
+    encode_stream_frame,
+    split_stream,
 )
 
 
@@ -88,3 +96,52 @@ def test_encode_packet_rejects_empty_connection_id():
             packet_number=0,
             payload=b"",
         )
+
+
+def test_stream_frame_roundtrip():
+    frame = StreamFrame(stream_id=3, offset=1024, data=b"chunk", fin=True)
+
+    assert decode_stream_frame(encode_stream_frame(frame)) == frame
+
+
+def test_decode_stream_frame_rejects_unknown_flags():
+    encoded = bytearray(encode_stream_frame(StreamFrame(stream_id=0, offset=0, data=b"x")))
+    encoded[0] = 0x80
+
+    with pytest.raises(ValueError, match="unsupported stream frame flags"):
+        decode_stream_frame(bytes(encoded))
+
+
+def test_split_stream_sets_offsets_and_fin_on_last_frame():
+    frames = split_stream(7, b"abcdefghij", 4)
+
+    assert [(frame.offset, frame.data, frame.fin) for frame in frames] == [
+        (0, b"abcd", False),
+        (4, b"efgh", False),
+        (8, b"ij", True),
+    ]
+    assert {frame.stream_id for frame in frames} == {7}
+    assert split_stream(0, b"", 4) == [StreamFrame(stream_id=0, offset=0, data=b"", fin=True)]
+
+
+def test_ack_frame_roundtrip_with_gaps():
+    ranges = ack_ranges([0, 1, 2, 5, 6, 9])
+    assert ranges == [(9, 9), (5, 6), (0, 2)]
+
+    frame = AckFrame(ranges=tuple(ranges), ack_delay_us=1500)
+    decoded = decode_ack_frame(encode_ack_frame(frame))
+
+    assert decoded == frame
+    assert decoded.largest == 9
+
+
+def test_encode_ack_frame_rejects_overlapping_ranges():
+    with pytest.raises(ValueError, match="disjoint"):
+        encode_ack_frame(AckFrame(ranges=((5, 9), (4, 5))))
+
+
+def test_decode_ack_frame_rejects_truncated_blocks():
+    encoded = encode_ack_frame(AckFrame(ranges=((8, 9), (0, 3))))
+
+    with pytest.raises(ValueError, match="length mismatch"):
+        decode_ack_frame(encoded[:-1])
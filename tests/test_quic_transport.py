@@ -1,8 +1,39 @@
 from types import SimpleNamespace
 
-from kemtls.quic_packets import HANDSHAKE, QUICPacket
-from kemtls.quic_state import QUICConnectionState
+import pytest
+
+from kemtls.quic_packets import (
+    ACK,
+    APP_DATA,
+    HANDSHAKE,
+    INITIAL,
+    AckFrame,
+    QUICPacket,
+    StreamFrame,
+    decode_packet,
+    encode_ack_frame,
+    encode_packet,
+    encode_stream_frame,
+    split_stream,
+)
+from kemtls.quic_state import (
+    INITIAL_RTO_S,
+    MIN_RTO_S,
+    PacketNumberWindow,
+    QUICConnectionState,
+    RetransmissionTimer,
+    RttEstimator,
+    StreamReassembler,
+)
+from kemtls._datagram import DatagramIO
 from kemtls.quic_client import KEMTLSQUICClientTransport
+from kemtls.quic_workers import (
+    SERVER_CONNECTION_ID_LEN,
+    connection_id_worker,
+    issue_connection_id,
+    unwrap_forwarded,
+    wrap_forwarded,
+)
 
 
 def test_quic_connection_state_tracks_out_of_order_packets():
@@ -14,7 +45,51 @@ def test_quic_connection_state_tracks_out_of_order_packets():
 
     assert state.recv_packet_number == 5
     assert state.pending_acks == {3, 4, 5}
-    assert state.received_packets == {3, 4, 5}
+    assert set(state.received_packets) == {3, 4, 5}
+
+
+def test_unauthenticated_packets_do_not_advance_the_duplicate_window():
+    state = QUICConnectionState(connection_id=b"conn-1")
+
+    assert state.note_received_packet(1 << 40, authenticated=False)
+    assert state.note_received_packet(0, authenticated=False)
+    assert state.note_received_packet(0)
+    assert not state.note_received_packet(0, authenticated=False)
+
+    assert state.recv_packet_number == 0
+    assert set(state.received_packets) == {0}
+    assert state.pending_acks == {0, 1 << 40}
+
+
+def test_quic_connection_state_delays_acks_until_due():
+    state = QUICConnectionState(connection_id=b"conn-1")
+
+    assert state.note_received_packet(4, now=10.0)
+    assert not state.ack_due(10.0)
+    assert state.ack_due(10.0 + 0.03)
+
+    state.note_received_packet(6, now=10.01)
+    state.note_received_packet(5, now=10.01)
+    assert not state.note_received_packet(5, now=10.01)
+    assert state.ack_due(10.01)
+
+    ranges, ack_delay_us = state.take_ack_ranges(now=10.02)
+    assert ranges == [(4, 6)]
+    assert ack_delay_us == 20000
+    assert state.pending_acks == set()
+    assert state.ack_deadline is None
+
+
+def test_quic_connection_state_acknowledges_ranges():
+    state = QUICConnectionState(connection_id=b"conn-1")
+    for packet_number in range(10):
+        state.schedule_retransmission(packet_number, deadline=1.0)
+
+    retired = state.acknowledge_ranges([(7, 20), (2, 3)])
+
+    assert sorted(retired) == [2, 3, 7, 8, 9]
+    assert sorted(state.retransmissions) == [0, 1, 4, 5, 6]
+    assert state.acknowledge_ranges([(2, 3)]) == []
 
 
 def test_quic_handshake_retransmits_after_timeout(monkeypatch):
@@ -28,6 +103,7 @@ def test_quic_handshake_retransmits_after_timeout(monkeypatch):
             sends.append(payload)
 
     transport.sock = DummySocket()
+    transport._io = DatagramIO(transport.sock, connected=True)
 
     packet_number = 11
     transport.pending_packets[packet_number] = {
@@ -68,3 +144,428 @@ def test_quic_handshake_retransmits_after_timeout(monkeypatch):
     assert packet.payload == b"server-hello"
     assert sends == [b"retransmit-me"]
     assert packet_number not in transport.pending_packets
+
+
+def test_stream_reassembler_reorders_frames_and_drops_duplicates():
+    reassembler = StreamReassembler()
+    first = split_stream(0, b"client-hello", 5)
+    second = split_stream(1, b"key-exchange", 5)
+
+    assert reassembler.push(HANDSHAKE, second[0], packet_number=3)
+    for frame in reversed(first):
+        assert reassembler.push(INITIAL, frame, packet_number=1)
+    assert not reassembler.push(INITIAL, first[0], packet_number=4)
+
+    message = reassembler.pop()
+    assert (message.packet_type, message.payload) == (INITIAL, b"client-hello")
+    assert reassembler.pop() is None
+
+    for frame in second[1:]:
+        reassembler.push(HANDSHAKE, frame, packet_number=5)
+    assert reassembler.pop().payload == b"key-exchange"
+    assert not reassembler.push(HANDSHAKE, second[1], packet_number=6)
+
+
+def test_stream_reassembler_rejects_conflicting_final_size():
+    reassembler = StreamReassembler()
+    head, tail = split_stream(0, b"abcdef", 3)
+    reassembler.push(APP_DATA, tail)
+
+    with pytest.raises(ValueError, match="final size"):
+        reassembler.push(APP_DATA, type(tail)(stream_id=0, offset=0, data=b"abcdefgh", fin=True))
+
+
+def test_stream_reassembler_rejects_overlapping_frames_on_arrival():
+    reassembler = StreamReassembler()
+    reassembler.push(APP_DATA, StreamFrame(stream_id=0, offset=0, data=b"abcd", fin=False))
+
+    with pytest.raises(ValueError, match="overlapping"):
+        reassembler.push(APP_DATA, StreamFrame(stream_id=0, offset=2, data=b"cdef", fin=False))
+    with pytest.raises(ValueError, match="overlapping"):
+        reassembler.push(APP_DATA, StreamFrame(stream_id=0, offset=0, data=b"ab", fin=False))
+    assert reassembler.buffered == 4
+
+
+def test_stream_reassembler_bounds_buffered_data():
+    reassembler = StreamReassembler(max_buffered_bytes=10, max_handshake_buffered_bytes=6)
+
+    with pytest.raises(ValueError, match="stream message too large"):
+        reassembler.push(INITIAL, StreamFrame(stream_id=0, offset=1 << 20, data=b"x", fin=False))
+
+    # Chunks with no FIN would otherwise be held forever.
+    reassembler.push(INITIAL, StreamFrame(stream_id=0, offset=100, data=b"xxxx", fin=False))
+    with pytest.raises(ValueError, match="buffered handshake data"):
+        reassembler.push(HANDSHAKE, StreamFrame(stream_id=1, offset=100, data=b"xxxx", fin=False))
+    reassembler.push(APP_DATA, StreamFrame(stream_id=2, offset=100, data=b"xxxxxx", fin=False))
+    with pytest.raises(ValueError, match="too much buffered stream data"):
+        reassembler.push(APP_DATA, StreamFrame(stream_id=3, offset=0, data=b"x", fin=False))
+
+    # Delivered messages release their share of the budget.
+    reassembler = StreamReassembler(max_buffered_bytes=10)
+    for _ in range(5):
+        stream_id = reassembler.next_stream_id
+        reassembler.push(APP_DATA, StreamFrame(stream_id=stream_id, offset=0, data=b"x" * 8, fin=True))
+        assert reassembler.pop().payload == b"x" * 8
+    assert reassembler.buffered == 0
+
+
+def test_send_message_packetizes_to_datagram_size(monkeypatch):
+    transport = KEMTLSQUICClientTransport(expected_identity="server-1")
+    sent = []
+
+    def fake_send_packet(*, packet_type, payload, epoch, reliable):
+        sent.append(payload)
+        return len(sent) - 1
+
+    monkeypatch.setattr(transport, "_send_packet", fake_send_packet)
+    transport._io = DatagramIO(None, connected=True)
+
+    packet_numbers = transport._send_message(packet_type=HANDSHAKE, payload=b"x" * 5000, epoch=0)
+
+    assert packet_numbers == list(range(len(sent)))
+    assert len(sent) == 5
+    assert all(len(payload) <= 1200 for payload in sent)
+
+
+def test_rtt_estimator_smooths_samples_and_bounds_rto():
+    rtt = RttEstimator()
+    assert rtt.rto == INITIAL_RTO_S
+
+    rtt.on_sample(0.100)
+    assert rtt.smoothed_rtt == 0.100
+    assert rtt.rttvar == 0.050
+
+    rtt.on_sample(0.120, ack_delay=0.010)
+    assert rtt.smoothed_rtt == 0.875 * 0.100 + 0.125 * 0.110
+    assert rtt.backoff(2) == min(2.0, rtt.rto * 4)
+
+    fast = RttEstimator()
+    fast.on_sample(0.0002)
+    assert fast.rto == MIN_RTO_S
+
+
+def test_retransmission_timer_pops_in_deadline_order():
+    timer = RetransmissionTimer()
+    timer.schedule(3.0, b"b", 1)
+    timer.schedule(1.0, b"a", 7)
+    timer.schedule(2.0, b"a", 8)
+
+    assert timer.next_deadline() == 1.0
+    assert timer.pop_expired(2.5) == [(1.0, b"a", 7), (2.0, b"a", 8)]
+    assert len(timer) == 1
+
+
+def test_packet_number_window_bounds_replay_tracking():
+    window = PacketNumberWindow(size=8)
+
+    assert window.add(10)
+    assert window.add(7)
+    assert not window.add(7)
+    assert set(window) == {7, 10}
+
+    assert window.add(20)
+    assert set(window) == {20}
+    assert 10 in window  # older than the window: treated as already seen
+    assert not window.add(12)
+    assert window.add(13)
+    assert 14 not in window
+    assert len(window) == 2
+
+
+def _quic_server_with_connection(monkeypatch, **server_kwargs):
+    from flask import Flask
+
+    from kemtls import quic_server
+    from kemtls.quic_server import KEMTLSQUICServer, _ServerConnection
+
+    clock = {"now": 100.0}
+    monkeypatch.setattr(quic_server.time, "monotonic", lambda: clock["now"])
+
+    sent = []
+
+    class RecordingSocket:
+        def sendto(self, payload, address):
+            sent.append(payload)
+
+    server = KEMTLSQUICServer(app=Flask(__name__), server_identity="server-1", server_lt_sk=b"", **server_kwargs)
+    server.sock.close()
+    server.sock = RecordingSocket()
+    server._io = DatagramIO(server.sock)
+    connection = _ServerConnection(
+        state=QUICConnectionState(connection_id=b"conn-1", peer_address=("127.0.0.1", 1)),
+        peer_address=("127.0.0.1", 1),
+        handshake=None,
+    )
+    server._connections[b"conn-1"] = connection
+    return server, connection, clock, sent
+
+
+def test_quic_server_retransmits_from_deadline_heap_with_backoff(monkeypatch):
+    server, connection, clock, sent = _quic_server_with_connection(monkeypatch)
+
+    packet_number = server._send_packet(connection, HANDSHAKE, b"hello", epoch=0, reliable=True)
+    assert len(sent) == 1
+
+    clock["now"] += INITIAL_RTO_S / 2
+    server._retransmit_expired_packets()
+    assert len(sent) == 1
+
+    clock["now"] += INITIAL_RTO_S
+    server._retransmit_expired_packets()
+    assert sent[1] == sent[0]
+    assert connection.state.retransmissions[packet_number].deadline == clock["now"] + 2 * INITIAL_RTO_S
+
+    ack = AckFrame(ranges=((packet_number, packet_number),))
+    server._process_ack(connection, encode_ack_frame(ack))
+    clock["now"] += 10
+    server._retransmit_expired_packets()
+
+    assert len(sent) == 2
+    assert connection.sent_packets == {}
+    # The acknowledged packet was retransmitted, so it yields no RTT sample.
+    assert connection.state.rtt.smoothed_rtt is None
+
+
+def test_quic_server_samples_rtt_from_first_transmission(monkeypatch):
+    server, connection, clock, sent = _quic_server_with_connection(monkeypatch)
+
+    first = server._send_packet(connection, HANDSHAKE, b"one", epoch=0, reliable=True)
+    second = server._send_packet(connection, HANDSHAKE, b"two", epoch=0, reliable=True)
+    clock["now"] += 0.040
+
+    server._process_ack(connection, encode_ack_frame(AckFrame(ranges=((first, second),), ack_delay_us=10_000)))
+
+    assert connection.state.rtt.latest_rtt == pytest.approx(0.040)
+    # The first sample defines min_rtt, so the ACK delay cannot be taken out of it.
+    assert connection.state.rtt.smoothed_rtt == pytest.approx(0.040)
+    assert decode_packet(sent[0]).packet_type == HANDSHAKE
+
+
+def _partial_initial(connection_id, packet_number=0):
+    frame = StreamFrame(stream_id=0, offset=0, data=b"partial", fin=False)
+    return QUICPacket(
+        packet_type=INITIAL,
+        connection_id=connection_id,
+        packet_number=packet_number,
+        payload=encode_stream_frame(frame),
+    )
+
+
+def test_quic_server_evicts_idle_and_least_recent_connections(monkeypatch):
+    server, _, clock, sent = _quic_server_with_connection(monkeypatch, idle_timeout=5.0, max_connections=2)
+    server._connections.clear()
+
+    server._handle_packet(_partial_initial(b"a"), ("127.0.0.1", 1))
+    clock["now"] += 1
+    server._handle_packet(_partial_initial(b"b"), ("127.0.0.1", 2))
+    clock["now"] += 1
+    server._handle_packet(_partial_initial(b"a", 1), ("127.0.0.1", 1))
+    clock["now"] += 1
+    server._handle_packet(_partial_initial(b"c"), ("127.0.0.1", 3))
+
+    def initial_ids():
+        return [connection.initial_connection_id for connection in server._connections.values()]
+
+    assert initial_ids() == [b"a", b"c"]
+    assert set(server._aliases) == {b"a", b"c"}
+    assert connection_id_worker(decode_packet(sent[-1]).connection_id) == 0
+
+    clock["now"] += 4.5
+    server._evict_idle_connections()
+    assert initial_ids() == [b"c"]
+    assert set(server._aliases) == {b"c"}
+
+    metrics = server.get_metrics()
+    assert metrics["connections"] == 1
+    assert metrics["max_table_size"] == 2
+    assert metrics["evicted_lru"] == 1
+    assert metrics["evicted_idle"] == 1
+    assert metrics["connections_opened"] == 3
+
+
+def test_server_connection_ids_route_to_their_worker():
+    connection_id = issue_connection_id(3)
+
+    assert len(connection_id) == SERVER_CONNECTION_ID_LEN
+    assert connection_id_worker(connection_id) == 3
+    assert connection_id_worker(b"short") is None
+    with pytest.raises(ValueError):
+        issue_connection_id(256)
+
+    wrapped = wrap_forwarded(("10.0.0.7", 4433), b"datagram")
+    assert unwrap_forwarded(wrapped) == (("10.0.0.7", 4433), b"datagram")
+    with pytest.raises(ValueError):
+        unwrap_forwarded(b"KQXX" + wrapped[4:])
+
+
+def test_quic_server_forwards_datagrams_for_other_workers(monkeypatch):
+    server, _, _, _ = _quic_server_with_connection(monkeypatch)
+    forwarded = []
+
+    class ForwardSocket:
+        def sendto(self, payload, address):
+            forwarded.append((payload, address))
+
+    server._forward_sock = ForwardSocket()
+    server._forward_addresses = (("127.0.0.1", 9000), ("127.0.0.1", 9001))
+
+    raw = encode_packet(packet_type=HANDSHAKE, connection_id=issue_connection_id(1), packet_number=0, payload=b"x")
+    server._receive_datagram(raw, ("10.0.0.7", 5000))
+
+    assert forwarded == [(wrap_forwarded(("10.0.0.7", 5000), raw), ("127.0.0.1", 9001))]
+    assert server.get_metrics()["forwarded_datagrams"] == 1
+
+    # New connections and our own IDs stay with this worker.
+    initial = _partial_initial(issue_connection_id(1))
+    server._receive_datagram(
+        encode_packet(
+            packet_type=initial.packet_type,
+            connection_id=initial.connection_id,
+            packet_number=initial.packet_number,
+            payload=initial.payload,
+        ),
+        ("10.0.0.7", 5000),
+    )
+    assert len(forwarded) == 1
+    assert len(server._connections) == 2
+
+
+def test_quic_server_only_accepts_forwarded_datagrams_from_sibling_workers(monkeypatch):
+    import socket
+
+    server, _, _, _ = _quic_server_with_connection(monkeypatch)
+    server.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.sock.bind(("127.0.0.1", 0))
+    server._io = DatagramIO(server.sock)
+    server._forward_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server._forward_sock.bind(("127.0.0.1", 0))
+    server._forward_sock.setblocking(False)
+    server._forward_io = DatagramIO(server._forward_sock)
+    sibling = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sibling.bind(("127.0.0.1", 0))
+    stranger = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server._forward_addresses = (server._forward_sock.getsockname(), sibling.getsockname())
+    try:
+        target = server._forward_sock.getsockname()
+        stranger.sendto(wrap_forwarded(("10.0.0.66", 1), b"spoofed"), target)
+        sibling.sendto(wrap_forwarded(("10.0.0.7", 5000), b"genuine"), target)
+
+        received = []
+        for _ in range(20):
+            received.extend(server._receive(0.1))
+            if received:
+                break
+        received.extend(server._receive(0.05))
+        assert received == [(b"genuine", ("10.0.0.7", 5000))]
+    finally:
+        for sock in (server.sock, server._forward_sock, sibling, stranger):
+            sock.close()
+
+
+def test_quic_server_retires_initial_connection_id_alias(monkeypatch):
+    server, _, _, sent = _quic_server_with_connection(monkeypatch)
+    server._connections.clear()
+
+    server._handle_packet(_partial_initial(b"client-cid"), ("127.0.0.1", 1))
+    (server_cid, connection), = server._connections.items()
+    assert connection_id_worker(server_cid) == 0
+    assert server._lookup(b"client-cid") is connection
+
+    server._handle_packet(_partial_initial(server_cid, 1), ("127.0.0.1", 1))
+    assert server._aliases == {}
+    assert server._lookup(b"client-cid") is None
+    assert {decode_packet(raw).connection_id for raw in sent} == {server_cid}
+
+
+def test_quic_client_adopts_server_connection_id_once(monkeypatch):
+    transport = KEMTLSQUICClientTransport(expected_identity="server-1")
+    server_cid = issue_connection_id(2)
+    ack_frame = encode_ack_frame(AckFrame(ranges=[(0, 0)]))
+    for packet_number, connection_id in enumerate([server_cid, issue_connection_id(3)]):
+        datagram = encode_packet(packet_type=ACK, connection_id=connection_id, packet_number=packet_number, payload=ack_frame)
+        assert transport._process_datagram(datagram, now=0.0) is None
+
+    assert transport.connection_id == server_cid
+    assert transport.state.connection_id == server_cid
+
+
+class _RecordingDatagramSocket:
+    def __init__(self, fail_sendmsg=None):
+        self.calls = []
+        self.fail_sendmsg = fail_sendmsg
+
+    def sendto(self, payload, address):
+        self.calls.append(("sendto", [payload], address))
+
+    def sendmsg(self, buffers, ancillary, flags=0, address=None):
+        if self.fail_sendmsg is not None:
+            raise OSError(self.fail_sendmsg, "no offload")
+        self.calls.append(("sendmsg", list(buffers), address))
+        return sum(map(len, buffers))
+
+
+def test_datagram_io_coalesces_equal_runs_per_peer():
+    sock = _RecordingDatagramSocket()
+    io = DatagramIO(sock)
+    io.segment_offload = True
+    peer_a, peer_b = ("127.0.0.1", 1), ("127.0.0.1", 2)
+
+    with io.batch():
+        for _ in range(3):
+            io.send(b"a" * 1200, peer_a)
+        io.send(b"a" * 500, peer_a)
+        io.send(b"b" * 1200, peer_b)
+        with io.batch():
+            io.send(b"ack", peer_b)
+        assert sock.calls == []
+
+    assert [(kind, len(buffers), address) for kind, buffers, address in sock.calls] == [
+        ("sendmsg", 4, peer_a),
+        ("sendmsg", 2, peer_b),
+    ]
+    assert io.get_metrics()["datagrams_sent"] == 6
+    assert io.get_metrics()["send_calls"] == 2
+
+    io.send(b"now", peer_a)
+    assert sock.calls[-1] == ("sendto", [b"now"], peer_a)
+
+
+def test_datagram_io_falls_back_without_segmentation_offload():
+    import errno
+
+    sock = _RecordingDatagramSocket(fail_sendmsg=errno.EIO)
+    io = DatagramIO(sock)
+    io.segment_offload = True
+
+    with io.batch():
+        io.send(b"x" * 100, ("127.0.0.1", 1))
+        io.send(b"y" * 100, ("127.0.0.1", 1))
+
+    assert not io.segment_offload
+    assert [buffers for _, buffers, _ in sock.calls] == [[b"x" * 100], [b"y" * 100]]
+
+
+def test_datagram_io_drains_a_burst_per_wakeup():
+    import socket
+
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        receiver.bind(("127.0.0.1", 0))
+        receiver.setblocking(False)
+        for index in range(10):
+            sender.sendto(bytes([index]) * 100, receiver.getsockname())
+
+        batched = DatagramIO(receiver)
+        datagrams = batched.recv_batch(1.0)
+        assert [payload[0] for payload, _ in datagrams] == list(range(10))
+        assert batched.receive_wakeups == 1
+
+        sender.sendto(b"one", receiver.getsockname())
+        sender.sendto(b"two", receiver.getsockname())
+        single = DatagramIO(receiver, batched=False)
+        assert [payload for payload, _ in single.recv_batch(1.0)] == [b"one"]
+        assert batched.recv_batch(0.0)[0][0] == b"two"
+    finally:
+        receiver.close()
+        sender.close()
@@ -2,6 +2,7 @@ import struct
 
 import pytest
 
+from kemtls._buffer import SocketReader
 from kemtls.record_layer import KEMTLSRecordLayer
 from kemtls.session import KEMTLSSession
 
@@ -113,3 +114,148 @@ def test_send_record_encrypts_once_and_header_matches_ciphertext(monkeypatch):
     assert len(frame) >= 12
     length = struct.unpack(">I", frame[8:12])[0]
     assert length == len(frame[12:])
+
+
+class _RecvIntoSocket(_MemorySocket):
+    def __init__(self):
+        super().__init__()
+        self.recv_calls = 0
+
+    def recv_into(self, view) -> int:
+        self.recv_calls += 1
+        size = min(len(view), len(self.buffer))
+        view[:size] = self.buffer[:size]
+        del self.buffer[:size]
+        return size
+
+
+def test_recv_record_reads_ahead_across_records():
+    client_sock = _MemorySocket()
+    server_sock = _RecvIntoSocket()
+    client_sock.connect(server_sock)
+    client = KEMTLSRecordLayer(_session(), client_sock, is_client=True)
+    server = KEMTLSRecordLayer(_session(), server_sock, is_client=False)
+
+    for payload in (b"one", b"two", b"three"):
+        client.send_record(payload)
+
+    assert [server.recv_record() for _ in range(3)] == [b"one", b"two", b"three"]
+    assert server_sock.recv_calls == 1
+    assert server.recv_seq == 3
+
+
+def test_recv_record_grows_buffer_for_large_records():
+    client_sock = _MemorySocket()
+    server_sock = _RecvIntoSocket()
+    client_sock.connect(server_sock)
+    client = KEMTLSRecordLayer(_session(), client_sock, is_client=True)
+    server = KEMTLSRecordLayer(_session(), server_sock, is_client=False)
+
+    large = bytes(range(256)) * 512
+    client.send_record(b"small")
+    client.send_record(large)
+    client.send_record(b"after")
+
+    assert server.recv_record() == b"small"
+    assert server.recv_record() == large
+    assert server.recv_record() == b"after"
+    assert server.reader.buffered == 0
+
+
+def test_socket_reader_never_grows_past_max_capacity():
+    sock = _MemorySocket()
+    sock.buffer.extend(b"x" * 64)
+    reader = SocketReader(sock, capacity=16, max_capacity=32)
+
+    assert reader.read_bytes(32) == b"x" * 32
+    with pytest.raises(ValueError, match="exceeds buffer limit"):
+        reader.read(33)
+
+
+def test_recv_handshake_rejects_oversized_length_before_reading_body():
+    from kemtls.tcp_transport import KEMTLSTCPServerConnection
+
+    sock = _MemorySocket()
+    sock.buffer.extend((1 << 30).to_bytes(4, "big"))
+    connection = KEMTLSTCPServerConnection(sock)
+
+    with pytest.raises(ValueError, match="handshake message too large"):
+        connection.recv_handshake()
+    assert len(connection.reader._buf) == 64 * 1024
+
+
+def test_open_record_accepts_buffer_views():
+    client_sock, _ = _socket_pair()
+    client = KEMTLSRecordLayer(_session(), client_sock, is_client=True)
+    server = KEMTLSRecordLayer(_session(), None, is_client=False)
+
+    (header, ciphertext), = client.seal_fragments(b"hello")
+    record = memoryview(bytearray(header + ciphertext))
+    length = server.parse_record_header(record[:12])
+
+    assert server.open_record(record[:12], record[12:12 + length]) == b"hello"
+    assert server.recv_seq == 1
+
+
+class _SendmsgSocket(_MemorySocket):
+    """Accepts at most ``limit`` bytes per sendmsg call to force partial writes."""
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+        self.sendmsg_calls = []
+
+    def sendmsg(self, buffers) -> int:
+        data = b"".join(bytes(buf) for buf in buffers)[: self.limit]
+        self.sendmsg_calls.append(len(buffers))
+        self.peer.buffer.extend(data)
+        return len(data)
+
+
+def test_send_record_fragments_large_messages():
+    client_sock, server_sock = _socket_pair()
+    client = KEMTLSRecordLayer(_session(), client_sock, is_client=True, max_fragment_size=1024)
+    server = KEMTLSRecordLayer(_session(), server_sock, is_client=False)
+
+    message = bytes(range(256)) * 10
+    client.send_record(message)
+
+    assert client.send_seq == 3
+    assert server.recv_record() == message
+    assert server.recv_seq == 3
+
+
+def test_recv_record_rejects_records_longer_than_a_fragment():
+    client_sock, server_sock = _socket_pair()
+    server = KEMTLSRecordLayer(_session(), server_sock, is_client=False, max_fragment_size=1024)
+    client_sock.sendall(struct.pack(">QI", 0, 1 << 30))
+
+    with pytest.raises(ValueError, match="record too large"):
+        server.recv_record()
+
+
+def test_recv_record_bounds_reassembled_message_size():
+    client_sock, server_sock = _socket_pair()
+    client = KEMTLSRecordLayer(_session(), client_sock, is_client=True, max_fragment_size=1024)
+    server = KEMTLSRecordLayer(_session(), server_sock, is_client=False, max_message_size=2048)
+
+    client.send_record(b"x" * 2048)
+    assert server.recv_record() == b"x" * 2048
+
+    client.send_record(b"x" * 4096)
+    with pytest.raises(ValueError, match="message exceeds 2048 bytes"):
+        server.recv_record()
+    assert server.recv_seq == 5
+
+
+def test_send_records_coalesces_with_sendmsg_and_resumes_partial_writes():
+    client_sock = _SendmsgSocket(limit=7)
+    server_sock = _MemorySocket()
+    client_sock.connect(server_sock)
+    client = KEMTLSRecordLayer(_session(), client_sock, is_client=True)
+    server = KEMTLSRecordLayer(_session(), server_sock, is_client=False)
+
+    client.send_records([b"one", b"two", b""])
+
+    assert client_sock.sendmsg_calls[0] == 6
+    assert [server.recv_record() for _ in range(3)] == [b"one", b"two", b""]
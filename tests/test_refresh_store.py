@@ -122,3 +122,46 @@ def test_rotate_rejects_invalid_inputs():
         store.rotate_token(token, {}, 2_000_000_100)
     with pytest.raises(TypeError):
         store.rotate_token(token, {"binding_method": "x"}, "bad-expiry")
+
+
+def test_revocation_is_scoped_to_family_and_subject():
+    store = RefreshTokenStore()
+    meta = build_refresh_binding_metadata(_session())
+    alice_one = store.issue_token("alice", "client123", meta, 2_000_000_000)
+    alice_rotated = store.rotate_token(alice_one, meta, 2_000_000_000)
+    alice_two = store.issue_token("alice", "client123", meta, 2_000_000_000)
+    alice_other_client = store.issue_token("alice", "client456", meta, 2_000_000_000)
+    bob = store.issue_token("bob", "client123", meta, 2_000_000_000)
+
+    assert store.revoke_family(alice_one) is True
+    assert store._lookup_token(alice_rotated).revoked is True
+    assert store._lookup_token(alice_two).revoked is False
+
+    assert store.revoke_subject("alice", "client123") == 2
+    assert store._lookup_token(alice_two).revoked is True
+    assert store._lookup_token(alice_other_client).revoked is False
+    assert store._lookup_token(bob).revoked is False
+
+
+def test_expired_records_are_swept_with_their_indexes(monkeypatch):
+    clock = {"now": 1_000}
+    monkeypatch.setattr("oidc.refresh_store.get_timestamp", lambda: clock["now"])
+    store = RefreshTokenStore(sweep_batch=2)
+    meta = build_refresh_binding_metadata(_session())
+    short_lived = [store.issue_token("alice", f"client{i}", meta, 1_010) for i in range(3)]
+    extended = store.issue_token("bob", "client123", meta, 1_010)
+    store._lookup_token(extended).expires_at = 5_000
+    long_lived = store.issue_token("carol", "client123", meta, 5_000)
+
+    clock["now"] = 1_020
+    # Each issue sweeps at most sweep_batch expired records.
+    store.issue_token("dave", "client123", meta, 5_000)
+    assert len(store) == 4
+    assert store.sweep_expired() == 1
+
+    assert all(store._lookup_token(token) is None for token in short_lived)
+    assert store.consume_token(extended) is not None
+    assert store.consume_token(long_lived) is not None
+    assert store.revoke_subject("alice", "client0") == 0
+    assert set(store._subject_families) == {("bob", "client123"), ("carol", "client123"), ("dave", "client123")}
+    assert not hasattr(store._lookup_token(long_lived), "__dict__")
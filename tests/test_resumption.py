@@ -0,0 +1,226 @@
+import socket
+import threading
+import time
+
+import pytest
+from flask import Flask, jsonify
+
+from client.kemtls_http_client import KEMTLSHttpClient
+
+from crypto.ml_kem import MLKEM768
+from kemtls._wire import decode_message, encode_message
+from kemtls.async_tcp_server import AsyncKEMTLSTCPServer
+from kemtls.handshake import ClientHandshake, ServerHandshake
+from kemtls.pdk import PDKTrustStore
+from kemtls.quic_server import KEMTLSQUICServer
+from kemtls.resumption import ResumptionTicket, TicketCache, TicketIssuer
+from kemtls.tcp_server import KEMTLSTCPServer
+from kemtls.tcp_transport import KEMTLSTCPClientTransport
+
+
+SERVER_LT_PUBLIC_KEY, SERVER_LT_SECRET_KEY = MLKEM768.generate_keypair()
+
+
+def _pdk_store():
+    store = PDKTrustStore()
+    store.add_entry("key-1", "server-1", SERVER_LT_PUBLIC_KEY)
+    return store
+
+
+def _handshake(issuer, ticket=None, *, versions=None):
+    server = ServerHandshake(
+        server_identity="server-1",
+        server_lt_sk=SERVER_LT_SECRET_KEY,
+        pdk_key_id="key-1",
+        ticket_issuer=issuer,
+        versions=versions,
+    )
+    client = ClientHandshake(
+        expected_identity="server-1",
+        pdk_store=_pdk_store(),
+        mode="pdk",
+        versions=versions,
+        ticket=ticket,
+        request_ticket=True,
+    )
+
+    sh = server.process_client_hello(client.client_hello())
+    cke, session_client = client.process_server_hello(sh)
+    if server.resumed:
+        assert cke is None
+        sf = server.resumed_server_finished()
+    else:
+        sf = server.process_client_key_exchange(cke)
+    nst = server.new_session_ticket()
+    session_client = client.process_server_finished(sf, session_client)
+    new_ticket = client.process_new_session_ticket(nst)
+    session_server = server.verify_client_finished(client.client_finished())
+    return session_client, session_server, new_ticket, server
+
+
+@pytest.mark.parametrize("versions", [None, ["KEMTLS/1.1"]])
+def test_resumed_handshake_skips_kem_and_derives_fresh_binding(versions):
+    issuer = TicketIssuer()
+    first_client, first_server, ticket, _ = _handshake(issuer, versions=versions)
+    assert first_client.resumed is False
+
+    client, server_session, next_ticket, server = _handshake(issuer, ticket, versions=versions)
+
+    assert server.resumed is True
+    assert server._eph_keypair is None
+    assert client.handshake_mode == server_session.handshake_mode == "psk"
+    assert client.resumed is server_session.resumed is True
+    assert client.client_write_key == server_session.client_write_key
+    assert client.session_binding_id == server_session.session_binding_id
+    assert client.session_binding_id != first_client.session_binding_id
+    assert next_ticket.ticket != ticket.ticket
+
+
+def test_tampered_binder_falls_back_to_full_handshake():
+    issuer = TicketIssuer()
+    _, _, ticket, _ = _handshake(issuer)
+    forged = ResumptionTicket(ticket.ticket, b"\x00" * 32, ticket.server_identity, ticket.expires_at)
+
+    client, _, _, server = _handshake(issuer, forged)
+
+    assert server.resumed is False
+    assert client.handshake_mode == "pdk"
+
+
+def test_ticket_from_another_issuer_is_ignored():
+    _, _, ticket, _ = _handshake(TicketIssuer())
+
+    _, _, _, server = _handshake(TicketIssuer(), ticket)
+
+    assert server.resumed is False
+
+
+def test_issuer_rejects_expired_and_keeps_previous_key_after_rotation(monkeypatch):
+    issuer = TicketIssuer(lifetime_s=10)
+    ticket = issuer.issue(resumption_secret=b"s" * 32, server_identity="server-1", handshake_mode="pdk")
+
+    issuer.rotate()
+    assert issuer.open(ticket)["secret"] == b"s" * 32
+    issuer.rotate()
+    assert issuer.open(ticket) is None
+
+    fresh = issuer.issue(resumption_secret=b"s" * 32, server_identity="server-1", handshake_mode="pdk")
+    monkeypatch.setattr("kemtls.resumption.time.time", lambda: time.time_ns() / 1e9 + 11)
+    assert issuer.open(fresh) is None
+
+
+def test_ticket_cache_is_single_use_and_bounded():
+    cache = TicketCache(max_entries=2)
+    ticket = ResumptionTicket(b"t", b"s" * 32, "server-1", time.time() + 60)
+    cache.put("127.0.0.1", 1, "server-1", ticket)
+    cache.put("127.0.0.1", 2, "server-1", ticket)
+    cache.put("127.0.0.1", 3, "server-1", ticket)
+
+    assert cache.take("127.0.0.1", 1, "server-1") is None
+    assert cache.take("127.0.0.1", 3, "server-1") is ticket
+    assert cache.take("127.0.0.1", 3, "server-1") is None
+    assert cache.get_metrics() == {"entries": 1, "hits": 1, "misses": 2}
+
+
+def test_new_session_ticket_roundtrips_binary_encoding():
+    message = {"type": "NewSessionTicket", "ticket": b"t" * 40, "nonce": b"n" * 16, "lifetime": "3600"}
+
+    assert decode_message(encode_message(message)) == {**message, "version": "KEMTLS/1.1"}
+
+
+def _free_port(kind=socket.SOCK_STREAM):
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _build_app():
+    app = Flask(__name__)
+
+    @app.route("/ping")
+    def ping():
+        return jsonify({"ok": True})
+
+    return app
+
+
+def _server_kwargs(port):
+    return dict(
+        app=_build_app(),
+        server_identity="server-1",
+        server_lt_sk=SERVER_LT_SECRET_KEY,
+        pdk_key_id="key-1",
+        host="127.0.0.1",
+        port=port,
+    )
+
+
+def _wait_for_tcp(port):
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+
+
+def test_tcp_client_resumes_with_cached_ticket():
+    port = _free_port()
+    server = KEMTLSTCPServer(**_server_kwargs(port))
+    threading.Thread(target=server.start, daemon=True).start()
+    _wait_for_tcp(port)
+    cache = TicketCache()
+    try:
+        modes = []
+        for _ in range(2):
+            transport = KEMTLSTCPClientTransport(
+                expected_identity="server-1",
+                pdk_store=_pdk_store(),
+                mode="pdk",
+                ticket_cache=cache,
+            )
+            transport.connect("127.0.0.1", port)
+            modes.append(transport.session.handshake_mode)
+            transport.close()
+
+        assert modes == ["pdk", "psk"]
+        assert len(cache) == 1
+    finally:
+        server.stop()
+
+
+@pytest.mark.parametrize("transport", ["tcp", "quic"])
+def test_http_client_resumes_against_async_and_quic_servers(transport):
+    if transport == "tcp":
+        port = _free_port()
+        server = AsyncKEMTLSTCPServer(**_server_kwargs(port))
+    else:
+        port = _free_port(socket.SOCK_DGRAM)
+        server = KEMTLSQUICServer(**_server_kwargs(port))
+    threading.Thread(target=server.start, daemon=True).start()
+    if transport == "tcp":
+        _wait_for_tcp(port)
+    else:
+        deadline = time.time() + 5
+        while server.sock.getsockname()[1] != port and time.time() < deadline:
+            time.sleep(0.01)
+    cache = TicketCache()
+    try:
+        modes = []
+        for _ in range(3):
+            client = KEMTLSHttpClient(
+                pdk_store=_pdk_store(),
+                expected_identity="server-1",
+                mode="pdk",
+                transport=transport,
+                ticket_cache=cache,
+            )
+            response = client.get(f"kemtls://127.0.0.1:{port}/ping")
+            assert response["status"] == 200
+            modes.append(response["kemtls_metadata"]["mode"])
+            client.close()
+
+        assert modes == ["pdk", "psk", "psk"]
+    finally:
+        server.stop()
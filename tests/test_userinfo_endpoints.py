@@ -6,8 +6,11 @@ from crypto.ml_dsa import MLDSA65
 from flask import Flask
 
 from oidc.jwt_handler import PQJWT
+from oidc.introspection_endpoints import IntrospectionEndpoint
 from oidc.session_binding import build_access_token_binding_claim
+from oidc.token_cache import VerifiedTokenCache
 from oidc.userinfo_endpoints import UserInfoEndpoint
+from telemetry.collector import OIDCUserinfoCollector
 
 
 @dataclass
@@ -260,3 +263,86 @@ def test_userinfo_route_fails_closed_without_session_resolution(monkeypatch):
 
     assert response.status_code == 401
     assert response.get_json()["error"] == "missing_session_context"
+
+
+def _count_verifies(monkeypatch):
+    calls = []
+    real_verify = MLDSA65.verify
+
+    def counting_verify(*args):
+        calls.append(args)
+        return real_verify(*args)
+
+    monkeypatch.setattr(MLDSA65, "verify", staticmethod(counting_verify))
+    return calls
+
+
+def test_userinfo_verifies_repeat_tokens_once_but_checks_binding_every_time(monkeypatch):
+    session = DummySession(b"a" * 32, b"b" * 32)
+    token = _make_access_token(session)
+    cache = VerifiedTokenCache()
+    endpoint = UserInfoEndpoint(
+        ISSUER_PUBLIC_KEY,
+        issuer="https://issuer.example",
+        audience="client123",
+        token_cache=cache,
+    )
+    introspection = IntrospectionEndpoint(
+        ISSUER_PUBLIC_KEY,
+        issuer="https://issuer.example",
+        audience="client123",
+        token_cache=cache,
+    )
+    verifies = _count_verifies(monkeypatch)
+
+    collectors = [OIDCUserinfoCollector() for _ in range(3)]
+    statuses = [
+        endpoint.handle_userinfo_request(token, session=session, collector=collector)[1]
+        for collector in collectors
+    ]
+    replay_payload, replay_status = endpoint.handle_userinfo_request(
+        token,
+        session=DummySession(b"z" * 32, b"b" * 32),
+    )
+
+    assert statuses == [200, 200, 200]
+    assert replay_status == 401
+    assert replay_payload["error"] == "binding_mismatch"
+    assert introspection.introspect(token)["active"] is True
+    assert len(verifies) == 1
+    assert [c.get_metrics()["token_cache_hits"] for c in collectors] == [0, 1, 1]
+    assert collectors[0].get_metrics()["token_cache_misses"] == 1
+    assert cache.get_metrics() == {"entries": 1, "hits": 4, "misses": 1}
+
+
+def test_cached_token_expires_with_its_exp_claim(monkeypatch):
+    session = DummySession(b"a" * 32, b"b" * 32)
+    token = _make_access_token(session)
+    cache = VerifiedTokenCache()
+    endpoint = UserInfoEndpoint(
+        ISSUER_PUBLIC_KEY,
+        issuer="https://issuer.example",
+        audience="client123",
+        token_cache=cache,
+    )
+    assert endpoint.handle_userinfo_request(token, session=session)[1] == 200
+
+    later = time.time() + 601
+    monkeypatch.setattr("oidc.token_cache.time.time", lambda: later)
+    monkeypatch.setattr("oidc.jwt_handler.time.time", lambda: later)
+    payload, status = endpoint.handle_userinfo_request(token, session=session)
+
+    assert status == 401
+    assert payload["error"] == "invalid_token"
+    assert len(cache) == 0
+
+
+def test_token_cache_keys_on_validation_policy():
+    session = DummySession(b"a" * 32, b"b" * 32)
+    token = _make_access_token(session)
+    cache = VerifiedTokenCache()
+    accepting = UserInfoEndpoint(ISSUER_PUBLIC_KEY, audience="client123", token_cache=cache)
+    rejecting = UserInfoEndpoint(ISSUER_PUBLIC_KEY, audience="other-client", token_cache=cache)
+
+    assert accepting.handle_userinfo_request(token, session=session)[1] == 200
+    assert rejecting.handle_userinfo_request(token, session=session)[1] == 401